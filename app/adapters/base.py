@@ -1,8 +1,24 @@
+import asyncio
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Any, Optional
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
 
-from app.spoofers.profile import BaseConfig
+from app.ephemeral import EphemeralUserDataDir
+from app.launch_plan import LaunchPlan
+from app.resource_governor import GOVERNOR, ResourceLimits
+from app.sessions import ProcessHandle
+from app.spoofers.profile import (
+    DEFAULT_NAVIGATION_TIMEOUT,
+    DEFAULT_NAVIGATION_WAIT,
+    MAX_CPU_PERCENT,
+    MAX_CPU_WEIGHT,
+    MAX_MEMORY_MB,
+    NAVIGATION_WAIT_POLICIES,
+    BaseConfig,
+    get_user_data_dir,
+    load_profile,
+)
 
 
 @dataclass
@@ -29,6 +45,14 @@ class ValidationError:
 @dataclass
 class LaunchResult:
     page: Any
+    pid: Optional[int] = None
+    debug_port: Optional[int] = None
+    user_data_dir: Optional[str] = None
+    # Runs once the browser process is gone, e.g. to sync back and drop an ephemeral user-data dir.
+    on_exit: Optional[Callable[[], None]] = None
+    # extra_config entries the launch generated for the profile to keep, e.g. a Camoufox fingerprint.
+    # The adapter never writes them itself; whoever owns the profile merges and saves them.
+    profile_updates: dict = field(default_factory=dict)
 
 
 class BrowserAdapter(ABC):
@@ -50,6 +74,62 @@ class BrowserAdapter(ABC):
             FieldSchema(key='target_url', label='Target URL', type='text', required=False),
             FieldSchema(key='user_data_dir', label='User Data Dir', type='text', required=False),
             FieldSchema(key='proxy', label='Proxy', type='text', required=False),
+            FieldSchema(key='ephemeral', label='Ephemeral (RAM)', type='switch', default=False),
+            FieldSchema(
+                key='ephemeral_sync',
+                label='Sync Back on Close',
+                type='text',
+                default='',
+                placeholder='Default/Cookies, Default/Local Storage',
+                help_text='Paths inside the user-data dir copied back to disk when an ephemeral session ends',
+            ),
+            FieldSchema(
+                key='navigation_wait',
+                label='Wait for Page',
+                type='combo',
+                default=DEFAULT_NAVIGATION_WAIT,
+                options=[(policy, policy) for policy in NAVIGATION_WAIT_POLICIES],
+                help_text='How far the first page must load before the launch counts as done',
+            ),
+            FieldSchema(
+                key='navigation_timeout',
+                label='Page Wait Timeout (s)',
+                type='spin',
+                default=DEFAULT_NAVIGATION_TIMEOUT,
+                min=1,
+                max=600,
+                step=1,
+            ),
+            FieldSchema(
+                key='cpu_weight',
+                label='CPU Weight',
+                type='spin',
+                default=0,
+                min=0,
+                max=MAX_CPU_WEIGHT,
+                step=10,
+                help_text='Share of CPU under contention, 100 being normal; 0 leaves it alone',
+            ),
+            FieldSchema(
+                key='cpu_max_percent',
+                label='CPU Limit (%)',
+                type='spin',
+                default=0,
+                min=0,
+                max=MAX_CPU_PERCENT,
+                step=50,
+                help_text='Hard CPU cap, 100 per core; 0 means no cap. Needs cgroup v2',
+            ),
+            FieldSchema(
+                key='memory_max_mb',
+                label='Memory Limit (MB)',
+                type='spin',
+                default=0,
+                min=0,
+                max=MAX_MEMORY_MB,
+                step=256,
+                help_text='memory.max of the browser cgroup; 0 means no limit. Needs cgroup v2',
+            ),
         ]
 
     @abstractmethod
@@ -63,3 +143,57 @@ class BrowserAdapter(ABC):
     @abstractmethod
     def launch(self, base_config: BaseConfig, extra_config: dict) -> LaunchResult:
         raise NotImplementedError
+
+    async def launch_async(self, base_config: BaseConfig, extra_config: dict) -> LaunchResult:
+        """
+        Launches from an asyncio loop. The default runs the blocking launch()
+        on a worker thread; adapters with an async driver override it so that
+        no thread is held while the browser starts and gets set up.
+        """
+        return await asyncio.to_thread(self.launch, base_config, extra_config)
+
+    def compile_launch_plan(self, base_config: BaseConfig, extra_config: dict, digest: str) -> LaunchPlan:
+        """What a launch can work out ahead from the profile alone; see app.launch_plan."""
+        return LaunchPlan(
+            profile_id=base_config.profile_id,
+            adapter_id=self.id,
+            digest=digest,
+            user_data_dir=None if base_config.ephemeral else get_user_data_dir(base_config),
+        )
+
+    def attach(self, record: dict) -> Optional[LaunchResult]:
+        """
+        Takes over a browser started by an earlier app process, described by
+        a session record (see app.sessions.session_record). The default can
+        only manage it as a process; adapters with a remote protocol override
+        this to reconnect their driver.
+        """
+        pid = record.get('pid')
+        if not pid:
+            return None
+        return LaunchResult(
+            page=ProcessHandle(pid),
+            pid=pid,
+            debug_port=record.get('debug_port'),
+            user_data_dir=record.get('user_data_dir'),
+            on_exit=self._adopt_ephemeral_dir(record),
+        )
+
+    def govern(self, base_config: BaseConfig, pid: Optional[int]) -> None:
+        """Applies the profile's CPU/memory limits to a freshly started browser; blocking, see app.resource_governor."""
+        limits = ResourceLimits.from_base_config(base_config)
+        if pid and limits.active:
+            GOVERNOR.place(pid, base_config.profile_id, limits)
+
+    def focus(self, handle: Any) -> bool:
+        """Brings the browser window behind `handle` to the front; False if the adapter cannot."""
+        return False
+
+    def _adopt_ephemeral_dir(self, record: dict) -> Optional[Callable[[], None]]:
+        user_data_dir = record.get('user_data_dir')
+        if not user_data_dir:
+            return None
+        profile = load_profile(record['profile_id'])
+        base_config = profile.base_config if profile else BaseConfig(profile_id=record['profile_id'])
+        ram_dir = EphemeralUserDataDir.adopt(Path(user_data_dir), base_config)
+        return ram_dir.close if ram_dir else None
@@ -1,34 +1,158 @@
+import asyncio
+import hashlib
+import json
+import time
+from importlib import metadata
 from pathlib import Path
 from typing import Optional
 
 from app.adapters.base import BrowserAdapter, FieldSchema, LaunchResult, ValidationError
-from app.spoofers.profile import get_profiles_dir
-from app.spoofers.profile import BaseConfig, SpoofProfile
+from app.async_bridge import complete_on_loop, get_async_loop
+from app.ephemeral import EphemeralUserDataDir
+from app.sessions import find_browser_pid
+from app.spoofers.profile import get_user_data_dir
+from app.spoofers.profile import CAMOUFOX_FINGERPRINT_KEY, BaseConfig, SpoofProfile
+
+# extra_config key holding the generated Camoufox config (fingerprint + GeoIP) and what it was built from.
+FINGERPRINT_CACHE_KEY = CAMOUFOX_FINGERPRINT_KEY
+CONFIG_ENV_PREFIX = 'CAMOU_CONFIG_'
+
+
+class _SharedPlaywright:
+    """
+    One Playwright driver (a Node process) for every Camoufox session of
+    this process. It lives on the shared loop of app.async_bridge, which is
+    the only loop Camoufox launches run on.
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+
+                started = time.perf_counter()
+                self._playwright = await async_playwright().start()
+                print(f'[CAMOUFOX] Playwright driver started in {(time.perf_counter() - started) * 1000:.0f} ms')
+            return self._playwright
+
+    def is_dead(self) -> bool:
+        """True if the driver was started and its connection to the Node process is gone."""
+        if self._playwright is None:
+            return False
+        connection = getattr(getattr(self._playwright, '_impl_obj', self._playwright), '_connection', None)
+        if connection is None:
+            return False
+        if getattr(connection, '_closed_error', None) is not None:
+            return True
+        proc = getattr(getattr(connection, '_transport', None), '_proc', None)
+        return proc is not None and proc.returncode is not None
+
+    async def reset(self) -> None:
+        """Drops the driver, e.g. after it died; the next get() starts a fresh one."""
+        playwright, self._playwright = self._playwright, None
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception:
+                pass
+
+
+_DRIVER = _SharedPlaywright()
 
 
 class _CamoufoxHandle:
-    def __init__(self, session, context, page):
-        self._session = session
+    """Handle for a Camoufox context on the shared driver; quit() may be called from any thread."""
+
+    QUIT_TIMEOUT_SECONDS = 10.0
+
+    def __init__(self, context, page, loop: asyncio.AbstractEventLoop):
         self._context = context
         self._page = page
+        self._loop = loop
 
     def quit(self) -> None:
-        try:
-            try:
-                self._context.close()
-            except Exception:
-                pass
-        finally:
-            try:
-                self._session.__exit__(None, None, None)
-            except Exception:
-                pass
+        # Only the context goes away; the driver keeps serving the other sessions.
+        complete_on_loop(self._loop, _close_context(self._context), self.QUIT_TIMEOUT_SECONDS)
 
     @property
     def page(self):
         return self._page
 
 
+async def _close_context(context) -> None:
+    try:
+        await context.close()
+    except Exception:
+        pass
+
+
+def fingerprint_cache_key(options: dict) -> str:
+    """
+    Hash of everything the generated config depends on. A changed proxy means
+    a different exit IP and so different GeoIP data; screen, locale or a
+    Camoufox upgrade change the fingerprint itself.
+    """
+    try:
+        camoufox_version = metadata.version('camoufox')
+    except metadata.PackageNotFoundError:
+        camoufox_version = ''
+    inputs = {
+        key: options.get(key)
+        for key in ('proxy', 'geoip', 'locale', 'timezone_id', 'window', 'args', 'executable_path')
+    }
+    inputs['camoufox'] = camoufox_version
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def config_from_env(env: dict) -> Optional[dict]:
+    """Reassembles the Camoufox config that launch_options() splits over CAMOU_CONFIG_1..N."""
+    chunks = sorted(
+        (int(name[len(CONFIG_ENV_PREFIX):]), value)
+        for name, value in (env or {}).items()
+        if name.startswith(CONFIG_ENV_PREFIX) and name[len(CONFIG_ENV_PREFIX):].isdigit()
+    )
+    if not chunks:
+        return None
+    try:
+        config = json.loads(''.join(str(value) for _, value in chunks))
+    except ValueError:
+        return None
+    return config if isinstance(config, dict) else None
+
+
+def _target_os(config: dict) -> Optional[str]:
+    user_agent = str(config.get('navigator.userAgent') or '')
+    if 'Windows' in user_agent:
+        return 'windows'
+    if 'Macintosh' in user_agent:
+        return 'macos'
+    if 'Linux' in user_agent:
+        return 'linux'
+    return None
+
+
+async def _open_target_url(page, url: str, wait: str, timeout: float) -> None:
+    """
+    Navigates the first page, returning once `wait` is reached ('none' does not
+    wait at all). A slow or failing first page is logged, not fatal: the
+    browser is already up and the user can retry from the address bar.
+    """
+    if wait == 'none':
+        task = asyncio.ensure_future(page.goto(url, wait_until='commit', timeout=timeout * 1000))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return
+    try:
+        await page.goto(url, wait_until=wait, timeout=timeout * 1000)
+    except Exception as exc:
+        print(f'[CAMOUFOX] {url} did not reach {wait}: {exc}')
+
+
 class CamoufoxAdapter(BrowserAdapter):
     @property
     def id(self) -> str:
@@ -83,11 +207,99 @@ class CamoufoxAdapter(BrowserAdapter):
         return errors
 
     def launch(self, base_config: BaseConfig, extra_config: dict) -> LaunchResult:
+        # Sync Playwright is tied to the calling thread; going through the shared loop lets
+        # blocking callers use the same long-lived driver as everyone else.
+        return get_async_loop().run(self.launch_async(base_config, extra_config))
+
+    async def launch_async(self, base_config: BaseConfig, extra_config: dict) -> LaunchResult:
+        """
+        Opens a persistent context on the shared Playwright driver. Must run
+        on app.async_bridge's loop: the driver and the context are bound to it.
+        """
         try:
-            from camoufox.sync_api import Camoufox
+            from camoufox.utils import launch_options  # noqa: F401 - fail early with a clear message
         except Exception as exc:
             raise RuntimeError('Camoufox is not available in this environment') from exc
 
+        url, options, ram_dir = await asyncio.to_thread(self._prepare_launch, base_config, extra_config)
+        try:
+            playwright_options, profile_updates = await asyncio.to_thread(
+                self._resolve_launch_options, base_config, extra_config, options
+            )
+            playwright = await _DRIVER.get()
+            try:
+                context = await playwright.firefox.launch_persistent_context(**playwright_options)
+            except Exception:
+                # A bad profile or a missing binary fails just this launch; only a dead driver is
+                # replaced, as resetting it closes every other session's context.
+                if _DRIVER.is_dead():
+                    await _DRIVER.reset()
+                raise
+        except Exception as exc:
+            if ram_dir:
+                ram_dir.close()
+            raise RuntimeError('Camoufox launch failed. Ensure Camoufox is installed: camoufox fetch') from exc
+
+        try:
+            pages = context.pages
+            page = pages[0] if pages else await context.new_page()
+        except BaseException:
+            await _close_context(context)
+            if ram_dir:
+                ram_dir.close()
+            raise
+        pid = await asyncio.to_thread(self._govern_browser, base_config, options['user_data_dir'])
+        await _open_target_url(page, url, base_config.navigation_wait, base_config.navigation_timeout)
+        return LaunchResult(
+            page=_CamoufoxHandle(context, page, asyncio.get_running_loop()),
+            pid=pid,
+            user_data_dir=options['user_data_dir'],
+            on_exit=ram_dir.close if ram_dir else None,
+            profile_updates=profile_updates,
+        )
+
+    def _govern_browser(self, base_config: BaseConfig, user_data_dir: str) -> Optional[int]:
+        # Playwright does not expose Firefox's pid; it is found by its profile dir, as SessionRegistry does.
+        pid = find_browser_pid(user_data_dir)
+        self.govern(base_config, pid)
+        return pid
+
+    def _resolve_launch_options(self, base_config: BaseConfig, extra_config: dict, options: dict) -> tuple[dict, dict]:
+        """
+        (Playwright launch arguments for `options`, profile updates). The first
+        launch lets Camoufox generate the fingerprint and resolve GeoIP and
+        returns the resulting config as an update for the profile's owner to
+        keep; later launches with the same inputs replay it, skipping both the
+        generation and the IP lookup. Runs on a worker thread, so neither
+        `extra_config` nor the saved profile is touched here.
+        """
+        from camoufox.utils import launch_options
+
+        key = fingerprint_cache_key(options)
+        kwargs = {name: value for name, value in options.items() if name != 'persistent_context'}
+        cached = (extra_config or {}).get(FINGERPRINT_CACHE_KEY)
+        if isinstance(cached, dict) and cached.get('key') == key and isinstance(cached.get('config'), dict):
+            config = cached['config']
+            print(f'[CAMOUFOX] Reusing fingerprint for {base_config.profile_id}')
+            # The cached config already carries the GeoIP locale/timezone; only a fresh
+            # fingerprint of the same OS is generated, and every key it has is overridden.
+            kwargs.update(config=config, geoip=None, locale=None, os=_target_os(config), i_know_what_im_doing=True)
+            return launch_options(**kwargs), {}
+
+        started = time.perf_counter()
+        resolved = launch_options(**kwargs)
+        config = config_from_env(resolved.get('env') or {})
+        print(f'[CAMOUFOX] Generated fingerprint for {base_config.profile_id} in {(time.perf_counter() - started) * 1000:.0f} ms')
+        if config is None:
+            return resolved, {}
+        return resolved, {FINGERPRINT_CACHE_KEY: {'key': key, 'config': config}}
+
+    def _prepare_launch(
+        self,
+        base_config: BaseConfig,
+        extra_config: dict,
+    ) -> tuple[str, dict, Optional[EphemeralUserDataDir]]:
+        """(url, Camoufox keyword arguments, RAM dir to close on exit) shared by both launch paths."""
         url = base_config.target_url or 'https://example.com'
         headless = bool((extra_config or {}).get('headless', False))
         geoip_enabled = bool((extra_config or {}).get('geoip', True))
@@ -111,18 +323,18 @@ class CamoufoxAdapter(BrowserAdapter):
         if isinstance(proxy_raw, str) and proxy_raw.strip():
             proxy = {'server': proxy_raw.strip()}
 
-        profiles_dir = get_profiles_dir()
-        if base_config.user_data_dir:
-            user_data_dir = Path(base_config.user_data_dir)
+        ram_dir = EphemeralUserDataDir.create(base_config) if base_config.ephemeral else None
+        if ram_dir:
+            user_data_dir = ram_dir.path
         else:
-            user_data_dir = profiles_dir / 'camoufox' / base_config.profile_id
-        user_data_dir.mkdir(parents=True, exist_ok=True)
+            user_data_dir = get_user_data_dir(base_config)
+            user_data_dir.mkdir(parents=True, exist_ok=True)
 
         executable_path: Optional[str] = base_config.browser_path or None
         args: list[str] = []
         if not lock_window_size:
             args.extend([f'--width={screen_width}', f'--height={screen_height}'])
-        session = Camoufox(
+        options = dict(
             persistent_context=True,
             user_data_dir=str(user_data_dir),
             headless=headless,
@@ -135,16 +347,4 @@ class CamoufoxAdapter(BrowserAdapter):
             window=(screen_width, screen_height) if lock_window_size else None,
             executable_path=executable_path,
         )
-        try:
-            context = session.__enter__()
-        except Exception as exc:
-            raise RuntimeError('Camoufox launch failed. Ensure Camoufox is installed: camoufox fetch') from exc
-
-        try:
-            page = context.pages[0] if getattr(context, 'pages', None) else None
-        except Exception:
-            page = None
-        if page is None:
-            page = context.new_page()
-        page.goto(url)
-        return LaunchResult(page=_CamoufoxHandle(session, context, page))
+        return url, options, ram_dir
@@ -1,13 +1,34 @@
+import asyncio
+import json
+import subprocess
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
 
 from DrissionPage import ChromiumOptions, ChromiumPage
 
 from app.adapters.base import BrowserAdapter, FieldSchema, LaunchResult, ValidationError
-from app.browser_library import BROWSER_ARGS, find_chrome_path
-from app.spoofers.profile import get_profiles_dir
-from app.spoofers.cdp_spoofer import apply_pre_navigation_spoofing
-from app.spoofers.profile import BaseConfig, SpoofProfile
+from app.async_bridge import complete_on_loop, get_async_loop
+from app.browser_library import (
+    BROWSER_ARGS,
+    DEFAULT_PERFORMANCE_PRESET,
+    PERFORMANCE_PRESETS,
+    find_chrome_path,
+    performance_preset_args,
+    resolve_browser_executable,
+)
+from app.cdp import CDPConnection, CDPError, navigate, wait_for_page_target
+from app.devtools import fetch_version
+from app.ephemeral import EphemeralUserDataDir
+from app.launch_plan import LaunchPlan, get_launch_plan
+from app.sessions import terminate_process_tree
+from app.spoofers.cdp_spoofer import CDPSpoofer, run_pre_navigation, run_pre_navigation_async
+from app.spoofers.profile import BaseConfig, SpoofProfile, get_user_data_dir
+
+BROWSER_START_TIMEOUT_SECONDS = 30.0
+CDP_CLOSE_TIMEOUT_SECONDS = 5.0
+# BaseConfig.navigation_wait -> DrissionPage load mode for the blocking launch().
+DRISSION_LOAD_MODES = {'none': 'none', 'commit': 'none', 'domcontentloaded': 'eager', 'load': 'normal'}
 
 
 class ChromiumAdapter(BrowserAdapter):
@@ -51,6 +72,22 @@ class ChromiumAdapter(BrowserAdapter):
             FieldSchema(key='latitude', label='Latitude', type='spin', default=SpoofProfile.latitude, min=-90.0, max=90.0, step=0.0001),
             FieldSchema(key='longitude', label='Longitude', type='spin', default=SpoofProfile.longitude, min=-180.0, max=180.0, step=0.0001),
             FieldSchema(key='accuracy', label='Geo Accuracy (m)', type='spin', default=SpoofProfile.accuracy, min=0.0, max=10000.0, step=1.0),
+            FieldSchema(
+                key='shared_process',
+                label='Shared Browser Process',
+                type='switch',
+                default=False,
+                help_text='Run as an isolated context inside one shared Chromium; nothing is kept after it closes',
+            ),
+            FieldSchema(
+                key='performance_preset',
+                label='Performance Preset',
+                type='combo',
+                default=DEFAULT_PERFORMANCE_PRESET,
+                options=[(name, name) for name in PERFORMANCE_PRESETS],
+                help_text='Chromium switches for many concurrent profiles: low-memory trades speed for RAM, '
+                'max-throughput keeps background windows at full speed. Shared-process contexts use the first profile\'s',
+            ),
             FieldSchema(key='protect_webrtc', label='Protect WebRTC', type='switch', default=SpoofProfile.protect_webrtc),
             FieldSchema(key='protect_canvas', label='Protect Canvas', type='switch', default=SpoofProfile.protect_canvas),
             FieldSchema(key='protect_webgl', label='Protect WebGL', type='switch', default=SpoofProfile.protect_webgl),
@@ -85,33 +122,247 @@ class ChromiumAdapter(BrowserAdapter):
         if not locale:
             errors.append(ValidationError(key='locale', message='locale is required'))
 
+        preset = extra_config.get('performance_preset')
+        if preset and preset not in PERFORMANCE_PRESETS:
+            errors.append(ValidationError(
+                key='performance_preset',
+                message=f'performance_preset must be one of {", ".join(PERFORMANCE_PRESETS)}',
+            ))
+
         return errors
 
     def launch(self, base_config: BaseConfig, extra_config: dict) -> LaunchResult:
+        if (extra_config or {}).get('shared_process'):
+            # Contexts live on the shared browser's CDP connection, which belongs to the shared loop.
+            return get_async_loop().run(self.launch_async(base_config, extra_config))
         url = base_config.target_url or 'https://example.com'
-        co = self._build_options(base_config)
-        page = ChromiumPage(co)
-        spoof_profile = SpoofProfile.from_dict(extra_config or {})
-        apply_pre_navigation_spoofing(page, spoof_profile)
-        page.get(url)
-        return LaunchResult(page=page)
-
-    def _build_options(self, base_config: BaseConfig) -> ChromiumOptions:
-        co = ChromiumOptions()
+        plan = get_launch_plan(self, base_config, extra_config)
+        ram_dir = EphemeralUserDataDir.create(base_config) if base_config.ephemeral else None
+        try:
+            co = self._plan_options(plan, ram_dir.path if ram_dir else plan.user_data_dir)
+            page = ChromiumPage(co)
+            run_pre_navigation(page, plan.spoof_commands)
+            # DrissionPage has no commit milestone; its 'none' load mode returns right after the request starts.
+            page.set.load_mode(DRISSION_LOAD_MODES[base_config.navigation_wait])
+            if not page.get(url, timeout=base_config.navigation_timeout):
+                print(f'[CHROMIUM] {url} did not reach {base_config.navigation_wait} within {base_config.navigation_timeout:.0f}s')
+        except Exception:
+            if ram_dir:
+                ram_dir.close()
+            raise
+        pid = self._process_id(page)
+        self.govern(base_config, pid)
+        return LaunchResult(
+            page=page,
+            pid=pid,
+            debug_port=self._debug_port(page),
+            user_data_dir=co.user_data_path,
+            on_exit=ram_dir.close if ram_dir else None,
+        )
 
-        profiles_dir = get_profiles_dir()
-        if base_config.user_data_dir:
-            user_data_dir = Path(base_config.user_data_dir)
-        else:
-            user_data_dir = profiles_dir / 'chrome' / base_config.profile_id
+    async def launch_async(self, base_config: BaseConfig, extra_config: dict) -> LaunchResult:
+        """
+        Starts Chrome itself from the profile's compiled launch plan and does
+        the spoofing and first navigation over the asyncio CDP client; only
+        short file-system steps use a thread. The CDP connection stays open
+        for the browser's lifetime because Emulation overrides and injected
+        scripts end with the client session; the session's on_exit closes it.
+        A ChromiumPage is attached at the end so quit/focus work as usual.
+        """
+        plan = await asyncio.to_thread(get_launch_plan, self, base_config, extra_config)
+        if (extra_config or {}).get('shared_process'):
+            from app.adapters.chromium_contexts import open_shared_context
+            return await open_shared_context(self, base_config, extra_config, plan)
+
+        ram_dir = await asyncio.to_thread(EphemeralUserDataDir.create, base_config) if base_config.ephemeral else None
+        process: Optional[subprocess.Popen] = None
+        cdp: Optional[CDPConnection] = None
+        user_data_dir = ram_dir.path if ram_dir else plan.user_data_dir
+        try:
+            process, port, cdp = await self._start_browser(plan, user_data_dir)
+            # Before the first navigation, so page load already runs within the limits.
+            await asyncio.to_thread(self.govern, base_config, process.pid)
+            targets = (await cdp.send('Target.getTargets'))['targetInfos']
+            target_id = next(t['targetId'] for t in targets if t.get('type') == 'page')
+            await self._prepare_target(cdp, target_id, base_config, plan)
+            page = await asyncio.to_thread(ChromiumPage, f'127.0.0.1:{port}')
+        except BaseException:
+            if cdp is not None:
+                await cdp.close()
+            if process is not None:
+                await asyncio.to_thread(terminate_process_tree, process.pid)
+            if ram_dir:
+                ram_dir.close()
+            raise
+        return LaunchResult(
+            page=page,
+            pid=process.pid,
+            debug_port=port,
+            user_data_dir=str(user_data_dir),
+            on_exit=_session_exit(asyncio.get_running_loop(), cdp, ram_dir),
+        )
+
+    def compile_launch_plan(self, base_config: BaseConfig, extra_config: dict, digest: str) -> LaunchPlan:
+        """
+        Resolves the browser, its arguments and the spoofing commands once;
+        launch_async then only spawns and replays them. The user-data dir is
+        left out of the arguments because ephemeral and shared launches use
+        a different one each time.
+        """
+        from DrissionPage._functions.browser import get_launch_args
+
+        user_data_dir = get_user_data_dir(base_config)
+        co = self._build_options(base_config, user_data_dir, extra_config)
+        args, _ = get_launch_args(co)
+        spoofer = CDPSpoofer(SpoofProfile.from_dict(extra_config or {}))
+        if not base_config.ephemeral:
+            user_data_dir.mkdir(parents=True, exist_ok=True)
+        return LaunchPlan(
+            profile_id=base_config.profile_id,
+            adapter_id=self.id,
+            digest=digest,
+            executable=resolve_browser_executable(co.browser_path),
+            arguments=tuple(arg for arg in args if not arg.startswith('--user-data-dir')),
+            preferences=MappingProxyType(dict(co.preferences)),
+            user_data_dir=None if base_config.ephemeral else user_data_dir,
+            spoof_commands=tuple(spoofer.pre_navigation_commands()),
+        )
+
+    async def _start_browser(self, plan: LaunchPlan, user_data_dir: Path) -> tuple[subprocess.Popen, int, CDPConnection]:
+        """Spawns Chrome and connects to its browser-level DevTools endpoint once a page exists."""
+        process = await asyncio.to_thread(self._spawn_browser, plan, user_data_dir)
+        try:
+            port = await self._wait_for_devtools_port(user_data_dir, process)
+            version = await wait_for_page_target(port, BROWSER_START_TIMEOUT_SECONDS)
+            cdp = await CDPConnection.connect(version['webSocketDebuggerUrl'])
+        except BaseException:
+            await asyncio.to_thread(terminate_process_tree, process.pid)
+            raise
+        return process, port, cdp
+
+    async def _prepare_target(self, cdp: CDPConnection, target_id: str, base_config: BaseConfig, plan: LaunchPlan) -> str:
+        """
+        Attaches to a page target, applies the profile's spoofing and opens the
+        target URL, waiting only as far as base_config.navigation_wait asks.
+        A failed or slow first page does not fail the launch; the browser is up.
+        Returns the CDP session id.
+        """
+        url = base_config.target_url or 'https://example.com'
+        attached = await cdp.send('Target.attachToTarget', {'targetId': target_id, 'flatten': True})
+        session_id = attached['sessionId']
+        await run_pre_navigation_async(cdp, plan.spoof_commands, session_id)
+        try:
+            await navigate(cdp, url, session_id, base_config.navigation_wait, base_config.navigation_timeout)
+        except asyncio.TimeoutError:
+            print(f'[CHROMIUM] {url} did not reach {base_config.navigation_wait} within {base_config.navigation_timeout:.0f}s')
+        except CDPError as exc:
+            print(f'[CHROMIUM] Navigation to {url} failed: {exc}')
+        return session_id
+
+    def attach(self, record: dict) -> Optional[LaunchResult]:
+        result = super().attach(record)
+        port = record.get('debug_port')
+        # ChromiumPage('host:port') starts a new browser when nothing listens there, so check first.
+        if result is None or not fetch_version(port):
+            return result
+        try:
+            result.page = ChromiumPage(f'127.0.0.1:{port}')
+        except Exception as exc:
+            print(f'[CHROMIUM] Could not reattach to port {port}: {exc}')
+        return result
+
+    def focus(self, handle: Any) -> bool:
+        from app.adapters.chromium_contexts import ContextHandle
+
+        if isinstance(handle, ContextHandle):
+            return handle.focus()
+        if not isinstance(handle, ChromiumPage):
+            return False
+        try:
+            window = handle.run_cdp('Browser.getWindowForTarget')
+            if window.get('bounds', {}).get('windowState') == 'minimized':
+                handle.run_cdp('Browser.setWindowBounds', windowId=window['windowId'], bounds={'windowState': 'normal'})
+            handle.run_cdp('Page.bringToFront')
+        except Exception as exc:
+            print(f'[CHROMIUM] Could not focus the browser window: {exc}')
+            return False
+        return True
+
+    def _spawn_browser(self, plan: LaunchPlan, user_data_dir: Path) -> subprocess.Popen:
+        """Starts Chrome the way DrissionPage would, but on a port Chrome picks itself."""
         user_data_dir.mkdir(parents=True, exist_ok=True)
+        _write_preferences(user_data_dir, plan.preferences)
+        # Chrome writes the port it bound into this file; a stale copy would point at a dead browser.
+        (user_data_dir / 'DevToolsActivePort').unlink(missing_ok=True)
+        return subprocess.Popen(
+            [plan.executable, '--remote-debugging-port=0', f'--user-data-dir={user_data_dir}', *plan.arguments],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    async def _wait_for_devtools_port(self, user_data_dir: Path, process: subprocess.Popen) -> int:
+        port_file = user_data_dir / 'DevToolsActivePort'
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + BROWSER_START_TIMEOUT_SECONDS
+        while loop.time() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f'browser exited during startup with code {process.returncode}')
+            try:
+                return int(port_file.read_text(encoding='utf-8').split()[0])
+            except (OSError, ValueError, IndexError):
+                await asyncio.sleep(0.05)
+        raise TimeoutError(f'browser did not open a DevTools port within {BROWSER_START_TIMEOUT_SECONDS:.0f}s')
+
+    def _process_id(self, page: ChromiumPage) -> Optional[int]:
+        try:
+            return page.process_id
+        except Exception:
+            return None
+
+    def _debug_port(self, page: ChromiumPage) -> Optional[int]:
+        try:
+            return int(str(page.address).rsplit(':', 1)[-1])
+        except Exception:
+            return None
+
+    def _plan_options(self, plan: LaunchPlan, user_data_dir: Path) -> ChromiumOptions:
+        """DrissionPage options replaying a compiled plan, without the ini file or browser discovery."""
+        co = ChromiumOptions(read_file=False)
+        # The plan already holds DrissionPage's defaults, merged with ours.
+        co.clear_arguments()
+        co.clear_prefs()
+        if plan.executable:
+            co.set_browser_path(plan.executable)
+        for arg in plan.arguments:
+            co.set_argument(arg)
+        for key, value in plan.preferences.items():
+            co.set_pref(key, value)
+        co.set_user_data_path(str(user_data_dir))
+        co.auto_port()
+        return co
+
+    def _build_options(
+        self,
+        base_config: BaseConfig,
+        user_data_dir: Optional[Path] = None,
+        extra_config: Optional[dict] = None,
+    ) -> ChromiumOptions:
+        co = ChromiumOptions()
+
+        if user_data_dir is None:
+            user_data_dir = get_user_data_dir(base_config)
+            user_data_dir.mkdir(parents=True, exist_ok=True)
         co.set_user_data_path(str(user_data_dir))
         co.auto_port()
 
         co.set_argument('--disable-infobars')
         co.set_argument('--no-first-run')
         co.set_argument('--no-default-browser-check')
-        co.set_argument('--disable-dev-shm-usage')
+        if base_config.ephemeral:
+            # Everything stays in RAM: no crash dumps on disk, and shared memory keeps using /dev/shm.
+            co.set_argument('--disable-breakpad')
+        else:
+            co.set_argument('--disable-dev-shm-usage')
 
         try:
             chrome_path = base_config.browser_path or find_chrome_path()
@@ -122,5 +373,54 @@ class ChromiumAdapter(BrowserAdapter):
         except Exception:
             if base_config.browser_path:
                 co.set_browser_path(base_config.browser_path)
+        for arg in performance_preset_args((extra_config or {}).get('performance_preset')):
+            co.set_argument(arg)
+        _merge_disabled_features(co)
 
         return co
+
+
+def _session_exit(
+    loop: asyncio.AbstractEventLoop,
+    cdp: CDPConnection,
+    ram_dir: Optional[EphemeralUserDataDir],
+) -> Callable[[], None]:
+    """on_exit for a launch_async session: drops its CDP connection on `loop`, then its RAM dir."""
+
+    def on_exit() -> None:
+        complete_on_loop(loop, cdp.close(), CDP_CLOSE_TIMEOUT_SECONDS)
+        if ram_dir:
+            ram_dir.close()
+
+    return on_exit
+
+
+def _merge_disabled_features(co: ChromiumOptions) -> None:
+    """Joins every --disable-features switch into one; Chrome would only honour the last."""
+    features: list[str] = []
+    for arg in co.arguments:
+        if arg.startswith('--disable-features='):
+            features.extend(f for f in arg.split('=', 1)[1].split(',') if f and f not in features)
+    if features:
+        co.set_argument('--disable-features', ','.join(features))
+
+
+def _write_preferences(user_data_dir: Path, preferences: Mapping[str, Any]) -> None:
+    """Merges DrissionPage-style preferences ('a.b.c' keys) into Default/Preferences, like its set_prefs."""
+    if not preferences:
+        return
+    prefs_file = user_data_dir / 'Default' / 'Preferences'
+    try:
+        data = json.loads(prefs_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        data = {}
+    for key, value in preferences.items():
+        *parents, leaf = key.split('.')
+        node = data
+        for part in parents:
+            if not isinstance(node.get(part), dict):
+                node[part] = {}
+            node = node[part]
+        node[leaf] = value
+    prefs_file.parent.mkdir(parents=True, exist_ok=True)
+    prefs_file.write_text(json.dumps(data), encoding='utf-8')
@@ -0,0 +1,206 @@
+"""
+Shared-process mode for the Chromium adapter.
+
+Profiles with `shared_process` enabled do not get a browser of their own.
+Each one becomes an isolated browser context (Target.createBrowserContext)
+with its own proxy inside a single Chromium, which costs one renderer per
+tab instead of a full browser per profile. Contexts are in-memory only:
+cookies and storage are gone when the session ends, and proxy credentials
+are not supported (Chromium takes a bare proxyServer per context).
+
+The shared browser is started with the first profile's browser path and
+arguments, lives on the app.async_bridge loop, and quits as soon as its
+last context is closed.
+"""
+import asyncio
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from app.async_bridge import complete_on_loop
+from app.cdp import CDPConnection
+from app.adapters.base import LaunchResult
+from app.launch_plan import LaunchPlan
+from app.sessions import terminate_process_tree
+from app.spoofers.profile import BaseConfig
+
+if TYPE_CHECKING:
+    from app.adapters.chromium import ChromiumAdapter
+
+SHARED_DIR_PREFIX = 'uselessbrowser-shared-'
+CLOSE_TIMEOUT_SECONDS = 10.0
+
+
+class SharedChromium:
+    def __init__(self, process: subprocess.Popen, port: int, cdp: CDPConnection, user_data_dir: Path):
+        self.process = process
+        self.port = port
+        self.cdp = cdp
+        self.user_data_dir = user_data_dir
+        self.closing = False
+        # browserContextId -> ids of its page targets; a context whose last page closes is disposed.
+        self._contexts: dict[str, set[str]] = {}
+        # Launches that picked this browser but have not created their context yet.
+        self._reserved = 0
+        cdp.on('Target.targetCreated', self._on_target_created)
+        cdp.on('Target.targetDestroyed', self._on_target_destroyed)
+
+    @classmethod
+    async def start(cls, adapter: 'ChromiumAdapter', plan: LaunchPlan) -> 'SharedChromium':
+        user_data_dir = Path(await asyncio.to_thread(tempfile.mkdtemp, prefix=SHARED_DIR_PREFIX))
+        try:
+            process, port, cdp = await adapter._start_browser(plan, user_data_dir)
+        except BaseException:
+            await asyncio.to_thread(shutil.rmtree, user_data_dir, True)
+            raise
+        browser = cls(process, port, cdp, user_data_dir)
+        # targetCreated/targetDestroyed are only sent with discovery on.
+        await cdp.send('Target.setDiscoverTargets', {'discover': True})
+        print(f'[CHROMIUM] Shared browser started (pid {process.pid}, port {port})')
+        return browser
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def is_alive(self) -> bool:
+        return not self.closing and not self.cdp.closed and self.process.poll() is None
+
+    def has_context(self, context_id: str) -> bool:
+        return context_id in self._contexts and not self.cdp.closed
+
+    def reserve(self) -> None:
+        self._reserved += 1
+
+    def release(self) -> None:
+        self._reserved -= 1
+        self._close_if_idle()
+
+    async def open_context(
+        self, base_config: BaseConfig, extra_config: dict, plan: LaunchPlan, adapter: 'ChromiumAdapter'
+    ) -> 'ContextHandle':
+        params: dict = {'disposeOnDetach': False}
+        proxy = (extra_config or {}).get('proxy') or base_config.proxy
+        if isinstance(proxy, str) and proxy.strip():
+            params['proxyServer'] = proxy.strip()
+        context_id = (await self.cdp.send('Target.createBrowserContext', params))['browserContextId']
+        self._contexts[context_id] = set()
+        try:
+            created = await self.cdp.send(
+                'Target.createTarget',
+                {'url': 'about:blank', 'browserContextId': context_id, 'newWindow': True},
+            )
+            target_id = created['targetId']
+            self._contexts[context_id].add(target_id)
+            await adapter._prepare_target(self.cdp, target_id, base_config, plan)
+        except BaseException:
+            await self.close_context(context_id)
+            raise
+        return ContextHandle(self, context_id, target_id, asyncio.get_running_loop())
+
+    async def close_context(self, context_id: str) -> None:
+        if self._contexts.pop(context_id, None) is None:
+            return
+        if not self.cdp.closed:
+            try:
+                await self.cdp.send('Target.disposeBrowserContext', {'browserContextId': context_id})
+            except Exception as exc:
+                print(f'[CHROMIUM] Could not dispose context {context_id}: {exc}')
+        self._close_if_idle()
+
+    async def focus(self, target_id: str) -> None:
+        await self.cdp.send('Target.activateTarget', {'targetId': target_id})
+
+    async def close(self) -> None:
+        self.closing = True
+        if not self.cdp.closed:
+            try:
+                await self.cdp.send('Browser.close', timeout=CLOSE_TIMEOUT_SECONDS)
+            except Exception:
+                pass
+            await self.cdp.close()
+        await asyncio.to_thread(self._reap)
+        print(f'[CHROMIUM] Shared browser (pid {self.pid}) closed')
+
+    def _reap(self) -> None:
+        try:
+            self.process.wait(CLOSE_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            terminate_process_tree(self.pid)
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+    def _close_if_idle(self) -> None:
+        if self._contexts or self._reserved or self.closing:
+            return
+        self.closing = True
+        asyncio.get_running_loop().create_task(self.close())
+
+    def _on_target_created(self, params: dict, _session_id: Optional[str]) -> None:
+        info = params.get('targetInfo') or {}
+        targets = self._contexts.get(info.get('browserContextId'))
+        if targets is not None and info.get('type') == 'page':
+            targets.add(info['targetId'])
+
+    def _on_target_destroyed(self, params: dict, _session_id: Optional[str]) -> None:
+        target_id = params.get('targetId')
+        for context_id, targets in list(self._contexts.items()):
+            if target_id in targets:
+                targets.discard(target_id)
+                if not targets:
+                    # The user closed the context's last window.
+                    asyncio.get_running_loop().create_task(self.close_context(context_id))
+                return
+
+
+class ContextHandle:
+    """Session handle for one browser context of the shared browser; usable from any thread."""
+
+    def __init__(self, browser: SharedChromium, context_id: str, target_id: str, loop: asyncio.AbstractEventLoop):
+        self.browser = browser
+        self.context_id = context_id
+        self.target_id = target_id
+        self._loop = loop
+
+    def is_alive(self) -> bool:
+        """Polled by SessionRegistry: a context session has no process of its own to watch."""
+        return self.browser.has_context(self.context_id)
+
+    def quit(self) -> None:
+        complete_on_loop(self._loop, self.browser.close_context(self.context_id), CLOSE_TIMEOUT_SECONDS)
+
+    def focus(self) -> bool:
+        if not self.is_alive() or self._loop.is_closed():
+            return False
+        future = asyncio.run_coroutine_threadsafe(self.browser.focus(self.target_id), self._loop)
+        try:
+            future.result(CLOSE_TIMEOUT_SECONDS)
+        except Exception as exc:
+            print(f'[CHROMIUM] Could not focus context {self.context_id}: {exc}')
+            return False
+        return True
+
+
+_shared: Optional[SharedChromium] = None
+_shared_lock: Optional[asyncio.Lock] = None
+
+
+async def open_shared_context(
+    adapter: 'ChromiumAdapter', base_config: BaseConfig, extra_config: dict, plan: LaunchPlan
+) -> LaunchResult:
+    """Opens a profile as a context of the shared browser, starting that browser if needed."""
+    global _shared, _shared_lock
+    if _shared_lock is None:
+        _shared_lock = asyncio.Lock()
+    async with _shared_lock:
+        if _shared is None or not _shared.is_alive():
+            _shared = await SharedChromium.start(adapter, plan)
+        browser = _shared
+        # Reserved before the lock is released so the browser cannot go idle and close under us.
+        browser.reserve()
+    try:
+        handle = await browser.open_context(base_config, extra_config, plan, adapter)
+    finally:
+        browser.release()
+    return LaunchResult(page=handle, debug_port=browser.port)
@@ -1,13 +1,19 @@
-from typing import Dict, Type
+import os
+from typing import Dict, Optional, Type
 
-from app.adapters.base import BrowserAdapter
+from app.adapters.base import BrowserAdapter, LaunchResult
 from app.adapters.chromium import ChromiumAdapter
 from app.adapters.camoufox import CamoufoxAdapter
+from app.adapters.simulated import SimulatedAdapter
 
 REGISTRY: Dict[str, Type[BrowserAdapter]] = {
     'chromium': ChromiumAdapter,
     'camoufox': CamoufoxAdapter,
+    'simulated': SimulatedAdapter,
 }
+# Test doubles: always reachable through get_adapter(), only listed for pickers when this is set to 1.
+DEV_ADAPTERS_ENV = 'USELESSBROWSER_DEV_ADAPTERS'
+DEV_ADAPTERS = ('simulated',)
 
 def get_adapter(adapter_id: str) -> BrowserAdapter:
     adapter_cls = REGISTRY.get(adapter_id)
@@ -17,4 +23,14 @@ def get_adapter(adapter_id: str) -> BrowserAdapter:
 
 
 def list_adapters() -> list[tuple[str, str]]:
-    return [(adapter_id, get_adapter(adapter_id).label) for adapter_id in REGISTRY]
+    show_dev = os.environ.get(DEV_ADAPTERS_ENV, '0') == '1'
+    return [
+        (adapter_id, get_adapter(adapter_id).label)
+        for adapter_id in REGISTRY
+        if show_dev or adapter_id not in DEV_ADAPTERS
+    ]
+
+
+def reattach_session(record: dict) -> Optional[LaunchResult]:
+    """Reconnects to a recorded session's browser through its adapter (see SessionRegistry.restore)."""
+    return get_adapter(record.get('adapter_id', 'chromium')).attach(record)
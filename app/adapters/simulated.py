@@ -0,0 +1,176 @@
+"""
+A browser adapter that launches no browser, for load tests of the GUI and
+the launch path (see scripts/load_simulated.py).
+
+Each launch waits the configured start-up delay on the shared loop, fails
+with the configured probability, and otherwise starts a small Python
+process holding the configured amount of memory, so the session registry
+samples, ends and reaps it like a real browser. With `devtools` on, the
+session also serves app.fake_devtools on its debug port.
+"""
+import asyncio
+import random
+import subprocess
+import sys
+from typing import Optional
+
+from app.adapters.base import BrowserAdapter, FieldSchema, LaunchResult, ValidationError
+from app.async_bridge import complete_on_loop, get_async_loop
+from app.fake_devtools import FakeDevTools
+from app.spoofers.profile import BaseConfig
+
+# Allocates and touches argv[1] bytes, then sleeps; argv[2] > 0 exits with code 1 after that
+# many seconds, like a crash.
+_SESSION_PROCESS_CODE = (
+    'import sys, time\n'
+    'block = b"\\x01" * int(sys.argv[1])\n'
+    'lifetime = float(sys.argv[2])\n'
+    'time.sleep(lifetime or 1e9)\n'
+    'sys.exit(1)\n'
+)
+QUIT_TIMEOUT_SECONDS = 5.0
+
+
+class SimulatedLaunchError(RuntimeError):
+    pass
+
+
+class SimulatedPage:
+    """Stands in for a browser page; quit() may be called from any thread."""
+
+    def __init__(
+        self,
+        url: str,
+        process: Optional[subprocess.Popen] = None,
+        devtools: Optional[FakeDevTools] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        startup_delay: float = 0.0,
+    ):
+        self.url = url
+        self.startup_delay = startup_delay
+        self._process = process
+        self._devtools = devtools
+        self._loop = loop
+        self._closed = False
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
+
+    def get(self, url: str, timeout: Optional[float] = None) -> bool:
+        self.url = url
+        return True
+
+    def is_alive(self) -> bool:
+        if self._process is not None:
+            return self._process.poll() is None
+        return not self._closed
+
+    def quit(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._devtools is not None and self._loop is not None:
+            complete_on_loop(self._loop, self._devtools.close(), QUIT_TIMEOUT_SECONDS)
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(QUIT_TIMEOUT_SECONDS)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+
+
+class SimulatedAdapter(BrowserAdapter):
+    @property
+    def id(self) -> str:
+        return 'simulated'
+
+    @property
+    def label(self) -> str:
+        return 'Simulated (load testing)'
+
+    def get_extra_config_schema(self) -> list[FieldSchema]:
+        return [
+            FieldSchema(key='startup_delay_ms', label='Start-up Delay (ms)', type='spin', default=800, min=0, max=60000, step=50),
+            FieldSchema(key='startup_jitter_ms', label='Start-up Jitter (ms)', type='spin', default=200, min=0, max=60000, step=50),
+            FieldSchema(key='memory_mb', label='Memory (MB)', type='spin', default=50, min=0, max=4096, step=10),
+            FieldSchema(key='failure_rate', label='Failure Rate (%)', type='spin', default=0, min=0, max=100, step=1),
+            FieldSchema(
+                key='crash_after_s',
+                label='Crash After (s)',
+                type='spin',
+                default=0,
+                min=0,
+                max=86400,
+                step=1,
+                help_text='0 keeps the session running until it is closed',
+            ),
+            FieldSchema(
+                key='spawn_process',
+                label='Spawn Process',
+                type='switch',
+                default=True,
+                help_text='Off: sessions have no process of their own, like contexts of a shared browser',
+            ),
+            FieldSchema(key='devtools', label='Fake DevTools Endpoint', type='switch', default=False),
+            FieldSchema(key='cdp_latency_ms', label='CDP Latency (ms)', type='spin', default=2, min=0, max=10000, step=1),
+        ]
+
+    def validate(self, base_config: BaseConfig, extra_config: dict) -> list[ValidationError]:
+        errors: list[ValidationError] = []
+        if not base_config.profile_id:
+            errors.append(ValidationError(key='profile_id', message='profile_id is required'))
+        try:
+            failure_rate = float(extra_config.get('failure_rate', 0))
+        except (TypeError, ValueError):
+            failure_rate = -1
+        if not 0 <= failure_rate <= 100:
+            errors.append(ValidationError(key='failure_rate', message='failure_rate must be between 0 and 100'))
+        for key in ('startup_delay_ms', 'startup_jitter_ms', 'memory_mb', 'crash_after_s', 'cdp_latency_ms'):
+            try:
+                if float(extra_config.get(key, 0)) < 0:
+                    raise ValueError
+            except (TypeError, ValueError):
+                errors.append(ValidationError(key=key, message=f'{key} must be a non-negative number'))
+        return errors
+
+    def launch(self, base_config: BaseConfig, extra_config: dict) -> LaunchResult:
+        return get_async_loop().run(self.launch_async(base_config, extra_config))
+
+    async def launch_async(self, base_config: BaseConfig, extra_config: dict) -> LaunchResult:
+        options = {field.key: field.default for field in self.get_extra_config_schema()}
+        options.update({key: value for key, value in (extra_config or {}).items() if key in options})
+        jitter = float(options['startup_jitter_ms'])
+        delay = max(0.0, float(options['startup_delay_ms']) + random.uniform(-jitter, jitter)) / 1000
+        await asyncio.sleep(delay)
+        if random.random() * 100 < float(options['failure_rate']):
+            raise SimulatedLaunchError(f'simulated launch failure after {delay * 1000:.0f} ms')
+
+        process = None
+        if options['spawn_process']:
+            process = subprocess.Popen(
+                [
+                    sys.executable, '-c', _SESSION_PROCESS_CODE,
+                    str(int(float(options['memory_mb']) * 2**20)), str(float(options['crash_after_s'])),
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        devtools = None
+        if options['devtools']:
+            devtools = FakeDevTools(latency=float(options['cdp_latency_ms']) / 1000)
+            await devtools.start()
+        page = SimulatedPage(
+            base_config.target_url or 'about:blank',
+            process=process,
+            devtools=devtools,
+            loop=asyncio.get_running_loop(),
+            startup_delay=delay,
+        )
+        print(f'[SIMULATED] {base_config.profile_id} up after {delay * 1000:.0f} ms (pid {page.pid or "-"})')
+        return LaunchResult(page=page, pid=page.pid, debug_port=devtools.port if devtools else None)
+
+    def focus(self, handle) -> bool:
+        return isinstance(handle, SimulatedPage) and handle.is_alive()
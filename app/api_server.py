@@ -0,0 +1,543 @@
+"""
+Local control API: a small HTTP/JSON server on 127.0.0.1 for driving
+profile launches from other tools.
+
+    GET  /health                         no auth, {"ok": true}
+    GET  /profiles                       profiles with a running flag
+    POST /profiles/<id>/launch           {"url": ..., "browser_path": ...} -> session + DevTools websocket
+    GET  /sessions                       all sessions of the registry
+    GET  /sessions/<id>                  one session
+    POST /sessions/<id>/stop             stops a session
+    POST /sessions/<id>/focus            brings the session's window to the front (thaws it if hibernated)
+    GET  /hibernation                    idle minutes before sessions are frozen / stopped
+    POST /hibernation                    {"idle_minutes": ..., "quit_minutes": ...}, 0 turns either off
+    GET  /metrics                        app.metrics in the Prometheus text format
+
+Every other request needs `Authorization: Bearer <token>`.
+
+The server runs its own asyncio loop, either on a background thread next
+to the GUI (start()/stop()) or in the foreground (python -m app.api_server).
+Blocking work such as profile I/O goes to a thread pool. Launches go
+through BrowserAdapter.launch_async on the shared loop of app.async_bridge
+and are capped by a semaphore so a burst of requests cannot start dozens
+of browsers at once.
+"""
+import argparse
+import asyncio
+import functools
+import hmac
+import json
+import os
+import re
+import secrets
+import signal
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+from urllib.parse import unquote, urlsplit
+
+from app.async_bridge import run_coroutine
+from app.devtools import fetch_ws_endpoint
+from app.metrics import REGISTRY, failure_cause, observe_launch
+from app.profile_utils import list_profile_entries
+from app.sessions import BrowserSession, SessionRegistry
+from app.shutdown import ShutdownCoordinator, ShutdownReport
+from app.spoofers.profile import BaseConfig, ProfileConfig, load_profile, update_extra_config
+
+DEFAULT_API_PORT = 17321
+DEFAULT_MAX_CONCURRENT_LAUNCHES = 2
+API_TOKEN_ENV = 'USELESSBROWSER_API_TOKEN'
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_LINES = 100
+# Keep-alive connections that stay silent this long are closed.
+IDLE_TIMEOUT_SECONDS = 30.0
+SESSION_POLL_INTERVAL_SECONDS = 2.0
+START_TIMEOUT_SECONDS = 5.0
+
+HTTP_REASONS = {
+    200: 'OK',
+    201: 'Created',
+    400: 'Bad Request',
+    401: 'Unauthorized',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    409: 'Conflict',
+    413: 'Payload Too Large',
+    422: 'Unprocessable Entity',
+    500: 'Internal Server Error',
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str, details: Any = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.details = details
+
+
+@dataclass
+class ApiRequest:
+    method: str
+    path: str
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b''
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get('connection', '').lower() != 'close'
+
+    def json(self) -> dict:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError as exc:
+            raise ApiError(400, f'invalid JSON body: {exc}') from exc
+        if not isinstance(data, dict):
+            raise ApiError(400, 'JSON body must be an object')
+        return data
+
+
+@dataclass
+class TextResponse:
+    """A handler payload sent as-is instead of as JSON."""
+
+    body: str
+    content_type: str = 'text/plain; charset=utf-8'
+
+
+def generate_token() -> str:
+    return secrets.token_urlsafe(32)
+
+
+class ApiServer:
+    ROUTES = [
+        ('GET', re.compile(r'^/profiles$'), '_list_profiles'),
+        ('POST', re.compile(r'^/profiles/(?P<profile_id>[^/]+)/launch$'), '_launch_profile'),
+        ('GET', re.compile(r'^/sessions$'), '_list_sessions'),
+        ('GET', re.compile(r'^/sessions/(?P<session_id>[^/]+)$'), '_get_session'),
+        ('POST', re.compile(r'^/sessions/(?P<session_id>[^/]+)/stop$'), '_stop_session'),
+        ('POST', re.compile(r'^/sessions/(?P<session_id>[^/]+)/focus$'), '_focus_session'),
+        ('GET', re.compile(r'^/hibernation$'), '_get_hibernation'),
+        ('POST', re.compile(r'^/hibernation$'), '_set_hibernation'),
+        ('GET', re.compile(r'^/metrics$'), '_metrics'),
+    ]
+
+    def __init__(
+        self,
+        registry: SessionRegistry,
+        token: str,
+        host: str = '127.0.0.1',
+        port: int = DEFAULT_API_PORT,
+        max_concurrent_launches: int = DEFAULT_MAX_CONCURRENT_LAUNCHES,
+        poll_sessions: bool = False,
+        browser_resolver: Optional[Callable[[ProfileConfig], Optional[str]]] = None,
+        on_session_changed: Optional[Callable[[BrowserSession], None]] = None,
+        launch_fn: Optional[Callable[[str, str, Optional[str]], BrowserSession]] = None,
+    ):
+        if not token:
+            raise ValueError('an API token is required')
+        self.registry = registry
+        self.token = token
+        self.host = host
+        self.port = port
+        self.max_concurrent_launches = max(1, max_concurrent_launches)
+        # The GUI polls the registry itself; standalone servers have to.
+        self.poll_sessions = poll_sessions
+        self.browser_resolver = browser_resolver
+        self.on_session_changed = on_session_changed
+        # (profile_id, url, browser_path) -> session; replaces the in-process adapter launch,
+        # e.g. to forward launches to the launcher process.
+        self.launch_fn = launch_fn
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._launching: set[str] = set()
+        self._launch_slots: Optional[asyncio.Semaphore] = None
+        self._connections: set[asyncio.StreamWriter] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._start_error: Optional[BaseException] = None
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    # --- lifecycle -------------------------------------------------------
+
+    def start(self) -> None:
+        """Serves on a background thread; returns once the socket is bound."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._start_error = None
+        self._thread = threading.Thread(target=self._thread_main, name='api-server', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(START_TIMEOUT_SECONDS):
+            raise RuntimeError('API server did not start in time')
+        if self._start_error:
+            raise self._start_error
+
+    def stop(self, timeout: float = START_TIMEOUT_SECONDS) -> None:
+        loop, stop_event = self._loop, self._stop_event
+        if loop is not None and stop_event is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(stop_event.set)
+            except RuntimeError:
+                pass
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def run_forever(self) -> None:
+        """Serves in the calling thread until interrupted."""
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+
+    def _thread_main(self) -> None:
+        try:
+            asyncio.run(self.serve())
+        except BaseException as exc:
+            if not self._ready.is_set():
+                self._start_error = exc
+                self._ready.set()
+            else:
+                print(f'[API] Server stopped with an error: {exc}')
+
+    async def serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._launch_slots = asyncio.Semaphore(self.max_concurrent_launches)
+        # A few threads beyond the launch cap so listing and polling never queue behind slow launches.
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_launches + 4,
+            thread_name_prefix='api-worker',
+        )
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        print(f'[API] Listening on {self.url}')
+        if threading.current_thread() is threading.main_thread() and hasattr(signal, 'SIGTERM'):
+            try:
+                self._loop.add_signal_handler(signal.SIGTERM, self._stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows event loops have no signal handlers
+        self._on_listening()
+        self._ready.set()
+        poller = asyncio.create_task(self._poll_loop()) if self.poll_sessions else None
+        try:
+            await self._stop_event.wait()
+        finally:
+            if poller:
+                poller.cancel()
+            server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await server.wait_closed()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            print('[API] Stopped')
+
+    def _on_listening(self) -> None:
+        """Called once the socket is bound and self.port is final."""
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(SESSION_POLL_INTERVAL_SECONDS)
+            await self._run(self.registry.poll)
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # --- HTTP ------------------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), IDLE_TIMEOUT_SECONDS)
+                except ApiError as exc:
+                    self._write_response(writer, exc.status, {'error': exc.message}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                status, payload = await self._dispatch(request)
+                self._write_response(writer, status, payload, request.keep_alive)
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _readline(self, reader: asyncio.StreamReader) -> bytes:
+        try:
+            return await reader.readline()
+        except ValueError as exc:
+            # StreamReader refuses lines longer than its buffer limit (64 KiB).
+            raise ApiError(400, 'line too long') from exc
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[ApiRequest]:
+        line = await self._readline(reader)
+        if not line:
+            return None
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+            raise ApiError(400, 'malformed request line')
+        method, target, version = parts
+        headers: dict[str, str] = {}
+        if version == 'HTTP/1.0':
+            headers['connection'] = 'close'
+        for _ in range(MAX_HEADER_LINES):
+            raw = await self._readline(reader)
+            if raw in (b'\r\n', b'\n', b''):
+                break
+            name, sep, value = raw.decode('latin-1').partition(':')
+            if not sep:
+                raise ApiError(400, 'malformed header')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise ApiError(400, 'too many headers')
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError as exc:
+            raise ApiError(400, 'invalid Content-Length') from exc
+        if length < 0 or length > MAX_BODY_BYTES:
+            raise ApiError(413, 'request body too large')
+        body = await reader.readexactly(length) if length else b''
+        return ApiRequest(method=method.upper(), path=urlsplit(target).path, headers=headers, body=body)
+
+    def _write_response(self, writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+        if isinstance(payload, TextResponse):
+            body, content_type = payload.body.encode('utf-8'), payload.content_type
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8'
+        head = [
+            f'HTTP/1.1 {status} {HTTP_REASONS.get(status, "")}',
+            f'Content-Type: {content_type}',
+            f'Content-Length: {len(body)}',
+            f'Connection: {"keep-alive" if keep_alive else "close"}',
+        ]
+        if status == 401:
+            head.append('WWW-Authenticate: Bearer')
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+
+    def _authorized(self, request: ApiRequest) -> bool:
+        scheme, _, supplied = request.headers.get('authorization', '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(supplied.strip().encode(), self.token.encode())
+
+    async def _dispatch(self, request: ApiRequest) -> tuple[int, Any]:
+        if request.path == '/health':
+            return 200, {'ok': True}
+        if not self._authorized(request):
+            return 401, {'error': 'missing or invalid bearer token'}
+        path_matched = False
+        for method, pattern, handler_name in self.ROUTES:
+            match = pattern.match(request.path)
+            if not match:
+                continue
+            path_matched = True
+            if method != request.method:
+                continue
+            params = {key: unquote(value) for key, value in match.groupdict().items()}
+            try:
+                return await getattr(self, handler_name)(request, **params)
+            except ApiError as exc:
+                payload = {'error': exc.message}
+                if exc.details is not None:
+                    payload['details'] = exc.details
+                return exc.status, payload
+            except Exception as exc:
+                print(f'[API] {request.method} {request.path} failed:\n{traceback.format_exc()}')
+                return 500, {'error': str(exc) or exc.__class__.__name__}
+        if path_matched:
+            return 405, {'error': f'{request.method} not allowed on {request.path}'}
+        return 404, {'error': f'no route for {request.path}'}
+
+    # --- handlers --------------------------------------------------------
+
+    async def _list_profiles(self, request: ApiRequest) -> tuple[int, Any]:
+        entries = await self._run(list_profile_entries)
+        running = {session.profile_id: session.session_id for session in self.registry.live_sessions()}
+        return 200, {
+            'profiles': [
+                {
+                    'id': entry['id'],
+                    'display': entry['display'],
+                    'running': entry['id'] in running,
+                    'session_id': running.get(entry['id']),
+                }
+                for entry in entries
+            ]
+        }
+
+    async def _launch_profile(self, request: ApiRequest, profile_id: str) -> tuple[int, Any]:
+        options = request.json()
+        profile = await self._run(load_profile, profile_id)
+        if not profile:
+            raise ApiError(404, f'profile {profile_id!r} not found')
+        if profile_id in self._launching or self.registry.find_live_by_profile(profile_id):
+            raise ApiError(409, f'profile {profile_id!r} is already running')
+        url = str(options.get('url') or '')
+        browser_path = options.get('browser_path')
+        if not browser_path and profile.base_config.adapter_id == 'chromium' and self.browser_resolver:
+            browser_path = self.browser_resolver(profile)
+        self._launching.add(profile_id)
+        try:
+            async with self._launch_slots:
+                if self.launch_fn:
+                    session = await self._run(self.launch_fn, profile_id, url, browser_path)
+                else:
+                    session = await self._launch_in_process(profile_id, profile, url, browser_path)
+        finally:
+            self._launching.discard(profile_id)
+        ws_endpoint = await self._run(fetch_ws_endpoint, session.debug_port)
+        self._notify(session)
+        return 201, {'session': session.to_dict(), 'ws_endpoint': ws_endpoint, 'profile_updates': session.profile_updates}
+
+    async def _launch_in_process(
+        self,
+        profile_id: str,
+        profile: ProfileConfig,
+        url: str,
+        browser_path: Optional[str],
+    ) -> BrowserSession:
+        from app.adapters.registry import get_adapter
+
+        base = BaseConfig.from_dict(profile.base_config.to_dict(), profile_id)
+        if url:
+            base.target_url = url
+        if browser_path:
+            base.browser_path = browser_path
+        adapter = get_adapter(base.adapter_id)
+        errors = adapter.validate(base, profile.extra_config or {})
+        if errors:
+            raise ApiError(422, 'invalid profile', [{'key': e.key, 'message': e.message} for e in errors])
+        # On the process-wide loop, not this server's: async drivers stay bound to the loop that
+        # started them, and the browser must outlive a stop()/start() of the server.
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wrap_future(run_coroutine(adapter.launch_async(base, profile.extra_config or {})))
+        except Exception as exc:
+            observe_launch(base.adapter_id, time.perf_counter() - started, failure_cause(exc))
+            raise
+        observe_launch(base.adapter_id, time.perf_counter() - started)
+        if result.profile_updates:
+            await self._run(update_extra_config, profile_id, result.profile_updates)
+        session = await self._run(
+            functools.partial(
+                self.registry.register,
+                profile_id,
+                base.adapter_id,
+                result.page,
+                pid=result.pid,
+                debug_port=result.debug_port,
+                user_data_dir=result.user_data_dir,
+                on_exit=result.on_exit,
+            )
+        )
+        session.profile_updates = dict(result.profile_updates)
+        return session
+
+    async def _list_sessions(self, request: ApiRequest) -> tuple[int, Any]:
+        return 200, {'sessions': [session.to_dict() for session in self.registry.sessions()]}
+
+    async def _get_session(self, request: ApiRequest, session_id: str) -> tuple[int, Any]:
+        session = self.registry.get(session_id)
+        if not session:
+            raise ApiError(404, f'session {session_id!r} not found')
+        return 200, {'session': session.to_dict()}
+
+    async def _stop_session(self, request: ApiRequest, session_id: str) -> tuple[int, Any]:
+        session = self.registry.stop(session_id)
+        if not session:
+            raise ApiError(404, f'session {session_id!r} not found')
+        self._notify(session)
+        return 200, {'session': session.to_dict()}
+
+    async def _focus_session(self, request: ApiRequest, session_id: str) -> tuple[int, Any]:
+        if not self.registry.get(session_id):
+            raise ApiError(404, f'session {session_id!r} not found')
+        return 200, {'focused': await self._run(self.registry.focus, session_id)}
+
+    async def _get_hibernation(self, request: ApiRequest) -> tuple[int, Any]:
+        return 200, self.registry.hibernation_config()
+
+    async def _set_hibernation(self, request: ApiRequest) -> tuple[int, Any]:
+        options = request.json()
+        current = self.registry.hibernation_config()
+        values = {}
+        for name in ('idle_minutes', 'quit_minutes'):
+            value = options.get(name, current[name])
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ApiError(422, f'{name} must be a number of minutes >= 0')
+            values[name] = value
+        self.registry.configure_hibernation(values['idle_minutes'], values['quit_minutes'])
+        return 200, self.registry.hibernation_config()
+
+    async def _metrics(self, request: ApiRequest) -> tuple[int, Any]:
+        return 200, TextResponse(REGISTRY.render_prometheus(), 'text/plain; version=0.0.4; charset=utf-8')
+
+    def _notify(self, session: BrowserSession) -> None:
+        if self.on_session_changed is None:
+            return
+        try:
+            self.on_session_changed(session)
+        except Exception as exc:
+            print(f'[API] Session callback failed: {exc}')
+
+
+def stop_live_sessions(registry: SessionRegistry) -> ShutdownReport:
+    """Quits every live browser of a registry, killing what does not exit in time."""
+    coordinator = ShutdownCoordinator()
+    # Suspended renderers would ignore the quit and be killed at the deadline.
+    registry.wake_all()
+    for session in registry.live_sessions():
+        if session.handle is not None:
+            coordinator.add_browser(f'session:{session.profile_id}', session.handle.quit, session.pid, session.on_exit)
+    return coordinator.run()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m app.api_server', description='UselessBrowser local control API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_API_PORT)
+    parser.add_argument('--token', default=os.environ.get(API_TOKEN_ENV), help=f'defaults to ${API_TOKEN_ENV}')
+    parser.add_argument('--max-launches', type=int, default=DEFAULT_MAX_CONCURRENT_LAUNCHES)
+    parser.add_argument('--hibernate-after', type=float, default=0, metavar='MINUTES', help='freeze idle sessions')
+    parser.add_argument('--quit-after', type=float, default=0, metavar='MINUTES', help='stop idle sessions')
+    args = parser.parse_args(argv)
+
+    token = args.token
+    if not token:
+        token = generate_token()
+        print(f'API token: {token}', file=sys.stderr)
+    registry = SessionRegistry()
+    registry.configure_hibernation(args.hibernate_after, args.quit_after)
+    server = ApiServer(
+        registry,
+        token,
+        host=args.host,
+        port=args.port,
+        max_concurrent_launches=args.max_launches,
+        poll_sessions=True,
+    )
+    server.run_forever()
+    # Browsers started through the API do not outlive a standalone server, same as with the GUI.
+    print(f'[API] {stop_live_sessions(server.registry).summary()}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,10 +4,25 @@ from pathlib import Path
 from PyQt6 import QtCore
 from qfluentwidgets.common import Theme
 
+from app.api_server import DEFAULT_API_PORT
+
 APP_SETTINGS_PATH = Path('config/app.json')
 DEFAULT_APP_SETTINGS = {
     'language': 'system',
     'theme': 'auto',
+    # Cache quota for all profile user-data dirs, 0 disables eviction.
+    'storage_quota_mb': 2048,
+    # Local control API (app.api_server); the token is generated the first time it is needed.
+    'api_enabled': False,
+    'api_port': DEFAULT_API_PORT,
+    'api_token': '',
+    # Run browsers in the detached launcher process (app.launcher) instead of the GUI process.
+    'use_launcher': True,
+    # GUI event-loop stalls longer than this are recorded (app.stall_watchdog); 0 turns the watchdog off.
+    'stall_threshold_ms': 100,
+    # Idle browsers are frozen after this many minutes and quit after the second (app.hibernation); 0 is off.
+    'hibernate_idle_minutes': 0,
+    'auto_quit_idle_minutes': 0,
 }
 
 
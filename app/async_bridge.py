@@ -0,0 +1,113 @@
+"""
+One shared asyncio loop on a background thread.
+
+Async launches (BrowserAdapter.launch_async) and their CDP setup all run
+on this loop instead of taking an OS thread each. Callers on other threads
+hand coroutines over with run_coroutine() and get a concurrent Future back;
+the GUI wraps that future in a worker that reports through a Qt signal
+(see app.workers.AsyncLaunchWorker). Objects created on the loop, such as
+async Playwright browsers, stay bound to it, which is why the loop lives
+for the whole process instead of per request.
+"""
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+START_TIMEOUT_SECONDS = 5.0
+
+
+class AsyncLoopThread:
+    def __init__(self, name: str = 'async-loop'):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self.start()
+        return self._loop
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is threading.current_thread()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.is_running():
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._thread_main, name=self.name, daemon=True)
+            self._thread.start()
+        if not self._ready.wait(START_TIMEOUT_SECONDS):
+            raise RuntimeError('async loop did not start in time')
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Blocks the calling thread until `coro` has run on the loop."""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError('run() called from the loop thread would deadlock')
+        return self.submit(coro).result(timeout)
+
+    def stop(self, timeout: float = START_TIMEOUT_SECONDS) -> None:
+        loop, thread = self._loop, self._thread
+        if loop is None or thread is None or not thread.is_alive():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _thread_main(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+
+def complete_on_loop(loop: asyncio.AbstractEventLoop, coro: Coroutine, timeout: float) -> None:
+    """
+    Runs `coro` on `loop` and waits up to `timeout` for it, from any thread.
+    On the loop's own thread waiting would deadlock, so it is only scheduled.
+    Errors are swallowed: this is for best-effort cleanup such as handle.quit().
+    """
+    if loop.is_closed():
+        coro.close()
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        loop.create_task(coro)
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+    except Exception:
+        pass
+
+
+_shared_loop = AsyncLoopThread()
+
+
+def get_async_loop() -> AsyncLoopThread:
+    """The process-wide loop, started on first use."""
+    _shared_loop.start()
+    return _shared_loop
+
+
+def run_coroutine(coro: Coroutine) -> concurrent.futures.Future:
+    return get_async_loop().submit(coro)
@@ -0,0 +1,417 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from app.file_lock import exclusive_lock
+from app.spoofers.profile import USER_DATA_SUBDIRS, BaseConfig, get_profiles_dir
+from app.storage import LOCK_FILE_NAMES, find_cache_dirs
+from app.trash import move_to_trash
+
+try:  # Python 3.14+
+    from compression import zstd as _zstd_stdlib
+except ImportError:
+    _zstd_stdlib = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BACKUP_FORMAT_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+LOCK_FILE_NAME = '.lock'
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class BackupError(Exception):
+    pass
+
+
+def get_backups_dir() -> Path:
+    backups_dir = get_profiles_dir().parent / 'backups'
+    backups_dir.mkdir(parents=True, exist_ok=True)
+    return backups_dir
+
+
+def compression_name() -> str:
+    return 'zstd' if _zstd_stdlib or zstandard else 'zlib'
+
+
+def _compress(data: bytes) -> bytes:
+    if _zstd_stdlib is not None:
+        return _zstd_stdlib.compress(data, level=3)
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(blob: bytes) -> bytes:
+    # Chunks are self-describing, so archives written with zstd and zlib can be mixed.
+    if blob[:4] != ZSTD_MAGIC:
+        return zlib.decompress(blob)
+    if _zstd_stdlib is not None:
+        return _zstd_stdlib.decompress(blob)
+    if zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(blob)
+    raise BackupError('Backup chunk is zstd-compressed but no zstd module is available (pip install zstandard)')
+
+
+def _write_json_atomic(path: Path, data: dict) -> None:
+    tmp = path.with_name(f'{path.name}.tmp')
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+@dataclass
+class SnapshotInfo:
+    snapshot_id: str
+    created_at: float
+    profiles: dict[str, dict] = field(default_factory=dict)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(int(item.get('bytes', 0)) for item in self.profiles.values())
+
+
+@dataclass
+class BackupStats:
+    snapshot: SnapshotInfo
+    files: int = 0
+    reused_files: int = 0
+    new_chunks: int = 0
+    stored_bytes: int = 0
+
+
+def _profile_sources(profiles_dir: Path, config_path: Path) -> list[Path]:
+    """The profile JSON plus its app-managed user-data dirs (explicit user_data_dir paths are not ours to back up)."""
+    sources = [config_path]
+    try:
+        data = json.loads(config_path.read_text(encoding='utf-8'))
+    except Exception:
+        return sources
+    if not isinstance(data, dict):
+        return sources
+    base = BaseConfig.from_dict(data.get('base_config') or data, config_path.stem)
+    for subdir in sorted(set(USER_DATA_SUBDIRS.values())):
+        for profile_id in sorted({base.profile_id, config_path.stem}):
+            path = profiles_dir / subdir / profile_id
+            if path.is_dir() and path not in sources:
+                sources.append(path)
+    return sources
+
+
+def _walk_files(root: Path) -> list[Path]:
+    if root.is_file():
+        return [root]
+    skipped = {path.resolve() for path in find_cache_dirs(root)}
+    files: list[Path] = []
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = sorted(os.scandir(current), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_symlink() or entry.name in LOCK_FILE_NAMES:
+                continue
+            path = Path(entry.path)
+            if entry.is_dir():
+                if path.resolve() not in skipped:
+                    stack.append(path)
+            elif entry.is_file():
+                files.append(path)
+    return files
+
+
+class BackupRepository:
+    """
+    Content-addressed backup store.
+
+    Layout under `root`:
+      chunks/<ab>/<sha256>            one compressed chunk (zstd if available, else zlib)
+      snapshots/<id>/index.json       written last; a snapshot without it is incomplete
+      snapshots/<id>/<profile>.json   file list of one profile, so restoring a
+                                      profile reads only its own manifest and chunks
+      .lock                           held by backup, restore, delete and GC
+    Paths inside manifests are relative to the profiles dir. Because every
+    writer holds the lock, a snapshot without an index seen under it is
+    left over from an interrupted backup, not one in progress.
+    """
+
+    def __init__(self, root: Optional[Path] = None, profiles_dir: Optional[Path] = None):
+        self.root = root or get_backups_dir()
+        self.profiles_dir = profiles_dir or get_profiles_dir()
+        self.chunks_dir = self.root / 'chunks'
+        self.snapshots_dir = self.root / 'snapshots'
+
+    def _lock(self):
+        return exclusive_lock(self.root / LOCK_FILE_NAME)
+
+    # --- chunks ---
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunks_dir / digest[:2] / digest
+
+    def _put_chunk(self, data: bytes) -> tuple[str, int]:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        if path.exists():
+            return digest, 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        blob = _compress(data)
+        tmp = path.with_name(f'{digest}.{uuid.uuid4().hex[:8]}.tmp')
+        tmp.write_bytes(blob)
+        os.replace(tmp, path)
+        return digest, len(blob)
+
+    def _read_chunk(self, digest: str) -> bytes:
+        try:
+            data = _decompress(self._chunk_path(digest).read_bytes())
+        except FileNotFoundError as exc:
+            raise BackupError(f'Backup chunk {digest} is missing') from exc
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise BackupError(f'Backup chunk {digest} is corrupted')
+        return data
+
+    # --- snapshots ---
+
+    def list_snapshots(self) -> list[SnapshotInfo]:
+        """Complete snapshots, newest first."""
+        snapshots: list[SnapshotInfo] = []
+        if not self.snapshots_dir.is_dir():
+            return snapshots
+        for entry in self.snapshots_dir.iterdir():
+            index_path = entry / 'index.json'
+            if not index_path.is_file():
+                continue
+            try:
+                data = json.loads(index_path.read_text(encoding='utf-8'))
+            except Exception:
+                continue
+            snapshots.append(SnapshotInfo(
+                snapshot_id=entry.name,
+                created_at=float(data.get('created_at', 0)),
+                profiles=dict(data.get('profiles') or {}),
+            ))
+        snapshots.sort(key=lambda item: item.created_at, reverse=True)
+        return snapshots
+
+    def load_profile_manifest(self, snapshot_id: str, profile_key: str) -> dict:
+        path = self.snapshots_dir / snapshot_id / f'{profile_key}.json'
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except FileNotFoundError as exc:
+            raise BackupError(f'Profile {profile_key} is not in snapshot {snapshot_id}') from exc
+
+    def _previous_files(self, profile_key: str) -> dict[str, dict]:
+        for snapshot in self.list_snapshots():
+            if profile_key in snapshot.profiles:
+                try:
+                    manifest = self.load_profile_manifest(snapshot.snapshot_id, profile_key)
+                except BackupError:
+                    return {}
+                return {item['path']: item for item in manifest.get('files', [])}
+        return {}
+
+    def backup(self, profile_keys: Optional[list[str]] = None, progress: Optional[ProgressCallback] = None) -> BackupStats:
+        """
+        Backs up profiles (all of them by default) into a new snapshot.
+
+        Files whose size and mtime match the previous snapshot reuse its chunk
+        list without being read; everything else is chunked and only chunks
+        that are not in the store yet are written.
+        """
+        with self._lock():
+            return self._backup(profile_keys, progress)
+
+    def _backup(self, profile_keys: Optional[list[str]], progress: Optional[ProgressCallback]) -> BackupStats:
+        wanted = set(profile_keys) if profile_keys is not None else None
+        plan: dict[str, list[Path]] = {}
+        for config_path in sorted(self.profiles_dir.glob('*.json')):
+            if wanted is not None and config_path.stem not in wanted:
+                continue
+            files: list[Path] = []
+            for source in _profile_sources(self.profiles_dir, config_path):
+                files.extend(_walk_files(source))
+            plan[config_path.stem] = files
+
+        total = 0
+        for files in plan.values():
+            for path in files:
+                try:
+                    total += path.stat().st_size
+                except OSError:
+                    continue
+        done = 0
+
+        snapshot_id = f'{time.strftime("%Y%m%d-%H%M%S")}-{uuid.uuid4().hex[:6]}'
+        snapshot_dir = self.snapshots_dir / snapshot_id
+        snapshot_dir.mkdir(parents=True)
+        stats = BackupStats(snapshot=SnapshotInfo(snapshot_id=snapshot_id, created_at=time.time()))
+
+        for profile_key, files in plan.items():
+            previous = self._previous_files(profile_key)
+            entries: list[dict] = []
+            profile_bytes = 0
+            for path in files:
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                rel = path.relative_to(self.profiles_dir).as_posix()
+                entry = {'path': rel, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'mode': st.st_mode & 0o777}
+                old = previous.get(rel)
+                if (
+                    old
+                    and old.get('size') == st.st_size
+                    and old.get('mtime_ns') == st.st_mtime_ns
+                    and all(self._chunk_path(digest).exists() for digest in old.get('chunks', []))
+                ):
+                    entry['chunks'] = list(old['chunks'])
+                    stats.reused_files += 1
+                    done += st.st_size
+                else:
+                    chunks: list[str] = []
+                    try:
+                        with path.open('rb') as fh:
+                            while True:
+                                data = fh.read(CHUNK_SIZE)
+                                if not data:
+                                    break
+                                digest, stored = self._put_chunk(data)
+                                chunks.append(digest)
+                                if stored:
+                                    stats.new_chunks += 1
+                                    stats.stored_bytes += stored
+                                done += len(data)
+                                if progress:
+                                    progress(done, total)
+                    except OSError as exc:
+                        # Files can vanish or be locked while a browser runs; skip them rather than fail the backup.
+                        print(f'[BACKUP] Skipped {rel}: {exc}')
+                        continue
+                    entry['chunks'] = chunks
+                entries.append(entry)
+                profile_bytes += st.st_size
+                stats.files += 1
+                if progress:
+                    progress(done, total)
+            _write_json_atomic(snapshot_dir / f'{profile_key}.json', {
+                'version': BACKUP_FORMAT_VERSION,
+                'profile': profile_key,
+                'files': entries,
+            })
+            stats.snapshot.profiles[profile_key] = {'files': len(entries), 'bytes': profile_bytes}
+
+        _write_json_atomic(snapshot_dir / 'index.json', {
+            'version': BACKUP_FORMAT_VERSION,
+            'created_at': stats.snapshot.created_at,
+            'compression': compression_name(),
+            'profiles': stats.snapshot.profiles,
+        })
+        return stats
+
+    def restore_profile(self, snapshot_id: str, profile_key: str, progress: Optional[ProgressCallback] = None) -> list[Path]:
+        """
+        Restores one profile from a snapshot. The data is rebuilt in a staging
+        dir first; current user-data dirs are then moved to the trash and
+        replaced. Returns the restored top-level paths.
+        """
+        with self._lock():
+            return self._restore_profile(snapshot_id, profile_key, progress)
+
+    def _restore_profile(self, snapshot_id: str, profile_key: str, progress: Optional[ProgressCallback]) -> list[Path]:
+        manifest = self.load_profile_manifest(snapshot_id, profile_key)
+        files = manifest.get('files', [])
+        total = sum(int(item.get('size', 0)) for item in files)
+        done = 0
+        staging = self.profiles_dir / f'.restore-{uuid.uuid4().hex[:8]}'
+        staging.mkdir(parents=True)
+        try:
+            tops: list[str] = []
+            for item in files:
+                rel = Path(item['path'])
+                if rel.is_absolute() or '..' in rel.parts:
+                    raise BackupError(f'Unsafe path in backup manifest: {item["path"]}')
+                top = rel.parts[0] if len(rel.parts) == 1 else '/'.join(rel.parts[:2])
+                if top not in tops:
+                    tops.append(top)
+                target = staging / rel
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with target.open('wb') as fh:
+                    for digest in item.get('chunks', []):
+                        data = self._read_chunk(digest)
+                        fh.write(data)
+                        done += len(data)
+                        if progress:
+                            progress(done, total)
+                os.chmod(target, int(item.get('mode', 0o644)) or 0o644)
+                mtime_ns = int(item.get('mtime_ns', 0))
+                if mtime_ns:
+                    os.utime(target, ns=(mtime_ns, mtime_ns))
+
+            restored: list[Path] = []
+            for top in tops:
+                source = staging / top
+                destination = self.profiles_dir / top
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                if destination.is_dir():
+                    move_to_trash(destination, self.profiles_dir)
+                os.replace(source, destination)
+                restored.append(destination)
+            return restored
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def delete_snapshot(self, snapshot_id: str) -> None:
+        with self._lock():
+            shutil.rmtree(self.snapshots_dir / snapshot_id, ignore_errors=True)
+
+    def prune(self, snapshot_ids: list[str]) -> int:
+        """Deletes snapshots and then the chunks only they used; returns the bytes freed."""
+        with self._lock():
+            for snapshot_id in snapshot_ids:
+                shutil.rmtree(self.snapshots_dir / snapshot_id, ignore_errors=True)
+            return self._collect_garbage()
+
+    def collect_garbage(self) -> int:
+        """Deletes chunks no complete snapshot refers to; returns the bytes freed."""
+        with self._lock():
+            return self._collect_garbage()
+
+    def _collect_garbage(self) -> int:
+        if self.snapshots_dir.is_dir():
+            for entry in self.snapshots_dir.iterdir():
+                # Under the lock no backup is running, so this one was interrupted.
+                if entry.is_dir() and not (entry / 'index.json').is_file():
+                    shutil.rmtree(entry, ignore_errors=True)
+        referenced: set[str] = set()
+        for snapshot in self.list_snapshots():
+            for profile_key in snapshot.profiles:
+                try:
+                    manifest = self.load_profile_manifest(snapshot.snapshot_id, profile_key)
+                except BackupError:
+                    continue
+                for item in manifest.get('files', []):
+                    referenced.update(item.get('chunks', []))
+        freed = 0
+        if not self.chunks_dir.is_dir():
+            return 0
+        for path in self.chunks_dir.glob('*/*'):
+            if path.name in referenced:
+                continue
+            try:
+                freed += path.stat().st_size
+                path.unlink()
+            except OSError:
+                continue
+        return freed
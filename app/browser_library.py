@@ -3,12 +3,16 @@ import os
 import platform
 import shutil
 import tempfile
+import time
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Optional
 from urllib.request import urlopen
 
+from app.metrics import observe_download
+from app.trash import is_in_trash, move_to_trash
+
 
 KNOWN_GOOD_VERSIONS_URL = (
     'https://googlechromelabs.github.io/chrome-for-testing/known-good-versions-with-downloads.json'
@@ -19,6 +23,72 @@ BROWSER_ARGS = [
 ]
 
 
+@dataclass(frozen=True)
+class PerformancePreset:
+    """
+    Chromium switches for one resource profile, added to BROWSER_ARGS.
+
+    Chrome only reads the last --disable-features switch, so features are
+    kept apart for the adapter to merge with any others. Nothing here changes what pages
+    can observe (no --disable-gpu, no fixed JS heap), so presets do not
+    fight the fingerprint settings.
+    """
+
+    name: str
+    switches: tuple[str, ...] = ()
+    disabled_features: tuple[str, ...] = ()
+
+    def arguments(self) -> list[str]:
+        args = list(self.switches)
+        if self.disabled_features:
+            args.append('--disable-features=' + ','.join(self.disabled_features))
+        return args
+
+
+# Background services a profile browser never needs: component and translate downloads, media casting,
+# optimization-guide models and reliability beacons.
+_QUIET_SWITCHES = ('--disable-component-update', '--disable-domain-reliability')
+_QUIET_FEATURES = ('Translate', 'OptimizationHints', 'OptimizationGuideModelDownloading', 'MediaRouter', 'DialMediaRouteProvider')
+
+PERFORMANCE_PRESETS = {
+    preset.name: preset
+    for preset in (
+        PerformancePreset('balanced', _QUIET_SWITCHES, _QUIET_FEATURES),
+        # Many concurrent profiles on little RAM: fewer and smaller renderers, nothing kept warm.
+        PerformancePreset(
+            'low-memory',
+            _QUIET_SWITCHES + (
+                '--disable-background-networking',
+                '--renderer-process-limit=2',
+                '--process-per-site',
+                '--num-raster-threads=1',
+                '--aggressive-cache-discard',
+            ),
+            _QUIET_FEATURES + ('SpareRendererForSitePerProcess', 'BackForwardCache'),
+        ),
+        # Automation across many windows: background and occluded pages run at full speed.
+        PerformancePreset(
+            'max-throughput',
+            _QUIET_SWITCHES + (
+                '--disable-background-networking',
+                '--disable-background-timer-throttling',
+                '--disable-backgrounding-occluded-windows',
+                '--disable-renderer-backgrounding',
+                '--disable-ipc-flooding-protection',
+            ),
+            _QUIET_FEATURES + ('CalculateNativeWinOcclusion', 'IntensiveWakeUpThrottling'),
+        ),
+    )
+}
+DEFAULT_PERFORMANCE_PRESET = 'balanced'
+
+
+def performance_preset_args(name: Optional[str]) -> list[str]:
+    """Switches of a preset; unknown or empty names get the default one."""
+    preset = PERFORMANCE_PRESETS.get(name or DEFAULT_PERFORMANCE_PRESET) or PERFORMANCE_PRESETS[DEFAULT_PERFORMANCE_PRESET]
+    return preset.arguments()
+
+
 @dataclass
 class BrowserEntry:
     id: str
@@ -36,8 +106,10 @@ def get_browsers_dir() -> Path:
 
 
 def fetch_known_good_versions(url: str = KNOWN_GOOD_VERSIONS_URL) -> dict:
+    started = time.perf_counter()
     with urlopen(url, timeout=20) as response:
         payload = response.read()
+    observe_download('version-list', len(payload), time.perf_counter() - started)
     return json.loads(payload.decode('utf-8'))
 
 
@@ -61,8 +133,11 @@ def install_chrome_download(download_url: str, version: str, target_dir: Optiona
     temp_dir = Path(tempfile.mkdtemp(prefix='chrome_download_'))
     archive_path = temp_dir / 'chrome.zip'
     try:
+        started = time.perf_counter()
         with urlopen(download_url, timeout=60) as response, open(archive_path, 'wb') as handle:
             shutil.copyfileobj(response, handle)
+            size = handle.tell()
+        observe_download('browser', size, time.perf_counter() - started)
 
         with zipfile.ZipFile(archive_path, 'r') as archive:
             archive.extractall(version_dir)
@@ -95,14 +170,17 @@ def _extract_version_from_path(path: Path, browsers_dir: Path) -> str:
     return 'unknown'
 
 
+def _chrome_exe_names() -> list[str]:
+    return ['chrome.exe'] if platform.system() == 'Windows' else ['chrome', 'Chromium']
+
+
 def scan_local_browsers() -> list[BrowserEntry]:
     browsers_dir = get_browsers_dir()
     entries: list[BrowserEntry] = []
 
-    exe_names = ['chrome.exe'] if platform.system() == 'Windows' else ['chrome', 'Chromium']
-    for exe_name in exe_names:
+    for exe_name in _chrome_exe_names():
         for path in browsers_dir.rglob(exe_name):
-            if not path.is_file():
+            if not path.is_file() or is_in_trash(path.relative_to(browsers_dir)):
                 continue
             version = _extract_version_from_path(path, browsers_dir)
             entries.append(_build_entry(path, 'Chrome', version, 'local'))
@@ -184,6 +262,20 @@ def find_chrome_path() -> Optional[str]:
     return None
 
 
+def resolve_browser_executable(path: str) -> str:
+    """The executable `path` names: the Chrome binary in a directory, or a bare command looked up on PATH."""
+    candidate = Path(path)
+    if candidate.is_dir():
+        exe_names = _chrome_exe_names()
+        for exe_name in exe_names:
+            if (candidate / exe_name).is_file():
+                return str(candidate / exe_name)
+        return str(candidate / exe_names[0])
+    if candidate.exists():
+        return str(candidate)
+    return shutil.which(path) or path
+
+
 def remove_local_browser(entry: BrowserEntry, browsers_dir: Optional[Path] = None) -> Path:
     if entry.source != 'local':
         raise ValueError('Only local browsers can be removed.')
@@ -196,6 +288,6 @@ def remove_local_browser(entry: BrowserEntry, browsers_dir: Optional[Path] = Non
     if not rel.parts:
         raise ValueError('Invalid local browser path.')
     target_dir = browsers_dir / rel.parts[0]
-    if target_dir.exists():
-        shutil.rmtree(target_dir)
+    # Only the rename happens here; the tree is deleted later by empty_trash() off the GUI thread.
+    move_to_trash(target_dir, browsers_dir)
     return target_dir
@@ -0,0 +1,340 @@
+"""
+Minimal asyncio Chrome DevTools Protocol client.
+
+DrissionPage drives CDP from blocking threads. This client speaks the
+protocol directly over a websocket built on asyncio streams, so a single
+event loop can set up many browsers at once. It supports commands
+(optionally scoped to a flattened target session) and event callbacks.
+Commands sent back to back are pipelined: Chromium answers them in order,
+so a batch costs about one round trip instead of one per command.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+# DevTools messages (e.g. large injected scripts) easily exceed asyncio's 64 KiB default.
+STREAM_LIMIT = 16 * 1024 * 1024
+CONNECT_TIMEOUT_SECONDS = 5.0
+COMMAND_TIMEOUT_SECONDS = 30.0
+
+# Open connections are kept referenced here: a launch hands its connection
+# off without keeping it, and the reader task must not be garbage collected.
+_OPEN_CONNECTIONS: set['CDPConnection'] = set()
+
+
+class CDPError(Exception):
+    def __init__(self, method: str, message: str, code: Optional[int] = None):
+        super().__init__(f'{method}: {message}')
+        self.method = method
+        self.code = code
+
+
+def websocket_accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode('ascii')).digest()).decode('ascii')
+
+
+def encode_frame(opcode: int, payload: bytes, mask: bool) -> bytes:
+    """One final websocket frame. Clients must mask what they send, servers must not."""
+    head = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        head.append(mask_bit | length)
+    elif length < 1 << 16:
+        head.append(mask_bit | 126)
+        head += struct.pack('!H', length)
+    else:
+        head.append(mask_bit | 127)
+        head += struct.pack('!Q', length)
+    if not mask:
+        return bytes(head) + payload
+    key = os.urandom(4)
+    return bytes(head) + key + _apply_mask(payload, key)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[bool, int, bytes]:
+    """(fin, opcode, payload) of the next frame, unmasking it if needed."""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack('!H', await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack('!Q', await reader.readexactly(8))
+    key = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if key:
+        payload = _apply_mask(payload, key)
+    return bool(first & 0x80), first & 0x0F, payload
+
+
+def _apply_mask(payload: bytes, key: bytes) -> bytes:
+    # XOR with the repeated 4-byte key, done on big ints instead of byte by byte.
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(len(payload), 'big')
+
+
+class CDPConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._pending: dict[int, tuple[str, asyncio.Future]] = {}
+        self._closed = False
+        self._listeners: dict[str, list[Callable[[dict, Optional[str]], None]]] = {}
+        self._reader_task = asyncio.create_task(self._read_loop())
+        _OPEN_CONNECTIONS.add(self)
+
+    @classmethod
+    async def connect(cls, ws_url: str, timeout: float = CONNECT_TIMEOUT_SECONDS) -> 'CDPConnection':
+        parts = urlsplit(ws_url)
+        if parts.scheme != 'ws':
+            raise ValueError(f'unsupported DevTools endpoint {ws_url!r}')
+        host = parts.hostname or '127.0.0.1'
+        port = parts.port or 80
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, limit=STREAM_LIMIT), timeout
+        )
+        try:
+            await asyncio.wait_for(cls._handshake(reader, writer, f'{host}:{port}', path), timeout)
+        except BaseException:
+            writer.close()
+            raise
+        return cls(reader, writer)
+
+    @staticmethod
+    async def _handshake(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, path: str) -> None:
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        writer.write(
+            (
+                f'GET {path} HTTP/1.1\r\n'
+                f'Host: {host}\r\n'
+                'Upgrade: websocket\r\n'
+                'Connection: Upgrade\r\n'
+                f'Sec-WebSocket-Key: {key}\r\n'
+                'Sec-WebSocket-Version: 13\r\n\r\n'
+            ).encode('ascii')
+        )
+        await writer.drain()
+        head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        status = head[0].split(' ')
+        if len(status) < 2 or status[1] != '101':
+            raise ConnectionError(f'websocket upgrade refused: {head[0]}')
+        headers = {}
+        for line in head[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if headers.get('sec-websocket-accept') != websocket_accept_key(key):
+            raise ConnectionError('websocket upgrade returned a bad accept key')
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def on(self, event: str, callback: Callable[[dict, Optional[str]], None]) -> None:
+        """Calls `callback(params, session_id)` on the loop for every `event`, e.g. 'Target.targetDestroyed'."""
+        self._listeners.setdefault(event, []).append(callback)
+
+    def off(self, event: str, callback: Callable[[dict, Optional[str]], None]) -> None:
+        callbacks = self._listeners.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def send_nowait(self, method: str, params: Optional[dict] = None, session_id: Optional[str] = None) -> asyncio.Future:
+        """Writes the command and returns a future for its result, without waiting for the reply."""
+        if self._closed:
+            raise ConnectionError('DevTools connection is closed')
+        self._next_id += 1
+        message: dict[str, Any] = {'id': self._next_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = (method, future)
+        self._writer.write(encode_frame(OP_TEXT, json.dumps(message).encode('utf-8'), mask=True))
+        return future
+
+    async def send(
+        self,
+        method: str,
+        params: Optional[dict] = None,
+        session_id: Optional[str] = None,
+        timeout: float = COMMAND_TIMEOUT_SECONDS,
+    ) -> dict:
+        future = self.send_nowait(method, params, session_id)
+        await self._writer.drain()
+        return await asyncio.wait_for(future, timeout)
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        try:
+            self._writer.write(encode_frame(OP_CLOSE, b'', mask=True))
+            await self._writer.drain()
+        except ConnectionError:
+            pass
+        self._shutdown(ConnectionError('DevTools connection is closed'))
+        self._reader_task.cancel()
+        try:
+            await self._reader_task
+        except asyncio.CancelledError:
+            pass
+
+    def _shutdown(self, exc: BaseException) -> None:
+        self._closed = True
+        _OPEN_CONNECTIONS.discard(self)
+        self._writer.close()
+        for _, future in self._pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self._pending.clear()
+
+    async def _read_loop(self) -> None:
+        buffer = bytearray()
+        try:
+            while True:
+                fin, opcode, payload = await read_frame(self._reader)
+                if opcode == OP_PING:
+                    self._writer.write(encode_frame(OP_PONG, payload, mask=True))
+                    continue
+                if opcode == OP_CLOSE:
+                    break
+                if opcode in (OP_TEXT, OP_BINARY, OP_CONTINUATION):
+                    buffer += payload
+                    if fin:
+                        self._dispatch(bytes(buffer))
+                        buffer.clear()
+        except (asyncio.IncompleteReadError, ConnectionError) as exc:
+            self._shutdown(ConnectionError(f'DevTools connection lost: {exc}'))
+            return
+        self._shutdown(ConnectionError('DevTools connection closed by the browser'))
+
+    def _dispatch(self, raw: bytes) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        if 'id' not in message:
+            for callback in list(self._listeners.get(message.get('method'), ())):
+                try:
+                    callback(message.get('params') or {}, message.get('sessionId'))
+                except Exception as exc:
+                    print(f'[CDP] {message.get("method")} listener failed: {exc}')
+            return
+        entry = self._pending.pop(message['id'], None)
+        if entry is None:
+            return
+        method, future = entry
+        if future.done():
+            return
+        error = message.get('error')
+        if error:
+            future.set_exception(CDPError(method, error.get('message', 'error'), error.get('code')))
+        else:
+            future.set_result(message.get('result') or {})
+
+
+# Page.lifecycleEvent names for the navigation wait policies that need one (see BaseConfig.navigation_wait).
+LIFECYCLE_MILESTONES = {'domcontentloaded': 'DOMContentLoaded', 'load': 'load'}
+
+
+async def navigate(
+    cdp: CDPConnection,
+    url: str,
+    session_id: Optional[str] = None,
+    wait: str = 'commit',
+    timeout: float = COMMAND_TIMEOUT_SECONDS,
+) -> None:
+    """
+    Navigates a page target and returns once `wait` is reached:
+
+        none              the command is sent, nothing is awaited
+        commit            Page.navigate answered, i.e. the response is being committed
+        domcontentloaded  DOMContentLoaded of the new document
+        load              load of the new document
+
+    Raises CDPError when the navigation itself fails (e.g. DNS errors) and
+    asyncio.TimeoutError when the milestone takes longer than `timeout`.
+    """
+    if wait == 'none':
+        future = cdp.send_nowait('Page.navigate', {'url': url}, session_id)
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return
+    milestone = LIFECYCLE_MILESTONES.get(wait)
+    # Lifecycle events can arrive before the Page.navigate reply that names their loader.
+    reached_loaders: set[str] = set()
+    current = {'loader_id': None}
+    reached = asyncio.Event()
+
+    def on_lifecycle(params: dict, event_session_id: Optional[str]) -> None:
+        if event_session_id != session_id or params.get('name') != milestone:
+            return
+        reached_loaders.add(params.get('loaderId'))
+        if current['loader_id'] in reached_loaders:
+            reached.set()
+
+    async def run() -> None:
+        result = await cdp.send('Page.navigate', {'url': url}, session_id)
+        if result.get('errorText'):
+            raise CDPError('Page.navigate', result['errorText'])
+        loader_id = result.get('loaderId')
+        if not milestone or not loader_id:
+            return  # commit, or a same-document navigation that loads nothing
+        current['loader_id'] = loader_id
+        if loader_id in reached_loaders:
+            return
+        await reached.wait()
+
+    if milestone:
+        await cdp.send('Page.enable', session_id=session_id)
+        await cdp.send('Page.setLifecycleEventsEnabled', {'enabled': True}, session_id)
+        cdp.on('Page.lifecycleEvent', on_lifecycle)
+    try:
+        await asyncio.wait_for(run(), timeout)
+    finally:
+        if milestone:
+            cdp.off('Page.lifecycleEvent', on_lifecycle)
+
+
+async def fetch_json(port: int, path: str, timeout: float = 1.0) -> Any:
+    """GET a DevTools HTTP endpoint (/json, /json/version) without blocking the loop."""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nConnection: close\r\n\r\n'.encode('ascii'))
+        await writer.drain()
+        raw = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    head, _, body = raw.partition(b'\r\n\r\n')
+    if b' 200 ' not in head.split(b'\r\n', 1)[0] + b' ':
+        raise ConnectionError(f'DevTools endpoint {path} answered {head[:40]!r}')
+    return json.loads(body)
+
+
+async def wait_for_page_target(port: int, timeout: float) -> dict:
+    """Polls /json until the browser on `port` lists a page target; returns /json/version."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        try:
+            targets = await fetch_json(port, '/json')
+            if any(target.get('type') in ('page', 'webview') for target in targets):
+                return await fetch_json(port, '/json/version')
+        except (OSError, ValueError, asyncio.TimeoutError):
+            pass
+        if loop.time() >= deadline:
+            raise TimeoutError(f'no DevTools endpoint on port {port} after {timeout:.0f}s')
+        await asyncio.sleep(0.1)
@@ -0,0 +1,216 @@
+"""
+Headless command-line entry point.
+
+    python -m app.cli list
+    python -m app.cli show <profile>
+    python -m app.cli launch <profile> [--url URL] [--detach]
+    python -m app.cli stop <profile|session_id>
+    python -m app.cli create <profile> [--adapter chromium|camoufox] [--from TEMPLATE]
+
+Nothing here may import PyQt6 or qfluentwidgets (directly or through
+app.workers / app.features / app.app_config): the point is to open a
+browser without paying for the GUI. Adapters are imported only by the
+commands that launch.
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+from typing import Optional
+
+import psutil
+
+from app.profile_utils import list_profile_entries
+from app.sessions import (
+    STOP_TIMEOUT_SECONDS,
+    BrowserSession,
+    load_session_records,
+    session_record,
+    terminate_process_tree,
+    update_session_records,
+)
+from app.spoofers.profile import (
+    BaseConfig,
+    build_default_profile_config,
+    get_profile_path,
+    get_user_data_dir,
+    load_profile,
+    save_profile,
+    update_extra_config,
+)
+
+def _fail(message: str) -> int:
+    print(f'error: {message}', file=sys.stderr)
+    return 1
+
+
+def _running_by_profile() -> dict[str, dict]:
+    return {record['profile_id']: record for record in load_session_records()}
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    running = _running_by_profile()
+    entries = list_profile_entries()
+    if args.json:
+        print(json.dumps([
+            {'id': entry['id'], 'display': entry['display'], 'running': entry['id'] in running}
+            for entry in entries
+        ], ensure_ascii=False, indent=2), file=args.out)
+        return 0
+    for entry in entries:
+        marker = '*' if entry['id'] in running else ' '
+        print(f'{marker} {entry["id"]}\t{entry["display"]}', file=args.out)
+    return 0
+
+
+def cmd_show(args: argparse.Namespace) -> int:
+    profile = load_profile(args.profile)
+    if not profile:
+        return _fail(f'profile {args.profile!r} not found')
+    print(json.dumps(profile.to_dict(), ensure_ascii=False, indent=2), file=args.out)
+    return 0
+
+
+def cmd_create(args: argparse.Namespace) -> int:
+    if get_profile_path(args.profile).exists():
+        return _fail(f'profile {args.profile!r} already exists')
+    seed_from = None
+    if args.template:
+        template = load_profile(args.template)
+        if not template:
+            return _fail(f'template profile {args.template!r} not found')
+        profile = build_default_profile_config(args.profile, template=template)
+        seed_from = get_user_data_dir(template.base_config)
+    else:
+        profile = build_default_profile_config(args.profile, adapter_id=args.adapter)
+    if not save_profile(args.profile, profile, seed_from=seed_from):
+        return _fail(f'could not save profile {args.profile!r}')
+    print(args.profile, file=args.out)
+    return 0
+
+
+def _wait_for_exit(session: BrowserSession) -> None:
+    if not session.pid:
+        # Without a pid only the handle can tell (shared-process contexts); otherwise wait until interrupted.
+        is_alive = getattr(session.handle, 'is_alive', None)
+        while is_alive is None or is_alive():
+            time.sleep(1)
+        return
+    try:
+        psutil.Process(session.pid).wait()
+    except psutil.Error:
+        pass
+
+
+def cmd_launch(args: argparse.Namespace) -> int:
+    profile = load_profile(args.profile)
+    if not profile:
+        return _fail(f'profile {args.profile!r} not found')
+    if args.profile in _running_by_profile():
+        return _fail(f'profile {args.profile!r} is already running')
+    base = BaseConfig.from_dict(profile.base_config.to_dict(), args.profile)
+    if args.url:
+        base.target_url = args.url
+    if args.browser_path:
+        base.browser_path = args.browser_path
+    shared = bool((profile.extra_config or {}).get('shared_process'))
+    if args.detach and (base.adapter_id != 'chromium' or base.ephemeral or shared):
+        # Camoufox dies with its Playwright driver, ephemeral dirs need on_exit and shared-process
+        # contexts lose their spoofing with this process's DevTools connection, so all need it alive.
+        return _fail('--detach is only supported for non-ephemeral, non-shared chromium profiles')
+
+    from app.adapters.registry import get_adapter
+
+    adapter = get_adapter(base.adapter_id)
+    errors = adapter.validate(base, profile.extra_config or {})
+    if errors:
+        return _fail(f'{errors[0].key}: {errors[0].message}')
+    try:
+        result = adapter.launch(base, profile.extra_config or {})
+    except Exception as exc:
+        return _fail(f'launch failed: {exc}')
+    update_extra_config(args.profile, result.profile_updates)
+    session = BrowserSession(
+        session_id=f'cli-{int(time.time() * 1000):x}',
+        profile_id=args.profile,
+        adapter_id=base.adapter_id,
+        handle=result.page,
+        pid=result.pid,
+        debug_port=result.debug_port,
+        user_data_dir=result.user_data_dir,
+    )
+    update_session_records([session_record(session)])
+    print(json.dumps({'session_id': session.session_id, 'pid': session.pid, 'debug_port': session.debug_port}), file=args.out)
+    args.out.flush()
+    if args.detach:
+        return 0
+
+    try:
+        _wait_for_exit(session)
+    except KeyboardInterrupt:
+        try:
+            result.page.quit()
+        except Exception:
+            pass
+    finally:
+        if result.on_exit:
+            result.on_exit()
+        update_session_records(remove=[session.session_id])
+    return 0
+
+
+def cmd_stop(args: argparse.Namespace) -> int:
+    records = load_session_records()
+    matches = [r for r in records if args.target in (r.get('session_id'), r.get('profile_id'))]
+    if not matches:
+        return _fail(f'no running session for {args.target!r}')
+    for record in matches:
+        terminate_process_tree(int(record['pid']), args.timeout)
+        print(record['session_id'], file=args.out)
+    update_session_records(remove=[record['session_id'] for record in matches])
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m app.cli', description='UselessBrowser without the GUI')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_list = sub.add_parser('list', help='list profiles (* = running)')
+    p_list.add_argument('--json', action='store_true', help='print JSON instead of a table')
+    p_list.set_defaults(func=cmd_list)
+
+    p_show = sub.add_parser('show', help='print a profile as JSON')
+    p_show.add_argument('profile')
+    p_show.set_defaults(func=cmd_show)
+
+    p_launch = sub.add_parser('launch', help='launch a profile and wait for the browser to exit')
+    p_launch.add_argument('profile')
+    p_launch.add_argument('--url', help='open this URL instead of the profile target URL')
+    p_launch.add_argument('--browser-path', help='browser executable to use')
+    p_launch.add_argument('--detach', action='store_true', help='return right away and leave the browser running')
+    p_launch.set_defaults(func=cmd_launch)
+
+    p_stop = sub.add_parser('stop', help='stop a recorded browser session')
+    p_stop.add_argument('target', help='profile id or session id')
+    p_stop.add_argument('--timeout', type=float, default=STOP_TIMEOUT_SECONDS)
+    p_stop.set_defaults(func=cmd_stop)
+
+    p_create = sub.add_parser('create', help='create a profile')
+    p_create.add_argument('profile')
+    p_create.add_argument('--adapter', default='chromium', choices=['chromium', 'camoufox'])
+    p_create.add_argument('--from', dest='template', help='clone config and user-data skeleton from this profile')
+    p_create.set_defaults(func=cmd_create)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    args.out = sys.stdout
+    # The shared modules log with print(); keep that on stderr so stdout stays parseable.
+    with contextlib.redirect_stdout(sys.stderr):
+        return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
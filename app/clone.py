@@ -0,0 +1,196 @@
+import errno
+import os
+import shutil
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.storage import LOCK_FILE_NAMES, find_cache_dirs
+
+# Per-site and per-identity state that must never be shared between profiles.
+# Matched by name at any depth; SQLite side files (-journal, -wal, -shm) follow their database.
+IDENTITY_NAMES = {
+    # Chromium
+    'Cookies',
+    'Network',
+    'Login Data',
+    'Login Data For Account',
+    'Web Data',
+    'Account Web Data',
+    'History',
+    'Visited Links',
+    'Top Sites',
+    'Favicons',
+    'Shortcuts',
+    'Network Action Predictor',
+    'Sessions',
+    'Session Storage',
+    'Local Storage',
+    'IndexedDB',
+    'Service Worker',
+    'File System',
+    'WebStorage',
+    'databases',
+    'blob_storage',
+    'shared_proto_db',
+    'Sync Data',
+    'GCM Store',
+    'Trust Tokens',
+    'SharedStorage',
+    'DIPS',
+    'MediaDeviceSalts',
+    'Affiliation Database',
+    'Platform Notifications',
+    'Crashpad',
+    'BrowserMetrics',
+    # Firefox / Camoufox
+    'cookies.sqlite',
+    'places.sqlite',
+    'favicons.sqlite',
+    'formhistory.sqlite',
+    'webappsstore.sqlite',
+    'logins.json',
+    'key4.db',
+    'storage',
+    'sessionstore.jsonlz4',
+    'sessionstore-backups',
+    'datareporting',
+    'crashes',
+    'minidumps',
+}
+SQLITE_SIDE_SUFFIXES = ('-journal', '-wal', '-shm')
+
+# Component data Chromium only ever replaces by writing a new versioned dir,
+# so a hardlink can never see another profile's writes.
+HARDLINK_SAFE_DIRS = {
+    'WidevineCdm',
+    'hyphen-data',
+    'ZxcvbnData',
+    'Subresource Filter',
+    'CertificateRevocation',
+    'FileTypePolicies',
+    'OriginTrials',
+    'SSLErrorAssistant',
+    'TrustTokenKeyCommitments',
+    'MEIPreload',
+    'PKIMetadata',
+    'FirstPartySetsPreloaded',
+    'Crowd Deny',
+    'AutofillStates',
+    'ClientSidePhishing',
+    'OnDeviceHeadSuggestModel',
+    'optimization_guide_model_store',
+}
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+
+@dataclass
+class CloneStats:
+    files: int = 0
+    bytes: int = 0
+    reflinked: int = 0
+    hardlinked: int = 0
+    copied: int = 0
+
+
+def is_identity_path(name: str) -> bool:
+    if name in IDENTITY_NAMES:
+        return True
+    for suffix in SQLITE_SIDE_SUFFIXES:
+        if name.endswith(suffix) and name[: -len(suffix)] in IDENTITY_NAMES:
+            return True
+    return False
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Copy-on-write clone (btrfs, XFS, bcachefs...). Returns False when the filesystem cannot do it."""
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl  # POSIX-only, so not imported at module level
+
+    with src.open('rb') as fsrc, dst.open('wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError as exc:
+            if exc.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EBADF):
+                fdst.close()
+                dst.unlink(missing_ok=True)
+                return False
+            raise
+    shutil.copystat(src, dst)
+    return True
+
+
+class _Cloner:
+    def __init__(self, src_root: Path, dst_root: Path):
+        self.src_root = src_root
+        self.dst_root = dst_root
+        self.stats = CloneStats()
+        self.skipped = {path.resolve() for path in find_cache_dirs(src_root)}
+        self.can_reflink = True
+        self.can_hardlink = True
+
+    def run(self) -> CloneStats:
+        self.dst_root.mkdir(parents=True, exist_ok=True)
+        self._copy_dir(self.src_root, self.dst_root, hardlink_ok=False)
+        return self.stats
+
+    def _copy_dir(self, src_dir: Path, dst_dir: Path, hardlink_ok: bool) -> None:
+        try:
+            entries = list(os.scandir(src_dir))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_symlink() or entry.name in LOCK_FILE_NAMES or is_identity_path(entry.name):
+                continue
+            src = Path(entry.path)
+            dst = dst_dir / entry.name
+            if entry.is_dir():
+                if src.resolve() in self.skipped:
+                    continue
+                dst.mkdir(exist_ok=True)
+                self._copy_dir(src, dst, hardlink_ok or (src_dir == self.src_root and entry.name in HARDLINK_SAFE_DIRS))
+            elif entry.is_file():
+                self._copy_file(src, dst, hardlink_ok)
+
+    def _copy_file(self, src: Path, dst: Path, hardlink_ok: bool) -> None:
+        size = src.stat().st_size
+        if self.can_reflink:
+            if _reflink(src, dst):
+                self.stats.reflinked += 1
+                self._count(size)
+                return
+            self.can_reflink = False
+        if hardlink_ok and self.can_hardlink:
+            try:
+                os.link(src, dst)
+                self.stats.hardlinked += 1
+                self._count(size)
+                return
+            except OSError:
+                self.can_hardlink = False
+        # copyfile uses sendfile()/fcopyfile() where available, so data stays in the kernel.
+        shutil.copyfile(src, dst)
+        shutil.copystat(src, dst)
+        self.stats.copied += 1
+        self._count(size)
+
+    def _count(self, size: int) -> None:
+        self.stats.files += 1
+        self.stats.bytes += size
+
+
+def clone_user_data_dir(src: Path, dst: Path) -> CloneStats:
+    """
+    Copies a user-data dir as a cache-free, identity-free skeleton: first-run
+    state, preferences, extensions and downloaded components are kept;
+    caches, cookies, storage, history and lock files are not.
+
+    Files are reflinked where the filesystem supports it; read-only
+    component dirs fall back to hardlinks, everything else to a plain copy.
+    """
+    if dst.exists() and any(dst.iterdir()):
+        raise FileExistsError(f'{dst} already exists and is not empty')
+    return _Cloner(src, dst).run()
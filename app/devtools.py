@@ -0,0 +1,21 @@
+import json
+import urllib.request
+from typing import Optional
+
+
+def fetch_version(debug_port: Optional[int], timeout: float = 1.0) -> Optional[dict]:
+    """GET /json/version of a Chromium DevTools endpoint; None when nothing answers on the port."""
+    if not debug_port:
+        return None
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{debug_port}/json/version', timeout=timeout) as resp:
+            data = json.loads(resp.read())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def fetch_ws_endpoint(debug_port: Optional[int], timeout: float = 2.0) -> Optional[str]:
+    """The browser-level DevTools websocket URL of a Chromium started with a debugging port."""
+    version = fetch_version(debug_port, timeout)
+    return version.get('webSocketDebuggerUrl') if version else None
@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+import psutil
+
+from app.spoofers.profile import BaseConfig, get_user_data_dir
+from app.trash import dir_size
+
+RAM_DIR_ENV = 'USELESSBROWSER_RAM_DIR'
+RAM_DIR_PREFIX = 'uselessbrowser-'
+OWNER_FILE_NAME = '.owner'
+
+
+def get_ram_root() -> Path:
+    """
+    Where ephemeral user-data dirs live: $USELESSBROWSER_RAM_DIR, then
+    /dev/shm, then $XDG_RUNTIME_DIR (tmpfs on systemd hosts). Falls back to
+    the temp dir, which may be disk-backed.
+    """
+    candidates = [os.environ.get(RAM_DIR_ENV), '/dev/shm', os.environ.get('XDG_RUNTIME_DIR')]
+    for candidate in candidates:
+        if candidate and os.path.isdir(candidate) and os.access(candidate, os.W_OK):
+            return Path(candidate)
+    print('[PROFILE] No RAM-backed directory found, ephemeral profiles fall back to the temp dir')
+    return Path(tempfile.gettempdir())
+
+
+def _copy_path(src: Path, dst: Path) -> None:
+    """Copies a file or dir over `dst`, swapping it in as late as possible so a crash never leaves half a copy."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    staging = dst.with_name(f'{dst.name}.sync-tmp')
+    if staging.is_dir():
+        shutil.rmtree(staging, ignore_errors=True)
+    if src.is_dir():
+        shutil.copytree(src, staging, symlinks=True)
+        if dst.is_dir():
+            retired = dst.with_name(f'{dst.name}.sync-old')
+            shutil.rmtree(retired, ignore_errors=True)
+            os.replace(dst, retired)
+            os.replace(staging, dst)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, dst)
+    else:
+        shutil.copy2(src, staging)
+        os.replace(staging, dst)
+
+
+class EphemeralUserDataDir:
+    """
+    A user-data dir on tmpfs for one browser session.
+
+    `sync_paths` (relative to the user-data dir, e.g. 'Default/Cookies') are
+    seeded from the profile's persistent dir before launch and copied back
+    by close(); everything else is thrown away.
+    """
+
+    def __init__(self, path: Path, persistent_dir: Path, sync_paths: list[str]):
+        self.path = path
+        self.persistent_dir = persistent_dir
+        self.sync_paths = sync_paths
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, base_config: BaseConfig, root: Optional[Path] = None) -> 'EphemeralUserDataDir':
+        root = root or get_ram_root()
+        safe_id = ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in base_config.profile_id)
+        path = Path(tempfile.mkdtemp(prefix=f'{RAM_DIR_PREFIX}{safe_id}-', dir=root))
+        (path / OWNER_FILE_NAME).write_text(str(os.getpid()), encoding='utf-8')
+        ram_dir = cls(path, get_user_data_dir(base_config), list(base_config.ephemeral_sync))
+        ram_dir.seed()
+        return ram_dir
+
+    @classmethod
+    def adopt(cls, path: Path, base_config: BaseConfig) -> Optional['EphemeralUserDataDir']:
+        """
+        Takes over the RAM dir of a browser that outlived the app process
+        which created it, so sweep_stale_ram_dirs() leaves it alone and
+        close() still syncs back. Returns None if `path` is not a RAM dir.
+        """
+        owner_file = path / OWNER_FILE_NAME
+        if not path.name.startswith(RAM_DIR_PREFIX) or not owner_file.is_file():
+            return None
+        owner_file.write_text(str(os.getpid()), encoding='utf-8')
+        return cls(path, get_user_data_dir(base_config), list(base_config.ephemeral_sync))
+
+    def seed(self) -> None:
+        for rel in self.sync_paths:
+            src = self.persistent_dir / rel
+            if src.exists():
+                _copy_path(src, self.path / rel)
+
+    def sync_back(self) -> None:
+        for rel in self.sync_paths:
+            src = self.path / rel
+            if not src.exists():
+                continue
+            try:
+                _copy_path(src, self.persistent_dir / rel)
+            except OSError as exc:
+                print(f'[PROFILE] Failed to sync {rel} back to {self.persistent_dir}: {exc}')
+
+    def close(self) -> None:
+        """Syncs the chosen paths back and deletes the RAM dir. Safe to call more than once."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self.sync_back()
+        finally:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+
+def sweep_stale_ram_dirs(root: Optional[Path] = None) -> int:
+    """Removes ephemeral dirs whose owning app process is gone (e.g. after a crash); returns bytes reclaimed."""
+    root = root or get_ram_root()
+    reclaimed = 0
+    for entry in root.glob(f'{RAM_DIR_PREFIX}*'):
+        if not entry.is_dir():
+            continue
+        try:
+            owner = int((entry / OWNER_FILE_NAME).read_text(encoding='utf-8').strip())
+        except (OSError, ValueError):
+            continue
+        if owner == os.getpid() or psutil.pid_exists(owner):
+            continue
+        size = dir_size(entry)
+        shutil.rmtree(entry, ignore_errors=True)
+        if not entry.exists():
+            reclaimed += size
+    return reclaimed
@@ -0,0 +1,460 @@
+"""
+A local stand-in for Chrome's DevTools endpoint, for tests and benchmarks.
+
+FakeDevTools serves the HTTP discovery endpoints (/json/version, /json,
+/json/new, ...) and browser- and page-level websockets on one port, and
+answers enough of CDP for app.cdp and DrissionPage to attach, spoof and
+navigate: Target.*, Page.*, Emulation.*, Runtime.evaluate and friends.
+Unknown methods get an empty result, like most setters in Chrome.
+
+Every command is recorded in order (FakeDevTools.commands). Replies can be
+delayed per method to model the browser round trip and individual methods
+can be made to fail, so launch-path latency and command batching can be
+measured without a browser:
+
+    devtools = FakeDevTools(latency=0.005, failures={'Browser.setPermission': 'not allowed'})
+    port = devtools.serve_in_background()
+    page = ChromiumPage(f'127.0.0.1:{port}')
+    ...
+    devtools.stop()
+
+Replies on one connection keep their order, as Chrome's do; a latency of L
+therefore costs about L for a pipelined batch and L per command otherwise.
+"""
+import asyncio
+import itertools
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, NamedTuple, Optional, Union
+from urllib.parse import unquote, urlsplit
+
+from app.cdp import OP_BINARY, OP_CLOSE, OP_CONTINUATION, OP_PING, OP_PONG, OP_TEXT, STREAM_LIMIT
+from app.cdp import encode_frame, read_frame, websocket_accept_key
+
+FAKE_BROWSER_VERSION = 'Chrome/131.0.6778.85'
+FAKE_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/131.0.6778.85 Safari/537.36'
+)
+ERROR_CODE = -32000
+START_TIMEOUT_SECONDS = 5.0
+
+
+class RecordedCommand(NamedTuple):
+    method: str
+    params: dict
+    session_id: Optional[str]
+    # Page target the command applies to; None for browser-level commands.
+    target_id: Optional[str]
+    received_at: float
+
+
+class FakeTarget:
+    def __init__(self, target_id: str, url: str = 'about:blank', context_id: str = 'default'):
+        self.target_id = target_id
+        self.url = url
+        self.title = url
+        self.context_id = context_id
+        self.frame_id = target_id
+        self.scripts: dict[str, str] = {}
+        self.overrides: dict[str, dict] = {}
+        self._loader_ids = itertools.count(1)
+
+    def info(self, port: int) -> dict:
+        return {
+            'targetId': self.target_id,
+            'id': self.target_id,
+            'type': 'page',
+            'title': self.title,
+            'url': self.url,
+            'attached': True,
+            'canAccessOpener': False,
+            'browserContextId': self.context_id,
+            'webSocketDebuggerUrl': f'ws://127.0.0.1:{port}/devtools/page/{self.target_id}',
+            'devtoolsFrontendUrl': f'/devtools/inspector.html?ws=127.0.0.1:{port}/devtools/page/{self.target_id}',
+        }
+
+    def next_loader_id(self) -> str:
+        return f'{self.target_id}-L{next(self._loader_ids)}'
+
+
+class _Connection:
+    """One websocket client; replies and events are written in order after their delay."""
+
+    def __init__(self, writer: asyncio.StreamWriter, target: Optional[FakeTarget]):
+        self.writer = writer
+        self.target = target
+        self.sessions: dict[str, FakeTarget] = {}
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        self.sender = asyncio.create_task(self._send_loop())
+
+    def send(self, message: dict, delay: float = 0.0) -> None:
+        self.outbox.put_nowait((time.monotonic() + delay, message))
+
+    async def _send_loop(self) -> None:
+        while True:
+            due, message = await self.outbox.get()
+            wait = due - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                self.writer.write(encode_frame(OP_TEXT, json.dumps(message).encode('utf-8'), mask=False))
+                await self.writer.drain()
+            except ConnectionError:
+                return
+
+
+class FakeDevTools:
+    """
+    latency: seconds before each reply, or {method: seconds} with an optional
+    '*' default. failures: methods that answer with a CDP error, as a set or
+    {method: message}. handlers: {method: fn(params, target) -> result} to
+    script extra answers (e.g. a Runtime.evaluate value).
+    """
+
+    def __init__(
+        self,
+        latency: Union[float, dict[str, float]] = 0.0,
+        failures: Union[set, dict[str, str], None] = None,
+        handlers: Optional[dict[str, Callable[[dict, Optional[FakeTarget]], dict]]] = None,
+        page_count: int = 1,
+    ):
+        self.latency = latency
+        if isinstance(failures, dict):
+            self.failures = dict(failures)
+        else:
+            self.failures = {method: 'injected failure' for method in failures or ()}
+        self.handlers = dict(handlers or {})
+        self.browser_id = uuid.uuid4().hex
+        self.targets: dict[str, FakeTarget] = {}
+        self.commands: list[RecordedCommand] = []
+        self.port: Optional[int] = None
+        self._initial_pages = page_count
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set[_Connection] = set()
+        self._ids = itertools.count(1)
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # --- lifecycle -------------------------------------------------------
+
+    async def start(self, port: int = 0) -> int:
+        for _ in range(self._initial_pages):
+            self._new_target('about:blank')
+        self._server = await asyncio.start_server(self._handle_client, '127.0.0.1', port, limit=STREAM_LIMIT)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for connection in list(self._connections):
+            connection.sender.cancel()
+            connection.writer.close()
+        self._connections.clear()
+        await self._server.wait_closed()
+        self._server = None
+
+    def serve_in_background(self, port: int = 0) -> int:
+        """Runs the server on a private loop thread, for blocking clients such as DrissionPage."""
+        ready = threading.Event()
+        errors: list[BaseException] = []
+
+        def main() -> None:
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            try:
+                loop.run_until_complete(self.start(port))
+            except BaseException as exc:
+                errors.append(exc)
+                ready.set()
+                return
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self.close())
+            loop.close()
+
+        self._thread = threading.Thread(target=main, name='fake-devtools', daemon=True)
+        self._thread.start()
+        if not ready.wait(START_TIMEOUT_SECONDS):
+            raise RuntimeError('fake DevTools server did not start in time')
+        if errors:
+            raise errors[0]
+        return self.port
+
+    def stop(self) -> None:
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(START_TIMEOUT_SECONDS)
+            self._thread = None
+
+    @property
+    def ws_url(self) -> str:
+        return f'ws://127.0.0.1:{self.port}/devtools/browser/{self.browser_id}'
+
+    def methods(self) -> list[str]:
+        return [command.method for command in self.commands]
+
+    # --- transport -------------------------------------------------------
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        parts = head[0].split(' ')
+        path = parts[1] if len(parts) > 1 else '/'
+        headers = {}
+        for line in head[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if headers.get('upgrade', '').lower() == 'websocket':
+            await self._serve_websocket(reader, writer, path, headers.get('sec-websocket-key', ''))
+        else:
+            self._serve_http(writer, path)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    def _serve_http(self, writer: asyncio.StreamWriter, raw_path: str) -> None:
+        parts = urlsplit(raw_path)
+        path = parts.path.rstrip('/')
+        status, body = '200 OK', None
+        if path == '/json/version':
+            body = {
+                'Browser': FAKE_BROWSER_VERSION,
+                'Protocol-Version': '1.3',
+                'User-Agent': FAKE_USER_AGENT,
+                'V8-Version': '13.1.201.13',
+                'WebKit-Version': '537.36',
+                'webSocketDebuggerUrl': self.ws_url,
+            }
+        elif path in ('/json', '/json/list'):
+            body = [target.info(self.port) for target in reversed(list(self.targets.values()))]
+        elif path == '/json/new':
+            body = self._new_target(unquote(parts.query) or 'about:blank').info(self.port)
+        elif path.startswith('/json/close/'):
+            target = self.targets.pop(path.rsplit('/', 1)[-1], None)
+            body = 'Target is closing' if target else None
+            if target is None:
+                status = '404 Not Found'
+        elif path.startswith('/json/activate/'):
+            body = 'Target activated' if path.rsplit('/', 1)[-1] in self.targets else None
+            if body is None:
+                status = '404 Not Found'
+        else:
+            status = '404 Not Found'
+        payload = (body if isinstance(body, str) else json.dumps(body)).encode('utf-8') if body is not None else b''
+        writer.write(
+            (
+                f'HTTP/1.1 {status}\r\nContent-Type: application/json; charset=UTF-8\r\n'
+                f'Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n'
+            ).encode('ascii')
+            + payload
+        )
+
+    async def _serve_websocket(self, reader, writer, path: str, key: str) -> None:
+        target = None
+        if path.startswith('/devtools/page/'):
+            target = self.targets.get(path.rsplit('/', 1)[-1])
+            if target is None:
+                writer.write(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n')
+                writer.close()
+                return
+        elif not path.startswith('/devtools/browser/'):
+            writer.write(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n')
+            writer.close()
+            return
+        writer.write(
+            (
+                'HTTP/1.1 101 WebSocket Protocol Handshake\r\nUpgrade: WebSocket\r\nConnection: Upgrade\r\n'
+                f'Sec-WebSocket-Accept: {websocket_accept_key(key)}\r\n\r\n'
+            ).encode('ascii')
+        )
+        connection = _Connection(writer, target)
+        self._connections.add(connection)
+        buffer = bytearray()
+        try:
+            while True:
+                fin, opcode, payload = await read_frame(reader)
+                if opcode == OP_PING:
+                    writer.write(encode_frame(OP_PONG, payload, mask=False))
+                    continue
+                if opcode == OP_CLOSE:
+                    writer.write(encode_frame(OP_CLOSE, b'', mask=False))
+                    break
+                if opcode in (OP_TEXT, OP_BINARY, OP_CONTINUATION):
+                    buffer += payload
+                    if fin:
+                        self._on_message(connection, bytes(buffer))
+                        buffer.clear()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # Let queued replies go out before the socket closes.
+            while not connection.outbox.empty() and not connection.sender.done():
+                await asyncio.sleep(0.001)
+            connection.sender.cancel()
+            self._connections.discard(connection)
+            writer.close()
+
+    # --- protocol --------------------------------------------------------
+
+    def _delay(self, method: str) -> float:
+        if isinstance(self.latency, dict):
+            return float(self.latency.get(method, self.latency.get('*', 0.0)))
+        return float(self.latency)
+
+    def _on_message(self, connection: _Connection, raw: bytes) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        method = message.get('method', '')
+        params = message.get('params') or {}
+        session_id = message.get('sessionId')
+        target = connection.sessions.get(session_id) if session_id else connection.target
+        self.commands.append(RecordedCommand(method, params, session_id, target.target_id if target else None, time.monotonic()))
+        reply: dict[str, Any] = {'id': message.get('id')}
+        if session_id:
+            reply['sessionId'] = session_id
+        events: list[dict] = []
+        if session_id and target is None:
+            reply['error'] = {'code': ERROR_CODE, 'message': f'Session with given id not found: {session_id}'}
+        elif method in self.failures:
+            reply['error'] = {'code': ERROR_CODE, 'message': self.failures[method]}
+        else:
+            try:
+                reply['result'] = self._handle(connection, method, params, target, events)
+            except KeyError as exc:
+                reply['error'] = {'code': ERROR_CODE, 'message': f'No target with given id {exc}'}
+        delay = self._delay(method)
+        connection.send(reply, delay)
+        for event in events:
+            if session_id:
+                event['sessionId'] = session_id
+            connection.send(event, delay)
+
+    def _handle(self, connection: _Connection, method: str, params: dict, target: Optional[FakeTarget], events: list) -> dict:
+        if method in self.handlers:
+            return self.handlers[method](params, target)
+        if method == 'Browser.getVersion':
+            return {
+                'protocolVersion': '1.3',
+                'product': FAKE_BROWSER_VERSION,
+                'revision': '@0',
+                'userAgent': FAKE_USER_AGENT,
+                'jsVersion': '13.1.201.13',
+            }
+        if method == 'SystemInfo.getProcessInfo':
+            return {'processInfo': [{'type': 'browser', 'id': 0, 'cpuTime': 0}]}
+        if method == 'Target.getTargets':
+            return {'targetInfos': [t.info(self.port) for t in self.targets.values()]}
+        if method == 'Target.getTargetInfo':
+            chosen = self.targets[params['targetId']] if params.get('targetId') else target
+            if chosen is None:
+                return {'targetInfo': {'targetId': self.browser_id, 'type': 'browser', 'title': '', 'url': '', 'attached': True}}
+            return {'targetInfo': chosen.info(self.port)}
+        if method == 'Target.attachToTarget':
+            session_id = uuid.uuid4().hex.upper()
+            connection.sessions[session_id] = self.targets[params['targetId']]
+            return {'sessionId': session_id}
+        if method == 'Target.detachFromTarget':
+            connection.sessions.pop(params.get('sessionId'), None)
+            return {}
+        if method == 'Target.createBrowserContext':
+            return {'browserContextId': f'ctx{next(self._ids)}'}
+        if method == 'Target.createTarget':
+            created = self._new_target(params.get('url') or 'about:blank', params.get('browserContextId') or 'default')
+            events.append({'method': 'Target.targetCreated', 'params': {'targetInfo': created.info(self.port)}})
+            return {'targetId': created.target_id}
+        if method == 'Target.closeTarget':
+            self.targets.pop(params['targetId'])
+            events.append({'method': 'Target.targetDestroyed', 'params': {'targetId': params['targetId']}})
+            return {'success': True}
+        if method == 'Target.disposeBrowserContext':
+            for target_id in [t.target_id for t in self.targets.values() if t.context_id == params.get('browserContextId')]:
+                self.targets.pop(target_id)
+                events.append({'method': 'Target.targetDestroyed', 'params': {'targetId': target_id}})
+            return {}
+        if method == 'Browser.getWindowForTarget':
+            return {'windowId': 1, 'bounds': {'left': 0, 'top': 0, 'width': 1280, 'height': 800, 'windowState': 'normal'}}
+        if target is None:
+            return {}
+        if method == 'Page.addScriptToEvaluateOnNewDocument':
+            identifier = str(next(self._ids))
+            target.scripts[identifier] = params.get('source', '')
+            return {'identifier': identifier}
+        if method.startswith('Emulation.set') and method.endswith('Override'):
+            target.overrides[method] = params
+            return {}
+        if method == 'Page.getFrameTree':
+            return {'frameTree': {'frame': self._frame(target)}}
+        if method == 'Page.getNavigationHistory':
+            return {'currentIndex': 0, 'entries': [{'id': 1, 'url': target.url, 'userTypedURL': target.url, 'title': target.title, 'transitionType': 'typed'}]}
+        if method == 'Page.navigate':
+            return self._navigate(target, params.get('url', 'about:blank'), events)
+        if method == 'Runtime.evaluate':
+            return {'result': self._evaluate(target, params.get('expression', ''))}
+        if method == 'Runtime.callFunctionOn':
+            return {'result': {'type': 'undefined'}}
+        if method == 'DOM.getDocument':
+            return {'root': {'nodeId': 1, 'backendNodeId': 1, 'nodeType': 9, 'nodeName': '#document', 'localName': '', 'nodeValue': '', 'childNodeCount': 1, 'documentURL': target.url, 'baseURL': target.url}}
+        if method == 'DOM.resolveNode':
+            return {'object': {'type': 'object', 'subtype': 'node', 'className': 'HTMLDocument', 'objectId': f'{target.target_id}.document'}}
+        if method == 'DOM.getOuterHTML':
+            return {'outerHTML': '<html><head></head><body></body></html>'}
+        return {}
+
+    def _frame(self, target: FakeTarget) -> dict:
+        return {
+            'id': target.frame_id,
+            'loaderId': f'{target.target_id}-L0',
+            'url': target.url,
+            'domainAndRegistry': '',
+            'securityOrigin': target.url,
+            'mimeType': 'text/html',
+            'adFrameStatus': {'adFrameType': 'none'},
+            'secureContextType': 'Secure',
+            'crossOriginIsolatedContextType': 'NotIsolated',
+            'gatedAPIFeatures': [],
+        }
+
+    def _navigate(self, target: FakeTarget, url: str, events: list) -> dict:
+        loader_id = target.next_loader_id()
+        target.url = target.title = url
+        frame = {'frameId': target.frame_id}
+        now = time.time()
+        events.append({'method': 'Page.frameStartedLoading', 'params': frame})
+        events.append({'method': 'Page.frameNavigated', 'params': {'frame': self._frame(target), 'type': 'Navigation'}})
+        for name in ('init', 'DOMContentLoaded', 'load'):
+            events.append({'method': 'Page.lifecycleEvent', 'params': {**frame, 'loaderId': loader_id, 'name': name, 'timestamp': now}})
+            if name == 'DOMContentLoaded':
+                events.append({'method': 'Page.domContentEventFired', 'params': {'timestamp': now}})
+        events.append({'method': 'Page.loadEventFired', 'params': {'timestamp': now}})
+        events.append({'method': 'Page.frameStoppedLoading', 'params': frame})
+        return {'frameId': target.frame_id, 'loaderId': loader_id}
+
+    def _evaluate(self, target: FakeTarget, expression: str) -> dict:
+        expression = expression.strip()
+        if 'readyState' in expression:
+            return {'type': 'string', 'value': 'complete'}
+        if expression in ('location.href', 'window.location.href', 'document.URL'):
+            return {'type': 'string', 'value': target.url}
+        if expression == 'document.title':
+            return {'type': 'string', 'value': target.title}
+        if 'navigator.userAgent' in expression:
+            override = target.overrides.get('Emulation.setUserAgentOverride', {})
+            return {'type': 'string', 'value': override.get('userAgent', FAKE_USER_AGENT)}
+        return {'type': 'undefined'}
+
+    def _new_target(self, url: str, context_id: str = 'default') -> FakeTarget:
+        target = FakeTarget(uuid.uuid4().hex.upper(), url, context_id)
+        self.targets[target.target_id] = target
+        return target
@@ -0,0 +1,111 @@
+from PyQt6 import QtCore, QtWidgets
+from qfluentwidgets import InfoBar, InfoBarPosition
+
+from app.api_server import ApiServer, generate_token
+from app.launcher import RemoteSessionRegistry
+from app.sessions import BrowserSession
+from app.spoofers.profile import merge_extra_config
+
+
+class ApiEventBridge(QtCore.QObject):
+    """Carries session changes made by API requests from the server thread to the GUI thread."""
+
+    session_changed = QtCore.pyqtSignal(object)
+
+
+class ApiMixin:
+    def _init_api_server(self) -> None:
+        self._api_events = ApiEventBridge(self)
+        self._api_events.session_changed.connect(self._on_api_session_changed)
+        if self._api_enabled:
+            self._start_api_server()
+        self._update_api_status()
+
+    def _start_api_server(self) -> bool:
+        if self._api_server and self._api_server.is_running():
+            return True
+        if not self._api_token:
+            self._api_token = generate_token()
+            self._save_app_settings()
+        server = ApiServer(
+            self._session_registry,
+            self._api_token,
+            port=self._api_port,
+            browser_resolver=self._resolve_browser_path,
+            on_session_changed=self._api_events.session_changed.emit,
+            # With the launcher process, API launches are forwarded to it like the GUI's own.
+            launch_fn=self._session_registry.launch if isinstance(self._session_registry, RemoteSessionRegistry) else None,
+        )
+        try:
+            server.start()
+        except Exception as exc:
+            self._log(f'Local API failed to start on port {self._api_port}: {exc}')
+            InfoBar.error(
+                title=self._t('info_api_failed_title'),
+                content=str(exc),
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return False
+        self._api_server = server
+        self._log(f'Local API listening on {server.url}')
+        return True
+
+    def _stop_api_server(self) -> None:
+        server, self._api_server = self._api_server, None
+        if server:
+            server.stop()
+
+    def _on_api_enabled_changed(self, checked: bool) -> None:
+        self._api_enabled = checked
+        if checked:
+            if not self._start_api_server():
+                self._api_enabled = False
+                self.api_enabled_switch.blockSignals(True)
+                self.api_enabled_switch.setChecked(False)
+                self.api_enabled_switch.blockSignals(False)
+        else:
+            self._stop_api_server()
+        self._save_app_settings()
+        self._update_api_status()
+
+    def _on_api_port_changed(self) -> None:
+        port = self.api_port_spin.value()
+        if port == self._api_port:
+            return
+        self._api_port = port
+        self._save_app_settings()
+        if self._api_server:
+            self._stop_api_server()
+            self._start_api_server()
+        self._update_api_status()
+
+    def _copy_api_token(self) -> None:
+        if not self._api_token:
+            self._api_token = generate_token()
+            self._save_app_settings()
+            self._update_api_status()
+        QtWidgets.QApplication.clipboard().setText(self._api_token)
+        InfoBar.success(
+            title=self._t('info_api_token_copied_title'),
+            content='',
+            parent=self,
+            position=InfoBarPosition.TOP,
+        )
+
+    def _update_api_status(self) -> None:
+        if getattr(self, 'api_status_value', None) is None:
+            return
+        self.api_token_input.setText(self._api_token)
+        if self._api_server and self._api_server.is_running():
+            self.api_status_value.setText(self._t('api_status_running').format(url=self._api_server.url))
+        else:
+            self.api_status_value.setText(self._t('api_status_stopped'))
+
+    def _on_api_session_changed(self, session: BrowserSession) -> None:
+        if session.profile_updates and session.profile_id == self._current_profile_id and self._current_profile:
+            # Already saved by the server or the launcher; the open profile must not drop them on its next save.
+            merge_extra_config(self._current_profile, session.profile_updates)
+        if not session.is_live:
+            self._on_session_ended(session)
+        self._refresh_sessions_view()
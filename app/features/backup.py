@@ -0,0 +1,205 @@
+import datetime
+from typing import Optional
+
+from PyQt6 import QtWidgets
+from qfluentwidgets import InfoBar, InfoBarPosition, MessageBox
+
+from app.backup import BackupRepository, BackupStats
+from app.features.sessions import format_bytes
+from app.spoofers.profile import load_profile
+from app.workers import BackupPruneWorker, BackupWorker, RestoreWorker
+
+
+class BackupMixin:
+    def _refresh_backup_snapshots(self) -> None:
+        combo = getattr(self, 'backup_snapshot_combo', None)
+        if combo is None:
+            return
+        current = combo.currentData()
+        combo.blockSignals(True)
+        combo.clear()
+        selected_index = 0
+        for idx, snapshot in enumerate(BackupRepository().list_snapshots()):
+            created = datetime.datetime.fromtimestamp(snapshot.created_at).strftime('%Y-%m-%d %H:%M')
+            combo.addItem(self._t('backup_snapshot_item').format(
+                created=created,
+                count=len(snapshot.profiles),
+                size=format_bytes(snapshot.total_bytes),
+            ))
+            combo.setItemData(idx, snapshot.snapshot_id)
+            if snapshot.snapshot_id == current:
+                selected_index = idx
+        if combo.count():
+            combo.setCurrentIndex(selected_index)
+        combo.blockSignals(False)
+        self._on_backup_snapshot_changed(combo.currentIndex())
+
+    def _on_backup_snapshot_changed(self, index: int) -> None:
+        self.backup_profile_combo.clear()
+        snapshot_id = self.backup_snapshot_combo.itemData(index) if index >= 0 else None
+        if snapshot_id:
+            for snapshot in BackupRepository().list_snapshots():
+                if snapshot.snapshot_id != snapshot_id:
+                    continue
+                for idx, profile_key in enumerate(sorted(snapshot.profiles)):
+                    self.backup_profile_combo.addItem(profile_key)
+                    self.backup_profile_combo.setItemData(idx, profile_key)
+                    if profile_key == self._current_profile_id:
+                        self.backup_profile_combo.setCurrentIndex(idx)
+                break
+        self._update_backup_buttons()
+
+    def _backup_busy(self) -> bool:
+        workers = (
+            getattr(self, '_backup_worker', None),
+            getattr(self, '_restore_worker', None),
+            getattr(self, '_backup_prune_worker', None),
+        )
+        return any(worker and worker.isRunning() for worker in workers)
+
+    def _update_backup_buttons(self, busy: Optional[bool] = None) -> None:
+        if getattr(self, 'backup_now_btn', None) is None:
+            return
+        if busy is None:
+            busy = self._backup_busy()
+        self.backup_now_btn.setEnabled(not busy)
+        self.backup_restore_btn.setEnabled(not busy and self.backup_profile_combo.count() > 0)
+        self.backup_delete_btn.setEnabled(not busy and self.backup_snapshot_combo.count() > 0)
+        self.backup_progress.setVisible(busy)
+
+    def _start_backup(self) -> None:
+        if self._backup_busy():
+            return
+        running = {session.profile_id for session in self._session_registry.live_sessions()}
+        profile_keys = None
+        if running:
+            # A running browser keeps rewriting its databases; back those profiles up once they are closed.
+            self._log(f'Backup skips running profiles: {", ".join(sorted(running))}')
+            profile_keys = [
+                path.stem for path in BackupRepository().profiles_dir.glob('*.json') if path.stem not in running
+            ]
+        self._backup_worker = BackupWorker(profile_keys)
+        self._backup_worker.progress.connect(self.backup_progress.setValue)
+        self._backup_worker.finished.connect(self._on_backup_finished)
+        self.backup_progress.setValue(0)
+        self._backup_worker.start()
+        self._update_backup_buttons(busy=True)
+
+    def _on_backup_finished(self, success: bool, stats: Optional[BackupStats], message: str) -> None:
+        # The worker thread may still be winding down when this slot runs.
+        self._update_backup_buttons(busy=False)
+        if not success or stats is None:
+            self._log(f'Backup failed: {message}')
+            InfoBar.error(
+                title=self._t('info_backup_failed_title'),
+                content=message,
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return
+        self._log(
+            f'Backup {stats.snapshot.snapshot_id}: {stats.files} files '
+            f'({stats.reused_files} unchanged), {stats.new_chunks} new chunks, {format_bytes(stats.stored_bytes)} written'
+        )
+        InfoBar.success(
+            title=self._t('info_backup_done_title'),
+            content=self._t('info_backup_done_body').format(
+                count=len(stats.snapshot.profiles),
+                size=format_bytes(stats.stored_bytes),
+            ),
+            parent=self,
+            position=InfoBarPosition.TOP,
+        )
+        self._refresh_backup_snapshots()
+
+    def _start_restore(self) -> None:
+        if self._backup_busy():
+            return
+        snapshot_id = self.backup_snapshot_combo.currentData()
+        profile_key = self.backup_profile_combo.currentData()
+        if not snapshot_id or not profile_key:
+            return
+        if self._session_registry.find_live_by_profile(profile_key):
+            InfoBar.warning(
+                title=self._t('info_restore_running_title'),
+                content=self._t('info_restore_running_body'),
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return
+        dialog = MessageBox(
+            self._t('confirm_restore_title'),
+            self._t('confirm_restore_body').format(profile_id=profile_key),
+            self,
+        )
+        if dialog.exec() != QtWidgets.QDialog.DialogCode.Accepted:
+            return
+        self._restore_worker = RestoreWorker(snapshot_id, profile_key)
+        self._restore_worker.progress.connect(self.backup_progress.setValue)
+        self._restore_worker.finished.connect(self._on_restore_finished)
+        self.backup_progress.setValue(0)
+        self._restore_worker.start()
+        self._update_backup_buttons(busy=True)
+
+    def _on_restore_finished(self, success: bool, restored: list, message: str) -> None:
+        self._update_backup_buttons(busy=False)
+        profile_key = self._restore_worker.profile_key if self._restore_worker else ''
+        if not success:
+            self._log(f'Restore of {profile_key} failed: {message}')
+            InfoBar.error(
+                title=self._t('info_restore_failed_title'),
+                content=message,
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return
+        self._log(f'Restored {profile_key}: {", ".join(str(path) for path in restored)}')
+        self.refresh_profiles()
+        if profile_key == self._current_profile_id:
+            self._set_profile_details(profile_key, load_profile(profile_key))
+        self._reap_trash()
+        InfoBar.success(
+            title=self._t('info_restore_done_title'),
+            content=self._t('info_restore_done_body').format(profile_id=profile_key),
+            parent=self,
+            position=InfoBarPosition.TOP,
+        )
+
+    def _start_backup_prune(self) -> None:
+        if self._backup_busy():
+            return
+        snapshot_id = self.backup_snapshot_combo.currentData()
+        if not snapshot_id:
+            return
+        dialog = MessageBox(
+            self._t('confirm_backup_delete_title'),
+            self._t('confirm_backup_delete_body').format(snapshot=self.backup_snapshot_combo.currentText()),
+            self,
+        )
+        if dialog.exec() != QtWidgets.QDialog.DialogCode.Accepted:
+            return
+        self._backup_prune_worker = BackupPruneWorker([snapshot_id])
+        self._backup_prune_worker.finished.connect(self._on_backup_prune_finished)
+        self._backup_prune_worker.start()
+        self._update_backup_buttons(busy=True)
+
+    def _on_backup_prune_finished(self, success: bool, freed: int, message: str) -> None:
+        self._update_backup_buttons(busy=False)
+        if not success:
+            self._log(f'Deleting backup snapshot failed: {message}')
+            InfoBar.error(
+                title=self._t('info_backup_delete_failed_title'),
+                content=message,
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return
+        snapshot_ids = self._backup_prune_worker.snapshot_ids if self._backup_prune_worker else []
+        self._log(f'Deleted backup snapshot {", ".join(snapshot_ids)}: {format_bytes(freed)} freed')
+        InfoBar.success(
+            title=self._t('info_backup_deleted_title'),
+            content=self._t('info_backup_deleted_body').format(size=format_bytes(freed)),
+            parent=self,
+            position=InfoBarPosition.TOP,
+        )
+        self._refresh_backup_snapshots()
@@ -135,6 +135,7 @@ class BrowserLibraryMixin:
                 position=InfoBarPosition.TOP,
             )
             return
+        self._reap_trash()
         InfoBar.success(
             title=self._t('browser_library_uninstall_success_title'),
             content=self._t('browser_library_uninstall_success_body'),
@@ -0,0 +1,208 @@
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+from qfluentwidgets import FluentIcon as FIF
+from qfluentwidgets import InfoBar, InfoBarPosition
+
+from app.app_config import load_app_settings
+from app.profiler_capture import CAPTURES_DIR, ProfilerCapture
+from app.stall_watchdog import STALL_LOG_PATH, StallSite, StallWatchdog
+from app.workers import CaptureExportWorker
+
+
+class _MainThreadPoster(QtCore.QObject):
+    """Runs callables posted from any thread on the thread this object lives in."""
+
+    posted = QtCore.pyqtSignal(object)
+
+    def __init__(self, parent: QtCore.QObject):
+        super().__init__(parent)
+        self.posted.connect(self._run)
+
+    def post(self, callback: Callable[[], None]) -> None:
+        self.posted.emit(callback)
+
+    def _run(self, callback: Callable[[], None]) -> None:
+        callback()
+
+
+class DiagnosticsMixin:
+    def _start_stall_watchdog(self) -> None:
+        self._stall_poster = _MainThreadPoster(self)
+        self._stall_watchdog = StallWatchdog(
+            self._stall_poster.post,
+            threshold_ms=self._stall_threshold_ms or 1,
+            on_stall=self._on_stall_recorded,
+        )
+        self._apply_stall_threshold()
+
+    def _apply_stall_threshold(self) -> None:
+        watchdog: Optional[StallWatchdog] = getattr(self, '_stall_watchdog', None)
+        if watchdog is None:
+            return
+        if self._stall_threshold_ms > 0:
+            watchdog.threshold_ms = self._stall_threshold_ms
+            watchdog.start()
+        else:
+            watchdog.stop()
+        self._refresh_diagnostics_view()
+
+    def _stop_stall_watchdog(self) -> None:
+        watchdog: Optional[StallWatchdog] = getattr(self, '_stall_watchdog', None)
+        if watchdog is not None:
+            watchdog.stop()
+
+    def _on_stall_recorded(self, site: StallSite) -> None:
+        # Watchdog thread: only hand over to the GUI thread here.
+        print(f'[WATCHDOG] Event loop stalled {site.last_ms:.0f} ms at {site.site}')
+        self._stall_poster.post(self._refresh_diagnostics_view)
+
+    def _refresh_diagnostics_view(self) -> None:
+        table = getattr(self, 'stalls_table', None)
+        watchdog: Optional[StallWatchdog] = getattr(self, '_stall_watchdog', None)
+        if table is None or watchdog is None:
+            return
+        selected = self._selected_stall_site()
+        sites = watchdog.sites()
+        table.setRowCount(len(sites))
+        for row, site in enumerate(sites):
+            values = [
+                site.site,
+                str(site.count),
+                f'{site.total_ms:.0f}',
+                f'{site.max_ms:.0f}',
+                time.strftime('%H:%M:%S', time.localtime(site.last_at)),
+            ]
+            for column, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem(value)
+                item.setData(QtCore.Qt.ItemDataRole.UserRole, site.site)
+                item.setData(QtCore.Qt.ItemDataRole.UserRole + 1, site.last_stack)
+                table.setItem(row, column, item)
+            if site.site == selected:
+                table.selectRow(row)
+        self.stalls_group_title.setText(
+            self._t('stalls_group_title').format(count=sum(site.count for site in sites))
+        )
+        if watchdog.is_running():
+            self.stalls_latency_label.setText(self._t('stalls_latency').format(
+                threshold=watchdog.threshold_ms,
+                last=watchdog.last_latency_ms,
+                max=watchdog.max_latency_ms,
+            ))
+        else:
+            self.stalls_latency_label.setText(self._t('stalls_disabled'))
+
+    def _selected_stall_site(self) -> Optional[str]:
+        table = getattr(self, 'stalls_table', None)
+        items = table.selectedItems() if table is not None else []
+        if not items:
+            return None
+        return items[0].data(QtCore.Qt.ItemDataRole.UserRole)
+
+    def _on_stall_selected(self) -> None:
+        items = self.stalls_table.selectedItems()
+        self.stalls_stack_view.setPlainText(items[0].data(QtCore.Qt.ItemDataRole.UserRole + 1) if items else '')
+
+    def _clear_stalls(self) -> None:
+        watchdog: Optional[StallWatchdog] = getattr(self, '_stall_watchdog', None)
+        if watchdog is not None:
+            watchdog.clear()
+        self.stalls_stack_view.clear()
+        self._refresh_diagnostics_view()
+
+    def _open_stall_log(self) -> None:
+        STALL_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        STALL_LOG_PATH.touch(exist_ok=True)
+        QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(str(STALL_LOG_PATH.resolve())))
+
+    def _apply_diagnostics_headers(self) -> None:
+        table = getattr(self, 'stalls_table', None)
+        if table is None:
+            return
+        table.setHorizontalHeaderLabels([
+            self._t('stalls_col_site'),
+            self._t('stalls_col_count'),
+            self._t('stalls_col_total'),
+            self._t('stalls_col_max'),
+            self._t('stalls_col_last'),
+        ])
+        self._refresh_diagnostics_view()
+
+    def _toggle_profiling(self) -> None:
+        if self._profiler.active:
+            self._stop_profiling()
+            return
+        if self._capture_export_worker and self._capture_export_worker.isRunning():
+            return
+        self._profiler.start()
+        print('[PROFILER] Capture started')
+        self._update_profiling_status()
+
+    def _stop_profiling(self) -> None:
+        result = self._profiler.stop()
+        print(f'[PROFILER] Capture stopped after {result.stopped_at - result.started_at:.1f} s')
+        self._capture_export_worker = CaptureExportWorker(result, self._capture_attachments())
+        self._capture_export_worker.finished.connect(self._on_capture_exported)
+        self._capture_export_worker.start()
+        self._update_profiling_status()
+
+    def _capture_attachments(self) -> dict:
+        watchdog: Optional[StallWatchdog] = getattr(self, '_stall_watchdog', None)
+        settings = load_app_settings()
+        settings.pop('api_token', None)
+        return {
+            'launches.json': list(self._launch_timings),
+            'stalls.json': [vars(site) for site in watchdog.sites()] if watchdog is not None else [],
+            'settings.json': settings,
+        }
+
+    def _take_memory_snapshot(self) -> None:
+        if not self._profiler.active:
+            return
+        snapshot = self._profiler.snapshot()
+        print(f'[PROFILER] {snapshot.label}: {snapshot.traced_bytes / 2**20:.1f} MiB traced')
+        self._update_profiling_status()
+
+    def _on_capture_exported(self, success: bool, path: Optional[Path], message: str) -> None:
+        self._update_profiling_status()
+        if not success:
+            InfoBar.error(
+                title=self._t('info_capture_failed_title'),
+                content=message,
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return
+        print(f'[PROFILER] Capture written to {path}')
+        InfoBar.success(
+            title=self._t('info_capture_saved_title'),
+            content=self._t('info_capture_saved_body').format(path=path),
+            parent=self,
+            position=InfoBarPosition.TOP,
+        )
+
+    def _open_captures_folder(self) -> None:
+        CAPTURES_DIR.mkdir(parents=True, exist_ok=True)
+        QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(str(CAPTURES_DIR.resolve())))
+
+    def _update_profiling_status(self) -> None:
+        button = getattr(self, 'profiling_toggle_btn', None)
+        if button is None:
+            return
+        exporting = bool(self._capture_export_worker and self._capture_export_worker.isRunning())
+        if self._profiler.active:
+            elapsed = time.time() - self._profiler.started_at
+            status = self._t('profiling_status_active').format(
+                seconds=elapsed, snapshots=self._profiler.snapshot_count
+            )
+            button.setText(self._t('profiling_stop'))
+            button.setIcon(FIF.SAVE)
+        else:
+            status = self._t('profiling_status_exporting' if exporting else 'profiling_status_idle')
+            button.setText(self._t('profiling_start'))
+            button.setIcon(FIF.PLAY)
+        button.setEnabled(not exporting)
+        self.profiling_snapshot_btn.setEnabled(self._profiler.active)
+        self.profiling_status_label.setText(status)
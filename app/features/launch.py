@@ -1,10 +1,17 @@
-from typing import Optional
+import time
+from datetime import datetime
+from typing import Optional, Union
 
 from PyQt6 import QtWidgets
 from qfluentwidgets import InfoBar, InfoBarPosition
 
-from app.workers import BrowserLaunchWorker
-from app.spoofers.profile import load_profile
+from app.launcher import RemoteSessionRegistry
+from app.sessions import BrowserSession
+from app.workers import AsyncLaunchWorker, LauncherLaunchWorker, SessionFocusWorker
+from app.spoofers.profile import load_profile, merge_extra_config, update_extra_config
+
+# Recent launches kept for diagnostics captures.
+LAUNCH_TIMINGS_KEPT = 100
 
 
 def resolve_effective_profile_id(
@@ -92,6 +99,12 @@ class LaunchMixin:
             )
             return
 
+        running = self._session_registry.find_live_by_profile(self._current_profile_id)
+        if running:
+            # A second browser on the same user-data dir would fail on its lock; show the open one instead.
+            self._focus_session(running)
+            return
+
         url = self.url_input.text().strip() or 'https://example.com'
         self.open_btn.setEnabled(False)
         InfoBar.info(
@@ -110,16 +123,47 @@ class LaunchMixin:
         if adapter_id == 'chromium':
             browser_path = self._resolve_browser_path(self._current_profile)
         self._log_settings(f'Launch browser path: {browser_path}')
-        self._launch_worker = BrowserLaunchWorker(
-            self._current_profile_id, self._current_profile, url, browser_path
-        )
+        if isinstance(self._session_registry, RemoteSessionRegistry):
+            self._launch_worker = LauncherLaunchWorker(
+                self._session_registry, self._current_profile_id, self._current_profile, url, browser_path
+            )
+        else:
+            self._launch_worker = AsyncLaunchWorker(
+                self._current_profile_id, self._current_profile, url, browser_path
+            )
         self._launch_worker.finished.connect(self._on_browser_launched)
         self._launch_worker.start()
 
     def _on_browser_launched(self, success: bool, message: str) -> None:
         self.open_btn.setEnabled(True)
-        if success and self._launch_worker and self._launch_worker.page:
-            self._pages.append(self._launch_worker.page)
+        worker = self._launch_worker
+        if isinstance(worker, LauncherLaunchWorker):
+            # The launcher owns the session and the registry mirror already has it.
+            launched = success and worker.session is not None
+            if launched:
+                # The launcher saved them to disk; without this the open profile's next save drops them.
+                merge_extra_config(worker.profile, worker.session.profile_updates)
+        else:
+            launched = success and worker is not None and worker.page is not None
+        if worker is not None:
+            self._record_launch_timing(worker, launched, message)
+        if launched and isinstance(worker, AsyncLaunchWorker):
+            result = worker.result
+            self._session_registry.register(
+                worker.profile_id,
+                worker.profile.base_config.adapter_id,
+                worker.page,
+                pid=result.pid if result else None,
+                debug_port=result.debug_port if result else None,
+                user_data_dir=result.user_data_dir if result else None,
+                on_exit=result.on_exit if result else None,
+            )
+            if result and result.profile_updates:
+                # Kept in the open profile too, so its next save does not drop them.
+                merge_extra_config(worker.profile, result.profile_updates)
+                update_extra_config(worker.profile_id, result.profile_updates)
+        if launched:
+            self._refresh_sessions_view()
             InfoBar.success(
                 title=self._t('info_launched_title'),
                 content=self._t('info_launched_body'),
@@ -134,3 +178,41 @@ class LaunchMixin:
                     parent=self,
                     position=InfoBarPosition.TOP,
                 )
+
+    def _record_launch_timing(
+        self, worker: Union[AsyncLaunchWorker, LauncherLaunchWorker], success: bool, message: str
+    ) -> None:
+        lines = message.strip().splitlines()
+        self._launch_timings.append({
+            'profile_id': worker.profile_id,
+            'adapter_id': worker.profile.base_config.adapter_id,
+            'duration_ms': round(worker.duration * 1000, 1),
+            'success': success,
+            'error': lines[-1] if lines and not success else '',
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+        })
+
+    def _focus_session(self, session: BrowserSession) -> None:
+        if self._session_focus_worker and self._session_focus_worker.isRunning():
+            return
+        self._focus_started_at = time.perf_counter()
+        self._session_focus_worker = SessionFocusWorker(self._session_registry, session.session_id)
+        self._session_focus_worker.finished.connect(self._on_session_focused)
+        self._session_focus_worker.start()
+
+    def _on_session_focused(self, success: bool, message: str) -> None:
+        worker = self._session_focus_worker
+        profile_id = ''
+        if worker:
+            session = self._session_registry.get(worker.session_id)
+            profile_id = session.profile_id if session else ''
+        elapsed_ms = (time.perf_counter() - self._focus_started_at) * 1000
+        self._log(f'Focus {profile_id}: {"ok" if success else "failed"} in {elapsed_ms:.0f} ms {message}'.rstrip())
+        if success:
+            return
+        InfoBar.info(
+            title=self._t('info_profile_running_title'),
+            content=self._t('info_profile_running_body').format(profile_id=profile_id),
+            parent=self,
+            position=InfoBarPosition.TOP,
+        )
@@ -7,12 +7,25 @@ from app.adapters.base import FieldSchema
 from app.adapters.registry import REGISTRY, get_adapter, list_adapters
 from app.features.dialogs import ProfileIdDialog
 from app.profile_utils import list_profile_entries
+from app.trash import trash_profile_data
+from app.workers import ProfileCloneWorker
 from app.spoofers.profile import (
+    DEFAULT_NAVIGATION_TIMEOUT,
+    DEFAULT_NAVIGATION_WAIT,
+    MAX_CPU_PERCENT,
+    MAX_CPU_WEIGHT,
+    MAX_MEMORY_MB,
+    NAVIGATION_WAIT_POLICIES,
     BaseConfig,
     ProfileConfig,
     build_default_profile_config,
+    parse_navigation_timeout,
+    parse_navigation_wait,
+    parse_resource_limit,
+    parse_sync_paths,
     generate_profile_from_ip,
     get_profile_path,
+    get_user_data_dir,
     load_profile,
     save_profile,
 )
@@ -28,6 +41,8 @@ class ProfilesMixin:
             item.setData(QtCore.Qt.ItemDataRole.UserRole, entry['id'])
             self.profile_list.addItem(item)
         self._populate_launch_profile_combo(entries, self._current_profile_id)
+        self._update_profile_storage_view()
+        self._refresh_storage_usage()
 
     def _populate_launch_profile_combo(self, entries: list[dict], current_id: Optional[str]) -> None:
         if self._updating_launch_combo:
@@ -127,18 +142,35 @@ class ProfilesMixin:
         if profile:
             self.field_target_url.setText(profile.base_config.target_url or '')
             self.field_proxy.setText(str(profile.base_config.proxy or ''))
+            self.field_ephemeral.setChecked(profile.base_config.ephemeral)
+            self.field_ephemeral_sync.setText(', '.join(profile.base_config.ephemeral_sync))
+            self.field_ephemeral_sync.setEnabled(profile.base_config.ephemeral)
+            self._set_combo_value(self.field_navigation_wait, profile.base_config.navigation_wait)
+            self.field_navigation_timeout.setValue(int(round(profile.base_config.navigation_timeout)))
+            self.field_cpu_weight.setValue(profile.base_config.cpu_weight)
+            self.field_cpu_max_percent.setValue(profile.base_config.cpu_max_percent)
+            self.field_memory_max_mb.setValue(profile.base_config.memory_max_mb)
             self._set_adapter_combo_value(profile.base_config.adapter_id)
             self._populate_profile_browser_combo(profile.base_config.browser_path)
             self._build_extra_config_form(profile.base_config.adapter_id)
         else:
             self.field_target_url.setText('')
             self.field_proxy.setText('')
+            self.field_ephemeral.setChecked(False)
+            self.field_ephemeral_sync.setText('')
+            self.field_ephemeral_sync.setEnabled(False)
+            self._set_combo_value(self.field_navigation_wait, DEFAULT_NAVIGATION_WAIT)
+            self.field_navigation_timeout.setValue(int(DEFAULT_NAVIGATION_TIMEOUT))
+            self.field_cpu_weight.setValue(0)
+            self.field_cpu_max_percent.setValue(0)
+            self.field_memory_max_mb.setValue(0)
             self.adapter_id_combo.setCurrentIndex(-1)
             self._populate_profile_browser_combo(None)
             self._clear_extra_config_form()
 
         self._updating_profile_controls = False
         self._update_home_profile_hint()
+        self._update_profile_storage_view()
         entries = list_profile_entries()
         self._populate_launch_profile_combo(entries, self._current_profile_id)
         if profile_id and not any(entry['id'] == profile_id for entry in entries):
@@ -187,11 +219,27 @@ class ProfilesMixin:
         if dialog.exec() != QtWidgets.QDialog.DialogCode.Accepted:
             return
 
+        if self._session_registry.find_live_by_profile(self._current_profile_id):
+            InfoBar.warning(
+                title=self._t('info_delete_running_title'),
+                content=self._t('info_delete_running_body'),
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return
+
+        base_config = (
+            self._current_profile.base_config
+            if isinstance(self._current_profile, ProfileConfig)
+            else BaseConfig(profile_id=self._current_profile_id)
+        )
         path = get_profile_path(self._current_profile_id)
         try:
+            trash_profile_data(base_config)
             if path.exists():
                 path.unlink()
-        except Exception:
+        except Exception as exc:
+            self._log(f'Delete failed: {exc}')
             InfoBar.error(
                 title=self._t('info_delete_failed_title'),
                 content=self._t('info_delete_failed_body'),
@@ -200,6 +248,7 @@ class ProfilesMixin:
             )
             return
 
+        self._reap_trash()
         self.refresh_profiles()
 
     def _populate_adapter_combo(self) -> None:
@@ -242,6 +291,28 @@ class ProfilesMixin:
                 position=InfoBarPosition.TOP,
             )
 
+    def _take_pending_profile_save(self) -> Optional[tuple[str, ProfileConfig]]:
+        """Applies base fields still being edited (no editingFinished yet) and returns what needs saving."""
+        if not self._current_profile_id or not isinstance(self._current_profile, ProfileConfig):
+            return None
+        base = self._current_profile.base_config
+        target_url = self.field_target_url.text().strip()
+        proxy = self.field_proxy.text().strip() or None
+        ephemeral_sync = parse_sync_paths(self.field_ephemeral_sync.text())
+        if (
+            target_url == (base.target_url or '')
+            and proxy == (str(base.proxy) if base.proxy else None)
+            and ephemeral_sync == base.ephemeral_sync
+        ):
+            return None
+        base.target_url = target_url
+        base.proxy = proxy
+        base.ephemeral_sync = ephemeral_sync
+        ok, _ = self._validate_current_profile()
+        if not ok:
+            return None
+        return self._current_profile_id, self._current_profile
+
     def _show_validation_error_dialog(self, message: str) -> None:
         dialog = MessageBox(self._t('info_invalid_profile_title'), message, self)
         dialog.exec()
@@ -395,6 +466,65 @@ class ProfilesMixin:
             return
         self._persist_profile()
 
+    def _on_base_ephemeral_changed(self, checked: bool) -> None:
+        self.field_ephemeral_sync.setEnabled(bool(checked))
+        if self._updating_profile_controls or not isinstance(self._current_profile, ProfileConfig):
+            return
+        self._current_profile.base_config.ephemeral = bool(checked)
+        self._persist_profile()
+
+    def _on_base_ephemeral_sync_changed(self) -> None:
+        if self._updating_profile_controls or not isinstance(self._current_profile, ProfileConfig):
+            return
+        paths = parse_sync_paths(self.field_ephemeral_sync.text())
+        self._current_profile.base_config.ephemeral_sync = paths
+        self._updating_profile_controls = True
+        self.field_ephemeral_sync.setText(', '.join(paths))
+        self._updating_profile_controls = False
+        self._persist_profile()
+
+    def _populate_navigation_wait_combo(self) -> None:
+        combo = self.field_navigation_wait
+        current = combo.currentData() or DEFAULT_NAVIGATION_WAIT
+        if isinstance(self._current_profile, ProfileConfig):
+            current = self._current_profile.base_config.navigation_wait
+        combo.blockSignals(True)
+        combo.clear()
+        for policy in NAVIGATION_WAIT_POLICIES:
+            combo.addItem(self._t(f'navigation_wait_{policy}'), userData=policy)
+        self._set_combo_value(combo, current)
+        combo.blockSignals(False)
+
+    def _on_base_navigation_wait_changed(self, _index: int) -> None:
+        if self._updating_profile_controls or not isinstance(self._current_profile, ProfileConfig):
+            return
+        self._current_profile.base_config.navigation_wait = parse_navigation_wait(self.field_navigation_wait.currentData())
+        self._persist_profile()
+
+    def _on_base_navigation_timeout_changed(self, value: int) -> None:
+        if self._updating_profile_controls or not isinstance(self._current_profile, ProfileConfig):
+            return
+        self._current_profile.base_config.navigation_timeout = parse_navigation_timeout(value)
+        self._persist_profile()
+
+    def _on_base_cpu_weight_changed(self, value: int) -> None:
+        if self._updating_profile_controls or not isinstance(self._current_profile, ProfileConfig):
+            return
+        self._current_profile.base_config.cpu_weight = parse_resource_limit(value, MAX_CPU_WEIGHT)
+        self._persist_profile()
+
+    def _on_base_cpu_max_percent_changed(self, value: int) -> None:
+        if self._updating_profile_controls or not isinstance(self._current_profile, ProfileConfig):
+            return
+        self._current_profile.base_config.cpu_max_percent = parse_resource_limit(value, MAX_CPU_PERCENT)
+        self._persist_profile()
+
+    def _on_base_memory_max_mb_changed(self, value: int) -> None:
+        if self._updating_profile_controls or not isinstance(self._current_profile, ProfileConfig):
+            return
+        self._current_profile.base_config.memory_max_mb = parse_resource_limit(value, MAX_MEMORY_MB)
+        self._persist_profile()
+
     def _create_random_profile(self) -> None:
         profile_id = self._prompt_profile_id(self._t('profiles_new_random'))
         if not profile_id:
@@ -418,6 +548,61 @@ class ProfilesMixin:
             return
         self.refresh_profiles()
 
+    def _clone_profile(self) -> None:
+        if not self._current_profile_id or not isinstance(self._current_profile, ProfileConfig):
+            InfoBar.warning(
+                title=self._t('info_clone_select_title'),
+                content=self._t('info_clone_select_body'),
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return
+        if self._clone_worker and self._clone_worker.isRunning():
+            return
+        if self._session_registry.find_live_by_profile(self._current_profile_id):
+            # Preferences and component state are rewritten while the browser runs.
+            InfoBar.warning(
+                title=self._t('info_clone_running_title'),
+                content=self._t('info_clone_running_body'),
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return
+        profile_id = self._prompt_profile_id(
+            self._t('profiles_clone'),
+            default=f'{self._current_profile_id}-copy',
+        )
+        if not profile_id:
+            return
+        if get_profile_path(profile_id).exists():
+            InfoBar.warning(
+                title=self._t('info_profile_exists_title'),
+                content=self._t('info_profile_exists_body'),
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return
+        template = self._current_profile
+        profile = build_default_profile_config(profile_id, template=template)
+        self.clone_btn.setEnabled(False)
+        self._clone_worker = ProfileCloneWorker(profile_id, profile, get_user_data_dir(template.base_config))
+        self._clone_worker.finished.connect(self._on_profile_cloned)
+        self._clone_worker.start()
+
+    def _on_profile_cloned(self, success: bool, message: str) -> None:
+        self.clone_btn.setEnabled(True)
+        if not success:
+            InfoBar.error(
+                title=self._t('info_save_failed_title'),
+                content=self._t('info_save_failed_body'),
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return
+        profile_id = self._clone_worker.profile_id
+        self.refresh_profiles()
+        self._select_profile_by_id(profile_id)
+
     def _create_ip_profile(self) -> None:
         profile_id = self._prompt_profile_id(self._t('profiles_new_from_ip'))
         if not profile_id:
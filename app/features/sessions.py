@@ -0,0 +1,150 @@
+from typing import Optional
+
+from PyQt6 import QtCore, QtWidgets
+from qfluentwidgets import InfoBar, InfoBarPosition
+
+from app.sessions import SESSION_HIBERNATED, BrowserSession, ProcessHandle, SessionRegistry
+from app.workers import SessionRestoreWorker
+
+SESSION_POLL_INTERVAL_MS = 2000
+
+
+def format_bytes(value: int) -> str:
+    size = float(value)
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GB'
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f'{hours}:{minutes:02d}:{secs:02d}'
+    return f'{minutes}:{secs:02d}'
+
+
+class SessionsMixin:
+    def _start_session_polling(self) -> None:
+        self._session_poll_timer = QtCore.QTimer(self)
+        self._session_poll_timer.setInterval(SESSION_POLL_INTERVAL_MS)
+        self._session_poll_timer.timeout.connect(self._poll_sessions)
+        self._session_poll_timer.start()
+
+    def _restore_sessions(self) -> None:
+        # The launcher restores its own sessions; only the in-process registry needs this.
+        if not isinstance(self._session_registry, SessionRegistry):
+            return
+        self._session_restore_worker = SessionRestoreWorker(self._session_registry)
+        self._session_restore_worker.finished.connect(self._on_sessions_restored)
+        self._session_restore_worker.start()
+
+    def _on_sessions_restored(self, success: bool, sessions: list, message: str) -> None:
+        if not success:
+            self._log(f'Session restore failed: {message}')
+            return
+        for session in sessions:
+            attached = 'process' if isinstance(session.handle, ProcessHandle) else 'driver'
+            self._log(f'Reattached session {session.session_id} ({session.profile_id}, pid {session.pid}) via {attached}')
+        if sessions:
+            self._refresh_sessions_view()
+
+    def _poll_sessions(self) -> None:
+        ended = self._session_registry.poll()
+        for session in ended:
+            self._on_session_ended(session)
+        self._refresh_sessions_view()
+
+    def _on_session_ended(self, session: BrowserSession) -> None:
+        self._log(f'Session {session.session_id} ({session.profile_id}) {session.state} exit_code={session.exit_code}')
+        self._schedule_cache_trim()
+
+    def _session_state_label(self, state: str) -> str:
+        return self._t(f'session_state_{state}')
+
+    def _refresh_sessions_view(self) -> None:
+        table = getattr(self, 'sessions_table', None)
+        if table is None:
+            return
+        selected_id = self._selected_session_id()
+        sessions = list(reversed(self._session_registry.sessions()))
+        table.setRowCount(len(sessions))
+        for row, session in enumerate(sessions):
+            values = [
+                session.profile_id,
+                session.adapter_id,
+                str(session.pid or '-'),
+                str(session.debug_port or '-'),
+                self._session_state_label(session.state),
+                f'{session.cpu_percent:.1f}%' if session.is_live else '-',
+                format_bytes(session.rss_bytes) if session.is_live else '-',
+            ]
+            for column, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem(value)
+                item.setData(QtCore.Qt.ItemDataRole.UserRole, session.session_id)
+                item.setToolTip(format_duration(session.uptime))
+                table.setItem(row, column, item)
+            if session.session_id == selected_id:
+                table.selectRow(row)
+        live = self._session_registry.live_sessions()
+        self.sessions_group_title.setText(self._t('sessions_group_title').format(count=len(live)))
+        label = getattr(self, 'sessions_hibernation_label', None)
+        if label is not None:
+            label.setText(self._t('sessions_hibernation_summary').format(
+                count=sum(1 for session in live if session.state == SESSION_HIBERNATED),
+                saved=format_duration(sum(session.cpu_saved_seconds for session in sessions)),
+            ))
+
+    def _selected_session_id(self) -> Optional[str]:
+        table = getattr(self, 'sessions_table', None)
+        if table is None:
+            return None
+        items = table.selectedItems()
+        if not items:
+            return None
+        return items[0].data(QtCore.Qt.ItemDataRole.UserRole)
+
+    def _warn_no_session_selected(self) -> None:
+        InfoBar.warning(
+            title=self._t('sessions_select_title'),
+            content=self._t('sessions_select_body'),
+            parent=self,
+            position=InfoBarPosition.TOP,
+        )
+
+    def _show_selected_session(self) -> None:
+        session_id = self._selected_session_id()
+        session = self._session_registry.get(session_id) if session_id else None
+        if not session or not session.is_live:
+            self._warn_no_session_selected()
+            return
+        # Focusing thaws a hibernated session and resets its idle timer.
+        self._focus_session(session)
+
+    def _stop_selected_session(self) -> None:
+        session_id = self._selected_session_id()
+        if not session_id:
+            self._warn_no_session_selected()
+            return
+        session = self._session_registry.stop(session_id)
+        if session:
+            self._on_session_ended(session)
+        self._refresh_sessions_view()
+
+    def _apply_sessions_headers(self) -> None:
+        table = getattr(self, 'sessions_table', None)
+        if table is None:
+            return
+        table.setHorizontalHeaderLabels([
+            self._t('sessions_col_profile'),
+            self._t('sessions_col_adapter'),
+            self._t('sessions_col_pid'),
+            self._t('sessions_col_port'),
+            self._t('sessions_col_state'),
+            self._t('sessions_col_cpu'),
+            self._t('sessions_col_memory'),
+        ])
+        self._refresh_sessions_view()
@@ -1,7 +1,7 @@
 from typing import Optional
 
 from PyQt6 import QtCore, QtWidgets
-from qfluentwidgets import ComboBox
+from qfluentwidgets import ComboBox, InfoBar, InfoBarPosition
 from qfluentwidgets.common import Theme, setTheme
 from qfluentwidgets.common.config import isDarkTheme
 from qfluentwidgets.common.translator import FluentTranslator
@@ -69,13 +69,33 @@ class SettingsMixin:
         set_text('actions_label', self._t('profiles_actions'))
         set_text('new_random_btn', self._t('profiles_new_random'))
         set_text('new_ip_btn', self._t('profiles_new_from_ip'))
+        set_text('clone_btn', self._t('profiles_clone'))
         set_text('delete_btn', self._t('profiles_delete'))
         set_text('refresh_btn', self._t('profiles_refresh'))
+        self._update_cleanup_button()
         set_text('details_header', self._t('profiles_details'))
         set_text('protection_header', self._t('profiles_protection'))
         set_text('fingerprint_header', self._t('profiles_fingerprint_title'))
 
         set_text('label_profile_id', self._t('field_profile_id'))
+        set_text('label_ephemeral', self._t('field_ephemeral'))
+        set_text('label_ephemeral_sync', self._t('field_ephemeral_sync'))
+        if getattr(self, 'field_ephemeral', None) is not None:
+            self.field_ephemeral.setToolTip(self._t('field_ephemeral_hint'))
+        set_text('label_navigation_wait', self._t('field_navigation_wait'))
+        set_text('label_navigation_timeout', self._t('field_navigation_timeout'))
+        set_text('label_cpu_weight', self._t('field_cpu_weight'))
+        set_text('label_cpu_max_percent', self._t('field_cpu_max_percent'))
+        set_text('label_memory_max_mb', self._t('field_memory_max_mb'))
+        if getattr(self, 'field_cpu_weight', None) is not None:
+            self.field_cpu_weight.setToolTip(self._t('field_cpu_weight_hint'))
+            self.field_cpu_max_percent.setToolTip(self._t('field_cpu_max_percent_hint'))
+            self.field_memory_max_mb.setToolTip(self._t('field_memory_max_mb_hint'))
+        if getattr(self, 'field_navigation_wait', None) is not None:
+            self.field_navigation_wait.setToolTip(self._t('field_navigation_wait_hint'))
+            self._populate_navigation_wait_combo()
+        set_text('label_profile_storage', self._t('field_profile_storage'))
+        set_text('trim_cache_btn', self._t('profiles_trim_cache'))
         set_text('label_user_agent', self._t('field_user_agent'))
         set_text('label_profile_browser', self._t('field_profile_browser'))
         set_text('label_timezone', self._t('field_timezone'))
@@ -100,7 +120,42 @@ class SettingsMixin:
         set_text('settings_group_title', self._t('settings_title'))
         set_text('settings_label_language', self._t('settings_language'))
         set_text('settings_label_theme', self._t('settings_theme'))
+        set_text('settings_label_storage_quota', self._t('settings_storage_quota'))
+        set_text('settings_label_stall_threshold', self._t('settings_stall_threshold'))
+        set_text('settings_label_use_launcher', self._t('settings_use_launcher'))
+        set_text('settings_label_hibernate_idle', self._t('settings_hibernate_idle'))
+        set_text('settings_label_auto_quit', self._t('settings_auto_quit'))
+        if getattr(self, 'hibernate_idle_spin', None) is not None:
+            self.hibernate_idle_spin.setToolTip(self._t('settings_hibernate_idle_hint'))
+        if getattr(self, 'auto_quit_spin', None) is not None:
+            self.auto_quit_spin.setToolTip(self._t('settings_auto_quit_hint'))
+        if getattr(self, 'use_launcher_switch', None) is not None:
+            self.use_launcher_switch.setToolTip(self._t('settings_use_launcher_hint'))
+        if getattr(self, 'storage_quota_spin', None) is not None:
+            self.storage_quota_spin.setToolTip(self._t('settings_storage_quota_hint'))
+        if getattr(self, 'stall_threshold_spin', None) is not None:
+            self.stall_threshold_spin.setToolTip(self._t('settings_stall_threshold_hint'))
         set_text('settings_onboarding_btn', self._t('settings_onboarding'))
+        set_text('backup_group_title', self._t('backup_title'))
+        set_text('backup_label_snapshot', self._t('backup_snapshot'))
+        set_text('backup_label_profile', self._t('backup_profile'))
+        set_text('backup_now_btn', self._t('backup_now'))
+        set_text('backup_restore_btn', self._t('backup_restore'))
+        set_text('backup_delete_btn', self._t('backup_delete'))
+        if getattr(self, 'backup_snapshot_combo', None) is not None:
+            self.backup_snapshot_combo.setPlaceholderText(self._t('backup_no_snapshots'))
+            self._refresh_backup_snapshots()
+        set_text('api_group_title', self._t('api_title'))
+        set_text('api_label_enabled', self._t('api_enabled'))
+        set_text('api_label_port', self._t('api_port'))
+        set_text('api_label_token', self._t('api_token'))
+        set_text('api_label_status', self._t('api_status'))
+        set_text('api_copy_token_btn', self._t('api_copy_token'))
+        self._update_api_status()
+        set_text('profiling_group_title', self._t('profiling_title'))
+        set_text('profiling_open_folder_btn', self._t('profiling_open_folder'))
+        set_text('profiling_snapshot_btn', self._t('profiling_snapshot'))
+        self._update_profiling_status()
 
         set_text('onboarding_welcome_title', self._t('onboarding_title'))
         set_text('onboarding_welcome_body', self._t('onboarding_body'))
@@ -118,6 +173,8 @@ class SettingsMixin:
         set_text('nav_home', self._t('nav_home'))
         set_text('nav_launch', self._t('nav_launch'))
         set_text('nav_profiles', self._t('nav_profiles'))
+        set_text('nav_sessions', self._t('nav_sessions'))
+        set_text('nav_diagnostics', self._t('nav_diagnostics'))
         set_text('nav_browser_library', self._t('nav_browser_library'))
         set_text('nav_install_browser', self._t('nav_install_browser'))
         set_text('nav_settings', self._t('nav_settings'))
@@ -134,6 +191,20 @@ class SettingsMixin:
         set_text('install_label_version', self._t('install_browser_version'))
         set_text('install_browser_btn', self._t('install_browser_action'))
 
+        set_text('sessions_title', self._t('sessions_title'))
+        set_text('sessions_subtitle', self._t('sessions_subtitle'))
+        set_text('sessions_show_btn', self._t('sessions_show'))
+        set_text('sessions_stop_btn', self._t('sessions_stop'))
+        set_text('sessions_refresh_btn', self._t('sessions_refresh'))
+        self._apply_sessions_headers()
+
+        set_text('diagnostics_title', self._t('diagnostics_title'))
+        set_text('diagnostics_subtitle', self._t('diagnostics_subtitle'))
+        set_text('stalls_refresh_btn', self._t('stalls_refresh'))
+        set_text('stalls_clear_btn', self._t('stalls_clear'))
+        set_text('stalls_open_log_btn', self._t('stalls_open_log'))
+        self._apply_diagnostics_headers()
+
         self._refresh_settings_options()
         if getattr(self, '_refresh_fingerprint_controls_options', None) is not None and getattr(self, 'fingerprint_header', None) is not None:
             self._refresh_fingerprint_controls_options()
@@ -186,6 +257,20 @@ class SettingsMixin:
             'settings_group_title',
             'settings_label_language',
             'settings_label_theme',
+            'settings_label_storage_quota',
+            'settings_label_stall_threshold',
+            'settings_label_use_launcher',
+            'settings_label_hibernate_idle',
+            'settings_label_auto_quit',
+            'backup_group_title',
+            'backup_label_snapshot',
+            'backup_label_profile',
+            'api_group_title',
+            'api_label_enabled',
+            'api_label_port',
+            'api_label_token',
+            'api_label_status',
+            'profiling_group_title',
             'browser_library_title',
             'browser_library_subtitle',
             'browser_library_group_title',
@@ -193,10 +278,26 @@ class SettingsMixin:
             'install_browser_subtitle',
             'install_browser_group_title',
             'install_label_version',
+            'sessions_title',
+            'sessions_subtitle',
+            'sessions_group_title',
+            'sessions_hibernation_label',
+            'diagnostics_title',
+            'diagnostics_subtitle',
+            'stalls_group_title',
+            'stalls_latency_label',
             'label_profile_browser',
             'label_adapter_id',
             'label_target_url',
             'label_proxy',
+            'label_ephemeral',
+            'label_ephemeral_sync',
+            'label_navigation_wait',
+            'label_navigation_timeout',
+            'label_cpu_weight',
+            'label_cpu_max_percent',
+            'label_memory_max_mb',
+            'label_profile_storage',
             'extra_header',
         ]
         labels = []
@@ -223,6 +324,8 @@ class SettingsMixin:
             getattr(self, 'home_page', None),
             getattr(self, 'browser_library_page', None),
             getattr(self, 'install_browser_page', None),
+            getattr(self, 'sessions_page', None),
+            getattr(self, 'diagnostics_page', None),
             getattr(self, 'settings_page', None),
             getattr(self, 'onboarding_page', None),
         ]
@@ -326,6 +429,28 @@ class SettingsMixin:
             self._theme_mode,
             theme_selection.get(self._theme_mode),
         )
+        self.storage_quota_spin.blockSignals(True)
+        self.storage_quota_spin.setValue(self._storage_quota_mb)
+        self.storage_quota_spin.blockSignals(False)
+        self.stall_threshold_spin.blockSignals(True)
+        self.stall_threshold_spin.setValue(self._stall_threshold_ms)
+        self.stall_threshold_spin.blockSignals(False)
+        self.use_launcher_switch.blockSignals(True)
+        self.use_launcher_switch.setChecked(self._use_launcher)
+        self.use_launcher_switch.blockSignals(False)
+        for spin, value in (
+            (self.hibernate_idle_spin, self._hibernate_idle_minutes),
+            (self.auto_quit_spin, self._auto_quit_idle_minutes),
+        ):
+            spin.blockSignals(True)
+            spin.setValue(value)
+            spin.blockSignals(False)
+        self.api_enabled_switch.blockSignals(True)
+        self.api_enabled_switch.setChecked(self._api_enabled)
+        self.api_enabled_switch.blockSignals(False)
+        self.api_port_spin.blockSignals(True)
+        self.api_port_spin.setValue(self._api_port)
+        self.api_port_spin.blockSignals(False)
 
     def _on_language_changed(self, index: int) -> None:
         mode = self._resolve_language_mode(index)
@@ -337,7 +462,7 @@ class SettingsMixin:
         self._apply_fluent_translator()
         self._apply_language()
         self._refresh_settings_options()
-        save_app_settings({'language': self._language_mode, 'theme': self._theme_mode})
+        self._save_app_settings()
 
     def _on_theme_changed(self, index: int) -> None:
         mode = self._resolve_theme_mode(index)
@@ -345,7 +470,46 @@ class SettingsMixin:
             return
         self._theme_mode = mode
         self._apply_theme(self._theme_mode, save=True)
-        save_app_settings({'language': self._language_mode, 'theme': self._theme_mode})
+        self._save_app_settings()
+
+    def _on_storage_quota_changed(self, value: int) -> None:
+        self._storage_quota_mb = value
+        self._save_app_settings()
+
+    def _on_stall_threshold_changed(self, value: int) -> None:
+        self._stall_threshold_ms = value
+        self._apply_stall_threshold()
+        self._save_app_settings()
+
+    def _on_hibernation_changed(self, value: int) -> None:
+        self._hibernate_idle_minutes = self.hibernate_idle_spin.value()
+        self._auto_quit_idle_minutes = self.auto_quit_spin.value()
+        self._session_registry.configure_hibernation(self._hibernate_idle_minutes, self._auto_quit_idle_minutes)
+        self._save_app_settings()
+
+    def _on_use_launcher_changed(self, checked: bool) -> None:
+        self._use_launcher = checked
+        self._save_app_settings()
+        InfoBar.info(
+            title=self._t('info_restart_required_title'),
+            content=self._t('info_restart_required_body'),
+            parent=self,
+            position=InfoBarPosition.TOP,
+        )
+
+    def _save_app_settings(self) -> None:
+        save_app_settings({
+            'language': self._language_mode,
+            'theme': self._theme_mode,
+            'storage_quota_mb': self._storage_quota_mb,
+            'api_enabled': self._api_enabled,
+            'api_port': self._api_port,
+            'api_token': self._api_token,
+            'use_launcher': self._use_launcher,
+            'stall_threshold_ms': self._stall_threshold_ms,
+            'hibernate_idle_minutes': self._hibernate_idle_minutes,
+            'auto_quit_idle_minutes': self._auto_quit_idle_minutes,
+        })
 
     def _on_system_theme_changed(self) -> None:
         if self._theme_mode == 'auto':
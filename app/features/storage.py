@@ -0,0 +1,209 @@
+from pathlib import Path
+from typing import Optional
+
+from PyQt6 import QtCore, QtWidgets
+from qfluentwidgets import InfoBar, InfoBarPosition, MessageBox
+
+from app.browser_library import get_browsers_dir
+from app.features.sessions import format_bytes
+from app.spoofers.profile import get_profiles_dir
+from app.storage import profile_user_data_dirs, usage_by_profile
+from app.trash import trash_orphan_user_data_dirs
+from app.workers import CacheTrimWorker, OrphanScanWorker, StorageUsageWorker, TrashReaperWorker
+
+ORPHAN_SCAN_INTERVAL_MS = 30 * 60 * 1000
+# Give a closing browser time to flush its files before its caches may be evicted.
+SESSION_TRIM_DELAY_MS = 5000
+
+
+class StorageMixin:
+    def _start_storage_gc(self) -> None:
+        self._trash_reaper_worker = None
+        self._trash_reap_pending = False
+        self._orphan_scan_worker = None
+        self._orphan_dirs: list[tuple[Path, int]] = []
+        self._orphan_scan_timer = QtCore.QTimer(self)
+        self._orphan_scan_timer.setInterval(ORPHAN_SCAN_INTERVAL_MS)
+        self._orphan_scan_timer.timeout.connect(self._start_orphan_scan)
+        self._orphan_scan_timer.start()
+        self._storage_usage_worker = None
+        self._storage_usage_pending = False
+        self._storage_usage: dict[str, tuple[int, int]] = {}
+        self._cache_trim_worker = None
+        self._cache_trim_queue: list[Path] = []
+        self._cache_trim_pending = False
+        self._cache_trim_notify = False
+        # Leftovers from a previous run (e.g. the app closed mid-delete) are reclaimed right away.
+        self._reap_trash()
+        self._start_orphan_scan()
+        self._trim_caches()
+
+    def _reap_trash(self) -> None:
+        if self._trash_reaper_worker and self._trash_reaper_worker.isRunning():
+            self._trash_reap_pending = True
+            return
+        self._trash_reap_pending = False
+        self._trash_reaper_worker = TrashReaperWorker([get_profiles_dir(), get_browsers_dir()])
+        self._trash_reaper_worker.finished.connect(self._on_trash_reaped)
+        self._trash_reaper_worker.start()
+
+    def _on_trash_reaped(self, success: bool, reclaimed: int, message: str) -> None:
+        if success:
+            if reclaimed:
+                self._log(f'Trash emptied, reclaimed {format_bytes(reclaimed)}')
+        else:
+            self._log(f'Emptying trash failed: {message}')
+        if self._trash_reap_pending:
+            self._reap_trash()
+        self._refresh_storage_usage()
+
+    def _start_orphan_scan(self) -> None:
+        if self._orphan_scan_worker and self._orphan_scan_worker.isRunning():
+            return
+        self._orphan_scan_worker = OrphanScanWorker()
+        self._orphan_scan_worker.finished.connect(self._on_orphan_scan_finished)
+        self._orphan_scan_worker.start()
+
+    def _on_orphan_scan_finished(self, success: bool, orphans: list, message: str) -> None:
+        if not success:
+            self._log(f'Orphan scan failed: {message}')
+            return
+        in_use = {
+            str(Path(session.user_data_dir).resolve())
+            for session in self._session_registry.live_sessions()
+            if session.user_data_dir
+        }
+        self._orphan_dirs = [(path, size) for path, size in orphans if str(path.resolve()) not in in_use]
+        reclaimable = sum(size for _, size in self._orphan_dirs)
+        if self._orphan_dirs:
+            self._log(f'Found {len(self._orphan_dirs)} orphaned user-data dirs ({format_bytes(reclaimable)} reclaimable)')
+        self._update_cleanup_button()
+
+    def _update_cleanup_button(self) -> None:
+        button = getattr(self, 'cleanup_btn', None)
+        if button is None:
+            return
+        reclaimable = sum(size for _, size in getattr(self, '_orphan_dirs', []))
+        button.setText(self._t('profiles_cleanup').format(size=format_bytes(reclaimable)))
+        button.setEnabled(bool(getattr(self, '_orphan_dirs', [])))
+
+    def _clean_orphan_dirs(self) -> None:
+        if not self._orphan_dirs:
+            return
+        reclaimable = sum(size for _, size in self._orphan_dirs)
+        dialog = MessageBox(
+            self._t('confirm_cleanup_title'),
+            self._t('confirm_cleanup_body').format(count=len(self._orphan_dirs), size=format_bytes(reclaimable)),
+            self,
+        )
+        if dialog.exec() != QtWidgets.QDialog.DialogCode.Accepted:
+            return
+        moved = trash_orphan_user_data_dirs(self._orphan_dirs)
+        self._orphan_dirs = []
+        self._update_cleanup_button()
+        self._reap_trash()
+        InfoBar.success(
+            title=self._t('info_cleanup_title'),
+            content=self._t('info_cleanup_body').format(count=moved),
+            parent=self,
+            position=InfoBarPosition.TOP,
+        )
+
+    def _refresh_storage_usage(self) -> None:
+        if not hasattr(self, '_storage_usage'):
+            # Storage GC has not started yet; _start_storage_gc() runs the first scan.
+            return
+        if self._storage_usage_worker and self._storage_usage_worker.isRunning():
+            self._storage_usage_pending = True
+            return
+        self._storage_usage_pending = False
+        self._storage_usage_worker = StorageUsageWorker()
+        self._storage_usage_worker.finished.connect(self._on_storage_usage_finished)
+        self._storage_usage_worker.start()
+
+    def _on_storage_usage_finished(self, success: bool, usage: list, message: str) -> None:
+        if not success:
+            self._log(f'Storage scan failed: {message}')
+        else:
+            self._storage_usage = usage_by_profile(usage)
+            self._update_profile_storage_view()
+        if self._storage_usage_pending:
+            self._refresh_storage_usage()
+
+    def _format_profile_storage(self, profile_id: Optional[str]) -> str:
+        if not profile_id or profile_id not in getattr(self, '_storage_usage', {}):
+            return '-'
+        total, cache = self._storage_usage[profile_id]
+        return self._t('profile_storage_value').format(total=format_bytes(total), cache=format_bytes(cache))
+
+    def _update_profile_storage_view(self) -> None:
+        label = getattr(self, 'profile_storage_value', None)
+        if label is not None:
+            label.setText(self._format_profile_storage(self._current_profile_id))
+        profile_list = getattr(self, 'profile_list', None)
+        if profile_list is None:
+            return
+        for row in range(profile_list.count()):
+            item = profile_list.item(row)
+            profile_id = item.data(QtCore.Qt.ItemDataRole.UserRole)
+            item.setToolTip(self._format_profile_storage(profile_id))
+
+    def _storage_quota_bytes(self) -> int:
+        return max(0, int(self._storage_quota_mb)) * 1024 * 1024
+
+    def _live_user_data_dirs(self) -> list[Path]:
+        return [
+            Path(session.user_data_dir)
+            for session in self._session_registry.live_sessions()
+            if session.user_data_dir
+        ]
+
+    def _trim_caches(self, dirs: Optional[list[Path]] = None) -> None:
+        """Trims the given dirs' caches, then evicts LRU caches until the quota is met."""
+        for path in dirs or []:
+            if path not in self._cache_trim_queue:
+                self._cache_trim_queue.append(path)
+        if self._cache_trim_worker and self._cache_trim_worker.isRunning():
+            self._cache_trim_pending = True
+            return
+        self._cache_trim_pending = False
+        queued, self._cache_trim_queue = self._cache_trim_queue, []
+        self._cache_trim_worker = CacheTrimWorker(queued, self._storage_quota_bytes(), self._live_user_data_dirs())
+        self._cache_trim_worker.finished.connect(self._on_cache_trim_finished)
+        self._cache_trim_worker.start()
+
+    def _schedule_cache_trim(self) -> None:
+        if self._storage_quota_bytes():
+            QtCore.QTimer.singleShot(SESSION_TRIM_DELAY_MS, self._trim_caches)
+
+    def _on_cache_trim_finished(self, success: bool, freed: int, message: str) -> None:
+        if not success:
+            self._log(f'Cache trim failed: {message}')
+        elif freed:
+            self._log(f'Cache trim freed {format_bytes(freed)}')
+        if success and self._cache_trim_notify and not self._cache_trim_pending:
+            self._cache_trim_notify = False
+            InfoBar.success(
+                title=self._t('info_trim_cache_title'),
+                content=self._t('info_trim_cache_body').format(size=format_bytes(freed)),
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+        if self._cache_trim_pending:
+            self._trim_caches()
+        else:
+            self._refresh_storage_usage()
+
+    def _trim_profile_cache(self) -> None:
+        if not self._current_profile_id or not self._current_profile:
+            return
+        if self._session_registry.find_live_by_profile(self._current_profile_id):
+            InfoBar.warning(
+                title=self._t('info_trim_running_title'),
+                content=self._t('info_trim_running_body'),
+                parent=self,
+                position=InfoBarPosition.TOP,
+            )
+            return
+        self._cache_trim_notify = True
+        self._trim_caches(profile_user_data_dirs(self._current_profile.base_config))
@@ -0,0 +1,348 @@
+"""
+Idle-session hibernation.
+
+A session is idle when nobody has looked at it for a while: the app has
+not focused it (Sessions page, a launch click on its running profile) and
+none of its pages reported document.hasFocus() to the focus probe, which
+asks every page over the DevTools port about twice a minute. After
+`idle_seconds` its pages are frozen with Page.setWebLifecycleState, the
+same freeze Chrome applies to background tabs: timers, workers and rAF
+stop, the page keeps its state and resumes where it was. If the browser
+refuses (older builds, or no page target answered), the renderer processes
+are suspended instead (psutil's suspend(): SIGSTOP, or NtSuspendProcess on
+Windows); the browser process itself keeps running so the window still
+paints, but the pages do not respond until the app thaws them. A browser
+without recognisable renderers is left running until it is next used.
+
+Focusing a session from the app thaws it. A CDP-frozen page the user
+brings to the front is noticed by the next probe and thawed as well; a
+suspended one is not, as its renderer cannot answer. With `quit_seconds`
+set, sessions idle for that long are stopped.
+
+Only sessions with their own browser process and a DevTools port are
+hibernated: contexts of the shared browser would freeze their neighbours,
+and without a probe (Camoufox) a session in active use cannot be told
+from an idle one.
+
+CPU saved is estimated per session as the drop from the CPU average
+before the freeze, integrated over the time spent frozen.
+"""
+import asyncio
+import concurrent.futures
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+import psutil
+
+from app.async_bridge import get_async_loop, run_coroutine
+from app.cdp import CDPConnection, fetch_json
+from app.metrics import observe_hibernation
+
+FOCUS_PROBE_INTERVAL_SECONDS = 30.0
+FOCUS_PROBE_TIMEOUT_SECONDS = 2.0
+LIFECYCLE_TIMEOUT_SECONDS = 5.0
+# Weight of the newest sample in the CPU average a freeze is measured against.
+CPU_AVERAGE_WEIGHT = 0.3
+FOCUS_EXPRESSION = 'document.visibilityState === "visible" && document.hasFocus()'
+# Chromium renderers and Firefox content processes.
+RENDERER_MARKERS = ('--type=renderer', '-contentproc')
+
+STATE_FROZEN = 'frozen'
+STATE_ACTIVE = 'active'
+METHOD_CDP = 'cdp'
+METHOD_SUSPEND = 'suspend'
+
+
+async def _for_each_page(port: int, command: Callable[[CDPConnection, str], Awaitable[Any]], timeout: float) -> list:
+    """Runs `command(cdp, session_id)` on every page target of the browser on `port`."""
+    version = await fetch_json(port, '/json/version', timeout)
+    cdp = await CDPConnection.connect(version['webSocketDebuggerUrl'], timeout)
+    try:
+        targets = (await cdp.send('Target.getTargets', timeout=timeout)).get('targetInfos', [])
+        pages = [target['targetId'] for target in targets if target.get('type') == 'page']
+
+        async def run(target_id: str) -> Any:
+            attached = await cdp.send('Target.attachToTarget', {'targetId': target_id, 'flatten': True}, timeout=timeout)
+            session_id = attached['sessionId']
+            try:
+                return await command(cdp, session_id)
+            finally:
+                await cdp.send('Target.detachFromTarget', {'sessionId': session_id}, timeout=timeout)
+
+        return await asyncio.gather(*(run(target_id) for target_id in pages), return_exceptions=True)
+    finally:
+        await cdp.close()
+
+
+async def set_lifecycle_state(port: int, state: str, timeout: float = LIFECYCLE_TIMEOUT_SECONDS) -> int:
+    """Freezes or thaws every page of the browser on `port`; returns how many pages took it."""
+
+    async def apply(cdp: CDPConnection, session_id: str) -> None:
+        await cdp.send('Page.setWebLifecycleState', {'state': state}, session_id, timeout)
+
+    results = await _for_each_page(port, apply, timeout)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    return len(results) - len(errors)
+
+
+async def probe_focus(port: int, timeout: float = FOCUS_PROBE_TIMEOUT_SECONDS) -> bool:
+    """True if a page of the browser on `port` is visible and has focus."""
+
+    async def has_focus(cdp: CDPConnection, session_id: str) -> bool:
+        reply = await cdp.send('Runtime.evaluate', {'expression': FOCUS_EXPRESSION, 'returnByValue': True}, session_id, timeout)
+        return reply.get('result', {}).get('value') is True
+
+    return any(result is True for result in await _for_each_page(port, has_focus, timeout))
+
+
+def _is_renderer(proc: psutil.Process) -> bool:
+    try:
+        cmdline = proc.cmdline()
+    except psutil.Error:
+        return False
+    return any(arg in RENDERER_MARKERS for arg in cmdline)
+
+
+def suspend_renderers(pid: int) -> list[psutil.Process]:
+    """Suspends the renderer processes under `pid`, never `pid` itself; returns them."""
+    try:
+        root = psutil.Process(pid)
+        tree = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+    renderers = [proc for proc in tree if proc.pid != pid and _is_renderer(proc)]
+    suspended = []
+    for proc in renderers:
+        try:
+            proc.suspend()
+            suspended.append(proc)
+        except psutil.Error:
+            continue
+    return suspended
+
+
+def resume_processes(procs: Iterable[psutil.Process]) -> None:
+    for proc in procs:
+        try:
+            proc.resume()
+        except psutil.Error:
+            continue
+
+
+def resume_process_tree(pid: int) -> None:
+    """Resumes every suspended process under `pid`, e.g. one left hibernated by a previous app process."""
+    try:
+        root = psutil.Process(pid)
+        tree = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return
+    stopped = []
+    for proc in tree:
+        try:
+            if proc.status() == psutil.STATUS_STOPPED:
+                stopped.append(proc)
+        except psutil.Error:
+            continue
+    resume_processes(stopped)
+
+
+def thaw_record(record: dict) -> None:
+    """Undoes the hibernation of a recorded session before it is reattached; blocks."""
+    if record.get('pid'):
+        resume_process_tree(record['pid'])
+    if record.get('debug_port'):
+        try:
+            get_async_loop().run(set_lifecycle_state(record['debug_port'], STATE_ACTIVE), LIFECYCLE_TIMEOUT_SECONDS + 1)
+        except Exception as exc:
+            print(f'[HIBERNATE] Could not thaw {record.get("profile_id")}: {exc}')
+
+
+@dataclass
+class _IdleState:
+    session: Any
+    last_active: float
+    sampled_at: float
+    cpu_average: Optional[float] = None
+    frozen_at: Optional[float] = None
+    method: str = ''
+    suspended: list[psutil.Process] = field(default_factory=list)
+    # Pending CDP freeze; a failure falls back to suspending the renderers.
+    freezing: Optional[concurrent.futures.Future] = None
+    probe: Optional[concurrent.futures.Future] = None
+    probed_at: float = 0.0
+    # Neither freeze took; not retried until the session is used again.
+    unfreezable: bool = False
+
+    @property
+    def frozen(self) -> bool:
+        return self.frozen_at is not None
+
+
+class Hibernator:
+    """
+    Freezes idle sessions for a SessionRegistry.
+
+    The registry calls check() from poll() after sampling CPU, touch() when
+    the app focuses a session and forget() when one ends; `on_change(session,
+    frozen)` tells it when a session was frozen or thawed. Nothing here
+    blocks: CDP commands run on the shared loop of app.async_bridge and
+    their results are picked up by the next check().
+    """
+
+    def __init__(
+        self,
+        idle_seconds: float = 0,
+        quit_seconds: float = 0,
+        on_change: Optional[Callable[[Any, bool], None]] = None,
+        probe_interval: float = FOCUS_PROBE_INTERVAL_SECONDS,
+    ):
+        self.idle_seconds = idle_seconds
+        self.quit_seconds = quit_seconds
+        self.probe_interval = probe_interval
+        self._on_change = on_change
+        self._states: dict[str, _IdleState] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.idle_seconds or self.quit_seconds)
+
+    def configure(self, idle_seconds: float, quit_seconds: float) -> None:
+        self.idle_seconds = max(0, idle_seconds)
+        self.quit_seconds = max(0, quit_seconds)
+        if not self.idle_seconds:
+            self.wake_all()
+
+    def is_frozen(self, session_id: str) -> bool:
+        with self._lock:
+            state = self._states.get(session_id)
+            return state is not None and state.frozen
+
+    def touch(self, session_id: str) -> Optional[concurrent.futures.Future]:
+        """Marks the session as in use, thawing it; returns the pending CDP thaw, if any."""
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is None:
+                return None
+            state.last_active = time.monotonic()
+            state.unfreezable = False
+            return self._thaw(state)
+
+    def wake_all(self) -> None:
+        with self._lock:
+            for state in self._states.values():
+                state.last_active = time.monotonic()
+                state.unfreezable = False
+                self._thaw(state)
+
+    def forget(self, session_id: str) -> None:
+        """Drops a session that ended; its suspended processes are resumed so they can exit."""
+        with self._lock:
+            state = self._states.pop(session_id, None)
+        if state is not None:
+            resume_processes(state.suspended)
+            if state.probe is not None:
+                state.probe.cancel()
+
+    def check(self, sessions: Iterable[Any], now: Optional[float] = None) -> list[Any]:
+        """Freezes sessions that went idle; returns those idle long enough to be stopped."""
+        now = time.monotonic() if now is None else now
+        to_quit = []
+        with self._lock:
+            for session in sessions:
+                if not session.debug_port or not session.pid:
+                    continue
+                state = self._states.get(session.session_id)
+                if state is None:
+                    state = self._states[session.session_id] = _IdleState(session, last_active=now, sampled_at=now)
+                self._collect(state, now)
+                if not self.enabled:
+                    continue
+                idle = now - state.last_active
+                if self.quit_seconds and idle >= self.quit_seconds:
+                    to_quit.append(session)
+                    continue
+                if self.idle_seconds and idle >= self.idle_seconds and not state.frozen and not state.unfreezable:
+                    self._freeze(state, now)
+                if state.probe is None and state.method != METHOD_SUSPEND and now - state.probed_at >= self.probe_interval:
+                    state.probed_at = now
+                    state.probe = run_coroutine(probe_focus(session.debug_port))
+        return to_quit
+
+    def _collect(self, state: _IdleState, now: float) -> None:
+        """Applies finished probes and freezes, and books the CPU saved since the last check."""
+        session = state.session
+        if state.probe is not None and state.probe.done():
+            probe, state.probe = state.probe, None
+            if not probe.cancelled() and not probe.exception() and probe.result():
+                state.last_active = now
+                state.unfreezable = False
+                self._thaw(state)
+        if state.freezing is not None and state.freezing.done():
+            freezing, state.freezing = state.freezing, None
+            error = freezing.exception()
+            if error is not None or not freezing.result():
+                print(f'[HIBERNATE] Page freeze failed for {session.profile_id} ({error or "no pages"}), suspending renderers')
+                self._suspend(state)
+        elapsed, state.sampled_at = now - state.sampled_at, now
+        if not state.frozen:
+            previous = state.cpu_average
+            state.cpu_average = session.cpu_percent if previous is None else (
+                CPU_AVERAGE_WEIGHT * session.cpu_percent + (1 - CPU_AVERAGE_WEIGHT) * previous
+            )
+        elif state.freezing is None and state.cpu_average:
+            saved = max(0.0, state.cpu_average - session.cpu_percent) / 100 * elapsed
+            session.cpu_saved_seconds += saved
+            observe_hibernation(session.adapter_id, cpu_saved=saved)
+
+    def _freeze(self, state: _IdleState, now: float) -> None:
+        session = state.session
+        state.frozen_at = now
+        state.method = METHOD_CDP
+        state.freezing = run_coroutine(set_lifecycle_state(session.debug_port, STATE_FROZEN))
+        print(f'[HIBERNATE] {session.profile_id} idle for {now - state.last_active:.0f}s, freezing its pages')
+        observe_hibernation(session.adapter_id, method=METHOD_CDP)
+        self._changed(session, True)
+
+    def _suspend(self, state: _IdleState) -> None:
+        state.method = METHOD_SUSPEND
+        state.suspended = suspend_renderers(state.session.pid)
+        if not state.suspended:
+            print(f'[HIBERNATE] No renderers to suspend for {state.session.profile_id}, leaving it running')
+            state.unfreezable = True
+            self._thaw(state)
+            return
+        observe_hibernation(state.session.adapter_id, method=METHOD_SUSPEND)
+
+    def _thaw(self, state: _IdleState) -> Optional[concurrent.futures.Future]:
+        if not state.frozen:
+            return None
+        session = state.session
+        pending = None
+        if state.method == METHOD_SUSPEND:
+            resume_processes(state.suspended)
+            state.suspended = []
+        else:
+            if state.freezing is not None:
+                state.freezing.cancel()
+                state.freezing = None
+            pending = run_coroutine(set_lifecycle_state(session.debug_port, STATE_ACTIVE))
+        print(f'[HIBERNATE] {session.profile_id} thawed')
+        state.frozen_at = None
+        state.method = ''
+        # A probe of the frozen page may have timed out; probe again on the next check.
+        state.probed_at = 0.0
+        self._changed(session, False)
+        return pending
+
+    def _changed(self, session: Any, frozen: bool) -> None:
+        if self._on_change is None:
+            return
+        try:
+            self._on_change(session, frozen)
+        except Exception as exc:
+            print(f'[HIBERNATE] Change callback failed: {exc}')
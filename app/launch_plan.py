@@ -0,0 +1,84 @@
+"""
+Compiled launch plans.
+
+A LaunchPlan holds everything a launch derives from the saved profile alone:
+the resolved browser executable, its command-line arguments and default
+preferences, the persistent user-data directory and the CDP spoofing
+commands, including the injected JS bundle. Adapters compile it once per
+profile (BrowserAdapter.compile_launch_plan) and later launches only spawn
+the browser and replay it.
+
+Plans are cached per profile id together with a digest of the inputs they
+were built from, so any edit to the profile, saved or not, compiles a new
+plan; save_profile() also drops the cached one right away.
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+
+from app.spoofers.cdp_spoofer import CDPCommand
+from app.spoofers.profile import BaseConfig
+
+if TYPE_CHECKING:
+    from app.adapters.base import BrowserAdapter
+
+# Per-launch overrides that do not change what gets compiled.
+PLAN_INDEPENDENT_FIELDS = ('target_url', 'navigation_wait', 'navigation_timeout')
+
+
+@dataclass(frozen=True)
+class LaunchPlan:
+    profile_id: str
+    adapter_id: str
+    digest: str
+    executable: Optional[str] = None
+    arguments: tuple[str, ...] = ()
+    # Written into <user-data>/Default/Preferences before each start; 'a.b' keys are nested paths.
+    preferences: Mapping[str, Any] = MappingProxyType({})
+    # None for ephemeral profiles, which get a fresh RAM directory per launch.
+    user_data_dir: Optional[Path] = None
+    # Pre-navigation spoofing in order; the last command carries the JS bundle. Treat params as read-only.
+    spoof_commands: tuple[CDPCommand, ...] = ()
+
+
+def plan_digest(adapter_id: str, base_config: BaseConfig, extra_config: Optional[dict]) -> str:
+    base = base_config.to_dict()
+    for name in PLAN_INDEPENDENT_FIELDS:
+        base.pop(name, None)
+    payload = json.dumps(
+        {'adapter': adapter_id, 'base': base, 'extra': extra_config or {}},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+_plans: dict[str, LaunchPlan] = {}
+_lock = threading.Lock()
+
+
+def get_launch_plan(adapter: 'BrowserAdapter', base_config: BaseConfig, extra_config: Optional[dict]) -> LaunchPlan:
+    """The cached plan for this profile, compiled first if the profile changed since."""
+    digest = plan_digest(adapter.id, base_config, extra_config)
+    with _lock:
+        plan = _plans.get(base_config.profile_id)
+    # A browser found by discovery can be uninstalled between launches.
+    if plan is not None and plan.digest == digest and (not plan.executable or Path(plan.executable).exists()):
+        return plan
+    plan = adapter.compile_launch_plan(base_config, extra_config or {}, digest)
+    with _lock:
+        _plans[base_config.profile_id] = plan
+    return plan
+
+
+def invalidate_launch_plan(profile_id: Optional[str] = None) -> None:
+    """Drops the cached plan of `profile_id`, or every plan when it is None."""
+    with _lock:
+        if profile_id is None:
+            _plans.clear()
+        else:
+            _plans.pop(profile_id, None)
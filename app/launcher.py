@@ -0,0 +1,471 @@
+"""
+Out-of-process launcher.
+
+The launcher is a detached `python -m app.launcher` process that owns every
+adapter launch and browser session, so DrissionPage/Playwright threads never
+share the GUI's interpreter and browsers keep running across GUI restarts.
+It serves the local control API (app.api_server) on an ephemeral port and
+advertises port, token and pid in config/launcher.json; that file plus
+loopback HTTP is the whole IPC channel.
+
+The GUI side is LauncherClient for requests and RemoteSessionRegistry, which
+mirrors the launcher's sessions behind the SessionRegistry interface.
+"""
+import http.client
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import psutil
+
+from app.api_server import ApiError, ApiRequest, ApiServer, generate_token, stop_live_sessions
+from app.metrics import observe_sessions
+from app.sessions import (
+    LIVE_STATES,
+    SESSION_CRASHED,
+    SESSION_STOPPED,
+    SESSIONS_STATE_PATH,
+    BrowserSession,
+    SessionRegistry,
+)
+
+LAUNCHER_STATE_PATH = Path('config/launcher.json')
+LAUNCHER_LOG_PATH = Path('config/launcher.log')
+LAUNCHER_START_TIMEOUT_SECONDS = 15.0
+CLIENT_TIMEOUT_SECONDS = 5.0
+# Launches wait for the browser and the first navigation.
+LAUNCH_TIMEOUT_SECONDS = 120.0
+MIRROR_INTERVAL_SECONDS = 2.0
+# Sessions are only given up after the launcher stayed unreachable this many polls in a row.
+MIRROR_MAX_FAILURES = 3
+MIRRORED_FIELDS = (
+    'pid', 'debug_port', 'state', 'ended_at', 'exit_code', 'cpu_percent', 'rss_bytes', 'cpu_saved_seconds',
+)
+
+
+class LauncherError(ApiError):
+    """A request to the launcher failed; `status` is the launcher's HTTP status (0 when unreachable)."""
+
+
+@dataclass
+class LauncherInfo:
+    pid: int
+    port: int
+    token: str
+    started_at: float
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.port}'
+
+    def process_alive(self) -> bool:
+        try:
+            return abs(psutil.Process(self.pid).create_time() - self.started_at) < 2.0
+        except psutil.Error:
+            return False
+
+
+def read_launcher_info(path: Path = LAUNCHER_STATE_PATH) -> Optional[LauncherInfo]:
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+        return LauncherInfo(
+            pid=int(data['pid']),
+            port=int(data['port']),
+            token=str(data['token']),
+            started_at=float(data['started_at']),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_launcher_info(info: LauncherInfo, path: Path = LAUNCHER_STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    # The token grants control over every browser; keep it readable by this user only.
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+        json.dump(asdict(info), fh, indent=2)
+    os.replace(tmp, path)
+
+
+def remove_launcher_info(pid: int, path: Path = LAUNCHER_STATE_PATH) -> None:
+    """Deletes the discovery file if it still belongs to `pid` (a newer launcher may have replaced it)."""
+    info = read_launcher_info(path)
+    if info and info.pid == pid:
+        path.unlink(missing_ok=True)
+
+
+class LauncherClient:
+    def __init__(self, info: LauncherInfo, timeout: float = CLIENT_TIMEOUT_SECONDS):
+        self.info = info
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, body: Optional[dict] = None, timeout: Optional[float] = None) -> dict:
+        conn = http.client.HTTPConnection('127.0.0.1', self.info.port, timeout=timeout or self.timeout)
+        headers = {'Authorization': f'Bearer {self.info.token}', 'Connection': 'close'}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            resp = conn.getresponse()
+            raw = resp.read()
+        except (OSError, http.client.HTTPException) as exc:
+            raise LauncherError(0, f'launcher unreachable: {exc}') from exc
+        finally:
+            conn.close()
+        try:
+            data = json.loads(raw) if raw else {}
+        except ValueError:
+            data = {}
+        if resp.status >= 400:
+            raise LauncherError(resp.status, data.get('error') or resp.reason, data.get('details'))
+        return data
+
+    def health(self) -> bool:
+        try:
+            return bool(self._request('GET', '/health', timeout=1.0).get('ok'))
+        except LauncherError:
+            return False
+
+    def list_sessions(self) -> list[dict]:
+        return self._request('GET', '/sessions').get('sessions', [])
+
+    def launch(self, profile_id: str, url: str = '', browser_path: Optional[str] = None) -> dict:
+        body: dict[str, Any] = {'url': url}
+        if browser_path:
+            body['browser_path'] = browser_path
+        return self._request('POST', f'/profiles/{profile_id}/launch', body, timeout=LAUNCH_TIMEOUT_SECONDS)
+
+    def stop(self, session_id: str) -> dict:
+        return self._request('POST', f'/sessions/{session_id}/stop').get('session', {})
+
+    def focus(self, session_id: str) -> bool:
+        return bool(self._request('POST', f'/sessions/{session_id}/focus').get('focused'))
+
+    def configure_hibernation(self, idle_minutes: float, quit_minutes: float) -> dict:
+        return self._request('POST', '/hibernation', {'idle_minutes': idle_minutes, 'quit_minutes': quit_minutes})
+
+    def shutdown(self) -> None:
+        self._request('POST', '/shutdown')
+
+
+def connect_launcher(path: Path = LAUNCHER_STATE_PATH) -> Optional[LauncherClient]:
+    info = read_launcher_info(path)
+    if not info or not info.process_alive():
+        return None
+    client = LauncherClient(info)
+    return client if client.health() else None
+
+
+def spawn_launcher() -> subprocess.Popen:
+    """Starts a detached launcher that survives the GUI; output goes to config/launcher.log."""
+    LAUNCHER_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    kwargs: dict[str, Any] = {}
+    if sys.platform == 'win32':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    with LAUNCHER_LOG_PATH.open('ab') as log:
+        return subprocess.Popen(
+            [sys.executable, '-m', 'app.launcher'],
+            cwd=os.getcwd(),
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            env=dict(os.environ, PYTHONUNBUFFERED='1'),
+            **kwargs,
+        )
+
+
+_ensure_lock = threading.Lock()
+
+
+def ensure_launcher(timeout: float = LAUNCHER_START_TIMEOUT_SECONDS) -> LauncherClient:
+    """Connects to the running launcher, starting one first if there is none."""
+    with _ensure_lock:
+        client = connect_launcher()
+        if client:
+            return client
+        proc = spawn_launcher()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            client = connect_launcher()
+            if client:
+                return client
+            if proc.poll() is not None:
+                # Lost a start race against another GUI; its launcher may be up by now.
+                client = connect_launcher()
+                if client:
+                    return client
+                raise LauncherError(0, f'launcher exited with code {proc.returncode}, see {LAUNCHER_LOG_PATH}')
+            time.sleep(0.1)
+        raise LauncherError(0, f'launcher did not start within {timeout:.0f}s, see {LAUNCHER_LOG_PATH}')
+
+
+class LauncherServer(ApiServer):
+    """The API server as run by the launcher process, plus discovery and remote shutdown."""
+
+    ROUTES = ApiServer.ROUTES + [
+        ('POST', re.compile(r'^/shutdown$'), '_shutdown'),
+    ]
+
+    def _on_listening(self) -> None:
+        proc = psutil.Process()
+        write_launcher_info(LauncherInfo(
+            pid=proc.pid,
+            port=self.port,
+            token=self.token,
+            started_at=proc.create_time(),
+        ))
+
+    async def _shutdown(self, request: ApiRequest) -> tuple[int, Any]:
+        self._loop.call_soon(self._stop_event.set)
+        return 200, {'ok': True}
+
+
+def _session_from_dict(data: dict) -> BrowserSession:
+    return BrowserSession(
+        session_id=data['session_id'],
+        profile_id=data['profile_id'],
+        adapter_id=data.get('adapter_id', 'chromium'),
+        pid=data.get('pid'),
+        debug_port=data.get('debug_port'),
+        user_data_dir=data.get('user_data_dir'),
+        state=data.get('state', 'running'),
+        started_at=data.get('started_at') or time.time(),
+        ended_at=data.get('ended_at'),
+        exit_code=data.get('exit_code'),
+        cpu_percent=data.get('cpu_percent', 0.0),
+        rss_bytes=data.get('rss_bytes', 0),
+        cgroup=data.get('cgroup'),
+        cpu_saved_seconds=data.get('cpu_saved_seconds', 0.0),
+    )
+
+
+class RemoteSessionRegistry:
+    """
+    SessionRegistry stand-in for sessions owned by the launcher.
+
+    A background thread mirrors the launcher's session list, so poll(),
+    sessions() and friends never wait on IPC; stop() is sent from a thread
+    as well. Only launch() blocks, and it is called from workers.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Optional[LauncherClient]] = connect_launcher,
+        ensure: Callable[[], LauncherClient] = ensure_launcher,
+        interval: float = MIRROR_INTERVAL_SECONDS,
+    ):
+        self._connect = connect
+        self._ensure = ensure
+        self._interval = interval
+        self._lock = threading.RLock()
+        self._sessions: dict[str, BrowserSession] = {}
+        self._ended: list[BrowserSession] = []
+        self._listeners: list[Callable[[BrowserSession], None]] = []
+        self._client: Optional[LauncherClient] = None
+        self._failures = 0
+        # Hibernation settings for the launcher, sent again whenever a different launcher answers.
+        self._hibernation: Optional[dict] = None
+        self._hibernation_sent_to: Optional[int] = None
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._mirror_loop, name='launcher-mirror', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._thread.join(self._interval + CLIENT_TIMEOUT_SECONDS)
+
+    def add_listener(self, callback: Callable[[BrowserSession], None]) -> None:
+        self._listeners.append(callback)
+
+    def launch(self, profile_id: str, url: str = '', browser_path: Optional[str] = None) -> BrowserSession:
+        client = self._ensure()
+        data = client.launch(profile_id, url, browser_path)
+        session = _session_from_dict(data['session'])
+        # The launcher already saved them; the caller may have the profile open.
+        session.profile_updates = dict(data.get('profile_updates') or {})
+        with self._lock:
+            self._client = client
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[BrowserSession]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def sessions(self) -> list[BrowserSession]:
+        with self._lock:
+            return sorted(self._sessions.values(), key=lambda s: s.started_at)
+
+    def live_sessions(self) -> list[BrowserSession]:
+        return [s for s in self.sessions() if s.is_live]
+
+    def find_live_by_profile(self, profile_id: str) -> Optional[BrowserSession]:
+        for session in self.live_sessions():
+            if session.profile_id == profile_id:
+                return session
+        return None
+
+    def poll(self) -> list[BrowserSession]:
+        """Returns the sessions the mirror saw end since the last call."""
+        with self._lock:
+            ended, self._ended = self._ended, []
+        observe_sessions(self.live_sessions(), ended)
+        for session in ended:
+            self._notify(session)
+        return ended
+
+    def stop(self, session_id: str) -> Optional[BrowserSession]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if not session or not session.is_live:
+                return session
+            session.state = SESSION_STOPPED
+            session.ended_at = time.time()
+            client = self._client
+        if client:
+            threading.Thread(target=self._send_stop, args=(client, session_id), daemon=True).start()
+        self._notify(session)
+        return session
+
+    def focus(self, session_id: str) -> bool:
+        with self._lock:
+            client = self._client
+        client = client or self._connect()
+        if client is None:
+            return False
+        try:
+            return client.focus(session_id)
+        except LauncherError as exc:
+            print(f'[LAUNCHER] Failed to focus session {session_id}: {exc.message}')
+            return False
+
+    def configure_hibernation(self, idle_minutes: float, quit_minutes: float) -> None:
+        """Applied by the launcher, which owns the sessions; sent from the mirror thread."""
+        with self._lock:
+            self._hibernation = {'idle_minutes': idle_minutes, 'quit_minutes': quit_minutes}
+            self._hibernation_sent_to = None
+
+    def hibernation_config(self) -> dict:
+        with self._lock:
+            return dict(self._hibernation or {'idle_minutes': 0, 'quit_minutes': 0})
+
+    def _send_hibernation(self, client: LauncherClient) -> None:
+        with self._lock:
+            config = self._hibernation
+            if config is None or self._hibernation_sent_to == client.info.pid:
+                return
+        try:
+            client.configure_hibernation(config['idle_minutes'], config['quit_minutes'])
+        except LauncherError as exc:
+            print(f'[LAUNCHER] Failed to configure hibernation: {exc.message}')
+            return
+        with self._lock:
+            if self._hibernation is config:
+                self._hibernation_sent_to = client.info.pid
+
+    def _send_stop(self, client: LauncherClient, session_id: str) -> None:
+        try:
+            client.stop(session_id)
+        except LauncherError as exc:
+            print(f'[LAUNCHER] Failed to stop session {session_id}: {exc.message}')
+
+    def _mirror_loop(self) -> None:
+        while True:
+            self.refresh()
+            if self._closed.wait(self._interval):
+                return
+
+    def refresh(self) -> None:
+        """Pulls the launcher's session list once."""
+        fetched_at = time.time()
+        client = self._client or self._connect()
+        remote: Optional[list[dict]] = None
+        if client:
+            try:
+                remote = client.list_sessions()
+            except LauncherError:
+                client = None
+        if client:
+            self._send_hibernation(client)
+        with self._lock:
+            self._client = client
+            if remote is None:
+                self._failures += 1
+                if self._failures >= MIRROR_MAX_FAILURES:
+                    self._client = None
+                    self._mark_lost()
+                return
+            self._failures = 0
+            seen = set()
+            for data in remote:
+                fresh = _session_from_dict(data)
+                seen.add(fresh.session_id)
+                current = self._sessions.get(fresh.session_id)
+                if current is None:
+                    self._sessions[fresh.session_id] = fresh
+                    continue
+                was_live = current.is_live
+                if current.state == SESSION_STOPPED and fresh.state in LIVE_STATES:
+                    fresh.state, fresh.ended_at = current.state, current.ended_at  # stop still in flight
+                for name in MIRRORED_FIELDS:
+                    setattr(current, name, getattr(fresh, name))
+                if was_live and not current.is_live:
+                    self._ended.append(current)
+            for session_id, session in list(self._sessions.items()):
+                if session_id not in seen and session.started_at < fetched_at:
+                    # Gone from the launcher (pruned or launcher restarted); sessions newer than
+                    # the list were launched while it was being fetched.
+                    if session.is_live:
+                        session.state = SESSION_CRASHED
+                        session.ended_at = time.time()
+                        self._ended.append(session)
+                    self._sessions.pop(session_id)
+
+    def _mark_lost(self) -> None:
+        for session in self._sessions.values():
+            if session.is_live:
+                session.state = SESSION_CRASHED
+                session.ended_at = time.time()
+                self._ended.append(session)
+
+    def _notify(self, session: BrowserSession) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(session)
+            except Exception as exc:
+                print(f'[LAUNCHER] Listener failed: {exc}')
+
+
+def main() -> int:
+    existing = connect_launcher()
+    if existing:
+        print(f'[LAUNCHER] Already running as pid {existing.info.pid} on {existing.info.url}')
+        return 0
+    from app.adapters.registry import reattach_session
+
+    registry = SessionRegistry(state_path=SESSIONS_STATE_PATH)
+    for session in registry.restore(reattach_session):
+        print(f'[LAUNCHER] Reattached {session.profile_id} (pid {session.pid})')
+    server = LauncherServer(registry, generate_token(), port=0, poll_sessions=True)
+    try:
+        server.run_forever()
+    finally:
+        remove_launcher_info(os.getpid())
+        print(f'[LAUNCHER] {stop_live_sessions(server.registry).summary()}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
-from typing import Optional, Any
+from collections import deque
+from typing import Optional
 
 from PyQt6 import QtWidgets
 
@@ -16,18 +17,42 @@ from app.ui_builders import (
     build_onboarding_page,
     build_browser_library_page,
     build_install_browser_page,
+    build_sessions_page,
+    build_diagnostics_page,
     build_navigation,
 )
-from app.workers import BrowserInstallWorker, BrowserLaunchWorker, BrowserVersionsWorker
+from app.workers import (
+    BackupWorker,
+    BrowserInstallWorker,
+    AsyncLaunchWorker,
+    BrowserVersionsWorker,
+    CaptureExportWorker,
+    LauncherLaunchWorker,
+    SessionFocusWorker,
+    SessionRestoreWorker,
+    ProfileCloneWorker,
+    RestoreWorker,
+    BackupPruneWorker,
+)
 from app.features.base import AppLogMixin
 from app.features.home import HomeMixin
 from app.features.settings import SettingsMixin
 from app.features.profiles import ProfilesMixin
-from app.features.launch import LaunchMixin
+from app.features.launch import LAUNCH_TIMINGS_KEPT, LaunchMixin
 from app.features.browser_library import BrowserLibraryMixin
 from app.features.install_browser import InstallBrowserMixin
 from app.features.onboarding import OnboardingMixin
-from app.spoofers.profile import ProfileConfig
+from app.features.sessions import SessionsMixin
+from app.features.diagnostics import DiagnosticsMixin
+from app.features.storage import StorageMixin
+from app.features.backup import BackupMixin
+from app.features.api import ApiMixin
+from app.api_server import ApiServer
+from app.launcher import RemoteSessionRegistry
+from app.profiler_capture import ProfilerCapture, write_capture_archive
+from app.sessions import SESSIONS_STATE_PATH, SessionRegistry
+from app.shutdown import ShutdownCoordinator
+from app.spoofers.profile import ProfileConfig, save_profile
 
 
 class MainWindow(
@@ -40,12 +65,31 @@ class MainWindow(
     BrowserLibraryMixin,
     InstallBrowserMixin,
     OnboardingMixin,
+    SessionsMixin,
+    DiagnosticsMixin,
+    StorageMixin,
+    BackupMixin,
+    ApiMixin,
 ):
     def __init__(self, settings: Optional[dict] = None) -> None:
         super().__init__()
         self._app_settings = settings or DEFAULT_APP_SETTINGS.copy()
         self._language_mode = self._app_settings.get('language', 'system')
         self._theme_mode = self._app_settings.get('theme', 'auto')
+        self._storage_quota_mb = int(self._app_settings.get('storage_quota_mb', DEFAULT_APP_SETTINGS['storage_quota_mb']))
+        self._api_enabled = bool(self._app_settings.get('api_enabled', False))
+        self._api_port = int(self._app_settings.get('api_port', DEFAULT_APP_SETTINGS['api_port']))
+        self._api_token = str(self._app_settings.get('api_token') or '')
+        self._stall_threshold_ms = int(
+            self._app_settings.get('stall_threshold_ms', DEFAULT_APP_SETTINGS['stall_threshold_ms'])
+        )
+        self._use_launcher = bool(self._app_settings.get('use_launcher', DEFAULT_APP_SETTINGS['use_launcher']))
+        self._hibernate_idle_minutes = int(
+            self._app_settings.get('hibernate_idle_minutes', DEFAULT_APP_SETTINGS['hibernate_idle_minutes'])
+        )
+        self._auto_quit_idle_minutes = int(
+            self._app_settings.get('auto_quit_idle_minutes', DEFAULT_APP_SETTINGS['auto_quit_idle_minutes'])
+        )
         self._language_code = resolve_language_code(self._language_mode)
         self._strings = UI_STRINGS[self._language_code]
         self._fluent_translator: Optional[FluentTranslator] = None
@@ -60,12 +104,28 @@ class MainWindow(
         self.setWindowTitle(self._t('window_title'))
         self.resize(1000, 650)
         self.setMinimumSize(520, 360)
-        self._pages: list[Any] = []
+        # Switching between the two needs a restart: sessions cannot move between processes.
+        if self._use_launcher:
+            self._session_registry = RemoteSessionRegistry()
+        else:
+            self._session_registry = SessionRegistry(state_path=SESSIONS_STATE_PATH)
+        self._session_registry.configure_hibernation(self._hibernate_idle_minutes, self._auto_quit_idle_minutes)
         self._current_profile_id: Optional[str] = None
         self._current_profile: Optional[ProfileConfig] = None
-        self._launch_worker: Optional[BrowserLaunchWorker] = None
+        self._launch_worker: Optional[AsyncLaunchWorker | LauncherLaunchWorker] = None
         self._browser_versions_worker: Optional[BrowserVersionsWorker] = None
         self._browser_install_worker: Optional[BrowserInstallWorker] = None
+        self._backup_worker: Optional[BackupWorker] = None
+        self._restore_worker: Optional[RestoreWorker] = None
+        self._backup_prune_worker: Optional[BackupPruneWorker] = None
+        self._clone_worker: Optional[ProfileCloneWorker] = None
+        self._api_server: Optional[ApiServer] = None
+        self._session_restore_worker: Optional[SessionRestoreWorker] = None
+        self._session_focus_worker: Optional[SessionFocusWorker] = None
+        self._capture_export_worker: Optional[CaptureExportWorker] = None
+        self._profiler = ProfilerCapture()
+        self._focus_started_at = 0.0
+        self._launch_timings: deque[dict] = deque(maxlen=LAUNCH_TIMINGS_KEPT)
         self._updating_protection = False
         self._updating_launch_combo = False
         self._updating_browser_combo = False
@@ -89,6 +149,11 @@ class MainWindow(
         self._apply_language()
         self._sync_settings_controls()
         self._apply_palette_overrides()
+        self._start_session_polling()
+        self._start_stall_watchdog()
+        self._restore_sessions()
+        self._start_storage_gc()
+        self._init_api_server()
         self._maybe_start_onboarding()
 
     def _build_ui(self) -> None:
@@ -97,6 +162,8 @@ class MainWindow(
         build_profiles_page(self)
         build_browser_library_page(self)
         build_install_browser_page(self)
+        build_sessions_page(self)
+        build_diagnostics_page(self)
         build_settings_page(self)
         build_onboarding_page(self)
         build_navigation(self)
@@ -105,15 +172,55 @@ class MainWindow(
         return self._strings.get(key, key)
 
     def closeEvent(self, event) -> None:  # noqa: N802
+        self._session_poll_timer.stop()
+        # Shutting down blocks the event loop on purpose; that is not a stall worth recording.
+        self._stop_stall_watchdog()
+        self._orphan_scan_timer.stop()
+        # No new launches may arrive once the browsers below are being shut down.
+        self._stop_api_server()
+        coordinator = ShutdownCoordinator()
+        pending = self._take_pending_profile_save()
+        if pending:
+            profile_id, profile = pending
+            coordinator.add_task(f'save:{profile_id}', lambda: save_profile(profile_id, profile))
         if self._theme_listener.isRunning():
             self._theme_listener.requestInterruption()
-            self._theme_listener.wait(1500)
-        for worker in (self._browser_versions_worker, self._browser_install_worker, self._launch_worker):
+            coordinator.add_task('theme-listener', self._theme_listener.wait)
+        if self._profiler.active:
+            # A capture still running is what the user wanted to look at: write it out.
+            result = self._profiler.stop()
+            attachments = self._capture_attachments()
+            coordinator.add_task('profiler-capture', lambda: write_capture_archive(result, attachments))
+        workers = {
+            'versions-worker': self._browser_versions_worker,
+            'install-worker': self._browser_install_worker,
+            'launch-worker': self._launch_worker,
+            'trash-reaper': self._trash_reaper_worker,
+            'orphan-scan': self._orphan_scan_worker,
+            'storage-usage': self._storage_usage_worker,
+            'cache-trim': self._cache_trim_worker,
+            'backup': self._backup_worker,
+            'restore': self._restore_worker,
+            'backup-prune': self._backup_prune_worker,
+            'clone': self._clone_worker,
+            'session-restore': self._session_restore_worker,
+            'session-focus': self._session_focus_worker,
+            'capture-export': self._capture_export_worker,
+        }
+        for label, worker in workers.items():
             if worker and worker.isRunning():
-                worker.wait(1500)
-        for page in self._pages:
-            try:
-                page.quit()
-            except Exception:
-                pass
+                coordinator.add_task(label, worker.wait)
+        if isinstance(self._session_registry, RemoteSessionRegistry):
+            # Launcher-owned browsers keep running; the next window picks them up again.
+            coordinator.add_task('launcher-mirror', self._session_registry.close)
+        else:
+            # Suspended renderers would ignore the quit and be killed at the deadline.
+            self._session_registry.wake_all()
+        for session in self._session_registry.live_sessions():
+            handle = session.handle
+            if handle is None:
+                continue
+            coordinator.add_browser(f'session:{session.profile_id}', handle.quit, session.pid, session.on_exit)
+        report = coordinator.run()
+        self._log(report.summary())
         event.accept()
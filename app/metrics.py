@@ -0,0 +1,301 @@
+"""
+In-process metrics for dashboards on shared machines.
+
+Counters, gauges and histograms live in one registry (REGISTRY). The code
+that does the work updates them directly: launch workers and the API
+server record launches, SessionRegistry.poll() records live sessions and
+their RSS, profile load/save and the GeoIP lookup time themselves, the
+storage scan records the profile store size, browser downloads their
+throughput and app.hibernation the sessions it froze and the CPU that
+saved. Nothing is sampled on its own; a metric only changes when the
+app does the thing it measures.
+
+The local API serves the registry in the Prometheus text format on
+GET /metrics (bearer token as for every other route):
+
+    scrape_configs:
+      - job_name: uselessbrowser
+        authorization: {credentials: <api token>}
+        static_configs: [{targets: ['127.0.0.1:17321']}]
+
+Each process has its own registry: with the launcher enabled, launches
+appear in the GUI's registry as seen from the GUI and in the launcher's
+as performed by it.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+METRIC_PREFIX = 'uselessbrowser_'
+LAUNCH_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+PROFILE_IO_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+GEOIP_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f'{self.name} takes labels {self.label_names}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _samples(self) -> list[tuple[str, str, float]]:
+        """(suffix, rendered labels, value) rows for the text format."""
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(f'{self.name}{suffix}{labels} {_format_value(value)}' for suffix, labels, value in self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError('counters only go up')
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [('_total', _format_labels(self.label_names, key), value) for key, value in items]
+
+    def render(self) -> list[str]:
+        # The family is named without _total, the samples with it.
+        base = self.name[:-len('_total')] if self.name.endswith('_total') else self.name
+        lines = [f'# HELP {base} {self.documentation}', f'# TYPE {base} counter']
+        lines.extend(f'{base}{suffix}{labels} {_format_value(value)}' for suffix, labels, value in self._samples())
+        return lines
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def replace(self, values: dict[LabelValues, float]) -> None:
+        """Swaps in a complete set of label values, e.g. one row per live session."""
+        for key in values:
+            if len(key) != len(self.label_names):
+                raise ValueError(f'{self.name} takes labels {self.label_names}')
+        with self._lock:
+            self._values = {tuple(str(part) for part in key): float(value) for key, value in values.items()}
+
+    def value(self, **labels: str) -> Optional[float]:
+        with self._lock:
+            return self._values.get(self._key(labels))
+
+    def _samples(self) -> list[tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [('', _format_labels(self.label_names, key), value) for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (), buckets: Iterable[float] = ()):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> (per-bucket counts, sum, count)
+        self._values: dict[LabelValues, tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def _samples(self) -> list[tuple[str, str, float]]:
+        with self._lock:
+            items = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items())
+        rows = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                rows.append(('_bucket', _format_labels(self.label_names, key, le), cumulative))
+            rows.append(('_sum', _format_labels(self.label_names, key), total))
+            rows.append(('_count', _format_labels(self.label_names, key), count))
+        return rows
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'metric {metric.name} is already registered')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Counter:
+        return self._add(Counter(METRIC_PREFIX + name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._add(Gauge(METRIC_PREFIX + name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Iterable[str] = (), buckets: Iterable[float] = ()) -> Histogram:
+        return self._add(Histogram(METRIC_PREFIX + name, documentation, labels, buckets))
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+LAUNCHES = REGISTRY.counter('launches_total', 'Browser launches by adapter and outcome.', ('adapter', 'outcome'))
+LAUNCH_DURATION = REGISTRY.histogram(
+    'launch_duration_seconds', 'Time from launch request to a usable browser.', ('adapter', 'outcome'), LAUNCH_BUCKETS
+)
+LAUNCH_FAILURES = REGISTRY.counter('launch_failures_total', 'Failed launches by adapter and cause.', ('adapter', 'cause'))
+SESSION_ENDS = REGISTRY.counter('session_ends_total', 'Sessions that ended, by how they ended.', ('adapter', 'state'))
+LIVE_SESSIONS = REGISTRY.gauge('live_sessions', 'Running browser sessions.', ('adapter',))
+SESSION_RSS = REGISTRY.gauge('session_rss_bytes', 'Resident memory of a live session.', ('profile', 'adapter'))
+PROFILE_STORE = REGISTRY.gauge(
+    'profile_store_bytes', 'Size of the user-data dirs under profiles/, as of the last scan.', ('browser', 'kind')
+)
+PROFILE_IO = REGISTRY.histogram(
+    'profile_io_seconds', 'Profile config load/save latency.', ('operation', 'outcome'), PROFILE_IO_BUCKETS
+)
+GEOIP_LOOKUPS = REGISTRY.counter(
+    'geoip_lookups_total', 'IP geolocation lookups; result is hit, fallback or local.', ('result',)
+)
+GEOIP_DURATION = REGISTRY.histogram(
+    'geoip_lookup_seconds', 'IP geolocation lookup latency.', ('result',), GEOIP_BUCKETS
+)
+DOWNLOAD_BYTES = REGISTRY.counter('download_bytes_total', 'Bytes downloaded, by kind.', ('kind',))
+DOWNLOAD_SECONDS = REGISTRY.counter('download_seconds_total', 'Time spent downloading, by kind.', ('kind',))
+DOWNLOAD_THROUGHPUT = REGISTRY.gauge(
+    'download_throughput_bytes_per_second', 'Throughput of the last finished download.', ('kind',)
+)
+HIBERNATIONS = REGISTRY.counter(
+    'hibernations_total', 'Idle sessions frozen, by adapter and method (cdp or suspend).', ('adapter', 'method')
+)
+HIBERNATION_CPU_SAVED = REGISTRY.counter(
+    'hibernation_cpu_saved_seconds_total', 'Estimated CPU time saved by hibernated sessions.', ('adapter',)
+)
+
+
+def failure_cause(exc: BaseException) -> str:
+    return type(exc).__name__
+
+
+def observe_launch(adapter_id: str, seconds: float, error: Optional[str] = None) -> None:
+    """`error` is the failure cause (see failure_cause); None for a successful launch."""
+    outcome = 'failure' if error else 'success'
+    LAUNCHES.inc(adapter=adapter_id, outcome=outcome)
+    LAUNCH_DURATION.observe(seconds, adapter=adapter_id, outcome=outcome)
+    if error:
+        LAUNCH_FAILURES.inc(adapter=adapter_id, cause=error)
+
+
+def observe_sessions(live: Iterable, ended: Iterable = ()) -> None:
+    """Takes BrowserSession objects: the live ones replace the previous gauges."""
+    per_adapter: dict[tuple[str], float] = {}
+    rss: dict[tuple[str, str], float] = {}
+    for session in live:
+        per_adapter[(session.adapter_id,)] = per_adapter.get((session.adapter_id,), 0) + 1
+        rss[(session.profile_id, session.adapter_id)] = session.rss_bytes
+    LIVE_SESSIONS.replace(per_adapter)
+    SESSION_RSS.replace(rss)
+    for session in ended:
+        SESSION_ENDS.inc(adapter=session.adapter_id, state=session.state)
+
+
+def observe_profile_store(usage: Iterable) -> None:
+    """Takes the UserDataUsage list of app.storage.measure_storage_usage()."""
+    totals: dict[tuple[str, str], float] = {}
+    for item in usage:
+        for kind, size in (('total', item.total_bytes), ('cache', item.cache_bytes)):
+            totals[(item.adapter_dir, kind)] = totals.get((item.adapter_dir, kind), 0) + size
+    PROFILE_STORE.replace(totals)
+
+
+def observe_download(kind: str, size: int, seconds: float) -> None:
+    DOWNLOAD_BYTES.inc(size, kind=kind)
+    DOWNLOAD_SECONDS.inc(seconds, kind=kind)
+    if seconds > 0:
+        DOWNLOAD_THROUGHPUT.set(size / seconds, kind=kind)
+
+
+def observe_hibernation(adapter_id: str, method: Optional[str] = None, cpu_saved: float = 0.0) -> None:
+    if method:
+        HIBERNATIONS.inc(adapter=adapter_id, method=method)
+    if cpu_saved > 0:
+        HIBERNATION_CPU_SAVED.inc(cpu_saved, adapter=adapter_id)
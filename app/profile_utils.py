@@ -1,10 +1,11 @@
 import json
-from typing import Optional
-
-from DrissionPage import ChromiumOptions
+from typing import TYPE_CHECKING, Optional
 
 from app.spoofers.profile import get_profiles_dir
 
+if TYPE_CHECKING:
+    from DrissionPage import ChromiumOptions
+
 
 def list_profile_entries() -> list[dict]:
     profiles_dir = get_profiles_dir()
@@ -20,7 +21,10 @@ def list_profile_entries() -> list[dict]:
     return entries
 
 
-def build_chromium_options(profile_id: str, browser_path: Optional[str] = None) -> ChromiumOptions:
+def build_chromium_options(profile_id: str, browser_path: Optional[str] = None) -> 'ChromiumOptions':
+    # Imported lazily so listing profiles (e.g. from app.cli) does not pay for DrissionPage.
+    from DrissionPage import ChromiumOptions
+
     co = ChromiumOptions()
 
     profiles_dir = get_profiles_dir()
@@ -0,0 +1,206 @@
+"""
+On-demand profiling for slowness and memory-growth reports.
+
+ProfilerCapture installs cProfile (on the thread that calls start(), i.e.
+the GUI thread) and tracemalloc only between start() and stop(), so nothing
+is hooked and nothing costs anything while no capture runs. snapshot()
+takes a tracemalloc snapshot; the snapshots are diffed against each other
+when the capture is written.
+
+write_capture_archive() bundles a stopped capture into one zip:
+
+    profile.prof      raw cProfile stats (pstats / snakeviz)
+    profile.txt       top functions by cumulative and by own time
+    memory.txt        allocation growth between consecutive snapshots and overall
+    environment.json  versions, platform, CPU and memory of the machine
+    + attachments     whatever the caller adds, e.g. launch timings and stalls
+"""
+import cProfile
+import io
+import json
+import marshal
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+import zipfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Optional
+
+import psutil
+
+CAPTURES_DIR = Path('logs/captures')
+TRACEMALLOC_FRAMES = 10
+TOP_FUNCTIONS = 80
+TOP_ALLOCATIONS = 25
+REPORTED_PACKAGES = ('PyQt6', 'PyQt6-Fluent-Widgets', 'DrissionPage', 'camoufox', 'playwright', 'psutil')
+
+
+@dataclass
+class MemorySnapshot:
+    label: str
+    taken_at: float
+    snapshot: tracemalloc.Snapshot
+    traced_bytes: int
+
+
+@dataclass
+class CaptureResult:
+    started_at: float
+    stopped_at: float
+    stats: Optional[pstats.Stats]
+    snapshots: list[MemorySnapshot] = field(default_factory=list)
+
+
+class ProfilerCapture:
+    def __init__(self):
+        self._profile: Optional[cProfile.Profile] = None
+        self._owns_tracemalloc = False
+        self._snapshots: list[MemorySnapshot] = []
+        self.started_at = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    @property
+    def snapshot_count(self) -> int:
+        return len(self._snapshots)
+
+    def start(self) -> None:
+        if self.active:
+            return
+        self._snapshots = []
+        # PYTHONTRACEMALLOC may already have it running; then it is left on afterwards.
+        self._owns_tracemalloc = not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.started_at = time.time()
+        self.snapshot('start')
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def snapshot(self, label: str = '') -> MemorySnapshot:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError('no capture is running')
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+        current, _ = tracemalloc.get_traced_memory()
+        entry = MemorySnapshot(label or f'snapshot {len(self._snapshots)}', time.time(), snapshot, current)
+        self._snapshots.append(entry)
+        return entry
+
+    def stop(self) -> CaptureResult:
+        if not self.active:
+            raise RuntimeError('no capture is running')
+        profile, self._profile = self._profile, None
+        profile.disable()
+        self.snapshot('stop')
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+        result = CaptureResult(self.started_at, time.time(), pstats.Stats(profile), self._snapshots)
+        self._snapshots = []
+        return result
+
+
+def _format_profile(stats: pstats.Stats) -> str:
+    out = io.StringIO()
+    stats.stream = out
+    for key, title in (('cumulative', 'cumulative time'), ('tottime', 'own time')):
+        out.write(f'=== Top {TOP_FUNCTIONS} by {title} ===\n')
+        stats.sort_stats(key).print_stats(TOP_FUNCTIONS)
+    return out.getvalue()
+
+
+def _format_memory(snapshots: list[MemorySnapshot]) -> str:
+    if not snapshots:
+        return ''
+    lines = []
+
+    def diff(old: MemorySnapshot, new: MemorySnapshot) -> None:
+        growth = (new.traced_bytes - old.traced_bytes) / 2**20
+        lines.append(
+            f'=== {old.label} -> {new.label} (+{new.taken_at - old.taken_at:.1f} s): '
+            f'{new.traced_bytes / 2**20:.1f} MiB traced, {growth:+.2f} MiB ==='
+        )
+        for stat in new.snapshot.compare_to(old.snapshot, 'lineno')[:TOP_ALLOCATIONS]:
+            lines.append(str(stat))
+        lines.append('')
+
+    for old, new in zip(snapshots, snapshots[1:]):
+        diff(old, new)
+    if len(snapshots) > 2:
+        diff(snapshots[0], snapshots[-1])
+    return '\n'.join(lines)
+
+
+def environment_info() -> dict:
+    packages = {}
+    for name in REPORTED_PACKAGES:
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            packages[name] = None
+    memory = psutil.virtual_memory()
+    process = psutil.Process()
+    try:
+        from PyQt6 import QtCore
+
+        qt_version = QtCore.QT_VERSION_STR
+    except Exception:
+        qt_version = None
+    return {
+        'python': sys.version,
+        'executable': sys.executable,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'memory_total': memory.total,
+        'memory_available': memory.available,
+        'process_rss': process.memory_info().rss,
+        'process_threads': process.num_threads(),
+        'qt': qt_version,
+        'packages': packages,
+    }
+
+
+def write_capture_archive(
+    result: CaptureResult,
+    attachments: Optional[dict[str, Any]] = None,
+    directory: Path = CAPTURES_DIR,
+) -> Path:
+    """Writes the bundle described in the module docstring; str attachments are stored as text, others as JSON."""
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.fromtimestamp(result.started_at).strftime('%Y%m%d-%H%M%S')
+    path = directory / f'capture-{stamp}.zip'
+    suffix = 1
+    while path.exists():
+        suffix += 1
+        path = directory / f'capture-{stamp}-{suffix}.zip'
+    environment = environment_info()
+    environment['capture'] = {
+        'started_at': datetime.fromtimestamp(result.started_at).isoformat(timespec='seconds'),
+        'duration_s': round(result.stopped_at - result.started_at, 3),
+        'snapshots': [snapshot.label for snapshot in result.snapshots],
+    }
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        if result.stats is not None:
+            archive.writestr('profile.prof', _dump_stats(result.stats))
+            archive.writestr('profile.txt', _format_profile(result.stats))
+        archive.writestr('memory.txt', _format_memory(result.snapshots))
+        archive.writestr('environment.json', json.dumps(environment, indent=2))
+        for name, content in (attachments or {}).items():
+            archive.writestr(name, content if isinstance(content, str) else json.dumps(content, indent=2, default=str))
+    return path
+
+
+def _dump_stats(stats: pstats.Stats) -> bytes:
+    # What pstats.Stats.dump_stats() writes to a file.
+    return marshal.dumps(stats.stats)
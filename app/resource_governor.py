@@ -0,0 +1,294 @@
+"""
+Per-profile CPU and memory limits for launched browsers.
+
+On Linux with cgroup v2, each profile gets its own cgroup next to the app's
+(`ub-<profile id>`), with cpu.weight, cpu.max and memory.max taken from the
+profile's BaseConfig, and the browser's whole process tree is moved into
+it. Processes the browser starts later inherit the cgroup, so renderers and
+GPU helpers count against the same limits. Live usage is read back from
+the cgroup's own files (see cgroup_usage).
+
+cgroup v2 only lets a group hand controllers to its children when it has
+no processes of its own, so the first placement moves the app itself into
+a leaf (`ub-app`), the same thing systemd-run --scope does. That needs the
+app's cgroup to be delegated to the user, as systemd does for user
+services and most container runtimes do for the container's root.
+
+Where cgroups are not usable (other systems, v1 hierarchies, no
+delegation) the CPU weight is approximated with nice/ionice on the process
+tree. Unprivileged processes can only lower their priority, so weights
+above the default have no effect there, and CPU quotas and memory limits
+are not enforced at all; this is printed once per launch.
+"""
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import psutil
+
+CGROUP_ROOT = Path('/sys/fs/cgroup')
+GROUP_PREFIX = 'ub-'
+APP_LEAF = 'ub-app'
+DEFAULT_CPU_WEIGHT = 100
+CPU_PERIOD_US = 100_000
+# Chrome keeps forking helpers while the tree is moved; stop once a pass finds no new process.
+MAX_MOVE_PASSES = 5
+
+
+@dataclass
+class ResourceLimits:
+    cpu_weight: int = 0
+    cpu_max_percent: int = 0
+    memory_max_mb: int = 0
+
+    @classmethod
+    def from_base_config(cls, base_config) -> 'ResourceLimits':
+        return cls(
+            cpu_weight=base_config.cpu_weight,
+            cpu_max_percent=base_config.cpu_max_percent,
+            memory_max_mb=base_config.memory_max_mb,
+        )
+
+    @property
+    def active(self) -> bool:
+        return bool(self.cpu_weight or self.cpu_max_percent or self.memory_max_mb)
+
+
+@dataclass
+class Placement:
+    pid: int
+    mode: str  # cgroup / nice / none
+    cgroup: Optional[Path] = None
+    nice: int = 0
+    # Limits that could not be applied in this mode.
+    unenforced: list[str] = field(default_factory=list)
+
+
+@dataclass
+class CgroupUsage:
+    cpu_usage_usec: int = 0
+    cpu_throttled_usec: int = 0
+    memory_current: int = 0
+    memory_peak: Optional[int] = None
+    memory_max: Optional[int] = None
+    oom_kills: int = 0
+
+
+def cgroup_of(pid: int | str = 'self', proc_root: Path = Path('/proc')) -> Optional[str]:
+    """The cgroup v2 path of a process ('/user.slice/...'), None without a unified hierarchy."""
+    try:
+        lines = (proc_root / str(pid) / 'cgroup').read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        if line.startswith('0::'):
+            return line[3:] or '/'
+    return None
+
+
+def governed_cgroup(pid: int, root: Path = CGROUP_ROOT) -> Optional[Path]:
+    """The profile cgroup a process was placed in, if any."""
+    path = cgroup_of(pid)
+    if not path:
+        return None
+    name = path.rsplit('/', 1)[-1]
+    if not name.startswith(GROUP_PREFIX) or name == APP_LEAF:
+        return None
+    return root / path.lstrip('/')
+
+
+def cgroup_usage(group: Path) -> Optional[CgroupUsage]:
+    try:
+        cpu_stat = _read_keyed(group / 'cpu.stat')
+        memory_current = int(_read(group / 'memory.current'))
+    except (OSError, ValueError):
+        return None
+    usage = CgroupUsage(
+        cpu_usage_usec=cpu_stat.get('usage_usec', 0),
+        cpu_throttled_usec=cpu_stat.get('throttled_usec', 0),
+        memory_current=memory_current,
+    )
+    for name, attr in (('memory.peak', 'memory_peak'), ('memory.max', 'memory_max')):
+        try:
+            value = _read(group / name)
+        except OSError:
+            continue
+        setattr(usage, attr, None if value == 'max' else int(value))
+    try:
+        usage.oom_kills = _read_keyed(group / 'memory.events').get('oom_kill', 0)
+    except OSError:
+        pass
+    return usage
+
+
+def nice_for_weight(weight: int) -> int:
+    """A nice value giving roughly `weight`/100 of the default CPU share (each nice step is ~1.25x)."""
+    if weight <= 0 or weight >= DEFAULT_CPU_WEIGHT:
+        return 0
+    return min(19, round(math.log(DEFAULT_CPU_WEIGHT / weight, 1.25)))
+
+
+def ionice_for_nice(nice: int) -> int:
+    # The kernel's own mapping for processes without an explicit I/O priority.
+    return max(0, min(7, (nice + 20) // 5))
+
+
+def _read(path: Path) -> str:
+    return path.read_text(encoding='utf-8').strip()
+
+
+def _read_keyed(path: Path) -> dict[str, int]:
+    values = {}
+    for line in _read(path).splitlines():
+        key, _, value = line.partition(' ')
+        if value.strip().isdigit():
+            values[key] = int(value)
+    return values
+
+
+def _write(path: Path, value: str) -> None:
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(value)
+
+
+def _process_tree(pid: int) -> list[psutil.Process]:
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+class ResourceGovernor:
+    def __init__(self, root: Path = CGROUP_ROOT, base: Optional[Path] = None):
+        self.root = root
+        # The cgroup the profile groups are created in; defaults to the app's own.
+        self._base = base
+        self._ready: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    def cgroups_available(self) -> bool:
+        with self._lock:
+            if self._ready is None:
+                self._ready = self._prepare()
+            return self._ready
+
+    def group_path(self, profile_id: str) -> Optional[Path]:
+        if not self.cgroups_available():
+            return None
+        return self._base / (GROUP_PREFIX + re.sub(r'[^A-Za-z0-9_.@-]', '_', profile_id))
+
+    def place(self, pid: int, profile_id: str, limits: ResourceLimits) -> Placement:
+        """Applies `limits` to the process tree of `pid`; never raises."""
+        if not limits.active:
+            return Placement(pid, 'none')
+        group = self.group_path(profile_id)
+        if group is not None:
+            try:
+                placement = self._place_in_cgroup(pid, group, limits)
+                print(f'[GOVERNOR] {profile_id} (pid {pid}) placed in {group}')
+                return placement
+            except OSError as exc:
+                print(f'[GOVERNOR] Could not use cgroup {group}: {exc}; falling back to nice')
+        placement = self._renice(pid, limits)
+        print(f'[GOVERNOR] {profile_id} (pid {pid}) reniced to {placement.nice}')
+        if placement.unenforced:
+            print(f'[GOVERNOR] Not enforced without cgroups for {profile_id}: {", ".join(placement.unenforced)}')
+        return placement
+
+    def _prepare(self) -> bool:
+        if not (self.root / 'cgroup.controllers').exists():
+            print('[GOVERNOR] No cgroup v2 hierarchy; resource limits fall back to nice/ionice')
+            return False
+        try:
+            if self._base is None:
+                own = cgroup_of()
+                if own is None:
+                    return False
+                self._base = self.root / own.lstrip('/')
+            base = self._base
+            if base.name == APP_LEAF:
+                # A previous app process already moved itself here; its parent holds the groups.
+                base = self._base = base.parent
+            available = set(_read(base / 'cgroup.controllers').split())
+            wanted = {'cpu', 'memory'} & available
+            if not wanted:
+                print(f'[GOVERNOR] {base} has no cpu/memory controllers delegated')
+                return False
+            enabled = set(_read(base / 'cgroup.subtree_control').split())
+            if not wanted <= enabled:
+                if base != self.root:
+                    self._move_out_of(base)
+                _write(base / 'cgroup.subtree_control', ' '.join(f'+{name}' for name in sorted(wanted - enabled)))
+        except OSError as exc:
+            print(f'[GOVERNOR] cgroups not usable here ({exc}); resource limits fall back to nice/ionice')
+            return False
+        return True
+
+    def _move_out_of(self, base: Path) -> None:
+        """Moves every process of `base` into its APP_LEAF child (the no-internal-processes rule)."""
+        leaf = base / APP_LEAF
+        leaf.mkdir(exist_ok=True)
+        for pid in _read(base / 'cgroup.procs').split():
+            try:
+                _write(leaf / 'cgroup.procs', pid)
+            except ProcessLookupError:
+                continue
+
+    def _place_in_cgroup(self, pid: int, group: Path, limits: ResourceLimits) -> Placement:
+        group.mkdir(exist_ok=True)
+        controllers = set(_read(group / 'cgroup.controllers').split())
+        unenforced = []
+        if 'cpu' in controllers:
+            _write(group / 'cpu.weight', str(limits.cpu_weight or DEFAULT_CPU_WEIGHT))
+            quota = limits.cpu_max_percent * CPU_PERIOD_US // 100
+            _write(group / 'cpu.max', f'{quota if quota else "max"} {CPU_PERIOD_US}')
+        elif limits.cpu_weight or limits.cpu_max_percent:
+            unenforced.append('cpu')
+        if 'memory' in controllers:
+            _write(group / 'memory.max', str(limits.memory_max_mb * 1024 * 1024) if limits.memory_max_mb else 'max')
+        elif limits.memory_max_mb:
+            unenforced.append('memory')
+        moved: set[int] = set()
+        for _ in range(MAX_MOVE_PASSES):
+            pending = [proc.pid for proc in _process_tree(pid) if proc.pid not in moved]
+            if not pending:
+                break
+            for child_pid in pending:
+                try:
+                    _write(group / 'cgroup.procs', str(child_pid))
+                except ProcessLookupError:
+                    pass
+                moved.add(child_pid)
+        return Placement(pid, 'cgroup', cgroup=group, unenforced=unenforced)
+
+    def _renice(self, pid: int, limits: ResourceLimits) -> Placement:
+        nice = nice_for_weight(limits.cpu_weight)
+        unenforced = [name for name, value in (
+            ('cpu_max_percent', limits.cpu_max_percent),
+            ('memory_max_mb', limits.memory_max_mb),
+        ) if value]
+        if limits.cpu_weight > DEFAULT_CPU_WEIGHT:
+            unenforced.append('cpu_weight')
+        for proc in _process_tree(pid):
+            try:
+                if os.name == 'nt':
+                    # Windows has priority classes instead of nice values.
+                    if nice:
+                        proc.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS if nice < 10 else psutil.IDLE_PRIORITY_CLASS)
+                        proc.ionice(psutil.IOPRIO_LOW)
+                    continue
+                if proc.nice() < nice:
+                    proc.nice(nice)
+                if nice and hasattr(psutil, 'IOPRIO_CLASS_BE'):
+                    proc.ionice(psutil.IOPRIO_CLASS_BE, ionice_for_nice(nice))
+            except psutil.Error:
+                continue
+        return Placement(pid, 'nice', nice=nice, unenforced=unenforced)
+
+
+GOVERNOR = ResourceGovernor()
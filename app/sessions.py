@@ -0,0 +1,524 @@
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+import psutil
+
+from app.file_lock import exclusive_lock
+from app.hibernation import Hibernator, thaw_record
+from app.metrics import observe_sessions
+from app.resource_governor import cgroup_usage, governed_cgroup
+
+SESSION_STARTING = 'starting'
+SESSION_RUNNING = 'running'
+SESSION_EXITED = 'exited'
+SESSION_CRASHED = 'crashed'
+SESSION_STOPPED = 'stopped'
+# Idle and frozen by app.hibernation; still live.
+SESSION_HIBERNATED = 'hibernated'
+
+LIVE_STATES = (SESSION_STARTING, SESSION_RUNNING, SESSION_HIBERNATED)
+
+# Ended sessions are kept for display only; their handles are already released.
+MAX_ENDED_SESSIONS = 50
+# How long on_exit callbacks wait for the browser to die after its handle is released.
+EXIT_WAIT_SECONDS = 10.0
+# Live sessions are recorded here so a restarted app (or app.cli) can find and reattach to them.
+SESSIONS_STATE_PATH = Path('config/sessions.json')
+STOP_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class BrowserSession:
+    session_id: str
+    profile_id: str
+    adapter_id: str
+    handle: Any = None
+    pid: Optional[int] = None
+    debug_port: Optional[int] = None
+    user_data_dir: Optional[str] = None
+    state: str = SESSION_RUNNING
+    started_at: float = field(default_factory=time.time)
+    ended_at: Optional[float] = None
+    exit_code: Optional[int] = None
+    cpu_percent: float = 0.0
+    rss_bytes: int = 0
+    # Set when app.resource_governor placed the browser in a cgroup of its own.
+    cgroup: Optional[str] = None
+    # Estimated CPU time app.hibernation saved by freezing the session while idle.
+    cpu_saved_seconds: float = 0.0
+    on_exit: Optional[Callable[[], None]] = field(default=None, repr=False)
+    # LaunchResult.profile_updates of the launch, already saved by whoever launched it; passed on
+    # so the GUI can merge them into the profile it has open. Not part of to_dict().
+    profile_updates: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def is_live(self) -> bool:
+        return self.state in LIVE_STATES
+
+    @property
+    def uptime(self) -> float:
+        end = self.ended_at or time.time()
+        return max(0.0, end - self.started_at)
+
+    def to_dict(self) -> dict:
+        return {
+            'session_id': self.session_id,
+            'profile_id': self.profile_id,
+            'adapter_id': self.adapter_id,
+            'pid': self.pid,
+            'debug_port': self.debug_port,
+            'user_data_dir': self.user_data_dir,
+            'state': self.state,
+            'started_at': self.started_at,
+            'ended_at': self.ended_at,
+            'exit_code': self.exit_code,
+            'cpu_percent': self.cpu_percent,
+            'rss_bytes': self.rss_bytes,
+            'cgroup': self.cgroup,
+            'cpu_saved_seconds': self.cpu_saved_seconds,
+        }
+
+
+def find_browser_pid(user_data_dir: str) -> Optional[int]:
+    """Finds the top-level browser process started by us for a user-data dir."""
+    if not user_data_dir:
+        return None
+    needle = str(user_data_dir)
+    try:
+        children = psutil.Process().children(recursive=True)
+    except psutil.Error:
+        return None
+    candidates = []
+    for proc in children:
+        try:
+            cmdline = proc.cmdline()
+        except psutil.Error:
+            continue
+        if any(needle in arg for arg in cmdline) and not any(arg.startswith('--type=') for arg in cmdline):
+            candidates.append(proc)
+    if not candidates:
+        return None
+    # The browser process is the oldest match; helpers are spawned after it.
+    candidates.sort(key=_create_time)
+    return candidates[0].pid
+
+
+def _create_time(proc: psutil.Process) -> float:
+    try:
+        return proc.create_time()
+    except psutil.Error:
+        return 0.0
+
+
+def terminate_process_tree(pid: int, timeout: float = STOP_TIMEOUT_SECONDS) -> None:
+    """Terminates a process and its children, killing whatever is still alive after `timeout`."""
+    try:
+        root = psutil.Process(pid)
+        procs = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return
+    for proc in procs:
+        try:
+            proc.terminate()
+        except psutil.Error:
+            pass
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    for proc in alive:
+        try:
+            proc.kill()
+        except psutil.Error:
+            pass
+    psutil.wait_procs(alive, timeout=timeout)
+
+
+class ProcessHandle:
+    """Handle for a browser that can only be managed as a process, e.g. one reattached without a driver."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+
+    def quit(self) -> None:
+        terminate_process_tree(self.pid)
+
+
+def _release_handle(handle: Any) -> None:
+    try:
+        handle.quit()
+    except Exception:
+        pass
+
+
+class _ProcessSampler:
+    """Keeps psutil handles across polls so cpu_percent() has a baseline."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self._root = psutil.Process(pid)
+        self._procs: dict[int, psutil.Process] = {pid: self._root}
+        self.cgroup = governed_cgroup(pid)
+        self._cgroup_cpu: Optional[tuple[float, int]] = None
+
+    def is_running(self) -> bool:
+        try:
+            return self._root.is_running() and self._root.status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
+    def exit_code(self) -> Optional[int]:
+        try:
+            return self._root.wait(timeout=0)
+        except (psutil.TimeoutExpired, psutil.Error):
+            return None
+
+    def sample(self) -> tuple[float, int]:
+        if self.cgroup is not None:
+            usage = cgroup_usage(self.cgroup)
+            if usage is not None:
+                return self._cgroup_cpu_percent(usage.cpu_usage_usec), usage.memory_current
+        try:
+            tree = [self._root] + self._root.children(recursive=True)
+        except psutil.Error:
+            return 0.0, 0
+        procs: dict[int, psutil.Process] = {}
+        for proc in tree:
+            procs[proc.pid] = self._procs.get(proc.pid, proc)
+        self._procs = procs
+        cpu = 0.0
+        rss = 0
+        for proc in procs.values():
+            try:
+                cpu += proc.cpu_percent(None)
+                rss += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return cpu, rss
+
+    def _cgroup_cpu_percent(self, usage_usec: int) -> float:
+        # The cgroup holds the whole browser tree, so one counter replaces the per-process walk.
+        # Its memory.current also counts page cache charged to the browser, unlike the RSS sum.
+        now = time.monotonic()
+        previous, self._cgroup_cpu = self._cgroup_cpu, (now, usage_usec)
+        if previous is None or now <= previous[0]:
+            return 0.0
+        return (usage_usec - previous[1]) / 1e6 / (now - previous[0]) * 100
+
+
+class SessionRegistry:
+    """
+    Tracks every browser launched by the app.
+
+    Sessions are polled for exit/crash; once a session ends its handle is
+    released on a background thread so DrissionPage/Playwright objects and
+    their websocket threads do not outlive the browser.
+
+    With a `state_path`, live sessions are also written to disk so that the
+    next app process can restore() them instead of launching a second browser
+    on the same user-data dir.
+
+    Idle sessions are frozen by `hibernator` (see app.hibernation) once
+    configure_hibernation() turned it on.
+    """
+
+    def __init__(self, release: Callable[[Any], None] = _release_handle, state_path: Optional[Path] = None):
+        self._state_path = state_path
+        self._lock = threading.RLock()
+        self._sessions: dict[str, BrowserSession] = {}
+        self._samplers: dict[str, _ProcessSampler] = {}
+        self._release = release
+        self._listeners: list[Callable[[BrowserSession], None]] = []
+        self.hibernator = Hibernator(on_change=self._on_hibernation_changed)
+
+    def configure_hibernation(self, idle_minutes: float, quit_minutes: float) -> None:
+        """Freezes sessions idle for `idle_minutes` and stops those idle for `quit_minutes`; 0 turns either off."""
+        with self._lock:
+            self.hibernator.configure(idle_minutes * 60, quit_minutes * 60)
+
+    def hibernation_config(self) -> dict:
+        return {
+            'idle_minutes': self.hibernator.idle_seconds / 60,
+            'quit_minutes': self.hibernator.quit_seconds / 60,
+        }
+
+    def add_listener(self, callback: Callable[[BrowserSession], None]) -> None:
+        """Registers a callback invoked (from poll()) whenever a session ends."""
+        self._listeners.append(callback)
+
+    def register(
+        self,
+        profile_id: str,
+        adapter_id: str,
+        handle: Any,
+        pid: Optional[int] = None,
+        debug_port: Optional[int] = None,
+        user_data_dir: Optional[str] = None,
+        on_exit: Optional[Callable[[], None]] = None,
+        session_id: Optional[str] = None,
+        started_at: Optional[float] = None,
+    ) -> BrowserSession:
+        if pid is None and user_data_dir:
+            pid = find_browser_pid(user_data_dir)
+        session = BrowserSession(
+            session_id=session_id or uuid.uuid4().hex[:12],
+            profile_id=profile_id,
+            adapter_id=adapter_id,
+            handle=handle,
+            pid=pid,
+            debug_port=debug_port,
+            user_data_dir=user_data_dir,
+            on_exit=on_exit,
+        )
+        if started_at:
+            session.started_at = started_at
+        with self._lock:
+            self._sessions[session.session_id] = session
+            if pid:
+                try:
+                    sampler = self._samplers[session.session_id] = _ProcessSampler(pid)
+                    session.cgroup = str(sampler.cgroup) if sampler.cgroup else None
+                except psutil.Error:
+                    session.state = SESSION_EXITED
+                    self._end(session)
+            if session.is_live:
+                self._persist([session])
+        return session
+
+    def restore(self, attach: Callable[[dict], Any]) -> list[BrowserSession]:
+        """
+        Re-registers recorded sessions whose browser is still running.
+
+        `attach(record)` returns a LaunchResult for the running browser (or
+        None); records it cannot attach to are still tracked by pid.
+        """
+        if self._state_path is None:
+            return []
+        restored = []
+        for record in load_session_records(self._state_path):
+            with self._lock:
+                known = record['session_id'] in self._sessions or any(
+                    s.pid == record.get('pid') for s in self._sessions.values() if s.is_live
+                )
+            if known:
+                continue
+            if record.get('state') == SESSION_HIBERNATED:
+                # Suspended renderers would hang the reattach; the idle timer starts over.
+                thaw_record(record)
+            result = None
+            try:
+                result = attach(record)
+            except Exception as exc:
+                print(f'[SESSIONS] Could not reattach {record.get("profile_id")}: {exc}')
+            pid = record.get('pid')
+            restored.append(self.register(
+                record['profile_id'],
+                record.get('adapter_id', 'chromium'),
+                result.page if result else ProcessHandle(pid),
+                pid=pid,
+                debug_port=record.get('debug_port'),
+                user_data_dir=record.get('user_data_dir'),
+                on_exit=result.on_exit if result else None,
+                session_id=record['session_id'],
+                started_at=record.get('started_at'),
+            ))
+        return restored
+
+    def focus(self, session_id: str) -> bool:
+        """Brings the session's browser window to the front, if its adapter can."""
+        session = self.get(session_id)
+        handle = session.handle if session and session.is_live else None
+        if handle is None:
+            return False
+        with self._lock:
+            thawing = self.hibernator.touch(session_id)
+        if thawing is not None:
+            try:
+                thawing.result(timeout=EXIT_WAIT_SECONDS)
+            except Exception as exc:
+                print(f'[SESSIONS] Could not thaw {session.profile_id}: {exc}')
+        from app.adapters.registry import get_adapter
+
+        return get_adapter(session.adapter_id).focus(handle)
+
+    def get(self, session_id: str) -> Optional[BrowserSession]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def sessions(self) -> list[BrowserSession]:
+        with self._lock:
+            return sorted(self._sessions.values(), key=lambda s: s.started_at)
+
+    def live_sessions(self) -> list[BrowserSession]:
+        return [s for s in self.sessions() if s.is_live]
+
+    def find_live_by_profile(self, profile_id: str) -> Optional[BrowserSession]:
+        for session in self.live_sessions():
+            if session.profile_id == profile_id:
+                return session
+        return None
+
+    def poll(self) -> list[BrowserSession]:
+        """Samples CPU/RSS of live sessions; returns the sessions that ended since the last poll."""
+        ended: list[BrowserSession] = []
+        with self._lock:
+            for session in list(self._sessions.values()):
+                if not session.is_live:
+                    continue
+                sampler = self._samplers.get(session.session_id)
+                if sampler is None:
+                    # No process of its own (e.g. a context of the shared browser): ask the handle.
+                    is_alive = getattr(session.handle, 'is_alive', None)
+                    if is_alive is None or is_alive():
+                        continue
+                    session.state = SESSION_EXITED
+                    self._end(session)
+                    ended.append(session)
+                    continue
+                if sampler.is_running():
+                    session.cpu_percent, session.rss_bytes = sampler.sample()
+                    continue
+                code = sampler.exit_code()
+                session.exit_code = code
+                session.state = SESSION_CRASHED if code not in (None, 0) else SESSION_EXITED
+                self._end(session)
+                ended.append(session)
+            owned = [s for s in self._sessions.values() if s.is_live and s.session_id in self._samplers]
+            for session in self.hibernator.check(owned):
+                print(f'[SESSIONS] Stopping {session.profile_id}, idle for {self.hibernator.quit_seconds / 60:.0f} min')
+                session.state = SESSION_STOPPED
+                self._end(session)
+                ended.append(session)
+            self._prune()
+            observe_sessions(self.live_sessions(), ended)
+        for session in ended:
+            self._notify(session)
+        return ended
+
+    def stop(self, session_id: str) -> Optional[BrowserSession]:
+        """Marks a session as stopped and quits its browser in the background."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if not session or not session.is_live:
+                return session
+            session.state = SESSION_STOPPED
+            self._end(session)
+        self._notify(session)
+        return session
+
+    def wake_all(self) -> None:
+        """Thaws every hibernated session, e.g. before the app quits them."""
+        with self._lock:
+            self.hibernator.wake_all()
+
+    def _on_hibernation_changed(self, session: BrowserSession, frozen: bool) -> None:
+        with self._lock:
+            if not session.is_live:
+                return
+            session.state = SESSION_HIBERNATED if frozen else SESSION_RUNNING
+            self._persist([session])
+
+    def _end(self, session: BrowserSession) -> None:
+        self.hibernator.forget(session.session_id)
+        session.ended_at = time.time()
+        session.cpu_percent = 0.0
+        session.rss_bytes = 0
+        self._samplers.pop(session.session_id, None)
+        handle, session.handle = session.handle, None
+        on_exit, session.on_exit = session.on_exit, None
+        self._persist(remove=[session.session_id])
+        if handle is not None or on_exit is not None:
+            threading.Thread(target=self._finish, args=(handle, on_exit, session.pid), daemon=True).start()
+
+    def _finish(self, handle: Any, on_exit: Optional[Callable[[], None]], pid: Optional[int]) -> None:
+        if handle is not None:
+            self._release(handle)
+        if on_exit is None:
+            return
+        if pid:
+            try:
+                psutil.Process(pid).wait(timeout=EXIT_WAIT_SECONDS)
+            except (psutil.TimeoutExpired, psutil.Error):
+                pass
+        try:
+            on_exit()
+        except Exception as exc:
+            print(f'[SESSIONS] Exit callback failed: {exc}')
+
+    def _persist(self, upsert: Iterable[BrowserSession] = (), remove: Iterable[str] = ()) -> None:
+        if self._state_path is None:
+            return
+        try:
+            update_session_records([session_record(s) for s in upsert], remove, self._state_path)
+        except OSError as exc:
+            print(f'[SESSIONS] Failed to save {self._state_path}: {exc}')
+
+    def _prune(self) -> None:
+        ended = [s for s in self._sessions.values() if not s.is_live]
+        if len(ended) <= MAX_ENDED_SESSIONS:
+            return
+        ended.sort(key=lambda s: s.ended_at or 0)
+        for session in ended[: len(ended) - MAX_ENDED_SESSIONS]:
+            self._sessions.pop(session.session_id, None)
+
+    def _notify(self, session: BrowserSession) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(session)
+            except Exception as exc:
+                print(f'[SESSIONS] Listener failed: {exc}')
+
+
+def _process_create_time(pid: Optional[int]) -> Optional[float]:
+    if not pid:
+        return None
+    try:
+        return psutil.Process(pid).create_time()
+    except psutil.Error:
+        return None
+
+
+def session_record(session: BrowserSession) -> dict:
+    record = session.to_dict()
+    # Guards against the pid being reused by an unrelated process later.
+    record['pid_create_time'] = _process_create_time(session.pid)
+    return record
+
+
+def is_record_alive(record: dict) -> bool:
+    created = _process_create_time(record.get('pid'))
+    return created is not None and created == record.get('pid_create_time')
+
+
+def load_session_records(path: Path = SESSIONS_STATE_PATH) -> list[dict]:
+    """Recorded sessions whose browser process is still the one that was launched."""
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return []
+    records = data.get('sessions', []) if isinstance(data, dict) else []
+    return [record for record in records if isinstance(record, dict) and is_record_alive(record)]
+
+
+def save_session_records(records: list[dict], path: Path = SESSIONS_STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps({'sessions': records}, indent=2), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def update_session_records(
+    upsert: Iterable[dict] = (),
+    remove: Iterable[str] = (),
+    path: Path = SESSIONS_STATE_PATH,
+) -> None:
+    """Adds or replaces some records and drops others, keeping the records of other processes."""
+    upsert = list(upsert)
+    drop = set(remove) | {record['session_id'] for record in upsert}
+    # Another process may update the file between the read and the write; the lock keeps its change.
+    with exclusive_lock(path.with_name(f'{path.name}.lock')):
+        records = [record for record in load_session_records(path) if record.get('session_id') not in drop]
+        save_session_records(records + upsert, path)
@@ -0,0 +1,156 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import psutil
+
+SHUTDOWN_DEADLINE_SECONDS = 5.0
+# Share of the deadline given to graceful quits before processes are killed.
+GRACEFUL_SHARE = 0.6
+# How long a browser whose quit() returned gets to exit before it is killed.
+EXIT_GRACE_SECONDS = 0.5
+
+
+@dataclass
+class ShutdownReport:
+    elapsed: float = 0.0
+    finished: list[str] = field(default_factory=list)
+    killed: list[str] = field(default_factory=list)
+    alive: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        parts = [f'finished={len(self.finished)}', f'killed={len(self.killed)}']
+        if self.alive:
+            parts.append(f'still alive: {", ".join(self.alive)}')
+        return f'Shutdown took {self.elapsed:.2f}s ({"; ".join(parts)})'
+
+
+@dataclass(eq=False)
+class _Job:
+    label: str
+    fn: Callable[[], Any]
+    pid: Optional[int] = None
+    cleanup: Optional[Callable[[], Any]] = None
+    done: threading.Event = field(default_factory=threading.Event)
+    error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            self.fn()
+        except BaseException as exc:
+            self.error = exc
+        finally:
+            self.done.set()
+
+
+def _process_tree(pid: int) -> list[psutil.Process]:
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+class ShutdownCoordinator:
+    """
+    Runs shutdown work concurrently under one global deadline.
+
+    Jobs run on daemon threads so a hung quit() can never keep the
+    interpreter alive. Browser jobs that miss the graceful window have
+    their process tree killed, as do those whose quit() returned but whose
+    process outlives a short grace; a browser's cleanup runs once its
+    process is gone. Anything still running at the deadline is reported as alive.
+    """
+
+    def __init__(self, deadline: float = SHUTDOWN_DEADLINE_SECONDS):
+        self.deadline = deadline
+        self._jobs: list[_Job] = []
+
+    def add_task(self, label: str, fn: Callable[[], Any]) -> None:
+        self._jobs.append(_Job(label=label, fn=fn))
+
+    def add_browser(
+        self,
+        label: str,
+        quit_fn: Callable[[], Any],
+        pid: Optional[int],
+        cleanup: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self._jobs.append(_Job(label=label, fn=quit_fn, pid=pid, cleanup=cleanup))
+
+    def run(self) -> ShutdownReport:
+        started = time.monotonic()
+        end = started + self.deadline
+        report = ShutdownReport()
+
+        for job in self._jobs:
+            threading.Thread(target=job.run, name=f'shutdown-{job.label}', daemon=True).start()
+
+        self._wait_jobs(self._jobs, started + self.deadline * GRACEFUL_SHARE)
+
+        # quit() returning does not mean the process has exited yet.
+        exiting = [
+            proc for job in self._jobs if job.pid is not None and job.done.is_set()
+            for proc in _process_tree(job.pid)
+        ]
+        if exiting:
+            psutil.wait_procs(exiting, timeout=max(0.0, min(EXIT_GRACE_SECONDS, end - time.monotonic())))
+
+        doomed: list[psutil.Process] = []
+        killed: list[_Job] = []
+        for job in self._jobs:
+            if job.pid is None:
+                continue
+            tree = [proc for proc in _process_tree(job.pid) if proc.is_running()]
+            if not tree:
+                # The browser is gone even if quit() is still tearing down its websocket.
+                job.done.set()
+                continue
+            for proc in tree:
+                try:
+                    proc.kill()
+                except psutil.Error:
+                    pass
+            doomed.extend(tree)
+            killed.append(job)
+
+        if doomed:
+            _, still_alive = psutil.wait_procs(doomed, timeout=max(0.0, end - time.monotonic()))
+            alive_pids = {proc.pid for proc in still_alive}
+            for job in killed:
+                if job.pid not in alive_pids:
+                    job.done.set()
+
+        cleanups: list[_Job] = []
+        for job in self._jobs:
+            if job.cleanup is None:
+                continue
+            # A graceful quit may still be running; only clean up once the process is really gone.
+            if job.pid is not None and any(proc.is_running() for proc in _process_tree(job.pid)):
+                continue
+            if job.pid is None and not job.done.is_set():
+                continue
+            cleanup = _Job(label=f'cleanup:{job.label}', fn=job.cleanup)
+            threading.Thread(target=cleanup.run, name=f'shutdown-{cleanup.label}', daemon=True).start()
+            cleanups.append(cleanup)
+
+        self._wait_jobs(self._jobs + cleanups, end)
+        for job in self._jobs + cleanups:
+            if not job.done.is_set():
+                report.alive.append(job.label)
+            elif job in killed:
+                report.killed.append(job.label)
+            else:
+                report.finished.append(job.label)
+            if job.error is not None:
+                print(f'[SHUTDOWN] {job.label} failed: {job.error}')
+        report.elapsed = time.monotonic() - started
+        return report
+
+    def _wait_jobs(self, jobs: list[_Job], until: float) -> None:
+        for job in jobs:
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                return
+            job.done.wait(remaining)
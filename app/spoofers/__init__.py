@@ -52,6 +52,9 @@ from .cdp_spoofer import (
     CDPSpoofer,
     apply_cdp_spoofing,
     apply_pre_navigation_spoofing,
+    apply_pre_navigation_spoofing_async,
+    run_pre_navigation,
+    run_pre_navigation_async,
 )
 
 # Behavior (Python module, not JS)
@@ -93,6 +96,9 @@ __all__ = [
     'CDPSpoofer',
     'apply_cdp_spoofing',
     'apply_pre_navigation_spoofing',
+    'apply_pre_navigation_spoofing_async',
+    'run_pre_navigation',
+    'run_pre_navigation_async',
     # Behavior
     'BehaviorSpoofModule',
     # All modules
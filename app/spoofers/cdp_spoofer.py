@@ -5,7 +5,8 @@ CDP-based спуфинг для DrissionPage
 Собирает JS из всех модулей и инжектит через CDP.
 """
 
-from typing import Dict, List, Optional
+import asyncio
+from typing import Dict, List, NamedTuple, Optional, Sequence
 
 from .profile import SpoofProfile, PROFILES, generate_random_profile
 from .automation import AutomationSpoofModule
@@ -64,6 +65,40 @@ MODULE_GATES = {
 }
 
 
+# Proxy чтобы полностью скрыть webdriver ('webdriver' in navigator === false)
+WEBDRIVER_PROXY_JS = '''
+    const originalNavigator = window.navigator;
+    const navigatorProxy = new Proxy(originalNavigator, {
+        has: function(target, prop) {
+            if (prop === 'webdriver') return false;
+            return prop in target;
+        },
+        get: function(target, prop) {
+            if (prop === 'webdriver') return undefined;
+            const value = target[prop];
+            if (typeof value === 'function') {
+                return value.bind(target);
+            }
+            return value;
+        }
+    });
+
+    Object.defineProperty(window, 'navigator', {
+        get: () => navigatorProxy,
+        configurable: true
+    });
+'''
+
+
+class CDPCommand(NamedTuple):
+    """Одна CDP-команда спуфинга; required - её сбой делает весь спуфинг неуспешным."""
+    method: str
+    params: dict
+    label: str
+    required: bool = False
+    fallback: Optional['CDPCommand'] = None
+
+
 class CDPSpoofer:
     """
     Спуфер на основе Chrome DevTools Protocol.
@@ -283,6 +318,57 @@ class CDPSpoofer:
         
         return results
     
+    def pre_navigation_commands(self) -> List[CDPCommand]:
+        """
+        CDP-команды для спуфинга ДО навигации, в порядке применения.
+
+        Один и тот же список исполняется синхронно (apply_pre_navigation через
+        DrissionPage) и асинхронно (apply_pre_navigation_async через app.cdp).
+        """
+        p = self.profile
+        commands = [
+            # 0. Отключаем webdriver через Proxy (КРИТИЧНО!)
+            # Proxy нужен чтобы 'webdriver' in navigator возвращал false
+            CDPCommand('Page.addScriptToEvaluateOnNewDocument', {'source': WEBDRIVER_PROXY_JS},
+                       'WebDriver hidden', required=True),
+            CDPCommand('Emulation.setUserAgentOverride', {
+                'userAgent': p.user_agent,
+                'platform': p.platform,
+                'acceptLanguage': f"{p.locale},en;q=0.9",
+            }, 'User-Agent', required=True),
+        ]
+        if getattr(p, 'protect_timezone', True):
+            commands.append(CDPCommand('Emulation.setTimezoneOverride', {'timezoneId': p.timezone},
+                                       f'Timezone: {p.timezone}'))
+        if getattr(p, 'protect_geolocation', True):
+            commands.append(CDPCommand('Emulation.setGeolocationOverride', {
+                'latitude': p.latitude,
+                'longitude': p.longitude,
+                'accuracy': p.accuracy,
+            }, 'Geolocation'))
+        commands.append(CDPCommand('Emulation.setDeviceMetricsOverride', {
+            'width': p.screen_width,
+            'height': p.screen_height,
+            'deviceScaleFactor': p.pixel_ratio,
+            'mobile': False,
+        }, 'Device metrics'))
+        # Permission override через CDP (для Notification.permission)
+        # Fallback: пробуем через Emulation
+        commands.append(CDPCommand(
+            'Browser.setPermission',
+            {'permission': {'name': 'notifications'}, 'setting': 'prompt'},
+            'Notification permission: prompt',
+            fallback=CDPCommand(
+                'Emulation.setPermissionOverride',
+                {'permission': {'name': 'notifications'}, 'setting': 'prompt'},
+                'Notification permission (emulation): prompt',
+            ),
+        ))
+        # Персистентный JS-инжект
+        commands.append(CDPCommand('Page.addScriptToEvaluateOnNewDocument', {'source': self._collect_js()},
+                                   f'Persistent JS ({len(self._modules)} modules)', required=True))
+        return commands
+
     def apply_pre_navigation(self, page) -> bool:
         """
         Применяет спуфинг ДО навигации на страницу.
@@ -295,119 +381,19 @@ class CDPSpoofer:
         Returns:
             True если успешно
         """
-        p = self.profile
-        success = True
-        
-        print("[SPOOF] Applying pre-navigation spoofing...")
-        
-        # 0. Отключаем webdriver через Proxy (КРИТИЧНО!)
-        # Proxy нужен чтобы 'webdriver' in navigator возвращал false
-        try:
-            page.run_cdp('Page.addScriptToEvaluateOnNewDocument', source='''
-                // Используем Proxy чтобы полностью скрыть webdriver
-                const originalNavigator = window.navigator;
-                const navigatorProxy = new Proxy(originalNavigator, {
-                    has: function(target, prop) {
-                        if (prop === 'webdriver') return false;
-                        return prop in target;
-                    },
-                    get: function(target, prop) {
-                        if (prop === 'webdriver') return undefined;
-                        const value = target[prop];
-                        if (typeof value === 'function') {
-                            return value.bind(target);
-                        }
-                        return value;
-                    }
-                });
-                
-                Object.defineProperty(window, 'navigator', {
-                    get: () => navigatorProxy,
-                    configurable: true
-                });
-            ''')
-            print("   [OK] WebDriver hidden")
-        except Exception as e:
-            print(f"   [WARN] WebDriver hide: {e}")
-            success = False
-        
-        # CDP настройки
-        try:
-            page.run_cdp('Emulation.setUserAgentOverride', 
-                userAgent=p.user_agent,
-                platform=p.platform,
-                acceptLanguage=f"{p.locale},en;q=0.9"
-            )
-            print(f"   [OK] User-Agent")
-        except Exception as e:
-            print(f"   [WARN] User-Agent: {e}")
-            success = False
-        
-        # 2. Timezone 折快把快戒 CDP
-        if getattr(p, 'protect_timezone', True):
-            try:
-                page.run_cdp('Emulation.setTimezoneOverride', timezoneId=p.timezone)
-                print(f"   [OK] Timezone: {p.timezone}")
-            except Exception as e:
-                print(f"   [WARN] Timezone: {e}")
-        else:
-            print('   [OK] Timezone spoof disabled')
+        return run_pre_navigation(page, self.pre_navigation_commands())
 
-        # 3. Geolocation 折快把快戒 CDP
-        if getattr(p, 'protect_geolocation', True):
-            try:
-                page.run_cdp('Emulation.setGeolocationOverride',
-                    latitude=p.latitude,
-                    longitude=p.longitude,
-                    accuracy=p.accuracy
-                )
-                print(f"   [OK] Geolocation")
-            except Exception as e:
-                print(f"   [WARN] Geolocation: {e}")
-        else:
-            print('   [OK] Geolocation spoof disabled')
+    async def apply_pre_navigation_async(self, cdp, session_id: Optional[str] = None) -> bool:
+        """Асинхронный вариант apply_pre_navigation для app.cdp.CDPConnection."""
+        return await run_pre_navigation_async(cdp, self.pre_navigation_commands(), session_id)
 
-        try:
-            page.run_cdp('Emulation.setDeviceMetricsOverride',
-                width=p.screen_width,
-                height=p.screen_height,
-                deviceScaleFactor=p.pixel_ratio,
-                mobile=False
-            )
-            print(f"   [OK] Device metrics")
-        except Exception as e:
-            print(f"   [WARN] Device metrics: {e}")
-        
-        # Permission override через CDP (для Notification.permission)
-        try:
-            # Устанавливаем notifications permission в 'prompt' для всех origins
-            page.run_cdp('Browser.setPermission',
-                permission={'name': 'notifications'},
-                setting='prompt'
-            )
-            print(f"   [OK] Notification permission: prompt")
-        except Exception as e:
-            # Fallback: пробуем через Emulation
-            try:
-                page.run_cdp('Emulation.setPermissionOverride',
-                    permission={'name': 'notifications'},
-                    setting='prompt'
-                )
-                print(f"   [OK] Notification permission (emulation): prompt")
-            except:
-                print(f"   [WARN] Notification permission: {e}")
-        
-        # Персистентный JS-инжект
-        try:
-            js_code = self._collect_js()
-            page.run_cdp('Page.addScriptToEvaluateOnNewDocument', source=js_code)
-            print(f"   [OK] Persistent JS ({len(self._modules)} modules)")
-        except Exception as e:
-            print(f"   [FAIL] Persistent JS: {e}")
-            success = False
-        
-        print("[SPOOF] Pre-navigation spoofing ready")
-        return success
+    @staticmethod
+    def _report(command: CDPCommand, error: Optional[Exception]) -> bool:
+        if error is None:
+            print(f"   [OK] {command.label}")
+            return True
+        print(f"   [{'FAIL' if command.required else 'WARN'}] {command.label}: {error}")
+        return not command.required
     
     def get_modules_info(self) -> List[Dict]:
         """Возвращает информацию о всех модулях"""
@@ -417,6 +403,55 @@ class CDPSpoofer:
         ]
 
 
+def run_pre_navigation(page, commands: Sequence[CDPCommand]) -> bool:
+    """
+    Выполняет готовый список команд (CDPSpoofer.pre_navigation_commands)
+    через DrissionPage. Список можно собрать один раз и переиспользовать,
+    см. app.launch_plan.
+    """
+    print("[SPOOF] Applying pre-navigation spoofing...")
+    success = True
+    for command in commands:
+        error = None
+        try:
+            page.run_cdp(command.method, **command.params)
+        except Exception as e:
+            error = e
+        if error is not None and command.fallback:
+            try:
+                page.run_cdp(command.fallback.method, **command.fallback.params)
+                command, error = command.fallback, None
+            except Exception:
+                pass
+        success = CDPSpoofer._report(command, error) and success
+    print("[SPOOF] Pre-navigation spoofing ready")
+    return success
+
+
+async def run_pre_navigation_async(cdp, commands: Sequence[CDPCommand], session_id: Optional[str] = None) -> bool:
+    """
+    Асинхронный вариант run_pre_navigation для app.cdp.CDPConnection.
+
+    Все команды отправляются разом (pipelining): браузер выполняет их
+    по порядку, а ожидание ответов стоит примерно один round trip.
+    """
+    print("[SPOOF] Applying pre-navigation spoofing...")
+    futures = [cdp.send_nowait(c.method, c.params, session_id) for c in commands]
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    success = True
+    for command, result in zip(commands, results):
+        error = result if isinstance(result, Exception) else None
+        if error is not None and command.fallback:
+            try:
+                await cdp.send(command.fallback.method, command.fallback.params, session_id)
+                command, error = command.fallback, None
+            except Exception:
+                pass
+        success = CDPSpoofer._report(command, error) and success
+    print("[SPOOF] Pre-navigation spoofing ready")
+    return success
+
+
 # === Удобные функции ===
 
 def apply_cdp_spoofing(page, profile: SpoofProfile = None) -> Dict[str, bool]:
@@ -439,3 +474,16 @@ def apply_pre_navigation_spoofing(page, profile: SpoofProfile = None) -> CDPSpoo
     spoofer = CDPSpoofer(profile)
     spoofer.apply_pre_navigation(page)
     return spoofer
+
+
+async def apply_pre_navigation_spoofing_async(cdp, profile: SpoofProfile = None,
+                                              session_id: Optional[str] = None) -> CDPSpoofer:
+    """
+    Асинхронный вариант apply_pre_navigation_spoofing поверх app.cdp.CDPConnection.
+
+    Returns:
+        CDPSpoofer instance
+    """
+    spoofer = CDPSpoofer(profile)
+    await spoofer.apply_pre_navigation_async(cdp, session_id)
+    return spoofer
@@ -11,6 +11,8 @@ import datetime
 from typing import Optional, Tuple, Dict
 from dataclasses import dataclass
 
+from app.metrics import GEOIP_DURATION, GEOIP_LOOKUPS
+
 
 @dataclass
 class IPGeoData:
@@ -288,11 +290,24 @@ def detect_ip_geo(use_external_api: bool = True) -> Optional[IPGeoData]:
         автоматически используется fallback на локальные данные.
     """
     
+    started = time.perf_counter()
     # Если не используем внешние API - возвращаем локальные данные
     if not use_external_api:
         print("[IP-GEO] Using local timezone data (no external API)")
-        return get_local_geo_data()
-    
+        result, geo = 'local', get_local_geo_data()
+    else:
+        result, geo = 'hit', _lookup_external_geo()
+        # Fallback на локальные данные если все API недоступны
+        if geo is None:
+            print("[IP-GEO] All external APIs failed, using local timezone fallback")
+            result, geo = 'fallback', get_local_geo_data()
+    GEOIP_LOOKUPS.inc(result=result)
+    GEOIP_DURATION.observe(time.perf_counter() - started, result=result)
+    return geo
+
+
+def _lookup_external_geo() -> Optional[IPGeoData]:
+    """Опрашивает внешние API по очереди; None если ни один не ответил."""
     # Попытка 1: ip-api.com (бесплатный, без ключа)
     try:
         resp = requests.get(
@@ -358,9 +373,7 @@ def detect_ip_geo(use_external_api: bool = True) -> Optional[IPGeoData]:
     except Exception as e:
         print(f"[IP-GEO] ipinfo.io failed: {e}")
     
-    # Fallback на локальные данные если все API недоступны
-    print("[IP-GEO] All external APIs failed, using local timezone fallback")
-    return get_local_geo_data()
+    return None
 
 
 def get_system_timezone() -> Tuple[str, int]:
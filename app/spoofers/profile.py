@@ -6,14 +6,69 @@
 
 import json
 import random
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
 
+from app.metrics import PROFILE_IO
+
 from .ip_timezone import detect_ip_geo, get_system_timezone, IPGeoData
 
 
 PROFILE_SCHEMA_VERSION = 1
+# Camoufox 启动时生成并缓存在 extra_config 中的指纹（含 GeoIP 结果），见 app.adapters.camoufox
+CAMOUFOX_FINGERPRINT_KEY = 'camoufox_fingerprint'
+# 启动时打开目标网址后等待到哪一步才算启动完成：none 不等待，commit 收到响应，domcontentloaded / load 对应页面事件
+NAVIGATION_WAIT_POLICIES = ('none', 'commit', 'domcontentloaded', 'load')
+DEFAULT_NAVIGATION_WAIT = 'commit'
+DEFAULT_NAVIGATION_TIMEOUT = 30.0
+# 资源限制上限：cgroup cpu.weight 最大 10000；CPU 百分比以单核为 100
+MAX_CPU_WEIGHT = 10000
+MAX_CPU_PERCENT = 100 * 256
+MAX_MEMORY_MB = 1024 * 1024
+
+
+def parse_sync_paths(value: Any) -> list[str]:
+    """解析 ephemeral_sync：接受列表或逗号分隔字符串，丢弃绝对路径和包含 .. 的路径。"""
+    if isinstance(value, str):
+        items = value.split(',')
+    elif isinstance(value, (list, tuple)):
+        items = [str(item) for item in value]
+    else:
+        return []
+    paths: list[str] = []
+    for item in items:
+        rel = item.strip().replace('\\', '/').strip('/')
+        if not rel or Path(item.strip()).is_absolute() or '..' in rel.split('/'):
+            continue
+        if rel not in paths:
+            paths.append(rel)
+    return paths
+
+
+def parse_navigation_wait(value: Any) -> str:
+    """未知取值回退为默认策略。"""
+    value = str(value or '').strip().lower()
+    return value if value in NAVIGATION_WAIT_POLICIES else DEFAULT_NAVIGATION_WAIT
+
+
+def parse_navigation_timeout(value: Any) -> float:
+    """导航等待超时（秒），非法或非正数时使用默认值。"""
+    try:
+        timeout = float(value)
+    except (TypeError, ValueError):
+        return DEFAULT_NAVIGATION_TIMEOUT
+    return timeout if timeout > 0 else DEFAULT_NAVIGATION_TIMEOUT
+
+
+def parse_resource_limit(value: Any, maximum: int) -> int:
+    """资源限制（CPU 权重 / CPU 上限百分比 / 内存 MB），0 表示不限制，非法值按 0 处理。"""
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return 0
+    return min(max(limit, 0), maximum)
 
 
 @dataclass
@@ -24,6 +79,15 @@ class BaseConfig:
     target_url: str = ''
     user_data_dir: Optional[str] = None
     proxy: Optional[Any] = None
+    # 临时模式：user-data 放在内存盘上，会话结束即删除；ephemeral_sync 中的相对路径会同步回持久目录
+    ephemeral: bool = False
+    ephemeral_sync: list[str] = field(default_factory=list)
+    navigation_wait: str = DEFAULT_NAVIGATION_WAIT
+    navigation_timeout: float = DEFAULT_NAVIGATION_TIMEOUT
+    # 资源限制，见 app.resource_governor；0 表示不限制
+    cpu_weight: int = 0
+    cpu_max_percent: int = 0
+    memory_max_mb: int = 0
 
     def to_dict(self) -> dict:
         return {
@@ -33,6 +97,13 @@ class BaseConfig:
             'target_url': self.target_url,
             'user_data_dir': self.user_data_dir,
             'proxy': self.proxy,
+            'ephemeral': self.ephemeral,
+            'ephemeral_sync': list(self.ephemeral_sync),
+            'navigation_wait': self.navigation_wait,
+            'navigation_timeout': self.navigation_timeout,
+            'cpu_weight': self.cpu_weight,
+            'cpu_max_percent': self.cpu_max_percent,
+            'memory_max_mb': self.memory_max_mb,
         }
 
     @classmethod
@@ -45,6 +116,13 @@ class BaseConfig:
             target_url=data.get('target_url', ''),
             user_data_dir=data.get('user_data_dir'),
             proxy=data.get('proxy'),
+            ephemeral=bool(data.get('ephemeral', False)),
+            ephemeral_sync=parse_sync_paths(data.get('ephemeral_sync')),
+            navigation_wait=parse_navigation_wait(data.get('navigation_wait')),
+            navigation_timeout=parse_navigation_timeout(data.get('navigation_timeout')),
+            cpu_weight=parse_resource_limit(data.get('cpu_weight'), MAX_CPU_WEIGHT),
+            cpu_max_percent=parse_resource_limit(data.get('cpu_max_percent'), MAX_CPU_PERCENT),
+            memory_max_mb=parse_resource_limit(data.get('memory_max_mb'), MAX_MEMORY_MB),
         )
 
 
@@ -421,6 +499,21 @@ def get_profiles_dir() -> Path:
     return profiles_dir
 
 
+# adapter_id -> profiles/ 下存放浏览器 user-data 的子目录
+USER_DATA_SUBDIRS = {
+    'chromium': 'chrome',
+    'camoufox': 'camoufox',
+}
+
+
+def get_user_data_dir(base_config: BaseConfig) -> Path:
+    """返回配置的 user-data 目录：优先使用显式 user_data_dir，否则为 profiles/<浏览器>/<profile_id>。"""
+    if base_config.user_data_dir:
+        return Path(base_config.user_data_dir)
+    subdir = USER_DATA_SUBDIRS.get(base_config.adapter_id, USER_DATA_SUBDIRS['chromium'])
+    return get_profiles_dir() / subdir / base_config.profile_id
+
+
 def get_profile_path(email: str) -> Path:
     """将 email 转成安全文件名并返回配置路径。"""
     profiles_dir = get_profiles_dir()
@@ -459,8 +552,9 @@ def _migrate_legacy_profile(profile_id: str, data: dict) -> ProfileConfig:
     return ProfileConfig(base_config=base_config, extra_config=extra_config)
 
 
-def save_profile(profile_id: str, profile: ProfileConfig) -> bool:
-    """保存 ProfileConfig 到文件（BaseConfig + ExtraConfig）。"""
+def save_profile(profile_id: str, profile: ProfileConfig, seed_from: Optional[Path] = None) -> bool:
+    """保存 ProfileConfig 到文件（BaseConfig + ExtraConfig）；传入 seed_from 时用该 user-data 目录的骨架初始化新配置的目录。"""
+    started = time.perf_counter()
     try:
         path = get_profile_path(profile_id)
         data = profile.to_dict()
@@ -469,19 +563,40 @@ def save_profile(profile_id: str, profile: ProfileConfig) -> bool:
         
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2)
+        # 只统计配置文件本身的写入，不含下面的骨架复制
+        PROFILE_IO.observe(time.perf_counter() - started, operation='save', outcome='ok')
         
         print(f"[PROFILE] Saved profile for {profile_id}")
+        # 已编译的启动计划基于旧配置，立即作废
+        from app.launch_plan import invalidate_launch_plan
+
+        invalidate_launch_plan(profile_id)
+        if seed_from is not None and Path(seed_from).is_dir():
+            # 骨架复制失败不影响配置本身，只是首次启动会慢一些
+            try:
+                from app.clone import clone_user_data_dir
+
+                stats = clone_user_data_dir(Path(seed_from), get_user_data_dir(profile.base_config))
+                print(
+                    f"[PROFILE] Seeded {profile_id} from {seed_from}: {stats.files} files "
+                    f"(reflink={stats.reflinked}, hardlink={stats.hardlinked}, copy={stats.copied})"
+                )
+            except Exception as e:
+                print(f"[PROFILE] Failed to seed user data for {profile_id}: {e}")
         return True
     except Exception as e:
+        PROFILE_IO.observe(time.perf_counter() - started, operation='save', outcome='error')
         print(f"[PROFILE] Failed to save: {e}")
         return False
 
 
 def load_profile(profile_id: str) -> Optional[ProfileConfig]:
     """从文件加载 ProfileConfig；自动迁移旧格式。"""
+    started = time.perf_counter()
     try:
         path = get_profile_path(profile_id)
         if not path.exists():
+            PROFILE_IO.observe(time.perf_counter() - started, operation='load', outcome='missing')
             return None
         
         with open(path, 'r', encoding='utf-8') as f:
@@ -491,17 +606,40 @@ def load_profile(profile_id: str) -> Optional[ProfileConfig]:
             base = BaseConfig.from_dict(data.get('base_config') or {}, profile_id)
             extra = data.get('extra_config') or {}
             profile = ProfileConfig(base_config=base, extra_config=extra, profile_schema_version=PROFILE_SCHEMA_VERSION)
+            PROFILE_IO.observe(time.perf_counter() - started, operation='load', outcome='ok')
             print(f"[PROFILE] Loaded profile for {profile_id}")
             return profile
 
         migrated = _migrate_legacy_profile(profile_id, data if isinstance(data, dict) else {})
+        PROFILE_IO.observe(time.perf_counter() - started, operation='load', outcome='ok')
         print(f"[PROFILE] Loaded legacy profile for {profile_id}")
         return migrated
     except Exception as e:
+        PROFILE_IO.observe(time.perf_counter() - started, operation='load', outcome='error')
         print(f"[PROFILE] Failed to load: {e}")
         return None
 
 
+def merge_extra_config(profile: ProfileConfig, updates: dict) -> None:
+    """把 updates 就地合并进内存中配置的 extra_config（不写文件），界面打开的配置下次保存时才不会丢掉它们。"""
+    if not updates:
+        return
+    if profile.extra_config is None:
+        profile.extra_config = {}
+    profile.extra_config.update(updates)
+
+
+def update_extra_config(profile_id: str, updates: dict) -> bool:
+    """把 updates 合并进已保存配置的 extra_config 后保存；配置不存在或保存失败时返回 False。"""
+    if not updates:
+        return True
+    profile = load_profile(profile_id)
+    if profile is None:
+        return False
+    merge_extra_config(profile, updates)
+    return save_profile(profile_id, profile)
+
+
 def load_profile_as_spoof_profile(profile_id: str) -> Optional[SpoofProfile]:
     profile = load_profile(profile_id)
     if not profile:
@@ -509,7 +647,22 @@ def load_profile_as_spoof_profile(profile_id: str) -> Optional[SpoofProfile]:
     return SpoofProfile.from_dict(profile.extra_config or {})
 
 
-def build_default_profile_config(profile_id: str, adapter_id: str = 'chromium') -> ProfileConfig:
+def build_default_profile_config(
+    profile_id: str,
+    adapter_id: str = 'chromium',
+    template: Optional[ProfileConfig] = None,
+) -> ProfileConfig:
+    """生成新配置；传入 template 时复制模板的基础配置与扩展配置（但使用自己的 user-data 目录和新的噪声种子）。"""
+    if template is not None:
+        base_config = BaseConfig.from_dict(template.base_config.to_dict(), profile_id)
+        base_config.profile_id = profile_id
+        base_config.user_data_dir = None
+        extra_config = json.loads(json.dumps(template.extra_config or {}))
+        if 'noise_seed' in extra_config:
+            extra_config['noise_seed'] = random.randint(1, 1000000)
+        # 缓存的指纹属于模板本身，复制过去会让两个配置指纹相同
+        extra_config.pop(CAMOUFOX_FINGERPRINT_KEY, None)
+        return ProfileConfig(base_config=base_config, extra_config=extra_config)
     base_config = BaseConfig(profile_id=profile_id, adapter_id=adapter_id)
     extra_config: dict
     if adapter_id == 'chromium':
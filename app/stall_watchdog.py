@@ -0,0 +1,167 @@
+"""
+Event-loop stall watchdog.
+
+A background thread keeps posting a no-op to the GUI thread and times how
+long it takes to run. When a ping is still pending after the threshold, the
+GUI thread is busy: its Python stack is captured right then (through
+sys._current_frames), and once the ping finally runs the stall is recorded
+with its full duration. Stalls are aggregated by call site, the innermost
+frame of this project on the captured stack, and appended to a log file.
+
+`post` is whatever runs a callable on the GUI thread from another thread;
+the window passes a queued Qt signal (see app.features.diagnostics).
+"""
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+STALL_LOG_PATH = Path('logs/stalls.log')
+STALL_LOG_MAX_BYTES = 1024 * 1024
+DEFAULT_STALL_THRESHOLD_MS = 100
+PING_INTERVAL_SECONDS = 0.05
+STACK_DEPTH = 30
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+UNKNOWN_SITE = '<event loop>'
+
+
+@dataclass
+class StallSite:
+    site: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+    last_at: float = 0.0
+    last_stack: str = ''
+
+
+def _call_site(stack: traceback.StackSummary) -> str:
+    """The innermost frame in this project's code, else the innermost frame."""
+    for frame in reversed(stack):
+        path = Path(frame.filename)
+        try:
+            relative = path.resolve().relative_to(PROJECT_ROOT)
+        except (OSError, ValueError):
+            continue
+        if relative.parts[0] in ('.venv', 'venv') or path.resolve() == Path(__file__).resolve():
+            continue
+        return f'{relative.as_posix()}:{frame.lineno} {frame.name}'
+    if stack:
+        frame = stack[-1]
+        return f'{Path(frame.filename).name}:{frame.lineno} {frame.name}'
+    return UNKNOWN_SITE
+
+
+class StallWatchdog:
+    def __init__(
+        self,
+        post: Callable[[Callable[[], None]], None],
+        threshold_ms: int = DEFAULT_STALL_THRESHOLD_MS,
+        log_path: Optional[Path] = STALL_LOG_PATH,
+        on_stall: Optional[Callable[[StallSite], None]] = None,
+        thread_id: Optional[int] = None,
+    ):
+        self._post = post
+        self.threshold_ms = threshold_ms
+        self.log_path = log_path
+        # Called from the watchdog thread after each recorded stall.
+        self.on_stall = on_stall
+        self._thread_id = thread_id or threading.main_thread().ident
+        self._sites: dict[str, StallSite] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pong = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stall-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._pong.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(1.0)
+        self._thread = None
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def sites(self) -> list[StallSite]:
+        """Recorded call sites, the costliest first."""
+        with self._lock:
+            sites = [StallSite(**vars(site)) for site in self._sites.values()]
+        return sorted(sites, key=lambda site: site.total_ms, reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sites.clear()
+        self.max_latency_ms = 0.0
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._pong.clear()
+            sent = time.perf_counter()
+            try:
+                self._post(self._pong.set)
+            except RuntimeError:
+                # The receiving Qt object is gone: the app is shutting down.
+                return
+            stack = None
+            threshold = max(1, self.threshold_ms) / 1000
+            if not self._pong.wait(threshold):
+                stack = self._capture()
+                self._pong.wait()
+            if self._stop.is_set():
+                return
+            latency_ms = (time.perf_counter() - sent) * 1000
+            self.last_latency_ms = latency_ms
+            self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+            if stack is not None and latency_ms >= self.threshold_ms:
+                self._record(latency_ms, stack)
+            self._stop.wait(PING_INTERVAL_SECONDS)
+
+    def _capture(self) -> traceback.StackSummary:
+        frame = sys._current_frames().get(self._thread_id)
+        if frame is None:
+            return traceback.StackSummary()
+        return traceback.extract_stack(frame, limit=STACK_DEPTH)
+
+    def _record(self, latency_ms: float, stack: traceback.StackSummary) -> None:
+        site_name = _call_site(stack)
+        stack_text = ''.join(stack.format())
+        with self._lock:
+            site = self._sites.setdefault(site_name, StallSite(site_name))
+            site.count += 1
+            site.total_ms += latency_ms
+            site.max_ms = max(site.max_ms, latency_ms)
+            site.last_ms = latency_ms
+            site.last_at = time.time()
+            site.last_stack = stack_text
+            snapshot = StallSite(**vars(site))
+        self._append_log(latency_ms, site_name, stack_text)
+        if self.on_stall:
+            self.on_stall(snapshot)
+
+    def _append_log(self, latency_ms: float, site: str, stack_text: str) -> None:
+        if self.log_path is None:
+            return
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            if self.log_path.exists() and self.log_path.stat().st_size > STALL_LOG_MAX_BYTES:
+                self.log_path.replace(self.log_path.with_suffix(self.log_path.suffix + '.1'))
+            stamp = datetime.now().isoformat(timespec='seconds')
+            with self.log_path.open('a', encoding='utf-8') as handle:
+                handle.write(f'{stamp} stall {latency_ms:.0f} ms at {site}\n{stack_text}\n')
+        except OSError as exc:
+            print(f'[WATCHDOG] Could not write {self.log_path}: {exc}')
@@ -0,0 +1,178 @@
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from app.metrics import observe_profile_store
+from app.spoofers.profile import USER_DATA_SUBDIRS, BaseConfig, get_profiles_dir, get_user_data_dir
+from app.trash import dir_size
+
+# Disposable caches inside a Chromium profile dir (Default, Profile 1, ...).
+# Cookies, Local Storage, IndexedDB and Preferences are never listed here.
+CHROMIUM_PROFILE_CACHE_DIRS = (
+    'Cache',
+    'Code Cache',
+    'GPUCache',
+    'DawnCache',
+    'DawnGraphiteCache',
+    'DawnWebGPUCache',
+    'Service Worker/CacheStorage',
+    'Service Worker/ScriptCache',
+)
+# Caches shared by all profiles, at the top of the user-data dir.
+CHROMIUM_ROOT_CACHE_DIRS = (
+    'GrShaderCache',
+    'GraphiteDawnCache',
+    'ShaderCache',
+    'component_crx_cache',
+)
+# Camoufox (Firefox) keeps its caches directly in the profile dir.
+FIREFOX_CACHE_DIRS = (
+    'cache2',
+    'startupCache',
+    'thumbnails',
+)
+CACHE_DIR_NAMES = CHROMIUM_PROFILE_CACHE_DIRS + CHROMIUM_ROOT_CACHE_DIRS + FIREFOX_CACHE_DIRS
+# Lock files only mean something to a running browser; copying them makes the copy look in use.
+LOCK_FILE_NAMES = {
+    'SingletonLock',
+    'SingletonSocket',
+    'SingletonCookie',
+    'lockfile',
+    'parent.lock',
+    '.parentlock',
+}
+
+
+@dataclass
+class UserDataUsage:
+    profile_id: str
+    adapter_dir: str
+    path: Path
+    total_bytes: int = 0
+    cache_bytes: int = 0
+    last_used: float = 0.0
+
+
+def _chromium_profile_dirs(user_data_dir: Path) -> list[Path]:
+    dirs = [user_data_dir / 'Default']
+    dirs.extend(sorted(user_data_dir.glob('Profile *')))
+    return [path for path in dirs if path.is_dir()]
+
+
+def find_cache_dirs(user_data_dir: Path) -> list[Path]:
+    """Existing cache dirs inside a Chromium or Camoufox user-data dir."""
+    candidates = [user_data_dir / name for name in CHROMIUM_ROOT_CACHE_DIRS + FIREFOX_CACHE_DIRS]
+    for profile_dir in _chromium_profile_dirs(user_data_dir):
+        candidates.extend(profile_dir / name for name in CHROMIUM_PROFILE_CACHE_DIRS)
+    return [path for path in candidates if path.is_dir() and not path.is_symlink()]
+
+
+def last_used_time(user_data_dir: Path) -> float:
+    # Both browsers rewrite top-level state files (Local State, prefs.js) on exit,
+    # so the newest top-level mtime is a cheap "last used" stamp.
+    latest = 0.0
+    try:
+        with os.scandir(user_data_dir) as it:
+            for entry in it:
+                try:
+                    latest = max(latest, entry.stat(follow_symlinks=False).st_mtime)
+                except OSError:
+                    continue
+    except OSError:
+        return 0.0
+    return latest
+
+
+def measure_user_data_dir(path: Path, profile_id: str = '', adapter_dir: str = '') -> UserDataUsage:
+    return UserDataUsage(
+        profile_id=profile_id or path.name,
+        adapter_dir=adapter_dir or path.parent.name,
+        path=path,
+        total_bytes=dir_size(path),
+        cache_bytes=sum(dir_size(cache_dir) for cache_dir in find_cache_dirs(path)),
+        last_used=last_used_time(path),
+    )
+
+
+def measure_storage_usage() -> list[UserDataUsage]:
+    """Sizes of every app-managed user-data dir under profiles/<browser>/."""
+    usage: list[UserDataUsage] = []
+    profiles_dir = get_profiles_dir()
+    for adapter_dir in sorted(set(USER_DATA_SUBDIRS.values())):
+        parent = profiles_dir / adapter_dir
+        if not parent.is_dir():
+            continue
+        for entry in sorted(parent.iterdir()):
+            if entry.is_dir():
+                usage.append(measure_user_data_dir(entry, entry.name, adapter_dir))
+    observe_profile_store(usage)
+    return usage
+
+
+def profile_user_data_dirs(base_config: BaseConfig) -> list[Path]:
+    """Existing user-data dirs of a profile, one per browser it has been launched with."""
+    dirs: list[Path] = []
+    for adapter_id in USER_DATA_SUBDIRS:
+        candidate = BaseConfig(
+            profile_id=base_config.profile_id,
+            adapter_id=adapter_id,
+            user_data_dir=base_config.user_data_dir,
+        )
+        path = get_user_data_dir(candidate)
+        if path.is_dir() and path not in dirs:
+            dirs.append(path)
+    return dirs
+
+
+def usage_by_profile(usage: Iterable[UserDataUsage]) -> dict[str, tuple[int, int]]:
+    """Folds per-browser usage into profile_id -> (total_bytes, cache_bytes)."""
+    totals: dict[str, tuple[int, int]] = {}
+    for item in usage:
+        total, cache = totals.get(item.profile_id, (0, 0))
+        totals[item.profile_id] = (total + item.total_bytes, cache + item.cache_bytes)
+    return totals
+
+
+def trim_cache(user_data_dir: Path) -> int:
+    """Deletes the cache dirs of one user-data dir; returns the number of bytes freed."""
+    freed = 0
+    for cache_dir in find_cache_dirs(user_data_dir):
+        size = dir_size(cache_dir)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        if not cache_dir.exists():
+            freed += size
+    return freed
+
+
+def enforce_quota(
+    quota_bytes: int,
+    skip: Iterable[Path] = (),
+    usage: Optional[list[UserDataUsage]] = None,
+) -> tuple[int, list[UserDataUsage]]:
+    """
+    Trims caches of the least recently used user-data dirs until the total
+    size fits in `quota_bytes`. Dirs in `skip` (e.g. running browsers) are
+    never touched. Returns the bytes freed and the trimmed entries.
+    """
+    if quota_bytes <= 0:
+        return 0, []
+    if usage is None:
+        usage = measure_storage_usage()
+    skipped = {Path(path).resolve() for path in skip}
+    total = sum(item.total_bytes for item in usage)
+    freed = 0
+    trimmed: list[UserDataUsage] = []
+    for item in sorted(usage, key=lambda entry: entry.last_used):
+        if total <= quota_bytes:
+            break
+        if not item.cache_bytes or item.path.resolve() in skipped:
+            continue
+        released = trim_cache(item.path)
+        total -= released
+        freed += released
+        item.total_bytes -= released
+        item.cache_bytes = max(0, item.cache_bytes - released)
+        trimmed.append(item)
+    return freed, trimmed
@@ -0,0 +1,158 @@
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from app.spoofers.profile import (
+    USER_DATA_SUBDIRS,
+    BaseConfig,
+    get_profiles_dir,
+    get_user_data_dir,
+)
+
+TRASH_DIR_NAME = '.trash'
+
+
+def get_trash_dir(root: Path) -> Path:
+    trash_dir = root / TRASH_DIR_NAME
+    trash_dir.mkdir(parents=True, exist_ok=True)
+    return trash_dir
+
+
+def is_in_trash(path: Path) -> bool:
+    return TRASH_DIR_NAME in path.parts
+
+
+def dir_size(path: Path) -> int:
+    total = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def move_to_trash(path: Path, root: Path) -> Optional[Path]:
+    """
+    Atomically moves `path` into `root/.trash` so it disappears from the
+    app immediately; the actual delete happens later in empty_trash().
+    """
+    if not path.exists():
+        return None
+    target = get_trash_dir(root) / f'{path.name}-{uuid.uuid4().hex[:8]}'
+    os.replace(path, target)
+    return target
+
+
+def empty_trash(root: Path) -> int:
+    """Deletes everything in `root/.trash`; returns the number of bytes reclaimed."""
+    trash_dir = root / TRASH_DIR_NAME
+    if not trash_dir.exists():
+        return 0
+    reclaimed = 0
+    for entry in trash_dir.iterdir():
+        size = dir_size(entry) if entry.is_dir() else entry.stat().st_size
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink(missing_ok=True)
+        if not entry.exists():
+            reclaimed += size
+    return reclaimed
+
+
+def _managed_user_data_dir(base_config: BaseConfig) -> Optional[Path]:
+    """Only dirs under profiles/<browser>/ are ours to delete; explicit user_data_dir paths are left alone."""
+    path = get_user_data_dir(base_config)
+    profiles_dir = get_profiles_dir().resolve()
+    try:
+        rel = path.resolve().relative_to(profiles_dir)
+    except (OSError, ValueError):
+        return None
+    if len(rel.parts) != 2 or rel.parts[0] not in USER_DATA_SUBDIRS.values():
+        return None
+    return path
+
+
+def _user_data_dir_candidates(base_config: BaseConfig, profile_ids: set[str]) -> list[BaseConfig]:
+    # A profile may have been launched with several adapters, so every browser subdir counts as its own.
+    return [
+        BaseConfig(profile_id=profile_id, adapter_id=adapter_id, user_data_dir=base_config.user_data_dir)
+        for profile_id in sorted(profile_ids)
+        for adapter_id in USER_DATA_SUBDIRS
+    ]
+
+
+def trash_profile_data(base_config: BaseConfig) -> list[Path]:
+    """Moves the profile's managed user-data dirs to the trash; returns the trashed paths."""
+    trashed: list[Path] = []
+    for candidate in _user_data_dir_candidates(base_config, {base_config.profile_id}):
+        user_data_dir = _managed_user_data_dir(candidate)
+        if user_data_dir is None:
+            continue
+        target = move_to_trash(user_data_dir, get_profiles_dir())
+        if target:
+            trashed.append(target)
+    return trashed
+
+
+def _referenced_user_data_dirs() -> set[Path]:
+    referenced: set[Path] = set()
+    for path in get_profiles_dir().glob('*.json'):
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except Exception:
+            continue
+        if not isinstance(data, dict):
+            continue
+        base = BaseConfig.from_dict(data.get('base_config') or data, data.get('email') or path.stem)
+        profile_ids = {base.profile_id, path.stem}
+        if data.get('email'):
+            profile_ids.add(data['email'])
+        for candidate in _user_data_dir_candidates(base, profile_ids):
+            try:
+                referenced.add(get_user_data_dir(candidate).resolve())
+            except OSError:
+                continue
+    return referenced
+
+
+def find_orphan_user_data_dirs() -> list[tuple[Path, int]]:
+    """User-data dirs under profiles/ that no profile JSON points to, with their sizes."""
+    referenced = _referenced_user_data_dirs()
+    orphans: list[tuple[Path, int]] = []
+    profiles_dir = get_profiles_dir()
+    for subdir in sorted(set(USER_DATA_SUBDIRS.values())):
+        parent = profiles_dir / subdir
+        if not parent.is_dir():
+            continue
+        for entry in sorted(parent.iterdir()):
+            if not entry.is_dir() or entry.resolve() in referenced:
+                continue
+            orphans.append((entry, dir_size(entry)))
+    return orphans
+
+
+def trash_orphan_user_data_dirs(orphans: list[tuple[Path, int]]) -> int:
+    moved = 0
+    profiles_dir = get_profiles_dir()
+    for path, _ in orphans:
+        try:
+            if move_to_trash(path, profiles_dir):
+                moved += 1
+        except OSError as exc:
+            print(f'[PROFILE] Failed to trash {path}: {exc}')
+    return moved
@@ -13,8 +13,14 @@ from qfluentwidgets import (
     TransparentToolButton,
     HorizontalSeparator,
     IndeterminateProgressBar,
+    TableWidget,
+    BodyLabel,
+    SpinBox,
+    ProgressBar,
+    PlainTextEdit,
 )
 from app.home_cards import CardFlowContainer, DraggableCard
+from app.spoofers.profile import MAX_CPU_PERCENT, MAX_CPU_WEIGHT, MAX_MEMORY_MB
 from qfluentwidgets.components.widgets.card_widget import SimpleCardWidget
 from qfluentwidgets import FluentIcon as FIF
 
@@ -263,6 +269,11 @@ def build_profiles_page(window) -> None:
     window.new_ip_btn.clicked.connect(window._create_ip_profile)
     left_layout.addWidget(window.new_ip_btn)
 
+    window.clone_btn = PushButton('')
+    window.clone_btn.setIcon(FIF.COPY)
+    window.clone_btn.clicked.connect(window._clone_profile)
+    left_layout.addWidget(window.clone_btn)
+
     window.delete_btn = PushButton('')
     window.delete_btn.setIcon(FIF.DELETE)
     window.delete_btn.clicked.connect(window._delete_profile)
@@ -273,6 +284,12 @@ def build_profiles_page(window) -> None:
     window.refresh_btn.clicked.connect(window.refresh_profiles)
     left_layout.addWidget(window.refresh_btn)
 
+    window.cleanup_btn = PushButton('')
+    window.cleanup_btn.setIcon(FIF.BROOM)
+    window.cleanup_btn.setEnabled(False)
+    window.cleanup_btn.clicked.connect(window._clean_orphan_dirs)
+    left_layout.addWidget(window.cleanup_btn)
+
     root_layout.addWidget(left_panel, 1)
 
     right_panel = QtWidgets.QWidget()
@@ -343,6 +360,63 @@ def build_profiles_page(window) -> None:
     window.label_proxy = QtWidgets.QLabel('Proxy')
     form.addRow(window.label_proxy, window.field_proxy)
 
+    window.field_ephemeral = SwitchButton()
+    window.field_ephemeral.setOnText('On')
+    window.field_ephemeral.setOffText('Off')
+    window.field_ephemeral.checkedChanged.connect(window._on_base_ephemeral_changed)
+    window.label_ephemeral = QtWidgets.QLabel('Ephemeral (RAM)')
+    form.addRow(window.label_ephemeral, window.field_ephemeral)
+
+    window.field_ephemeral_sync = LineEdit()
+    window.field_ephemeral_sync.setPlaceholderText('Default/Cookies, Default/Local Storage')
+    window.field_ephemeral_sync.setEnabled(False)
+    window.field_ephemeral_sync.editingFinished.connect(window._on_base_ephemeral_sync_changed)
+    window.label_ephemeral_sync = QtWidgets.QLabel('Sync Back on Close')
+    form.addRow(window.label_ephemeral_sync, window.field_ephemeral_sync)
+
+    window.field_navigation_wait = ComboBox()
+    window.field_navigation_wait.currentIndexChanged.connect(window._on_base_navigation_wait_changed)
+    window.label_navigation_wait = QtWidgets.QLabel('Launch Completes At')
+    form.addRow(window.label_navigation_wait, window.field_navigation_wait)
+
+    window.field_navigation_timeout = SpinBox()
+    window.field_navigation_timeout.setRange(1, 600)
+    window.field_navigation_timeout.setValue(30)
+    window.field_navigation_timeout.valueChanged.connect(window._on_base_navigation_timeout_changed)
+    window.label_navigation_timeout = QtWidgets.QLabel('Navigation Timeout (s)')
+    form.addRow(window.label_navigation_timeout, window.field_navigation_timeout)
+
+    window.field_cpu_weight = SpinBox()
+    window.field_cpu_weight.setRange(0, MAX_CPU_WEIGHT)
+    window.field_cpu_weight.setSingleStep(10)
+    window.field_cpu_weight.valueChanged.connect(window._on_base_cpu_weight_changed)
+    window.label_cpu_weight = QtWidgets.QLabel('CPU Weight')
+    form.addRow(window.label_cpu_weight, window.field_cpu_weight)
+
+    window.field_cpu_max_percent = SpinBox()
+    window.field_cpu_max_percent.setRange(0, MAX_CPU_PERCENT)
+    window.field_cpu_max_percent.setSingleStep(50)
+    window.field_cpu_max_percent.valueChanged.connect(window._on_base_cpu_max_percent_changed)
+    window.label_cpu_max_percent = QtWidgets.QLabel('CPU Limit (%)')
+    form.addRow(window.label_cpu_max_percent, window.field_cpu_max_percent)
+
+    window.field_memory_max_mb = SpinBox()
+    window.field_memory_max_mb.setRange(0, MAX_MEMORY_MB)
+    window.field_memory_max_mb.setSingleStep(256)
+    window.field_memory_max_mb.valueChanged.connect(window._on_base_memory_max_mb_changed)
+    window.label_memory_max_mb = QtWidgets.QLabel('Memory Limit (MB)')
+    form.addRow(window.label_memory_max_mb, window.field_memory_max_mb)
+
+    storage_row = QtWidgets.QHBoxLayout()
+    window.profile_storage_value = BodyLabel('-')
+    storage_row.addWidget(window.profile_storage_value, 1)
+    window.trim_cache_btn = PushButton('')
+    window.trim_cache_btn.setIcon(FIF.BROOM)
+    window.trim_cache_btn.clicked.connect(window._trim_profile_cache)
+    storage_row.addWidget(window.trim_cache_btn)
+    window.label_profile_storage = QtWidgets.QLabel()
+    form.addRow(window.label_profile_storage, storage_row)
+
     details_layout.addWidget(details_form_container)
     config_layout.addWidget(window.details_card)
 
@@ -401,12 +475,165 @@ def build_settings_page(window) -> None:
     window.theme_combo.currentIndexChanged.connect(window._on_theme_changed)
     settings_form.addRow(window.settings_label_theme, window.theme_combo)
 
+    window.settings_label_storage_quota = QtWidgets.QLabel()
+    window.storage_quota_spin = SpinBox()
+    window.storage_quota_spin.setRange(0, 1024 * 1024)
+    window.storage_quota_spin.setSingleStep(256)
+    window.storage_quota_spin.valueChanged.connect(window._on_storage_quota_changed)
+    settings_form.addRow(window.settings_label_storage_quota, window.storage_quota_spin)
+
+    window.settings_label_stall_threshold = QtWidgets.QLabel()
+    window.stall_threshold_spin = SpinBox()
+    window.stall_threshold_spin.setRange(0, 10000)
+    window.stall_threshold_spin.setSingleStep(50)
+    window.stall_threshold_spin.valueChanged.connect(window._on_stall_threshold_changed)
+    settings_form.addRow(window.settings_label_stall_threshold, window.stall_threshold_spin)
+
+    window.settings_label_hibernate_idle = QtWidgets.QLabel()
+    window.hibernate_idle_spin = SpinBox()
+    window.hibernate_idle_spin.setRange(0, 24 * 60)
+    window.hibernate_idle_spin.setSingleStep(5)
+    window.hibernate_idle_spin.valueChanged.connect(window._on_hibernation_changed)
+    settings_form.addRow(window.settings_label_hibernate_idle, window.hibernate_idle_spin)
+
+    window.settings_label_auto_quit = QtWidgets.QLabel()
+    window.auto_quit_spin = SpinBox()
+    window.auto_quit_spin.setRange(0, 7 * 24 * 60)
+    window.auto_quit_spin.setSingleStep(30)
+    window.auto_quit_spin.valueChanged.connect(window._on_hibernation_changed)
+    settings_form.addRow(window.settings_label_auto_quit, window.auto_quit_spin)
+
+    window.settings_label_use_launcher = QtWidgets.QLabel()
+    window.use_launcher_switch = SwitchButton()
+    window.use_launcher_switch.setOnText('On')
+    window.use_launcher_switch.setOffText('Off')
+    window.use_launcher_switch.checkedChanged.connect(window._on_use_launcher_changed)
+    settings_form.addRow(window.settings_label_use_launcher, window.use_launcher_switch)
+
     settings_card_layout.addWidget(settings_form_container)
     window.settings_onboarding_btn = PushButton('')
     window.settings_onboarding_btn.setIcon(FIF.PLAY)
     window.settings_onboarding_btn.clicked.connect(window._show_onboarding)
     settings_card_layout.addWidget(window.settings_onboarding_btn)
     settings_layout.addWidget(window.settings_card)
+
+    window.backup_card = SimpleCardWidget()
+    backup_card_layout = QtWidgets.QVBoxLayout(window.backup_card)
+    backup_card_layout.setContentsMargins(16, 12, 16, 16)
+    backup_card_layout.setSpacing(10)
+    window.backup_group_title = StrongBodyLabel('')
+    backup_card_layout.addWidget(window.backup_group_title)
+    backup_card_layout.addWidget(HorizontalSeparator())
+    backup_form_container = QtWidgets.QWidget()
+    backup_form = QtWidgets.QFormLayout(backup_form_container)
+    backup_form.setVerticalSpacing(10)
+    backup_form.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
+
+    window.backup_label_snapshot = QtWidgets.QLabel()
+    window.backup_snapshot_combo = ComboBox()
+    window.backup_snapshot_combo.currentIndexChanged.connect(window._on_backup_snapshot_changed)
+    backup_form.addRow(window.backup_label_snapshot, window.backup_snapshot_combo)
+
+    window.backup_label_profile = QtWidgets.QLabel()
+    window.backup_profile_combo = ComboBox()
+    backup_form.addRow(window.backup_label_profile, window.backup_profile_combo)
+    backup_card_layout.addWidget(backup_form_container)
+
+    window.backup_progress = ProgressBar()
+    window.backup_progress.setRange(0, 100)
+    window.backup_progress.setVisible(False)
+    backup_card_layout.addWidget(window.backup_progress)
+
+    backup_actions = QtWidgets.QHBoxLayout()
+    window.backup_now_btn = PushButton('')
+    window.backup_now_btn.setIcon(FIF.SAVE)
+    window.backup_now_btn.clicked.connect(window._start_backup)
+    backup_actions.addWidget(window.backup_now_btn)
+    window.backup_restore_btn = PushButton('')
+    window.backup_restore_btn.setIcon(FIF.HISTORY)
+    window.backup_restore_btn.clicked.connect(window._start_restore)
+    backup_actions.addWidget(window.backup_restore_btn)
+    window.backup_delete_btn = PushButton('')
+    window.backup_delete_btn.setIcon(FIF.DELETE)
+    window.backup_delete_btn.clicked.connect(window._start_backup_prune)
+    backup_actions.addWidget(window.backup_delete_btn)
+    backup_actions.addStretch(1)
+    backup_card_layout.addLayout(backup_actions)
+    settings_layout.addWidget(window.backup_card)
+
+    window.api_card = SimpleCardWidget()
+    api_card_layout = QtWidgets.QVBoxLayout(window.api_card)
+    api_card_layout.setContentsMargins(16, 12, 16, 16)
+    api_card_layout.setSpacing(10)
+    window.api_group_title = StrongBodyLabel('')
+    api_card_layout.addWidget(window.api_group_title)
+    api_card_layout.addWidget(HorizontalSeparator())
+    api_form_container = QtWidgets.QWidget()
+    api_form = QtWidgets.QFormLayout(api_form_container)
+    api_form.setVerticalSpacing(10)
+    api_form.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
+
+    window.api_label_enabled = QtWidgets.QLabel()
+    window.api_enabled_switch = SwitchButton()
+    window.api_enabled_switch.setOnText('On')
+    window.api_enabled_switch.setOffText('Off')
+    window.api_enabled_switch.checkedChanged.connect(window._on_api_enabled_changed)
+    api_form.addRow(window.api_label_enabled, window.api_enabled_switch)
+
+    window.api_label_port = QtWidgets.QLabel()
+    window.api_port_spin = SpinBox()
+    window.api_port_spin.setRange(1024, 65535)
+    window.api_port_spin.editingFinished.connect(window._on_api_port_changed)
+    api_form.addRow(window.api_label_port, window.api_port_spin)
+
+    window.api_label_token = QtWidgets.QLabel()
+    window.api_token_input = LineEdit()
+    window.api_token_input.setReadOnly(True)
+    window.api_token_input.setEchoMode(QtWidgets.QLineEdit.EchoMode.Password)
+    api_form.addRow(window.api_label_token, window.api_token_input)
+
+    window.api_label_status = QtWidgets.QLabel()
+    window.api_status_value = BodyLabel('')
+    api_form.addRow(window.api_label_status, window.api_status_value)
+    api_card_layout.addWidget(api_form_container)
+
+    api_actions = QtWidgets.QHBoxLayout()
+    window.api_copy_token_btn = PushButton('')
+    window.api_copy_token_btn.setIcon(FIF.COPY)
+    window.api_copy_token_btn.clicked.connect(window._copy_api_token)
+    api_actions.addWidget(window.api_copy_token_btn)
+    api_actions.addStretch(1)
+    api_card_layout.addLayout(api_actions)
+    settings_layout.addWidget(window.api_card)
+
+    window.profiling_card = SimpleCardWidget()
+    profiling_card_layout = QtWidgets.QVBoxLayout(window.profiling_card)
+    profiling_card_layout.setContentsMargins(16, 12, 16, 16)
+    profiling_card_layout.setSpacing(10)
+    window.profiling_group_title = StrongBodyLabel('')
+    profiling_card_layout.addWidget(window.profiling_group_title)
+    profiling_card_layout.addWidget(HorizontalSeparator())
+    window.profiling_status_label = BodyLabel('')
+    window.profiling_status_label.setWordWrap(True)
+    profiling_card_layout.addWidget(window.profiling_status_label)
+
+    profiling_actions = QtWidgets.QHBoxLayout()
+    window.profiling_toggle_btn = PushButton('')
+    window.profiling_toggle_btn.setIcon(FIF.PLAY)
+    window.profiling_toggle_btn.clicked.connect(window._toggle_profiling)
+    profiling_actions.addWidget(window.profiling_toggle_btn)
+    window.profiling_snapshot_btn = PushButton('')
+    window.profiling_snapshot_btn.setIcon(FIF.CAMERA)
+    window.profiling_snapshot_btn.setEnabled(False)
+    window.profiling_snapshot_btn.clicked.connect(window._take_memory_snapshot)
+    profiling_actions.addWidget(window.profiling_snapshot_btn)
+    window.profiling_open_folder_btn = PushButton('')
+    window.profiling_open_folder_btn.setIcon(FIF.FOLDER)
+    window.profiling_open_folder_btn.clicked.connect(window._open_captures_folder)
+    profiling_actions.addWidget(window.profiling_open_folder_btn)
+    profiling_actions.addStretch(1)
+    profiling_card_layout.addLayout(profiling_actions)
+    settings_layout.addWidget(window.profiling_card)
     settings_layout.addStretch(1)
 
 
@@ -604,10 +831,128 @@ def build_install_browser_page(window) -> None:
     layout.addStretch(1)
 
 
+def build_sessions_page(window) -> None:
+    window.sessions_page = QtWidgets.QWidget()
+    window.sessions_page.setObjectName('sessionsPage')
+    layout = QtWidgets.QVBoxLayout(window.sessions_page)
+    layout.setContentsMargins(24, 24, 24, 24)
+    layout.setSpacing(16)
+    layout.setSizeConstraint(QtWidgets.QLayout.SizeConstraint.SetNoConstraint)
+
+    window.sessions_title = TitleLabel('')
+    layout.addWidget(window.sessions_title)
+
+    window.sessions_subtitle = SubtitleLabel('')
+    layout.addWidget(window.sessions_subtitle)
+
+    window.sessions_card = SimpleCardWidget()
+    card_layout = QtWidgets.QVBoxLayout(window.sessions_card)
+    card_layout.setContentsMargins(16, 12, 16, 16)
+    card_layout.setSpacing(10)
+
+    window.sessions_group_title = StrongBodyLabel('')
+    card_layout.addWidget(window.sessions_group_title)
+    card_layout.addWidget(HorizontalSeparator())
+
+    window.sessions_table = TableWidget()
+    window.sessions_table.setColumnCount(7)
+    window.sessions_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+    window.sessions_table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
+    window.sessions_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+    window.sessions_table.verticalHeader().hide()
+    window.sessions_table.horizontalHeader().setStretchLastSection(True)
+    card_layout.addWidget(window.sessions_table, 1)
+
+    window.sessions_hibernation_label = BodyLabel('')
+    card_layout.addWidget(window.sessions_hibernation_label)
+
+    action_row = QtWidgets.QHBoxLayout()
+    window.sessions_show_btn = PushButton('')
+    window.sessions_show_btn.setIcon(FIF.VIEW)
+    window.sessions_show_btn.clicked.connect(window._show_selected_session)
+    action_row.addWidget(window.sessions_show_btn)
+    window.sessions_stop_btn = PushButton('')
+    window.sessions_stop_btn.setIcon(FIF.CLOSE)
+    window.sessions_stop_btn.clicked.connect(window._stop_selected_session)
+    action_row.addWidget(window.sessions_stop_btn)
+    window.sessions_refresh_btn = PushButton('')
+    window.sessions_refresh_btn.setIcon(FIF.SYNC)
+    window.sessions_refresh_btn.clicked.connect(window._poll_sessions)
+    action_row.addWidget(window.sessions_refresh_btn)
+    action_row.addStretch(1)
+    card_layout.addLayout(action_row)
+
+    layout.addWidget(window.sessions_card, 1)
+
+
+def build_diagnostics_page(window) -> None:
+    window.diagnostics_page = QtWidgets.QWidget()
+    window.diagnostics_page.setObjectName('diagnosticsPage')
+    layout = QtWidgets.QVBoxLayout(window.diagnostics_page)
+    layout.setContentsMargins(24, 24, 24, 24)
+    layout.setSpacing(16)
+    layout.setSizeConstraint(QtWidgets.QLayout.SizeConstraint.SetNoConstraint)
+
+    window.diagnostics_title = TitleLabel('')
+    layout.addWidget(window.diagnostics_title)
+
+    window.diagnostics_subtitle = SubtitleLabel('')
+    layout.addWidget(window.diagnostics_subtitle)
+
+    window.stalls_card = SimpleCardWidget()
+    card_layout = QtWidgets.QVBoxLayout(window.stalls_card)
+    card_layout.setContentsMargins(16, 12, 16, 16)
+    card_layout.setSpacing(10)
+
+    window.stalls_group_title = StrongBodyLabel('')
+    card_layout.addWidget(window.stalls_group_title)
+    card_layout.addWidget(HorizontalSeparator())
+
+    window.stalls_latency_label = BodyLabel('')
+    card_layout.addWidget(window.stalls_latency_label)
+
+    window.stalls_table = TableWidget()
+    window.stalls_table.setColumnCount(5)
+    window.stalls_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+    window.stalls_table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
+    window.stalls_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+    window.stalls_table.verticalHeader().hide()
+    window.stalls_table.horizontalHeader().setStretchLastSection(True)
+    window.stalls_table.itemSelectionChanged.connect(window._on_stall_selected)
+    card_layout.addWidget(window.stalls_table, 2)
+
+    window.stalls_stack_view = PlainTextEdit()
+    window.stalls_stack_view.setReadOnly(True)
+    window.stalls_stack_view.setLineWrapMode(QtWidgets.QPlainTextEdit.LineWrapMode.NoWrap)
+    card_layout.addWidget(window.stalls_stack_view, 1)
+
+    action_row = QtWidgets.QHBoxLayout()
+    window.stalls_refresh_btn = PushButton('')
+    window.stalls_refresh_btn.setIcon(FIF.SYNC)
+    window.stalls_refresh_btn.clicked.connect(window._refresh_diagnostics_view)
+    action_row.addWidget(window.stalls_refresh_btn)
+    window.stalls_clear_btn = PushButton('')
+    window.stalls_clear_btn.setIcon(FIF.BROOM)
+    window.stalls_clear_btn.clicked.connect(window._clear_stalls)
+    action_row.addWidget(window.stalls_clear_btn)
+    window.stalls_open_log_btn = PushButton('')
+    window.stalls_open_log_btn.setIcon(FIF.DOCUMENT)
+    window.stalls_open_log_btn.clicked.connect(window._open_stall_log)
+    action_row.addWidget(window.stalls_open_log_btn)
+    action_row.addStretch(1)
+    card_layout.addLayout(action_row)
+
+    layout.addWidget(window.stalls_card, 1)
+
+
 def build_navigation(window) -> None:
     window.nav_home = window.addSubInterface(window.home_page, FIF.HOME, window._t('nav_home'))
     window.nav_launch = window.addSubInterface(window.launch_page, FIF.PLAY, window._t('nav_launch'))
     window.nav_profiles = window.addSubInterface(window.profiles_page, FIF.PEOPLE, window._t('nav_profiles'))
+    window.nav_sessions = window.addSubInterface(window.sessions_page, FIF.APPLICATION, window._t('nav_sessions'))
+    window.nav_diagnostics = window.addSubInterface(
+        window.diagnostics_page, FIF.SPEED_HIGH, window._t('nav_diagnostics')
+    )
     window.nav_browser_library = window.addSubInterface(
         window.browser_library_page, FIF.GLOBE, window._t('nav_browser_library')
     )
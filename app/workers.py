@@ -1,15 +1,34 @@
+import concurrent.futures
+import time
 import traceback
+from pathlib import Path
 from typing import Optional, Any
 
 from PyQt6 import QtCore
 
+from app.adapters.base import LaunchResult
+from app.async_bridge import run_coroutine
 from app.browser_library import fetch_known_good_versions, install_chrome_download
+from app.backup import BackupRepository
+from app.ephemeral import sweep_stale_ram_dirs
+from app.launcher import LauncherError, RemoteSessionRegistry
+from app.metrics import failure_cause, observe_launch
+from app.profiler_capture import CaptureResult, write_capture_archive
+from app.sessions import BrowserSession, SessionRegistry
+from app.storage import enforce_quota, measure_storage_usage, trim_cache
+from app.trash import empty_trash, find_orphan_user_data_dirs
 from urllib.error import URLError
 import json
-from app.spoofers.profile import ProfileConfig, BaseConfig
+from app.spoofers.profile import ProfileConfig, BaseConfig, save_profile
 
 
-class BrowserLaunchWorker(QtCore.QThread):
+class AsyncLaunchWorker(QtCore.QObject):
+    """
+    Launches through BrowserAdapter.launch_async on the shared asyncio loop
+    (app.async_bridge) instead of occupying a thread of its own. Offers the
+    QThread worker interface (start/isRunning/wait) so callers treat it alike;
+    `finished` is emitted from the loop thread and queued to the GUI thread.
+    """
     finished = QtCore.pyqtSignal(bool, str)
 
     def __init__(self, profile_id: str, profile: ProfileConfig, url: str, browser_path: Optional[str] = None):
@@ -19,23 +38,123 @@ class BrowserLaunchWorker(QtCore.QThread):
         self.url = url
         self.browser_path = browser_path
         self.page: Any = None
+        self.result: Optional[LaunchResult] = None
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._future: Optional[concurrent.futures.Future] = None
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._future = run_coroutine(self._launch())
+        self._future.add_done_callback(self._on_done)
+
+    def isRunning(self) -> bool:  # noqa: N802 - QThread naming
+        return self._future is not None and not self._future.done()
+
+    def wait(self, timeout_ms: Optional[int] = None) -> bool:
+        if self._future is None:
+            return True
+        try:
+            self._future.result(None if timeout_ms is None else timeout_ms / 1000)
+        except concurrent.futures.TimeoutError:
+            return False
+        except Exception:
+            pass
+        return True
+
+    async def _launch(self) -> LaunchResult:
+        from app.adapters.registry import get_adapter
+        adapter = get_adapter(self.profile.base_config.adapter_id)
+
+        base = BaseConfig.from_dict(self.profile.base_config.to_dict(), self.profile_id)
+        if self.url:
+            base.target_url = self.url
+        if self.browser_path:
+            base.browser_path = self.browser_path
+        return await adapter.launch_async(base, self.profile.extra_config or {})
+
+    def _on_done(self, future: concurrent.futures.Future) -> None:
+        self.duration = time.perf_counter() - self.started_at
+        adapter_id = self.profile.base_config.adapter_id
+        try:
+            self.result = future.result()
+        except Exception as exc:
+            observe_launch(adapter_id, self.duration, failure_cause(exc))
+            self.finished.emit(False, ''.join(traceback.format_exception(exc)))
+            return
+        observe_launch(adapter_id, self.duration)
+        self.page = self.result.page
+        self.finished.emit(True, '')
+
+
+class LauncherLaunchWorker(QtCore.QThread):
+    """Asks the launcher process to start a profile; starts the launcher first if needed."""
+
+    finished = QtCore.pyqtSignal(bool, str)
+
+    def __init__(
+        self,
+        registry: RemoteSessionRegistry,
+        profile_id: str,
+        profile: ProfileConfig,
+        url: str,
+        browser_path: Optional[str] = None,
+    ):
+        super().__init__()
+        self.registry = registry
+        self.profile_id = profile_id
+        self.profile = profile
+        self.url = url
+        self.browser_path = browser_path
+        self.session: Optional[BrowserSession] = None
+        self.duration = 0.0
 
     def run(self) -> None:
+        started = time.perf_counter()
+        cause = None
         try:
-            from app.adapters.registry import get_adapter
-            adapter = get_adapter(self.profile.base_config.adapter_id)
+            self.session = self.registry.launch(self.profile_id, self.url, self.browser_path)
+            ok, message = True, ''
+        except LauncherError as exc:
+            ok, message, cause = False, exc.message, failure_cause(exc)
+        except Exception as exc:
+            ok, message, cause = False, traceback.format_exc(), failure_cause(exc)
+        self.duration = time.perf_counter() - started
+        observe_launch(self.profile.base_config.adapter_id, self.duration, cause)
+        self.finished.emit(ok, message)
 
-            base = BaseConfig.from_dict(self.profile.base_config.to_dict(), self.profile_id)
-            if self.url:
-                base.target_url = self.url
-            if self.browser_path:
-                base.browser_path = self.browser_path
 
-            result = adapter.launch(base, self.profile.extra_config or {})
-            self.page = result.page
-            self.finished.emit(True, '')
+class SessionRestoreWorker(QtCore.QThread):
+    """Reattaches to browsers that outlived the previous app process."""
+
+    finished = QtCore.pyqtSignal(bool, object, str)
+
+    def __init__(self, registry: SessionRegistry):
+        super().__init__()
+        self.registry = registry
+
+    def run(self) -> None:
+        try:
+            from app.adapters.registry import reattach_session
+
+            self.finished.emit(True, self.registry.restore(reattach_session), '')
         except Exception:
-            self.finished.emit(False, traceback.format_exc())
+            self.finished.emit(False, [], traceback.format_exc())
+
+
+class SessionFocusWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(bool, str)
+
+    def __init__(self, registry: Any, session_id: str):
+        super().__init__()
+        self.registry = registry
+        self.session_id = session_id
+
+    def run(self) -> None:
+        try:
+            self.finished.emit(bool(self.registry.focus(self.session_id)), '')
+        except Exception as exc:
+            self.finished.emit(False, str(exc))
 
 
 class BrowserVersionsWorker(QtCore.QThread):
@@ -67,3 +186,147 @@ class BrowserInstallWorker(QtCore.QThread):
             self.finished.emit(True, '')
         except Exception as exc:
             self.finished.emit(False, str(exc))
+
+
+class TrashReaperWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(bool, object, str)
+
+    def __init__(self, roots: list[Path]):
+        super().__init__()
+        self.roots = roots
+
+    def run(self) -> None:
+        try:
+            reclaimed = sum(empty_trash(root) for root in self.roots)
+            reclaimed += sweep_stale_ram_dirs()
+            self.finished.emit(True, reclaimed, '')
+        except Exception as exc:
+            self.finished.emit(False, 0, str(exc))
+
+
+class OrphanScanWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(bool, object, str)
+
+    def run(self) -> None:
+        try:
+            self.finished.emit(True, find_orphan_user_data_dirs(), '')
+        except Exception as exc:
+            self.finished.emit(False, [], str(exc))
+
+
+class StorageUsageWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(bool, object, str)
+
+    def run(self) -> None:
+        try:
+            self.finished.emit(True, measure_storage_usage(), '')
+        except Exception as exc:
+            self.finished.emit(False, [], str(exc))
+
+
+class CacheTrimWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(bool, object, str)
+
+    def __init__(self, dirs: list[Path], quota_bytes: int, skip: list[Path]):
+        super().__init__()
+        self.dirs = dirs
+        self.quota_bytes = quota_bytes
+        self.skip = skip
+
+    def run(self) -> None:
+        try:
+            freed = sum(trim_cache(path) for path in self.dirs)
+            quota_freed, _ = enforce_quota(self.quota_bytes, self.skip)
+            self.finished.emit(True, freed + quota_freed, '')
+        except Exception as exc:
+            self.finished.emit(False, 0, str(exc))
+
+
+class _ProgressWorker(QtCore.QThread):
+    progress = QtCore.pyqtSignal(int)
+
+    def __init__(self):
+        super().__init__()
+        self._last_percent = -1
+
+    def _report(self, done: int, total: int) -> None:
+        percent = int(done * 100 / total) if total else 100
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.progress.emit(percent)
+
+
+class BackupWorker(_ProgressWorker):
+    finished = QtCore.pyqtSignal(bool, object, str)
+
+    def __init__(self, profile_keys: Optional[list[str]] = None):
+        super().__init__()
+        self.profile_keys = profile_keys
+
+    def run(self) -> None:
+        try:
+            stats = BackupRepository().backup(self.profile_keys, self._report)
+            self.finished.emit(True, stats, '')
+        except Exception as exc:
+            self.finished.emit(False, None, str(exc))
+
+
+class RestoreWorker(_ProgressWorker):
+    finished = QtCore.pyqtSignal(bool, object, str)
+
+    def __init__(self, snapshot_id: str, profile_key: str):
+        super().__init__()
+        self.snapshot_id = snapshot_id
+        self.profile_key = profile_key
+
+    def run(self) -> None:
+        try:
+            restored = BackupRepository().restore_profile(self.snapshot_id, self.profile_key, self._report)
+            self.finished.emit(True, restored, '')
+        except Exception as exc:
+            self.finished.emit(False, [], str(exc))
+
+
+class BackupPruneWorker(QtCore.QThread):
+    """Deletes snapshots and the chunks only they used; waits for a running backup or restore first."""
+
+    finished = QtCore.pyqtSignal(bool, int, str)
+
+    def __init__(self, snapshot_ids: list[str]):
+        super().__init__()
+        self.snapshot_ids = snapshot_ids
+
+    def run(self) -> None:
+        try:
+            self.finished.emit(True, BackupRepository().prune(self.snapshot_ids), '')
+        except Exception as exc:
+            self.finished.emit(False, 0, str(exc))
+
+
+class ProfileCloneWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(bool, str)
+
+    def __init__(self, profile_id: str, profile: ProfileConfig, seed_from: Optional[Path]):
+        super().__init__()
+        self.profile_id = profile_id
+        self.profile = profile
+        self.seed_from = seed_from
+
+    def run(self) -> None:
+        ok = save_profile(self.profile_id, self.profile, seed_from=self.seed_from)
+        self.finished.emit(ok, '' if ok else 'save failed')
+
+
+class CaptureExportWorker(QtCore.QThread):
+    finished = QtCore.pyqtSignal(bool, object, str)
+
+    def __init__(self, result: CaptureResult, attachments: dict):
+        super().__init__()
+        self.result = result
+        self.attachments = attachments
+
+    def run(self) -> None:
+        try:
+            self.finished.emit(True, write_capture_archive(self.result, self.attachments), '')
+        except Exception as exc:
+            self.finished.emit(False, None, str(exc))
@@ -0,0 +1,113 @@
+"""
+Shared-process benchmark: opens N throwaway Chromium profiles once as
+separate browsers and once as contexts of one shared browser, and reports
+launch time and the memory of the resulting process trees.
+
+    python scripts/bench_contexts.py [--count 5] [--browser PATH] [--url URL]
+
+Memory is USS (memory private to each process) where psutil can read it,
+otherwise RSS. Needs a local Chrome/Chromium.
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import psutil
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.adapters.chromium import ChromiumAdapter  # noqa: E402
+from app.async_bridge import get_async_loop  # noqa: E402
+from app.browser_library import find_chrome_path  # noqa: E402
+from app.sessions import terminate_process_tree  # noqa: E402
+from app.spoofers.profile import BaseConfig, generate_random_profile  # noqa: E402
+
+SETTLE_SECONDS = 3.0
+
+
+def _tree_memory(pids: set[int]) -> int:
+    procs: dict[int, psutil.Process] = {}
+    for pid in pids:
+        try:
+            root = psutil.Process(pid)
+            for proc in [root] + root.children(recursive=True):
+                procs[proc.pid] = proc
+        except psutil.Error:
+            continue
+    total = 0
+    for proc in procs.values():
+        try:
+            try:
+                total += proc.memory_full_info().uss
+            except (psutil.AccessDenied, AttributeError):
+                total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+async def _run_mode(shared: bool, count: int, browser: str, url: str, tmp: Path) -> dict:
+    adapter = ChromiumAdapter()
+    results = []
+    started = time.perf_counter()
+    for i in range(count):
+        base = BaseConfig(
+            profile_id=f'bench-{i}',
+            browser_path=browser,
+            target_url=url,
+            user_data_dir=str(tmp / ('shared' if shared else 'process') / str(i)),
+        )
+        extra = generate_random_profile().to_dict()
+        extra['shared_process'] = shared
+        results.append(await adapter.launch_async(base, extra))
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(SETTLE_SECONDS)
+    if shared:
+        pids = {results[0].page.browser.pid}
+    else:
+        pids = {result.pid for result in results if result.pid}
+    memory = await asyncio.to_thread(_tree_memory, pids)
+    for result in results:
+        await asyncio.to_thread(result.page.quit)
+    for pid in pids:
+        await asyncio.to_thread(terminate_process_tree, pid)
+    return {'launch_s': elapsed, 'memory': memory}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=5)
+    parser.add_argument('--browser', default=None)
+    parser.add_argument('--url', default='about:blank')
+    args = parser.parse_args()
+
+    browser = args.browser or find_chrome_path()
+    if not browser:
+        print('No Chrome/Chromium found; pass --browser PATH', file=sys.stderr)
+        return 1
+
+    loop = get_async_loop()
+    with tempfile.TemporaryDirectory(prefix='bench-contexts-') as tmp:
+        results = {}
+        for name, shared in (('per-process', False), ('shared', True)):
+            results[name] = loop.run(_run_mode(shared, args.count, browser, args.url, Path(tmp)))
+            r = results[name]
+            print(
+                f'{name:12s} {args.count} profiles: launch {r["launch_s"]:6.2f} s '
+                f'({r["launch_s"] / args.count * 1000:.0f} ms each), memory {r["memory"] / 2**20:8.1f} MiB'
+            )
+    per, shared = results['per-process'], results['shared']
+    if shared['memory'] and shared['launch_s']:
+        print(
+            f'shared mode uses {per["memory"] / shared["memory"]:.1f}x less memory '
+            f'and launches {per["launch_s"] / shared["launch_s"]:.1f}x faster'
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
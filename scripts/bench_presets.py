@@ -0,0 +1,133 @@
+"""
+Performance preset benchmark: launches N throwaway Chromium profiles with
+each performance preset in turn and reports start-up time, process count
+and the memory of the resulting process trees.
+
+    python scripts/bench_presets.py [--count 5] [--browser PATH] [--url URL] [--presets low-memory,balanced]
+
+Start-up time is launch_async() up to the first navigation's `load`, per
+profile, launched one after another. Memory is RSS summed over the trees
+and USS (memory private to each process) where psutil can read it, taken
+after the browsers settled. Each preset starts from empty user-data dirs.
+Needs a local Chrome/Chromium.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import psutil
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.adapters.chromium import ChromiumAdapter  # noqa: E402
+from app.async_bridge import get_async_loop  # noqa: E402
+from app.browser_library import DEFAULT_PERFORMANCE_PRESET, PERFORMANCE_PRESETS, find_chrome_path  # noqa: E402
+from app.sessions import terminate_process_tree  # noqa: E402
+from app.spoofers.profile import BaseConfig, generate_random_profile  # noqa: E402
+
+SETTLE_SECONDS = 3.0
+
+
+def _tree_usage(pids: set[int]) -> dict:
+    procs: dict[int, psutil.Process] = {}
+    for pid in pids:
+        try:
+            root = psutil.Process(pid)
+            for proc in [root] + root.children(recursive=True):
+                procs[proc.pid] = proc
+        except psutil.Error:
+            continue
+    rss = 0
+    uss: Optional[int] = 0
+    for proc in procs.values():
+        try:
+            rss += proc.memory_info().rss
+            if uss is not None:
+                try:
+                    uss += proc.memory_full_info().uss
+                except (psutil.AccessDenied, AttributeError):
+                    uss = None  # a partial sum would look like a saving
+        except psutil.Error:
+            continue
+    return {'processes': len(procs), 'rss': rss, 'uss': uss}
+
+
+async def _run_preset(preset: str, count: int, browser: str, url: str, tmp: Path) -> dict:
+    adapter = ChromiumAdapter()
+    results = []
+    startup = []
+    try:
+        for i in range(count):
+            base = BaseConfig(
+                profile_id=f'bench-{preset}-{i}',
+                browser_path=browser,
+                target_url=url,
+                user_data_dir=str(tmp / preset / str(i)),
+                navigation_wait='load',
+            )
+            extra = generate_random_profile().to_dict()
+            extra['performance_preset'] = preset
+            started = time.perf_counter()
+            results.append(await adapter.launch_async(base, extra))
+            startup.append(time.perf_counter() - started)
+        await asyncio.sleep(SETTLE_SECONDS)
+        usage = await asyncio.to_thread(_tree_usage, {result.pid for result in results if result.pid})
+    finally:
+        for result in results:
+            await asyncio.to_thread(result.page.quit)
+            if result.pid:
+                await asyncio.to_thread(terminate_process_tree, result.pid)
+            if result.on_exit:
+                await asyncio.to_thread(result.on_exit)
+    return {'startup': startup, **usage}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=5)
+    parser.add_argument('--browser', default=None)
+    parser.add_argument('--url', default='about:blank')
+    parser.add_argument('--presets', default=','.join(PERFORMANCE_PRESETS), help='comma-separated preset names')
+    args = parser.parse_args()
+
+    presets = [name.strip() for name in args.presets.split(',') if name.strip()]
+    unknown = [name for name in presets if name not in PERFORMANCE_PRESETS]
+    if unknown:
+        print(f'Unknown presets: {", ".join(unknown)}; known: {", ".join(PERFORMANCE_PRESETS)}', file=sys.stderr)
+        return 2
+    browser = args.browser or find_chrome_path()
+    if not browser:
+        print('No Chrome/Chromium found; pass --browser PATH', file=sys.stderr)
+        return 1
+
+    loop = get_async_loop()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bench-presets-') as tmp:
+        for preset in presets:
+            r = results[preset] = loop.run(_run_preset(preset, args.count, browser, args.url, Path(tmp)))
+            uss = f'{r["uss"] / 2**20:8.1f} MiB' if r['uss'] is not None else '       -'
+            print(
+                f'{preset:15s} start-up median {statistics.median(r["startup"]) * 1000:6.0f} ms '
+                f'(max {max(r["startup"]) * 1000:.0f} ms), {r["processes"]:3d} processes, '
+                f'RSS {r["rss"] / 2**20:8.1f} MiB, USS {uss}'
+            )
+    baseline = results.get(DEFAULT_PERFORMANCE_PRESET)
+    if baseline and baseline['rss']:
+        for preset, r in results.items():
+            if preset == DEFAULT_PERFORMANCE_PRESET:
+                continue
+            print(
+                f'{preset} vs {DEFAULT_PERFORMANCE_PRESET}: RSS {r["rss"] / baseline["rss"] - 1:+.0%}, '
+                f'start-up {statistics.median(r["startup"]) / statistics.median(baseline["startup"]) - 1:+.0%}'
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
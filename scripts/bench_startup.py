@@ -0,0 +1,50 @@
+"""
+Cold-start benchmark: `python -m app.cli list` against bringing up the GUI
+(QApplication + MainWindow, offscreen). Each run is a fresh interpreter.
+
+    python scripts/bench_startup.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+GUI_SNIPPET = (
+    'from PyQt6 import QtWidgets; app = QtWidgets.QApplication([]); '
+    'from app.main_window import MainWindow; w = MainWindow(); app.processEvents(); w.close()'
+)
+
+
+def _time_run(cmd: list[str], env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen', PYTHONDONTWRITEBYTECODE='1')
+    cases = {
+        'cli list': [sys.executable, '-m', 'app.cli', 'list'],
+        'gui': [sys.executable, '-c', GUI_SNIPPET],
+    }
+    results = {}
+    for name, cmd in cases.items():
+        _time_run(cmd, env)  # warm the OS page cache so runs compare interpreters, not disks
+        samples = [_time_run(cmd, env) for _ in range(args.runs)]
+        results[name] = statistics.median(samples)
+        print(f'{name:10s} median {results[name] * 1000:8.1f} ms  (min {min(samples) * 1000:.1f} ms)')
+    print(f'cli is {results["gui"] / results["cli list"]:.1f}x faster to start')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
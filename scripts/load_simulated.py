@@ -0,0 +1,205 @@
+"""
+GUI load test with the simulated adapter (app/adapters/simulated.py): starts
+N simulated sessions at once through AsyncLaunchWorker and the launch page's
+completion handler, keeps them polled for a while, then closes the window,
+which shuts them all down. Reports how late the Qt event loop ran in each
+phase and what every launch cost beyond its simulated start-up delay.
+
+    python scripts/load_simulated.py [--sessions 50] [--delay-ms 800] [--jitter-ms 200]
+        [--memory-mb 20] [--failure-rate 5] [--no-process] [--devtools] [--hold 5]
+
+Runs offscreen (unless QT_QPA_PLATFORM is set) in a temporary working
+directory with its own profiles folder; real profiles and sessions are not
+touched.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import psutil
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6 import QtCore, QtWidgets  # noqa: E402
+
+PROBE_INTERVAL_MS = 10
+LAUNCH_TIMEOUT_SECONDS = 120.0
+
+
+class LagProbe(QtCore.QObject):
+    """A fast timer on the GUI thread; how late each tick fires is how long the event loop was busy."""
+
+    def __init__(self):
+        super().__init__()
+        self.samples: dict[str, list[float]] = {}
+        self.peak_threads = 0
+        self.phase = 'idle'
+        self._last = time.perf_counter()
+        self._timer = QtCore.QTimer(self)
+        self._timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(PROBE_INTERVAL_MS)
+        self._timer.timeout.connect(self._tick)
+
+    def start(self, phase: str) -> None:
+        self.phase = phase
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        lag = max(0.0, now - self._last - PROBE_INTERVAL_MS / 1000)
+        self._last = now
+        self.samples.setdefault(self.phase, []).append(lag)
+        self.peak_threads = max(self.peak_threads, threading.active_count())
+
+
+class LaunchDriver(QtCore.QObject):
+    """Starts the launches and feeds each result through the launch page like a click on Open would."""
+
+    def __init__(self, window, profile_ids: list[str]):
+        super().__init__()
+        self.window = window
+        self.profile_ids = profile_ids
+        self.workers = []
+        self.started_at: dict[str, float] = {}
+        self.overheads: list[float] = []
+        self.failed = 0
+        self.done = 0
+
+    def start(self) -> None:
+        from app.spoofers.profile import load_profile
+        from app.workers import AsyncLaunchWorker
+
+        for profile_id in self.profile_ids:
+            worker = AsyncLaunchWorker(profile_id, load_profile(profile_id), 'about:blank')
+            worker.finished.connect(lambda success, message, worker=worker: self._on_finished(worker, success, message))
+            self.workers.append(worker)
+            self.started_at[profile_id] = time.perf_counter()
+            worker.start()
+
+    def _on_finished(self, worker, success: bool, message: str) -> None:
+        elapsed = time.perf_counter() - self.started_at[worker.profile_id]
+        self.window._launch_worker = worker
+        self.window._on_browser_launched(success, message)
+        self.done += 1
+        if success and worker.page is not None:
+            self.overheads.append(elapsed - worker.page.startup_delay)
+        else:
+            self.failed += 1
+
+
+def _percentiles(values: list[float]) -> str:
+    if not values:
+        return 'n/a'
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f'p50 {statistics.median(ordered) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  '
+        f'max {ordered[-1] * 1000:7.1f} ms'
+    )
+
+
+def _wait(app: QtWidgets.QApplication, predicate, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if predicate():
+            return True
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 20)
+    return predicate()
+
+
+def _use_profiles_dir(path: Path) -> None:
+    """Points every module that imported get_profiles_dir at `path`."""
+    import app.spoofers.profile as profile_module
+
+    path.mkdir(parents=True, exist_ok=True)
+    original = profile_module.get_profiles_dir
+    for module in list(sys.modules.values()):
+        if getattr(module, 'get_profiles_dir', None) is original:
+            module.get_profiles_dir = lambda: path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--delay-ms', type=int, default=800)
+    parser.add_argument('--jitter-ms', type=int, default=200)
+    parser.add_argument('--memory-mb', type=int, default=20)
+    parser.add_argument('--failure-rate', type=float, default=5.0, help='percent of launches that fail')
+    parser.add_argument('--no-process', action='store_true', help='sessions without a process of their own')
+    parser.add_argument('--devtools', action='store_true', help='serve a fake DevTools endpoint per session')
+    parser.add_argument('--hold', type=float, default=5.0, help='seconds to keep the sessions polled')
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory(prefix='ub-load-') as tmp:
+        os.chdir(tmp)
+        from app.app_config import DEFAULT_APP_SETTINGS
+        from app.main_window import MainWindow
+        from app.spoofers.profile import BaseConfig, ProfileConfig, save_profile
+
+        _use_profiles_dir(Path(tmp) / 'profiles')
+        extra = {
+            'startup_delay_ms': args.delay_ms,
+            'startup_jitter_ms': args.jitter_ms,
+            'memory_mb': args.memory_mb,
+            'failure_rate': args.failure_rate,
+            'spawn_process': not args.no_process,
+            'devtools': args.devtools,
+        }
+        profile_ids = [f'load-{i:04d}' for i in range(args.sessions)]
+        for profile_id in profile_ids:
+            save_profile(profile_id, ProfileConfig(
+                base_config=BaseConfig(profile_id=profile_id, adapter_id='simulated'),
+                extra_config=dict(extra),
+            ))
+
+        started = time.perf_counter()
+        window = MainWindow({**DEFAULT_APP_SETTINGS, 'use_launcher': False, 'api_enabled': False})
+        window.show()
+        window.switchTo(window.launch_page)
+        app.processEvents()
+        print(f'window with {args.sessions} profiles up in {(time.perf_counter() - started) * 1000:.0f} ms')
+
+        probe = LagProbe()
+        driver = LaunchDriver(window, profile_ids)
+        probe.start('launch')
+        started = time.perf_counter()
+        driver.start()
+        if not _wait(app, lambda: driver.done == args.sessions, LAUNCH_TIMEOUT_SECONDS):
+            print(f'only {driver.done}/{args.sessions} launches finished in {LAUNCH_TIMEOUT_SECONDS:.0f} s')
+        burst = time.perf_counter() - started
+
+        probe.phase = 'hold'
+        _wait(app, lambda: False, args.hold)
+        live = len(window._session_registry.live_sessions())
+        rss = psutil.Process().memory_info().rss
+
+        probe.phase = 'shutdown'
+        started = time.perf_counter()
+        window.close()
+        app.processEvents()
+        shutdown = time.perf_counter() - started
+
+        print(
+            f'{args.sessions} launches in {burst:.2f} s: {args.sessions - driver.failed} up, {driver.failed} failed, '
+            f'{live} live after {args.hold:.0f} s'
+        )
+        print(f'launch overhead beyond the simulated delay: {_percentiles(driver.overheads)}')
+        for phase in ('launch', 'hold'):
+            print(f'event-loop lag ({phase:6s}): {_percentiles(probe.samples.get(phase, []))}')
+        print(f'shutdown of {live} sessions: {shutdown * 1000:.0f} ms')
+        print(f'peak threads {probe.peak_threads}, GUI process RSS {rss / 2**20:.1f} MiB')
+        os.chdir(ROOT)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
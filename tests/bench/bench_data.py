@@ -0,0 +1,25 @@
+"""Sizes and builders shared by the benchmark fixtures and tests."""
+import dataclasses
+import random
+
+from app.spoofers.profile import PROFILES, SpoofProfile
+
+PROFILE_COUNT = 2000
+MANIFEST_VERSIONS = 1500
+BROWSER_TREES = 40
+CHROME_PLATFORMS = ('linux64', 'mac-arm64', 'mac-x64', 'win32', 'win64')
+
+
+def synthetic_spoof_profiles(count: int) -> list[SpoofProfile]:
+    """Varied SpoofProfiles built from the PROFILES presets; generate_random_profile() would hit the network."""
+    rng = random.Random(42)
+    presets = list(PROFILES.values())
+    return [
+        dataclasses.replace(
+            presets[i % len(presets)],
+            screen_width=rng.choice([1280, 1366, 1440, 1536, 1920]),
+            hardware_concurrency=rng.choice([4, 6, 8, 12]),
+            latitude=presets[i % len(presets)].latitude + rng.uniform(-0.05, 0.05),
+        )
+        for i in range(count)
+    ]
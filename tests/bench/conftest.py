@@ -0,0 +1,164 @@
+"""
+Hot-path benchmarks. Skipped unless UB_BENCH=1:
+
+    UB_BENCH=1 python -m pytest tests/bench -q
+
+Each benchmark records the median and best time of several rounds in
+tests/bench/results.json and is compared with tests/bench/baseline.json
+(override with UB_BENCH_BASELINE). A best time more than UB_BENCH_THRESHOLD
+(default 0.3, i.e. 30%) and at least UB_BENCH_MIN_DELTA_MS (default 2) slower
+than its baseline fails the test; the best round is far less noisy than the
+median on a busy machine. Benchmarks without a baseline entry add one; set
+UB_BENCH_UPDATE=1 to re-record all of them. Baselines depend on the machine,
+so they are not committed.
+"""
+import sys
+import os
+import json
+import platform
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root and this directory (for bench_data) to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_data import BROWSER_TREES, CHROME_PLATFORMS, MANIFEST_VERSIONS, PROFILE_COUNT, synthetic_spoof_profiles  # noqa: E402
+
+BENCH_DIR = Path(__file__).resolve().parent
+ENABLED = os.environ.get('UB_BENCH') == '1'
+THRESHOLD = float(os.environ.get('UB_BENCH_THRESHOLD', '0.3'))
+MIN_DELTA_SECONDS = float(os.environ.get('UB_BENCH_MIN_DELTA_MS', '2')) / 1000
+UPDATE = os.environ.get('UB_BENCH_UPDATE') == '1'
+BASELINE_PATH = Path(os.environ.get('UB_BENCH_BASELINE') or BENCH_DIR / 'baseline.json')
+RESULTS_PATH = BENCH_DIR / 'results.json'
+DEFAULT_ROUNDS = 10
+
+if not ENABLED:
+    collect_ignore_glob = ['test_*.py']
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+@pytest.fixture(scope='session')
+def bench_results():
+    results: dict = {}
+    yield results
+    if not results:
+        return
+    machine = {'python': platform.python_version(), 'platform': platform.platform()}
+    RESULTS_PATH.write_text(json.dumps({'machine': machine, 'results': results}, indent=2), encoding='utf-8')
+    baseline = _read_json(BASELINE_PATH)
+    entries = baseline.get('results', {})
+    changed = False
+    for name, result in results.items():
+        if UPDATE or name not in entries:
+            entries[name] = result
+            changed = True
+    if changed:
+        BASELINE_PATH.write_text(json.dumps({'machine': machine, 'results': entries}, indent=2), encoding='utf-8')
+
+
+@pytest.fixture
+def bench(request, bench_results):
+    """
+    bench(fn, rounds=10, setup=None) times `fn()` after one warm-up call and
+    returns the best round in seconds; `setup()` runs untimed before each round.
+    """
+    baseline = _read_json(BASELINE_PATH).get('results', {})
+
+    def run(fn, rounds: int = DEFAULT_ROUNDS, setup=None) -> float:
+        name = request.node.name
+        if setup:
+            setup()
+        fn()
+        timings = []
+        for _ in range(rounds):
+            if setup:
+                setup()
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        bench_results[name] = {'min_s': best, 'median_s': statistics.median(timings), 'rounds': rounds}
+        print(f'[BENCH] {name}: best {best * 1000:.2f} ms over {rounds} rounds')
+        previous = baseline.get(name, {}).get('min_s')
+        if previous and not UPDATE and best > previous * (1 + THRESHOLD) and best - previous > MIN_DELTA_SECONDS:
+            pytest.fail(
+                f'{name} regressed: {best * 1000:.2f} ms vs baseline {previous * 1000:.2f} ms '
+                f'(threshold {THRESHOLD:.0%})'
+            )
+        return best
+
+    return run
+
+
+@pytest.fixture(scope='session')
+def profiles_dir(tmp_path_factory):
+    """PROFILE_COUNT saved chromium profiles, written the way save_profile() writes them."""
+    from app.spoofers.profile import BaseConfig, ProfileConfig
+
+    path = tmp_path_factory.mktemp('profiles')
+    for i, spoof in enumerate(synthetic_spoof_profiles(PROFILE_COUNT)):
+        profile_id = f'bench-{i:05d}'
+        data = ProfileConfig(base_config=BaseConfig(profile_id=profile_id), extra_config=spoof.to_dict()).to_dict()
+        data['email'] = profile_id
+        data['saved_at'] = '2026-01-01T00:00:00'
+        (path / f'{profile_id}.json').write_text(json.dumps(data, indent=2), encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def use_profiles_dir(monkeypatch, profiles_dir):
+    import app.profile_utils as profile_utils_module
+    import app.spoofers.profile as profile_module
+
+    monkeypatch.setattr(profile_module, 'get_profiles_dir', lambda: profiles_dir)
+    monkeypatch.setattr(profile_utils_module, 'get_profiles_dir', lambda: profiles_dir)
+    return profiles_dir
+
+
+@pytest.fixture(scope='session')
+def known_good_versions(tmp_path_factory):
+    """A manifest shaped like Chrome for Testing's known-good-versions-with-downloads.json."""
+    versions = []
+    for i in range(MANIFEST_VERSIONS):
+        version = f'{113 + i // 60}.0.{5672 + i}.{i % 7}'
+        entry = {'version': version, 'revision': str(1121455 + i), 'downloads': {}}
+        # Like the real manifest, the oldest entries carry no chrome downloads.
+        if i >= 100:
+            base = f'https://storage.googleapis.com/chrome-for-testing-public/{version}'
+            entry['downloads']['chrome'] = [
+                {'platform': name, 'url': f'{base}/{name}/chrome-{name}.zip'} for name in CHROME_PLATFORMS
+            ]
+            entry['downloads']['chromedriver'] = [
+                {'platform': name, 'url': f'{base}/{name}/chromedriver-{name}.zip'} for name in CHROME_PLATFORMS
+            ]
+        versions.append(entry)
+    path = tmp_path_factory.mktemp('manifest') / 'known-good-versions-with-downloads.json'
+    path.write_text(json.dumps({'timestamp': '2026-01-01T00:00:00.000Z', 'versions': versions}), encoding='utf-8')
+    return path
+
+
+@pytest.fixture(scope='session')
+def browsers_tree(tmp_path_factory):
+    """BROWSER_TREES unpacked chrome-linux64 builds plus one in the trash, with the usual clutter."""
+    root = tmp_path_factory.mktemp('browsers')
+    for i in range(BROWSER_TREES + 1):
+        version_dir = root / ('.trash/old' if i == BROWSER_TREES else '') / f'{120 + i}.0.{6000 + i}.0'
+        build = version_dir / 'chrome-linux64'
+        for sub in ('locales', 'resources/inspector', 'MEIPreload', 'swiftshader'):
+            (build / sub).mkdir(parents=True, exist_ok=True)
+            for n in range(20):
+                (build / sub / f'file_{n}.pak').write_bytes(b'')
+        (build / 'chrome').write_bytes(b'')
+        (build / 'chrome_crashpad_handler').write_bytes(b'')
+    return root
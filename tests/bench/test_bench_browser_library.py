@@ -0,0 +1,22 @@
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import app.browser_library as browser_library_module
+from app.browser_library import parse_chrome_downloads, scan_local_browsers
+from bench_data import BROWSER_TREES
+
+
+def test_parse_chrome_downloads(bench, known_good_versions):
+    text = known_good_versions.read_text(encoding='utf-8')
+    assert len(parse_chrome_downloads(json.loads(text))) > 0
+    bench(lambda: parse_chrome_downloads(json.loads(text)))
+
+
+def test_scan_local_browsers(bench, browsers_tree, monkeypatch):
+    monkeypatch.setattr(browser_library_module, 'get_browsers_dir', lambda: browsers_tree)
+    assert len(scan_local_browsers()) == BROWSER_TREES
+    bench(scan_local_browsers)
@@ -0,0 +1,38 @@
+import sys
+import os
+import asyncio
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.cdp import CDPConnection, fetch_json, navigate
+from app.fake_devtools import FakeDevTools
+from app.spoofers.cdp_spoofer import CDPSpoofer, run_pre_navigation_async
+from bench_data import synthetic_spoof_profiles
+
+# Roughly a local Chrome's reply time per command.
+LATENCY = 0.002
+
+
+def test_spoof_and_navigate_round_trip(bench):
+    """The CDP part of a launch: attach, pipelined spoofing, navigate to load."""
+    commands = CDPSpoofer(synthetic_spoof_profiles(1)[0]).pre_navigation_commands()
+    loop = asyncio.new_event_loop()
+    devtools = FakeDevTools(latency=LATENCY)
+    loop.run_until_complete(devtools.start())
+
+    async def launch():
+        target_id = (await fetch_json(devtools.port, '/json'))[0]['id']
+        cdp = await CDPConnection.connect(devtools.ws_url)
+        try:
+            session_id = (await cdp.send('Target.attachToTarget', {'targetId': target_id, 'flatten': True}))['sessionId']
+            await run_pre_navigation_async(cdp, commands, session_id)
+            await navigate(cdp, 'https://example.test', session_id, wait='load')
+        finally:
+            await cdp.close()
+
+    try:
+        bench(lambda: loop.run_until_complete(launch()))
+    finally:
+        loop.run_until_complete(devtools.close())
+        loop.close()
@@ -0,0 +1,25 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6 import QtWidgets  # noqa: E402
+
+from app.app_config import load_app_settings  # noqa: E402
+
+
+def test_main_window_construction(bench, use_profiles_dir):
+    from app.main_window import MainWindow
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    settings = load_app_settings()
+
+    def construct():
+        window = MainWindow(settings)
+        window.close()
+        app.processEvents()
+
+    bench(construct, rounds=3)
@@ -0,0 +1,44 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.profile_utils import list_profile_entries
+from app.spoofers.profile import SpoofProfile, load_profile, save_profile
+from bench_data import PROFILE_COUNT, synthetic_spoof_profiles
+
+
+def test_list_profile_entries(bench, use_profiles_dir):
+    assert len(list_profile_entries()) == PROFILE_COUNT
+    bench(list_profile_entries)
+
+
+def test_load_profile(bench, use_profiles_dir):
+    ids = [f'bench-{i:05d}' for i in range(0, PROFILE_COUNT, 10)]
+
+    def load_all():
+        for profile_id in ids:
+            assert load_profile(profile_id) is not None
+
+    bench(load_all)
+
+
+def test_save_profile(bench, use_profiles_dir):
+    profiles = [(f'bench-{i:05d}', load_profile(f'bench-{i:05d}')) for i in range(0, PROFILE_COUNT, 10)]
+
+    def save_all():
+        for profile_id, profile in profiles:
+            save_profile(profile_id, profile)
+
+    bench(save_all)
+
+
+def test_spoof_profile_round_trip(bench):
+    profiles = synthetic_spoof_profiles(500)
+
+    def round_trip():
+        for profile in profiles:
+            SpoofProfile.from_dict(profile.to_dict())
+
+    bench(round_trip)
@@ -0,0 +1,31 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.spoofers.cdp_spoofer import CDPSpoofer
+from bench_data import synthetic_spoof_profiles
+
+SPOOFER_COUNT = 200
+
+
+def test_collect_js(bench):
+    spoofers = [CDPSpoofer(profile) for profile in synthetic_spoof_profiles(SPOOFER_COUNT)]
+    assert spoofers[0]._collect_js()
+
+    def collect_all():
+        for spoofer in spoofers:
+            spoofer._collect_js()
+
+    bench(collect_all)
+
+
+def test_pre_navigation_commands(bench):
+    profiles = synthetic_spoof_profiles(SPOOFER_COUNT)
+
+    def build_all():
+        for profile in profiles:
+            CDPSpoofer(profile).pre_navigation_commands()
+
+    bench(build_all)
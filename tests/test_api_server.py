@@ -0,0 +1,163 @@
+import sys
+import os
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.adapters.registry as registry_module
+import app.profile_utils as profile_utils_module
+import app.spoofers.profile as profile_module
+from app.adapters.base import BrowserAdapter, LaunchResult
+from app.adapters.chromium import ChromiumAdapter
+from app.api_server import ApiServer
+from app.metrics import LAUNCHES, PROFILE_IO
+from app.sessions import SessionRegistry
+from app.spoofers.profile import BaseConfig, ProfileConfig, save_profile
+
+TOKEN = 'secret-token'
+
+
+class _Handle:
+    def quit(self):
+        pass
+
+
+class _SlowAdapter(ChromiumAdapter):
+    # Keep the blocking fake launch; ChromiumAdapter's own async path would start a real browser.
+    launch_async = BrowserAdapter.launch_async
+
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def validate(self, base_config, extra_config):
+        return []
+
+    def launch(self, base_config, extra_config):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.2)
+        with cls.lock:
+            cls.active -= 1
+        return LaunchResult(page=_Handle())
+
+
+def _request(server, method, path, body=None, token=TOKEN):
+    conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=10)
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    payload = json.dumps(body) if body is not None else None
+    if payload:
+        headers['Content-Type'] = 'application/json'
+    conn.request(method, path, body=payload, headers=headers)
+    resp = conn.getresponse()
+    data = json.loads(resp.read())
+    conn.close()
+    return resp.status, data
+
+
+def _start(tmp_path, monkeypatch, profiles=('a', 'b', 'c', 'd')):
+    monkeypatch.setattr(profile_module, 'get_profiles_dir', lambda: tmp_path)
+    monkeypatch.setattr(profile_utils_module, 'get_profiles_dir', lambda: tmp_path)
+    monkeypatch.setitem(registry_module.REGISTRY, 'chromium', _SlowAdapter)
+    _SlowAdapter.active = _SlowAdapter.peak = 0
+    for profile_id in profiles:
+        save_profile(profile_id, ProfileConfig(base_config=BaseConfig(profile_id=profile_id), extra_config={}))
+    server = ApiServer(SessionRegistry(), TOKEN, port=0, max_concurrent_launches=2)
+    server.start()
+    return server
+
+
+def test_auth_and_routes(tmp_path, monkeypatch):
+    server = _start(tmp_path, monkeypatch)
+    try:
+        assert _request(server, 'GET', '/health', token=None) == (200, {'ok': True})
+        assert _request(server, 'GET', '/profiles', token=None)[0] == 401
+        assert _request(server, 'GET', '/profiles', token='wrong')[0] == 401
+        status, data = _request(server, 'GET', '/profiles')
+        assert status == 200
+        assert [p['id'] for p in data['profiles']] == ['a', 'b', 'c', 'd']
+        assert _request(server, 'GET', '/nope')[0] == 404
+        assert _request(server, 'DELETE', '/sessions')[0] == 405
+        assert _request(server, 'POST', '/profiles/missing/launch')[0] == 404
+    finally:
+        server.stop()
+    assert not server.is_running()
+
+
+def test_launch_query_and_stop(tmp_path, monkeypatch):
+    server = _start(tmp_path, monkeypatch)
+    try:
+        status, data = _request(server, 'POST', '/profiles/a/launch', {'url': 'https://example.org'})
+        assert status == 201
+        assert data['ws_endpoint'] is None
+        session_id = data['session']['session_id']
+        assert _request(server, 'POST', '/profiles/a/launch')[0] == 409
+
+        status, data = _request(server, 'GET', f'/sessions/{session_id}')
+        assert status == 200 and data['session']['state'] == 'running'
+        running = {p['id']: p['running'] for p in _request(server, 'GET', '/profiles')[1]['profiles']}
+        assert running['a'] and not running['b']
+
+        status, data = _request(server, 'POST', f'/sessions/{session_id}/stop')
+        assert status == 200 and data['session']['state'] == 'stopped'
+        assert _request(server, 'GET', '/sessions/unknown')[0] == 404
+    finally:
+        server.stop()
+
+
+def test_launches_are_capped(tmp_path, monkeypatch):
+    server = _start(tmp_path, monkeypatch)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(_request, server, 'POST', f'/profiles/{p}/launch') for p in 'abcd']
+            # Reads keep being answered while launches are queued.
+            assert _request(server, 'GET', '/sessions')[0] == 200
+            statuses = [future.result()[0] for future in futures]
+        assert statuses == [201] * 4
+        assert _SlowAdapter.peak == 2
+        assert len(server.registry.live_sessions()) == 4
+    finally:
+        server.stop()
+
+
+def test_api_serves_launch_and_session_metrics(tmp_path, monkeypatch):
+    launched = LAUNCHES.value(adapter='chromium', outcome='success')
+    saves = PROFILE_IO.count(operation='save', outcome='ok')
+    server = _start(tmp_path, monkeypatch, profiles=('a',))
+    try:
+        assert PROFILE_IO.count(operation='save', outcome='ok') == saves + 1
+        assert _request(server, 'POST', '/profiles/a/launch')[0] == 201
+        server.registry.poll()
+        assert LAUNCHES.value(adapter='chromium', outcome='success') == launched + 1
+
+        conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=10)
+        conn.request('GET', '/metrics', headers={'Authorization': f'Bearer {TOKEN}'})
+        resp = conn.getresponse()
+        text = resp.read().decode()
+        conn.close()
+        assert resp.status == 200
+        assert resp.getheader('Content-Type').startswith('text/plain; version=0.0.4')
+        assert 'uselessbrowser_launch_duration_seconds_count{adapter="chromium",outcome="success"}' in text
+        assert 'uselessbrowser_live_sessions{adapter="chromium"} 1' in text
+        assert 'uselessbrowser_profile_io_seconds_count{operation="load",outcome="ok"}' in text
+        assert _request(server, 'GET', '/metrics', token=None)[0] == 401
+    finally:
+        server.stop()
+
+
+def test_hibernation_is_configured_over_the_api(tmp_path, monkeypatch):
+    server = _start(tmp_path, monkeypatch, profiles=())
+    try:
+        assert _request(server, 'GET', '/hibernation') == (200, {'idle_minutes': 0, 'quit_minutes': 0})
+        assert _request(server, 'POST', '/hibernation', {'idle_minutes': 15}) == (200, {'idle_minutes': 15, 'quit_minutes': 0})
+        assert server.registry.hibernator.idle_seconds == 15 * 60
+        assert _request(server, 'POST', '/hibernation', {'quit_minutes': -1})[0] == 422
+    finally:
+        server.stop()
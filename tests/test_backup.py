@@ -0,0 +1,115 @@
+import sys
+import os
+import json
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.backup as backup_module
+from app.backup import CHUNK_SIZE, BackupRepository
+
+
+def _make_profile(profiles_dir, profile_id, payload):
+    (profiles_dir / f'{profile_id}.json').write_text(
+        json.dumps({'base_config': {'profile_id': profile_id, 'adapter_id': 'chromium'}}),
+        encoding='utf-8',
+    )
+    user_data = profiles_dir / 'chrome' / profile_id
+    (user_data / 'Default' / 'Cache').mkdir(parents=True)
+    (user_data / 'Default' / 'Cache' / 'data_0').write_bytes(b'cache' * 100)
+    (user_data / 'Default' / 'Cookies').write_bytes(payload)
+    (user_data / 'Local State').write_text('{}')
+    os.symlink('nowhere', user_data / 'SingletonLock')
+    return user_data
+
+
+def test_backup_is_incremental_and_skips_caches(tmp_path):
+    profiles_dir = tmp_path / 'profiles'
+    profiles_dir.mkdir()
+    user_data = _make_profile(profiles_dir, 'alice', os.urandom(CHUNK_SIZE + 10))
+    _make_profile(profiles_dir, 'bob', b'bob cookies')
+    repo = BackupRepository(root=tmp_path / 'backups', profiles_dir=profiles_dir)
+
+    first = repo.backup()
+    assert sorted(first.snapshot.profiles) == ['alice', 'bob']
+    manifest = repo.load_profile_manifest(first.snapshot.snapshot_id, 'alice')
+    paths = sorted(item['path'] for item in manifest['files'])
+    assert paths == ['alice.json', 'chrome/alice/Default/Cookies', 'chrome/alice/Local State']
+    cookies = next(item for item in manifest['files'] if item['path'].endswith('Cookies'))
+    assert len(cookies['chunks']) == 2
+
+    (user_data / 'Local State').write_text('{"changed": true}')
+    second = repo.backup(['alice'])
+    assert second.reused_files == 2
+    assert second.new_chunks == 1
+    assert [s.snapshot_id for s in repo.list_snapshots()][0] == second.snapshot.snapshot_id
+
+
+def test_restore_single_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(backup_module, 'move_to_trash', lambda path, root: path.rename(root / f'{path.name}.old'))
+    profiles_dir = tmp_path / 'profiles'
+    profiles_dir.mkdir()
+    payload = os.urandom(CHUNK_SIZE * 2)
+    user_data = _make_profile(profiles_dir, 'alice', payload)
+    _make_profile(profiles_dir, 'bob', b'bob cookies')
+    repo = BackupRepository(root=tmp_path / 'backups', profiles_dir=profiles_dir)
+    snapshot = repo.backup().snapshot
+
+    (user_data / 'Default' / 'Cookies').write_bytes(b'broken')
+    (profiles_dir / 'bob.json').write_text('{}')
+    progress = []
+    restored = repo.restore_profile(snapshot.snapshot_id, 'alice', lambda done, total: progress.append((done, total)))
+
+    assert sorted(path.name for path in restored) == ['alice', 'alice.json']
+    assert (user_data / 'Default' / 'Cookies').read_bytes() == payload
+    assert not (user_data / 'Default' / 'Cache').exists()
+    assert (profiles_dir / 'bob.json').read_text() == '{}'
+    assert progress[-1][0] == progress[-1][1]
+    assert not list(profiles_dir.glob('.restore-*'))
+
+
+def test_zlib_fallback_reads_back(tmp_path, monkeypatch):
+    monkeypatch.setattr(backup_module, '_zstd_stdlib', None)
+    monkeypatch.setattr(backup_module, 'zstandard', None)
+    repo = BackupRepository(root=tmp_path / 'backups', profiles_dir=tmp_path)
+    digest, stored = repo._put_chunk(b'a' * 10000)
+    assert 0 < stored < 10000
+    assert repo._read_chunk(digest) == b'a' * 10000
+    assert repo.collect_garbage() == stored
+
+
+def test_prune_frees_only_chunks_no_remaining_snapshot_uses(tmp_path):
+    profiles_dir = tmp_path / 'profiles'
+    profiles_dir.mkdir()
+    user_data = _make_profile(profiles_dir, 'alice', os.urandom(CHUNK_SIZE))
+    repo = BackupRepository(root=tmp_path / 'backups', profiles_dir=profiles_dir)
+    old = repo.backup().snapshot
+    (user_data / 'Default' / 'Cookies').write_bytes(os.urandom(100))
+    new = repo.backup().snapshot
+
+    assert repo.prune([old.snapshot_id]) > 0
+    assert [s.snapshot_id for s in repo.list_snapshots()] == [new.snapshot_id]
+    repo.restore_profile(new.snapshot_id, 'alice')
+    assert repo.collect_garbage() == 0
+
+
+def test_garbage_collection_waits_for_a_running_backup(tmp_path):
+    profiles_dir = tmp_path / 'profiles'
+    profiles_dir.mkdir()
+    _make_profile(profiles_dir, 'alice', os.urandom(CHUNK_SIZE * 3))
+    repo = BackupRepository(root=tmp_path / 'backups', profiles_dir=profiles_dir)
+    collector = threading.Thread(target=repo.collect_garbage)
+
+    def progress(done, total):
+        # Chunks are on disk but no manifest refers to them yet.
+        if not collector.is_alive() and done >= CHUNK_SIZE:
+            collector.start()
+            time.sleep(0.2)
+            assert collector.is_alive()
+
+    snapshot = repo.backup(progress=progress).snapshot
+    collector.join(5)
+    assert not collector.is_alive()
+    repo.restore_profile(snapshot.snapshot_id, 'alice')
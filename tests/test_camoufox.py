@@ -0,0 +1,133 @@
+import sys
+import os
+import json
+import asyncio
+import types
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.adapters.camoufox as camoufox_module
+import app.spoofers.profile as profile_module
+from app.adapters.camoufox import FINGERPRINT_CACHE_KEY, CamoufoxAdapter, config_from_env
+from app.spoofers.profile import (
+    BaseConfig,
+    ProfileConfig,
+    build_default_profile_config,
+    load_profile,
+    save_profile,
+    update_extra_config,
+)
+
+
+def _fake_camoufox(monkeypatch, calls):
+    def launch_options(**kwargs):
+        calls.append(kwargs)
+        config = dict(kwargs.get('config') or {})
+        # Like Camoufox: generated keys only fill in what the given config lacks.
+        config.setdefault('navigator.userAgent', f'Mozilla/5.0 (Windows NT 10.0) Firefox/{len(calls)}')
+        if kwargs.get('geoip'):
+            config.setdefault('timezone', 'Europe/Berlin')
+        text = json.dumps(config)
+        env = {'PATH': '/bin', 'CAMOU_CONFIG_1': text[:10], 'CAMOU_CONFIG_2': text[10:]}
+        return {'env': env, 'headless': kwargs.get('headless')}
+
+    utils = types.ModuleType('camoufox.utils')
+    utils.launch_options = launch_options
+    monkeypatch.setitem(sys.modules, 'camoufox', types.ModuleType('camoufox'))
+    monkeypatch.setitem(sys.modules, 'camoufox.utils', utils)
+
+
+def test_config_from_env_joins_chunks_in_order():
+    env = {'CAMOU_CONFIG_2': '"b"}', 'CAMOU_CONFIG_1': '{"a": ', 'CAMOU_CONFIG_X': 'junk'}
+    assert config_from_env(env) == {'a': 'b'}
+    assert config_from_env({'PATH': '/bin'}) is None
+
+
+def test_fingerprint_is_reused_until_the_proxy_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_module, 'get_profiles_dir', lambda: tmp_path)
+    calls = []
+    _fake_camoufox(monkeypatch, calls)
+    adapter = CamoufoxAdapter()
+    base = BaseConfig(profile_id='p', adapter_id='camoufox', user_data_dir=str(tmp_path / 'data'))
+    profile = ProfileConfig(base_config=base, extra_config={'geoip': True})
+    save_profile('p', profile)
+
+    def resolve(extra):
+        _, options, _ = adapter._prepare_launch(base, extra)
+        _, updates = adapter._resolve_launch_options(base, extra, options)
+        # What the profile's owner does with the LaunchResult.
+        extra.update(updates)
+        update_extra_config('p', updates)
+        return calls[-1]
+
+    extra = dict(profile.extra_config)
+    before = dict(extra)
+    _, options, _ = adapter._prepare_launch(base, extra)
+    _, updates = adapter._resolve_launch_options(base, extra, options)
+    # Resolving runs off the owning thread and leaves the caller's config and the saved profile alone.
+    assert extra == before and FINGERPRINT_CACHE_KEY not in load_profile('p').extra_config
+    assert set(updates) == {FINGERPRINT_CACHE_KEY}
+    calls.clear()
+
+    first = resolve(extra)
+    assert first['geoip'] is True and 'config' not in first and 'persistent_context' not in first
+    cached = extra[FINGERPRINT_CACHE_KEY]
+    assert cached['config']['timezone'] == 'Europe/Berlin'
+    assert load_profile('p').extra_config[FINGERPRINT_CACHE_KEY] == cached
+
+    second = resolve(extra)
+    assert second['geoip'] is None and second['config'] == cached['config']
+    assert second['os'] == 'windows'
+
+    extra['proxy'] = 'http://127.0.0.1:8080'
+    third = resolve(extra)
+    assert third['geoip'] is True and 'config' not in third
+    assert extra[FINGERPRINT_CACHE_KEY]['key'] != cached['key']
+
+    # A profile cloned from this one must generate its own fingerprint.
+    clone = build_default_profile_config('q', template=load_profile('p'))
+    assert FINGERPRINT_CACHE_KEY not in clone.extra_config
+    assert camoufox_module.fingerprint_cache_key({'proxy': None}) != camoufox_module.fingerprint_cache_key({'proxy': 'x'})
+
+
+def test_failed_launch_only_resets_a_dead_driver(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_module, 'get_profiles_dir', lambda: tmp_path)
+    calls = []
+    _fake_camoufox(monkeypatch, calls)
+    driver_proc = types.SimpleNamespace(returncode=None)
+    connection = types.SimpleNamespace(_closed_error=None, _transport=types.SimpleNamespace(_proc=driver_proc))
+    stopped = []
+
+    class _Firefox:
+        async def launch_persistent_context(self, **kwargs):
+            raise RuntimeError('bad profile')
+
+    class _Playwright:
+        _connection = connection
+        firefox = _Firefox()
+
+        async def stop(self):
+            stopped.append(True)
+
+    driver = camoufox_module._SharedPlaywright()
+    driver._playwright = _Playwright()
+    monkeypatch.setattr(camoufox_module, '_DRIVER', driver)
+    adapter = CamoufoxAdapter()
+    base = BaseConfig(profile_id='p', adapter_id='camoufox', user_data_dir=str(tmp_path / 'data'))
+
+    def launch():
+        try:
+            asyncio.run(adapter.launch_async(base, {'geoip': False}))
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError('launch should have failed')
+
+    launch()
+    # Other sessions keep their driver.
+    assert driver._playwright is not None and stopped == []
+
+    driver_proc.returncode = 1
+    launch()
+    assert driver._playwright is None and stopped == [True]
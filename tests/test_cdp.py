@@ -0,0 +1,170 @@
+import sys
+import os
+import asyncio
+import json
+import threading
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.adapters.base import BrowserAdapter, LaunchResult
+from app.adapters.chromium import ChromiumAdapter
+from app.async_bridge import AsyncLoopThread, get_async_loop
+from app.cdp import OP_TEXT, CDPConnection, CDPError, encode_frame, navigate, read_frame, websocket_accept_key
+from app.spoofers.cdp_spoofer import CDPSpoofer
+from app.spoofers.profile import BaseConfig, SpoofProfile
+
+
+class _DevToolsStub:
+    """Just enough of a DevTools websocket endpoint: answers each command in order."""
+
+    def __init__(self, failing=(), lifecycle=()):
+        self.failing = set(failing)
+        # Page.lifecycleEvent names sent after each Page.navigate reply.
+        self.lifecycle = list(lifecycle)
+        self.received = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f'ws://127.0.0.1:{port}/devtools/browser/stub'
+
+    async def _handle(self, reader, writer):
+        head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+        key = next(line.split(':', 1)[1].strip() for line in head.split('\r\n') if line.lower().startswith('sec-websocket-key'))
+        writer.write(
+            (
+                'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                f'Sec-WebSocket-Accept: {websocket_accept_key(key)}\r\n\r\n'
+            ).encode('ascii')
+        )
+        try:
+            while True:
+                _, opcode, payload = await read_frame(reader)
+                if opcode != OP_TEXT:
+                    break
+                message = json.loads(payload)
+                self.received.append(message)
+                if message['method'] in self.failing:
+                    reply = {'id': message['id'], 'error': {'code': -32601, 'message': 'not found'}}
+                elif message['method'] == 'Page.navigate':
+                    reply = {'id': message['id'], 'result': {'frameId': 'F', 'loaderId': 'L1'}}
+                else:
+                    reply = {'id': message['id'], 'result': {'echo': message['method']}}
+                messages = [reply]
+                if message['method'] == 'Page.navigate':
+                    messages += [
+                        {'method': 'Page.lifecycleEvent', 'sessionId': message.get('sessionId'),
+                         'params': {'frameId': 'F', 'loaderId': 'L1', 'name': name}}
+                        for name in self.lifecycle
+                    ]
+                for item in messages:
+                    writer.write(encode_frame(OP_TEXT, json.dumps(item).encode('utf-8'), mask=False))
+        except asyncio.IncompleteReadError:
+            pass
+        writer.close()
+
+
+def test_connection_pipelines_commands_and_reports_errors():
+    async def scenario():
+        stub = _DevToolsStub(failing={'Broken.method'})
+        cdp = await CDPConnection.connect(await stub.start())
+        futures = [cdp.send_nowait(f'Domain.m{i}', {'i': i}, session_id='S') for i in range(20)]
+        results = await asyncio.gather(*futures)
+        assert [r['echo'] for r in results] == [f'Domain.m{i}' for i in range(20)]
+        assert all(m['sessionId'] == 'S' for m in stub.received)
+        # Large payloads use the 64-bit length form.
+        assert (await cdp.send('Big.payload', {'blob': 'x' * 200_000}))['echo'] == 'Big.payload'
+        try:
+            await cdp.send('Broken.method')
+            assert False, 'expected CDPError'
+        except CDPError as exc:
+            assert exc.code == -32601
+        await cdp.close()
+        assert cdp.closed
+        stub.server.close()
+
+    asyncio.run(scenario())
+
+
+def test_navigate_waits_only_for_the_requested_milestone():
+    async def scenario():
+        stub = _DevToolsStub(lifecycle=['DOMContentLoaded'])
+        cdp = await CDPConnection.connect(await stub.start())
+        await navigate(cdp, 'https://a.test', 'S', wait='commit')
+        assert [m['method'] for m in stub.received] == ['Page.navigate']
+
+        await navigate(cdp, 'https://a.test', 'S', wait='domcontentloaded', timeout=5)
+        assert [m['method'] for m in stub.received[1:]] == ['Page.enable', 'Page.setLifecycleEventsEnabled', 'Page.navigate']
+
+        # The stub never fires 'load'.
+        try:
+            await navigate(cdp, 'https://a.test', 'S', wait='load', timeout=0.2)
+            assert False, 'expected a timeout'
+        except asyncio.TimeoutError:
+            pass
+        assert not cdp._listeners['Page.lifecycleEvent']
+
+        await navigate(cdp, 'https://b.test', 'S', wait='none')
+        await asyncio.sleep(0.05)
+        assert stub.received[-1]['params'] == {'url': 'https://b.test'}
+        await cdp.close()
+        stub.server.close()
+
+    asyncio.run(scenario())
+
+
+def test_spoofer_runs_the_same_commands_sync_and_async():
+    profile = SpoofProfile(protect_timezone=False)
+    spoofer = CDPSpoofer(profile)
+    methods = [c.method for c in spoofer.pre_navigation_commands()]
+    assert 'Emulation.setTimezoneOverride' not in methods
+    assert methods[0] == methods[-1] == 'Page.addScriptToEvaluateOnNewDocument'
+
+    class _Page:
+        def __init__(self):
+            self.calls = []
+
+        def run_cdp(self, method, **params):
+            self.calls.append(method)
+            if method == 'Browser.setPermission':
+                raise RuntimeError('unsupported')
+
+    page = _Page()
+    assert spoofer.apply_pre_navigation(page) is True
+
+    async def scenario():
+        stub = _DevToolsStub(failing={'Browser.setPermission'})
+        cdp = await CDPConnection.connect(await stub.start())
+        ok = await spoofer.apply_pre_navigation_async(cdp, 'S')
+        await cdp.close()
+        stub.server.close()
+        return ok, [m['method'] for m in stub.received]
+
+    ok, sent = asyncio.run(scenario())
+    assert ok is True
+    # Both paths fall back to the emulation permission override; the async one after the whole pipelined batch.
+    fallback = methods.index('Browser.setPermission') + 1
+    assert page.calls == methods[:fallback] + ['Emulation.setPermissionOverride'] + methods[fallback:]
+    assert sent == methods + ['Emulation.setPermissionOverride']
+
+
+def test_default_launch_async_runs_blocking_launch_off_the_loop():
+    loop_thread = AsyncLoopThread(name='test-loop')
+    seen = []
+
+    class _BlockingAdapter(ChromiumAdapter):
+        launch_async = BrowserAdapter.launch_async
+
+        def launch(self, base_config, extra_config):
+            seen.append(threading.current_thread().name)
+            return LaunchResult(page='page', pid=1)
+
+    try:
+        result = loop_thread.run(_BlockingAdapter().launch_async(BaseConfig(profile_id='p'), {}), timeout=5)
+        assert result.page == 'page'
+        assert seen and seen[0] != 'test-loop'
+    finally:
+        loop_thread.stop()
+    assert not loop_thread.is_running()
+    assert get_async_loop().run(asyncio.sleep(0, 'shared'), timeout=5) == 'shared'
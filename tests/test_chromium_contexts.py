@@ -0,0 +1,155 @@
+import sys
+import os
+import asyncio
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.adapters.chromium as chromium_module
+from app.adapters.chromium import ChromiumAdapter
+from app.async_bridge import get_async_loop
+from app.adapters.chromium_contexts import SharedChromium
+from app.launch_plan import LaunchPlan
+from app.sessions import SessionRegistry
+from app.spoofers.profile import BaseConfig
+
+
+class _FakeCDP:
+    def __init__(self):
+        self.sent = []
+        self.listeners = {}
+        self.closed = False
+        self._ids = 0
+
+    def on(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def emit(self, event, params):
+        for callback in self.listeners.get(event, []):
+            callback(params, None)
+
+    async def send(self, method, params=None, session_id=None, timeout=None):
+        self.sent.append((method, params or {}))
+        self._ids += 1
+        if method == 'Target.createBrowserContext':
+            return {'browserContextId': f'ctx{self._ids}'}
+        if method == 'Target.createTarget':
+            target_id = f'tab{self._ids}'
+            self.emit('Target.targetCreated', {'targetInfo': {
+                'targetId': target_id, 'type': 'page', 'browserContextId': params['browserContextId'],
+            }})
+            return {'targetId': target_id}
+        return {}
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeProcess:
+    pid = 424242
+
+    def poll(self):
+        return None
+
+    def wait(self, timeout=None):
+        return 0
+
+
+class _Adapter(ChromiumAdapter):
+    def __init__(self):
+        self.prepared = []
+
+    async def _prepare_target(self, cdp, target_id, base_config, plan):
+        self.prepared.append((target_id, plan.profile_id, base_config.target_url))
+        return 'session'
+
+
+def test_contexts_get_their_own_proxy_and_close_with_the_last_one(tmp_path):
+    async def scenario():
+        cdp = _FakeCDP()
+        browser = SharedChromium(_FakeProcess(), 9222, cdp, tmp_path / 'shared')
+        adapter = _Adapter()
+        base = BaseConfig(profile_id='a', proxy='http://10.0.0.1:3128', target_url='https://a.test')
+        first = await browser.open_context(base, {}, LaunchPlan('a', 'chromium', 'd1'), adapter)
+        second = await browser.open_context(
+            BaseConfig(profile_id='b'), {'proxy': 'socks5://10.0.0.2:1080'}, LaunchPlan('b', 'chromium', 'd2'), adapter
+        )
+
+        contexts = [params for method, params in cdp.sent if method == 'Target.createBrowserContext']
+        assert [c.get('proxyServer') for c in contexts] == ['http://10.0.0.1:3128', 'socks5://10.0.0.2:1080']
+        assert [p[0] for p in adapter.prepared] == [first.target_id, second.target_id]
+        assert adapter.prepared[0][1:] == ('a', 'https://a.test')
+        assert first.is_alive() and second.is_alive()
+
+        # Closing the context's window from the browser ends that session only.
+        cdp.emit('Target.targetDestroyed', {'targetId': first.target_id})
+        await asyncio.sleep(0)
+        assert not first.is_alive() and second.is_alive()
+        assert ('Target.disposeBrowserContext', {'browserContextId': first.context_id}) in cdp.sent
+        assert not browser.closing
+
+        await browser.close_context(second.context_id)
+        await asyncio.sleep(0.05)
+        assert browser.closing and cdp.closed
+        assert ('Browser.close', {}) in cdp.sent
+        return first
+
+    first = asyncio.run(scenario())
+
+    registry = SessionRegistry()
+    session = registry.register('a', 'chromium', first)
+    assert session.pid is None
+    assert [s.session_id for s in registry.poll()] == [session.session_id]
+    assert session.state == 'exited'
+
+
+class _StartedAdapter(ChromiumAdapter):
+    """Skips spawning Chrome: the browser "starts" with the given CDP connection."""
+
+    def __init__(self, cdp):
+        self.cdp = cdp
+
+    async def _start_browser(self, plan, user_data_dir):
+        return _FakeProcess(), 9222, self.cdp
+
+    async def _prepare_target(self, cdp, target_id, base_config, plan):
+        return 'session'
+
+    def govern(self, base_config, pid):
+        pass
+
+
+class _PagesCDP(_FakeCDP):
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+
+    async def send(self, method, params=None, session_id=None, timeout=None):
+        if method == 'Target.getTargets':
+            return {'targetInfos': [{'targetId': f'tab{n}', 'type': 'page'} for n in range(self.pages)]}
+        return await super().send(method, params, session_id, timeout)
+
+
+def test_launch_closes_its_cdp_connection_on_failure_and_at_session_exit(tmp_path, monkeypatch):
+    base = BaseConfig(profile_id='p', browser_path=str(tmp_path / 'chrome'), user_data_dir=str(tmp_path / 'data'))
+    (tmp_path / 'chrome').write_text('')
+    monkeypatch.setattr(chromium_module, 'terminate_process_tree', lambda pid: None)
+    loop = get_async_loop()
+
+    # No page target to spoof: the launch fails and must not leave its connection open.
+    failing = _PagesCDP(pages=0)
+    try:
+        loop.run(_StartedAdapter(failing).launch_async(base, {}), timeout=10)
+    except Exception:
+        pass
+    else:
+        raise AssertionError('launch without a page target should fail')
+    assert failing.closed
+
+    monkeypatch.setattr(chromium_module, 'ChromiumPage', lambda address: address)
+    cdp = _PagesCDP(pages=1)
+    result = loop.run(_StartedAdapter(cdp).launch_async(base, {}), timeout=10)
+    # Spoofing lives on the connection, so it stays open for the session.
+    assert not cdp.closed
+    result.on_exit()
+    assert cdp.closed
@@ -0,0 +1,55 @@
+import sys
+import os
+import json
+import subprocess
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.profile_utils as profile_utils_module
+import app.spoofers.profile as profile_module
+from app import cli
+from app.sessions import load_session_records, save_session_records
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_cli_does_not_import_qt():
+    code = (
+        'import sys; from app import cli; cli.main(["list"]); '
+        'print(sorted(m for m in sys.modules if m.split(".")[0] in ("PyQt6", "qfluentwidgets", "DrissionPage")))'
+    )
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == '[]'
+
+
+def test_create_show_and_list(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(profile_module, 'get_profiles_dir', lambda: tmp_path)
+    monkeypatch.setattr(profile_utils_module, 'get_profiles_dir', lambda: tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    assert cli.main(['create', 'alpha', '--adapter', 'camoufox']) == 0
+    assert cli.main(['create', 'alpha']) == 1
+    assert cli.main(['create', 'beta', '--from', 'alpha']) == 0
+    capsys.readouterr()
+
+    assert cli.main(['show', 'beta']) == 0
+    shown = json.loads(capsys.readouterr().out)
+    assert shown['base_config']['adapter_id'] == 'camoufox'
+    assert shown['base_config']['profile_id'] == 'beta'
+
+    assert cli.main(['list', '--json']) == 0
+    listed = json.loads(capsys.readouterr().out)
+    assert [entry['id'] for entry in listed] == ['alpha', 'beta']
+    assert not any(entry['running'] for entry in listed)
+    assert cli.main(['show', 'missing']) == 1
+
+
+def test_session_records_drop_dead_processes(tmp_path):
+    path = tmp_path / 'sessions.json'
+    me = cli.psutil.Process()
+    save_session_records([
+        {'session_id': 'a', 'profile_id': 'p', 'pid': me.pid, 'pid_create_time': me.create_time()},
+        {'session_id': 'b', 'profile_id': 'q', 'pid': me.pid, 'pid_create_time': 1.0},
+    ], path)
+    assert [record['session_id'] for record in load_session_records(path)] == ['a']
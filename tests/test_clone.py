@@ -0,0 +1,79 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.spoofers.profile as profile_module
+from app.clone import clone_user_data_dir
+from app.spoofers.profile import (
+    BaseConfig,
+    ProfileConfig,
+    build_default_profile_config,
+    get_user_data_dir,
+    load_profile,
+    save_profile,
+)
+
+
+def _make_template(path):
+    files = {
+        'Local State': '{}',
+        'First Run': '',
+        'Default/Preferences': '{"prefs": 1}',
+        'Default/Extensions/abc/1.0/manifest.json': '{}',
+        'Default/Cookies': 'secret',
+        'Default/Cookies-journal': 'secret',
+        'Default/Local Storage/leveldb/000003.log': 'secret',
+        'Default/Cache/Cache_Data/data_0': 'cache',
+        'WidevineCdm/4.10/manifest.json': '{}',
+    }
+    for rel, content in files.items():
+        target = path / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+    os.symlink('host-1234', path / 'SingletonLock')
+
+
+def _tree(path):
+    return sorted(p.relative_to(path).as_posix() for p in path.rglob('*') if p.is_file())
+
+
+def test_clone_user_data_dir_keeps_skeleton_only(tmp_path):
+    src = tmp_path / 'src'
+    _make_template(src)
+
+    stats = clone_user_data_dir(src, tmp_path / 'dst')
+
+    assert _tree(tmp_path / 'dst') == [
+        'Default/Extensions/abc/1.0/manifest.json',
+        'Default/Preferences',
+        'First Run',
+        'Local State',
+        'WidevineCdm/4.10/manifest.json',
+    ]
+    assert stats.files == 5
+    assert stats.reflinked + stats.hardlinked + stats.copied == 5
+    # Mutable files are never shared with the template.
+    assert os.stat(tmp_path / 'dst' / 'Default' / 'Preferences').st_nlink == 1
+
+
+def test_clone_profile_from_template(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_module, 'get_profiles_dir', lambda: tmp_path)
+    template = ProfileConfig(
+        base_config=BaseConfig(profile_id='tpl', target_url='https://example.org', proxy='http://p:1', ephemeral=True),
+        extra_config={'user_agent': 'UA', 'noise_seed': 42},
+    )
+    _make_template(get_user_data_dir(template.base_config))
+
+    clone = build_default_profile_config('copy', template=template)
+    assert save_profile('copy', clone, seed_from=get_user_data_dir(template.base_config))
+
+    loaded = load_profile('copy')
+    assert loaded.base_config.profile_id == 'copy'
+    assert loaded.base_config.target_url == 'https://example.org'
+    assert loaded.base_config.ephemeral is True
+    assert loaded.extra_config['user_agent'] == 'UA'
+    assert template.extra_config['noise_seed'] == 42
+    assert (tmp_path / 'chrome' / 'copy' / 'Default' / 'Preferences').exists()
+    assert not (tmp_path / 'chrome' / 'copy' / 'Default' / 'Cookies').exists()
@@ -0,0 +1,94 @@
+import sys
+import os
+import subprocess
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.ephemeral import OWNER_FILE_NAME, RAM_DIR_PREFIX, EphemeralUserDataDir, sweep_stale_ram_dirs
+from app.sessions import SessionRegistry
+from app.spoofers.profile import BaseConfig, parse_sync_paths
+
+
+def test_parse_sync_paths():
+    assert parse_sync_paths('Default/Cookies, Local State,,Default/Cookies') == ['Default/Cookies', 'Local State']
+    assert parse_sync_paths(['../etc', '/abs/path', 'Default\\Local Storage']) == ['Default/Local Storage']
+    assert parse_sync_paths(None) == []
+
+
+def test_ephemeral_dir_seeds_and_syncs_back(tmp_path):
+    persistent = tmp_path / 'persistent'
+    (persistent / 'Default').mkdir(parents=True)
+    (persistent / 'Default' / 'Cookies').write_text('old')
+    ram_root = tmp_path / 'ram'
+    ram_root.mkdir()
+    base = BaseConfig(
+        profile_id='alice@example.com',
+        user_data_dir=str(persistent),
+        ephemeral=True,
+        ephemeral_sync=['Default/Cookies', 'Default/Local Storage'],
+    )
+
+    ram_dir = EphemeralUserDataDir.create(base, root=ram_root)
+    assert ram_dir.path.parent == ram_root
+    assert (ram_dir.path / 'Default' / 'Cookies').read_text() == 'old'
+
+    (ram_dir.path / 'Default' / 'Cookies').write_text('new')
+    (ram_dir.path / 'Default' / 'Local Storage').mkdir()
+    (ram_dir.path / 'Default' / 'Local Storage' / 'leveldb').write_text('ls')
+    (ram_dir.path / 'Default' / 'Cache').mkdir()
+    ram_dir.close()
+    ram_dir.close()
+
+    assert not ram_dir.path.exists()
+    assert (persistent / 'Default' / 'Cookies').read_text() == 'new'
+    assert (persistent / 'Default' / 'Local Storage' / 'leveldb').read_text() == 'ls'
+    assert not (persistent / 'Default' / 'Cache').exists()
+
+
+def test_registry_runs_on_exit_after_browser_exits():
+    calls = []
+    proc = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(0.3)'])
+    registry = SessionRegistry(release=lambda handle: None)
+    registry.register('p1', 'chromium', object(), pid=proc.pid, on_exit=lambda: calls.append(proc.poll()))
+    deadline = time.time() + 10
+    while not calls and time.time() < deadline:
+        registry.poll()
+        time.sleep(0.05)
+    assert len(calls) == 1
+
+
+def test_sweep_stale_ram_dirs(tmp_path):
+    dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+    dead.wait()
+    stale = tmp_path / f'{RAM_DIR_PREFIX}old-abc'
+    stale.mkdir()
+    (stale / OWNER_FILE_NAME).write_text(str(dead.pid))
+    (stale / 'data').write_bytes(b'x' * 10)
+    mine = tmp_path / f'{RAM_DIR_PREFIX}mine-def'
+    mine.mkdir()
+    (mine / OWNER_FILE_NAME).write_text(str(os.getpid()))
+
+    assert sweep_stale_ram_dirs(tmp_path) > 0
+    assert not stale.exists()
+    assert mine.exists()
+
+
+def test_adopt_claims_ram_dir_of_a_dead_app(tmp_path):
+    dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+    dead.wait()
+    persistent = tmp_path / 'persistent'
+    ram_dir = tmp_path / f'{RAM_DIR_PREFIX}p1-abc'
+    (ram_dir / 'Default').mkdir(parents=True)
+    (ram_dir / OWNER_FILE_NAME).write_text(str(dead.pid))
+    (ram_dir / 'Default' / 'Cookies').write_text('kept')
+    base = BaseConfig(profile_id='p1', user_data_dir=str(persistent), ephemeral=True, ephemeral_sync=['Default/Cookies'])
+
+    assert EphemeralUserDataDir.adopt(persistent, base) is None
+    adopted = EphemeralUserDataDir.adopt(ram_dir, base)
+    assert (ram_dir / OWNER_FILE_NAME).read_text() == str(os.getpid())
+    assert sweep_stale_ram_dirs(tmp_path) == 0
+    adopted.close()
+    assert not ram_dir.exists()
+    assert (persistent / 'Default' / 'Cookies').read_text() == 'kept'
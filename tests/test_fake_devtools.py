@@ -0,0 +1,88 @@
+import sys
+import os
+import asyncio
+import time
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.cdp import CDPConnection, CDPError, fetch_json, navigate
+from app.fake_devtools import FakeDevTools
+from app.spoofers.cdp_spoofer import CDPSpoofer, run_pre_navigation, run_pre_navigation_async
+from app.spoofers.profile import PROFILES
+
+LATENCY = 0.05
+
+
+def _commands():
+    return CDPSpoofer(next(iter(PROFILES.values()))).pre_navigation_commands()
+
+
+async def _attach(devtools):
+    await devtools.start()
+    page = (await fetch_json(devtools.port, '/json'))[0]
+    cdp = await CDPConnection.connect((await fetch_json(devtools.port, '/json/version'))['webSocketDebuggerUrl'])
+    session_id = (await cdp.send('Target.attachToTarget', {'targetId': page['id'], 'flatten': True}))['sessionId']
+    return cdp, page['id'], session_id
+
+
+def test_pipelined_spoofing_costs_one_round_trip():
+    commands = _commands()
+
+    async def scenario():
+        devtools = FakeDevTools(latency=LATENCY)
+        cdp, target_id, session_id = await _attach(devtools)
+        started = time.monotonic()
+        assert await run_pre_navigation_async(cdp, commands, session_id)
+        pipelined = time.monotonic() - started
+        started = time.monotonic()
+        for command in commands:
+            await cdp.send(command.method, command.params, session_id)
+        sequential = time.monotonic() - started
+        await cdp.close()
+        await devtools.close()
+        return devtools, target_id, session_id, pipelined, sequential
+
+    devtools, target_id, session_id, pipelined, sequential = asyncio.run(scenario())
+    assert pipelined < 2 * LATENCY
+    assert sequential >= len(commands) * LATENCY
+    spoofing = devtools.commands[1:1 + len(commands)]
+    assert [c.method for c in spoofing] == [c.method for c in commands]
+    assert {(c.session_id, c.target_id) for c in spoofing} == {(session_id, target_id)}
+    assert devtools.targets[target_id].scripts
+
+
+def test_injected_failures_surface_as_cdp_errors_and_fallbacks_run():
+    async def scenario():
+        devtools = FakeDevTools(failures={'Browser.setPermission': 'Permission denied'})
+        cdp, _, session_id = await _attach(devtools)
+        with pytest.raises(CDPError, match='Permission denied'):
+            await cdp.send('Browser.setPermission', {}, session_id)
+        assert await run_pre_navigation_async(cdp, _commands(), session_id)
+        await navigate(cdp, 'https://example.test', session_id, wait='load', timeout=2)
+        await cdp.close()
+        await devtools.close()
+        return devtools.methods()
+
+    methods = asyncio.run(scenario())
+    assert methods.count('Browser.setPermission') == 2
+    assert methods.count('Emulation.setPermissionOverride') == 1
+    assert methods[-1] == 'Page.navigate'
+
+
+def test_drissionpage_attaches_and_navigates():
+    ChromiumPage = pytest.importorskip('DrissionPage').ChromiumPage
+    devtools = FakeDevTools()
+    port = devtools.serve_in_background()
+    try:
+        page = ChromiumPage(f'127.0.0.1:{port}')
+        assert run_pre_navigation(page, _commands())
+        page.set.load_mode('none')
+        page.get('https://example.test', timeout=5)
+        assert page.url == 'https://example.test'
+        methods = devtools.methods()
+        assert methods.index('Emulation.setUserAgentOverride') < methods.index('Page.navigate')
+    finally:
+        devtools.stop()
@@ -0,0 +1,157 @@
+import sys
+import os
+import subprocess
+import time
+from types import SimpleNamespace
+
+import psutil
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.fake_devtools import FakeDevTools
+from app.hibernation import Hibernator
+from app.sessions import SESSION_HIBERNATED, SESSION_RUNNING, SESSION_STOPPED, SessionRegistry
+
+
+class _FakeHandle:
+    def quit(self):
+        pass
+
+
+def _sleeper():
+    return subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+
+
+def _browser_with_renderer():
+    """A sleeper with one child that looks like a Chromium renderer."""
+    script = (
+        'import subprocess, sys, time; '
+        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)', '--type=renderer']); "
+        'time.sleep(30)'
+    )
+    browser = subprocess.Popen([sys.executable, '-c', script])
+    deadline = time.monotonic() + 5
+    while not psutil.Process(browser.pid).children():
+        assert time.monotonic() < deadline, 'renderer did not start'
+        time.sleep(0.02)
+    return browser
+
+
+def _kill_tree(browser):
+    for child in psutil.Process(browser.pid).children(recursive=True):
+        child.kill()
+    browser.kill()
+    browser.wait()
+
+
+def _poll_until(registry, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'condition not reached'
+        registry.poll()
+        time.sleep(0.02)
+
+
+def _lifecycle_states(devtools):
+    return [command.params['state'] for command in devtools.commands if command.method == 'Page.setWebLifecycleState']
+
+
+def test_idle_session_is_frozen_and_thawed_on_focus():
+    devtools = FakeDevTools(page_count=2)
+    port = devtools.serve_in_background()
+    browser = _sleeper()
+    registry = SessionRegistry()
+    try:
+        session = registry.register('work', 'simulated', _FakeHandle(), pid=browser.pid, debug_port=port)
+        registry.hibernator.configure(idle_seconds=0.05, quit_seconds=0)
+        _poll_until(registry, lambda: _lifecycle_states(devtools) == ['frozen', 'frozen'])
+        assert session.state == SESSION_HIBERNATED and session.is_live
+        # Both pages, each through its own target session.
+        assert len({c.target_id for c in devtools.commands if c.method == 'Page.setWebLifecycleState'}) == 2
+
+        registry.focus(session.session_id)
+        assert session.state == SESSION_RUNNING
+        assert _lifecycle_states(devtools)[2:] == ['active', 'active']
+    finally:
+        browser.kill()
+        browser.wait()
+        devtools.stop()
+
+
+def test_renderers_are_suspended_when_the_page_freeze_fails():
+    devtools = FakeDevTools(failures={'Page.setWebLifecycleState'})
+    port = devtools.serve_in_background()
+    browser = _browser_with_renderer()
+    registry = SessionRegistry()
+    try:
+        session = registry.register('work', 'simulated', _FakeHandle(), pid=browser.pid, debug_port=port)
+        registry.hibernator.configure(idle_seconds=0.05, quit_seconds=0)
+        root = psutil.Process(browser.pid)
+        renderer = root.children()[0]
+        _poll_until(registry, lambda: renderer.status() == psutil.STATUS_STOPPED)
+        assert session.state == SESSION_HIBERNATED
+        # The browser process keeps running.
+        assert root.status() != psutil.STATUS_STOPPED
+
+        # Stopping resumes the renderer first, so it can act on the quit.
+        registry.stop(session.session_id)
+        assert renderer.status() != psutil.STATUS_STOPPED
+    finally:
+        _kill_tree(browser)
+        devtools.stop()
+
+
+def test_browser_without_renderers_is_left_running_when_the_page_freeze_fails():
+    devtools = FakeDevTools(failures={'Page.setWebLifecycleState'})
+    port = devtools.serve_in_background()
+    browser = _sleeper()
+    registry = SessionRegistry()
+    try:
+        session = registry.register('work', 'simulated', _FakeHandle(), pid=browser.pid, debug_port=port)
+        registry.hibernator.configure(idle_seconds=0.05, quit_seconds=0)
+        states = registry.hibernator._states
+        _poll_until(registry, lambda: session.session_id in states and states[session.session_id].unfreezable)
+        assert session.state == SESSION_RUNNING
+        assert psutil.Process(browser.pid).status() != psutil.STATUS_STOPPED
+        # No retry until the session is used again.
+        attempts = len(devtools.commands)
+        time.sleep(0.1)
+        registry.poll()
+        assert not registry.hibernator.is_frozen(session.session_id)
+        assert len(devtools.commands) == attempts
+    finally:
+        browser.kill()
+        browser.wait()
+        devtools.stop()
+
+
+def test_cpu_saved_is_counted_and_long_idle_sessions_are_returned_for_quitting():
+    devtools = FakeDevTools()
+    port = devtools.serve_in_background()
+    session = SimpleNamespace(
+        session_id='s1', profile_id='work', adapter_id='simulated', pid=os.getpid(), debug_port=port,
+        cpu_percent=40.0, cpu_saved_seconds=0.0,
+    )
+    changes = []
+    hibernator = Hibernator(idle_seconds=5, quit_seconds=60, on_change=lambda s, frozen: changes.append(frozen))
+    try:
+        assert hibernator.check([session], now=0) == []
+        assert hibernator.check([session], now=10) == []
+        assert changes == [True] and hibernator.is_frozen('s1')
+        deadline = time.monotonic() + 5
+        while 'frozen' not in _lifecycle_states(devtools):
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+
+        session.cpu_percent = 5.0
+        time.sleep(0.1)
+        assert hibernator.check([session], now=20) == []
+        # (40% before - 5% now) over 10 s
+        assert abs(session.cpu_saved_seconds - 3.5) < 1e-6
+        assert hibernator.check([session], now=100) == [session]
+
+        hibernator.touch('s1')
+        assert changes == [True, False] and not hibernator.is_frozen('s1')
+    finally:
+        devtools.stop()
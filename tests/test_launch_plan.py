@@ -0,0 +1,119 @@
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.adapters.chromium as chromium_module
+import app.browser_library as browser_library
+import app.spoofers.profile as profile_module
+from app.adapters.chromium import ChromiumAdapter, _write_preferences
+from app.launch_plan import get_launch_plan, invalidate_launch_plan
+from app.spoofers.profile import BaseConfig, ProfileConfig, SpoofProfile, save_profile
+
+
+class _CountingAdapter(ChromiumAdapter):
+    def __init__(self):
+        self.compiled = 0
+
+    def compile_launch_plan(self, base_config, extra_config, digest):
+        self.compiled += 1
+        return super().compile_launch_plan(base_config, extra_config, digest)
+
+
+def _base(tmp_path, **kwargs):
+    browser = tmp_path / 'chrome'
+    browser.write_text('')
+    return BaseConfig(profile_id='p', browser_path=str(browser), user_data_dir=str(tmp_path / 'data'), **kwargs)
+
+
+def test_plan_is_compiled_once_and_recompiled_after_edits(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_module, 'get_profiles_dir', lambda: tmp_path)
+    invalidate_launch_plan()
+    adapter = _CountingAdapter()
+    base = _base(tmp_path)
+    extra = SpoofProfile(user_agent='Mozilla/5.0 Chrome/120.0').to_dict()
+
+    plan = get_launch_plan(adapter, base, extra)
+    assert plan.executable == base.browser_path
+    assert plan.user_data_dir == tmp_path / 'data' and plan.user_data_dir.is_dir()
+    assert not any(arg.startswith(('--user-data-dir', '--remote-debugging-port')) for arg in plan.arguments)
+    user_agent = next(c for c in plan.spoof_commands if c.method == 'Emulation.setUserAgentOverride')
+    assert user_agent.params['userAgent'] == 'Mozilla/5.0 Chrome/120.0'
+
+    # A different URL for this launch does not change the plan.
+    base.target_url = 'https://elsewhere.test'
+    assert get_launch_plan(adapter, base, extra) is plan
+    assert adapter.compiled == 1
+
+    extra['protect_timezone'] = not extra['protect_timezone']
+    edited = get_launch_plan(adapter, base, extra)
+    assert edited is not plan and adapter.compiled == 2
+
+    save_profile('p', ProfileConfig(base_config=base, extra_config=extra))
+    assert get_launch_plan(adapter, base, extra) is not edited
+    assert adapter.compiled == 3
+
+    base.ephemeral = True
+    assert get_launch_plan(adapter, base, extra).user_data_dir is None
+
+
+def test_blocking_launch_options_replay_the_plan(tmp_path, monkeypatch):
+    adapter = ChromiumAdapter()
+    base = _base(tmp_path)
+    plan = adapter.compile_launch_plan(base, SpoofProfile().to_dict(), 'a')
+
+    def no_discovery():
+        raise AssertionError('browser discovery ran for a compiled plan')
+
+    monkeypatch.setattr(chromium_module, 'find_chrome_path', no_discovery)
+    co = adapter._plan_options(plan, tmp_path / 'ram')
+    assert co.browser_path == plan.executable
+    assert co.user_data_path == str(tmp_path / 'ram')
+    assert set(co.arguments) == set(plan.arguments) | {f'--user-data-dir={tmp_path / "ram"}'}
+    assert co.preferences == dict(plan.preferences)
+
+
+def test_browser_paths_are_resolved_to_executables(tmp_path, monkeypatch):
+    folder = tmp_path / 'chrome-win64'
+    folder.mkdir()
+    (folder / 'chrome.exe').write_text('')
+    monkeypatch.setattr(browser_library.platform, 'system', lambda: 'Windows')
+    assert browser_library.resolve_browser_executable(str(folder)) == str(folder / 'chrome.exe')
+
+    monkeypatch.setattr(browser_library.platform, 'system', lambda: 'Linux')
+    monkeypatch.setattr(browser_library.shutil, 'which', lambda name: f'/usr/bin/{name}')
+    assert browser_library.resolve_browser_executable('chromium') == '/usr/bin/chromium'
+    # A file path is kept as given.
+    base = _base(tmp_path)
+    assert browser_library.resolve_browser_executable(base.browser_path) == base.browser_path
+
+
+def test_preferences_are_merged_as_nested_keys(tmp_path):
+    prefs_file = tmp_path / 'Default' / 'Preferences'
+    prefs_file.parent.mkdir()
+    prefs_file.write_text(json.dumps({'profile': {'name': 'kept', 'default_content_settings': 3}}))
+    _write_preferences(tmp_path, {'profile.default_content_settings.popups': 0, 'intl.accept_languages': 'en'})
+    assert json.loads(prefs_file.read_text()) == {
+        'profile': {'name': 'kept', 'default_content_settings': {'popups': 0}},
+        'intl': {'accept_languages': 'en'},
+    }
+
+
+def test_performance_preset_switches_end_up_in_the_plan(tmp_path):
+    adapter = ChromiumAdapter()
+    base = _base(tmp_path)
+    extra = SpoofProfile().to_dict()
+
+    balanced = adapter.compile_launch_plan(base, extra, 'a').arguments
+    low_memory = adapter.compile_launch_plan(base, {**extra, 'performance_preset': 'low-memory'}, 'b').arguments
+    assert '--disable-component-update' in balanced and '--renderer-process-limit=2' not in balanced
+    assert '--renderer-process-limit=2' in low_memory
+    # Chrome only honours the last --disable-features, so DrissionPage's own and the preset's are merged.
+    disabled = [arg for arg in low_memory if arg.startswith('--disable-features=')]
+    assert len(disabled) == 1
+    assert {'Translate', 'SpareRendererForSitePerProcess'} <= set(disabled[0].split('=', 1)[1].split(','))
+
+    errors = adapter.validate(base, {**extra, 'performance_preset': 'turbo'})
+    assert [error.key for error in errors] == ['performance_preset']
@@ -0,0 +1,175 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import psutil
+
+import app.adapters.registry as registry_module
+import app.profile_utils as profile_utils_module
+import app.spoofers.profile as profile_module
+from app.adapters.base import BrowserAdapter, LaunchResult
+from app.adapters.chromium import ChromiumAdapter
+from app.launcher import (
+    LauncherError,
+    LauncherServer,
+    RemoteSessionRegistry,
+    connect_launcher,
+    ensure_launcher,
+    read_launcher_info,
+)
+from app.sessions import SessionRegistry
+from app.spoofers.profile import BaseConfig, ProfileConfig, load_profile, merge_extra_config, save_profile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class _Handle:
+    def quit(self):
+        pass
+
+
+class _FakeAdapter(ChromiumAdapter):
+    # Keep the blocking fake launch; ChromiumAdapter's own async path would start a real browser.
+    launch_async = BrowserAdapter.launch_async
+
+    def validate(self, base_config, extra_config):
+        return []
+
+    def launch(self, base_config, extra_config):
+        return LaunchResult(page=_Handle())
+
+
+class _FingerprintAdapter(_FakeAdapter):
+    def launch(self, base_config, extra_config):
+        return LaunchResult(page=_Handle(), profile_updates={'camoufox_fingerprint': {'key': 'k', 'config': {}}})
+
+
+class _FakeClient:
+    def __init__(self):
+        self.remote = []
+        self.stopped = []
+        self.fail = False
+
+    def list_sessions(self):
+        if self.fail:
+            raise LauncherError(0, 'down')
+        return [dict(item) for item in self.remote]
+
+    def stop(self, session_id):
+        self.stopped.append(session_id)
+        return {}
+
+
+def _remote_session(session_id, state='running', profile_id='p'):
+    return {
+        'session_id': session_id,
+        'profile_id': profile_id,
+        'adapter_id': 'chromium',
+        'state': state,
+        'started_at': time.time() - 10,
+    }
+
+
+def test_remote_registry_mirrors_launcher_sessions():
+    client = _FakeClient()
+    registry = RemoteSessionRegistry(connect=lambda: client, interval=3600)
+    try:
+        client.remote = [_remote_session('a'), _remote_session('b', profile_id='q')]
+        registry.refresh()
+        assert [s.session_id for s in registry.live_sessions()] == ['a', 'b']
+        assert registry.find_live_by_profile('q').session_id == 'b'
+        assert registry.poll() == []
+
+        client.remote = [_remote_session('a', state='crashed'), _remote_session('b', profile_id='q')]
+        registry.refresh()
+        assert [s.session_id for s in registry.poll()] == ['a']
+
+        stopped = registry.stop('b')
+        assert stopped.state == 'stopped'
+        # The launcher has not applied the stop yet; the mirror must not resurrect the session.
+        registry.refresh()
+        assert registry.get('b').state == 'stopped'
+        time.sleep(0.1)
+        assert client.stopped == ['b']
+
+        client.remote = [_remote_session('c')]
+        client.fail = True
+        for _ in range(3):
+            registry.refresh()
+        assert registry.get('c') is None
+        assert registry.live_sessions() == []
+    finally:
+        registry.close()
+
+
+def _serve_launcher(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(profile_module, 'get_profiles_dir', lambda: tmp_path / 'profiles')
+    monkeypatch.setattr(profile_utils_module, 'get_profiles_dir', lambda: tmp_path / 'profiles')
+    monkeypatch.setitem(registry_module.REGISTRY, 'chromium', _FakeAdapter)
+    (tmp_path / 'profiles').mkdir()
+    save_profile('p', ProfileConfig(base_config=BaseConfig(profile_id='p'), extra_config={}))
+    server = LauncherServer(SessionRegistry(), 'token', port=0)
+    server.start()
+    return server
+
+
+def test_launcher_server_is_discoverable_and_launches(tmp_path, monkeypatch):
+    server = _serve_launcher(tmp_path, monkeypatch)
+    registry = RemoteSessionRegistry(ensure=ensure_launcher, interval=3600)
+    try:
+        info = read_launcher_info()
+        assert info.port == server.port and info.pid == os.getpid()
+        assert connect_launcher() is not None
+
+        session = registry.launch('p', 'https://example.org')
+        assert registry.find_live_by_profile('p') is session
+        assert server.registry.find_live_by_profile('p').session_id == session.session_id
+        registry.refresh()
+        assert registry.get(session.session_id).is_live
+
+        registry.stop(session.session_id)
+        time.sleep(0.2)
+        assert not server.registry.get(session.session_id).is_live
+    finally:
+        registry.close()
+        server.stop()
+
+
+def test_profile_updates_of_a_launcher_launch_survive_the_next_save(tmp_path, monkeypatch):
+    server = _serve_launcher(tmp_path, monkeypatch)
+    monkeypatch.setitem(registry_module.REGISTRY, 'chromium', _FingerprintAdapter)
+    registry = RemoteSessionRegistry(ensure=ensure_launcher, interval=3600)
+    try:
+        # The profile as the GUI has it open.
+        profile = load_profile('p')
+        session = registry.launch('p')
+        assert load_profile('p').extra_config['camoufox_fingerprint'] == {'key': 'k', 'config': {}}
+        assert session.profile_updates == {'camoufox_fingerprint': {'key': 'k', 'config': {}}}
+
+        # What the GUI does once LauncherLaunchWorker finishes, followed by an edit that saves the profile.
+        merge_extra_config(profile, session.profile_updates)
+        profile.base_config.target_url = 'https://edited.test'
+        save_profile('p', profile)
+        assert load_profile('p').extra_config['camoufox_fingerprint'] == {'key': 'k', 'config': {}}
+    finally:
+        registry.close()
+        server.stop()
+
+
+def test_ensure_launcher_spawns_a_detached_process(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PYTHONPATH', ROOT)
+    client = ensure_launcher()
+    try:
+        assert client.info.pid != os.getpid()
+        assert client.list_sessions() == []
+        # A second caller reuses the running launcher instead of starting another one.
+        assert ensure_launcher().info.pid == client.info.pid
+    finally:
+        client.shutdown()
+        psutil.Process(client.info.pid).wait(10)
+    assert read_launcher_info() is None
@@ -0,0 +1,40 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.metrics import MetricsRegistry
+
+
+def test_text_format():
+    registry = MetricsRegistry()
+    launches = registry.counter('launches_total', 'Launches.', ('adapter',))
+    rss = registry.gauge('rss_bytes', 'RSS.', ('profile',))
+    duration = registry.histogram('duration_seconds', 'Duration.', ('adapter',), (0.5, 1.0))
+
+    launches.inc(adapter='chromium')
+    launches.inc(2, adapter='camoufox')
+    rss.replace({('a"b',): 1024, ('c',): 2048})
+    rss.replace({('c',): 4096})
+    for value in (0.2, 0.7, 3.0):
+        duration.observe(value, adapter='chromium')
+
+    text = registry.render_prometheus()
+    assert '# TYPE uselessbrowser_launches counter' in text
+    assert 'uselessbrowser_launches_total{adapter="camoufox"} 2' in text
+    assert 'uselessbrowser_launches_total{adapter="chromium"} 1' in text
+    assert 'uselessbrowser_rss_bytes{profile="c"} 4096' in text and 'a\\"b' not in text
+    assert 'uselessbrowser_duration_seconds_bucket{adapter="chromium",le="0.5"} 1' in text
+    assert 'uselessbrowser_duration_seconds_bucket{adapter="chromium",le="1"} 2' in text
+    assert 'uselessbrowser_duration_seconds_bucket{adapter="chromium",le="+Inf"} 3' in text
+    assert 'uselessbrowser_duration_seconds_count{adapter="chromium"} 3' in text
+    assert 'uselessbrowser_duration_seconds_sum{adapter="chromium"} 3.9' in text
+
+    try:
+        launches.inc(adapter='chromium', outcome='success')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('unknown labels must be rejected')
+
@@ -0,0 +1,49 @@
+import sys
+import os
+import json
+import pstats
+import tracemalloc
+import zipfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.profiler_capture import ProfilerCapture, write_capture_archive
+
+
+def _grow(store):
+    store.extend(bytearray(1024) for _ in range(2000))
+
+
+def test_capture_archive_holds_profile_memory_diff_and_attachments(tmp_path):
+    assert not tracemalloc.is_tracing()
+    capture = ProfilerCapture()
+    capture.start()
+    assert capture.active
+    store = []
+    _grow(store)
+    capture.snapshot('after grow')
+    result = capture.stop()
+
+    assert not capture.active
+    assert not tracemalloc.is_tracing()
+    assert [snapshot.label for snapshot in result.snapshots] == ['start', 'after grow', 'stop']
+    assert result.snapshots[1].traced_bytes - result.snapshots[0].traced_bytes > 1024 * 1024
+
+    path = write_capture_archive(
+        result,
+        {'launches.json': [{'profile_id': 'p1', 'duration_ms': 812.5}], 'notes.txt': 'slow after resume'},
+        directory=tmp_path,
+    )
+    with zipfile.ZipFile(path) as archive:
+        names = set(archive.namelist())
+        assert {'profile.prof', 'profile.txt', 'memory.txt', 'environment.json', 'launches.json', 'notes.txt'} <= names
+        assert '_grow' in archive.read('profile.txt').decode()
+        memory = archive.read('memory.txt').decode()
+        assert 'start -> after grow' in memory and 'test_profiler_capture.py' in memory
+        environment = json.loads(archive.read('environment.json'))
+        assert environment['capture']['snapshots'] == ['start', 'after grow', 'stop']
+        assert json.loads(archive.read('launches.json'))[0]['profile_id'] == 'p1'
+        assert archive.read('notes.txt').decode() == 'slow after resume'
+        archive.extract('profile.prof', tmp_path)
+    assert pstats.Stats(str(tmp_path / 'profile.prof')).total_calls > 0
@@ -0,0 +1,95 @@
+import sys
+import os
+import subprocess
+
+import psutil
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.sessions as sessions_module
+from app.resource_governor import ResourceGovernor, ResourceLimits, cgroup_usage, nice_for_weight
+from app.sessions import SessionRegistry
+from app.spoofers.profile import BaseConfig
+
+
+def _sleeper():
+    return subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+
+
+def _fake_hierarchy(tmp_path):
+    """A cgroup v2 tree as the kernel would show it to a delegated app cgroup."""
+    root = tmp_path / 'cgroup'
+    base = root / 'user.slice' / 'app.scope'
+    base.mkdir(parents=True)
+    (root / 'cgroup.controllers').write_text('cpuset cpu io memory pids\n')
+    (base / 'cgroup.controllers').write_text('cpu io memory pids\n')
+    (base / 'cgroup.subtree_control').write_text('\n')
+    (base / 'cgroup.procs').write_text(f'{os.getpid()}\n')
+    group = base / 'ub-work_1'
+    group.mkdir()
+    (group / 'cgroup.controllers').write_text('cpu memory\n')
+    return root, base, group
+
+
+def test_limits_come_from_the_profile():
+    base = BaseConfig.from_dict({'cpu_weight': '50', 'cpu_max_percent': -5, 'memory_max_mb': 99999999}, 'p')
+    assert (base.cpu_weight, base.cpu_max_percent, base.memory_max_mb) == (50, 0, 1024 * 1024)
+    assert BaseConfig.from_dict(base.to_dict(), 'p').cpu_weight == 50
+    assert not ResourceLimits.from_base_config(BaseConfig(profile_id='p')).active
+
+
+def test_browser_tree_is_placed_in_a_profile_cgroup(tmp_path):
+    root, base, group = _fake_hierarchy(tmp_path)
+    governor = ResourceGovernor(root=root, base=base)
+    browser = _sleeper()
+    try:
+        placement = governor.place(browser.pid, 'work 1', ResourceLimits(cpu_weight=50, cpu_max_percent=150, memory_max_mb=512))
+    finally:
+        browser.kill()
+        browser.wait()
+    assert placement.mode == 'cgroup' and placement.cgroup == group
+    # The app moved itself out so its cgroup may hand controllers to the profile groups.
+    assert (base / 'ub-app' / 'cgroup.procs').read_text() == str(os.getpid())
+    assert (base / 'cgroup.subtree_control').read_text() == '+cpu +memory'
+    assert (group / 'cpu.weight').read_text() == '50'
+    assert (group / 'cpu.max').read_text() == '150000 100000'
+    assert (group / 'memory.max').read_text() == str(512 * 1024 * 1024)
+    assert (group / 'cgroup.procs').read_text() == str(browser.pid)
+
+
+def test_usage_is_read_back_from_the_cgroup(tmp_path, monkeypatch):
+    _, _, group = _fake_hierarchy(tmp_path)
+    (group / 'cpu.stat').write_text('usage_usec 2000000\nuser_usec 1500000\nthrottled_usec 300\n')
+    (group / 'memory.current').write_text('734003200\n')
+    (group / 'memory.max').write_text('max\n')
+    (group / 'memory.events').write_text('low 0\nhigh 0\nmax 4\noom 1\noom_kill 1\n')
+    usage = cgroup_usage(group)
+    assert usage.cpu_usage_usec == 2000000 and usage.cpu_throttled_usec == 300
+    assert usage.memory_current == 734003200 and usage.memory_max is None and usage.oom_kills == 1
+
+    monkeypatch.setattr(sessions_module, 'governed_cgroup', lambda pid: group)
+    registry = SessionRegistry()
+    browser = _sleeper()
+    try:
+        session = registry.register('work', 'chromium', None, pid=browser.pid)
+        assert session.cgroup == str(group)
+        registry.poll()
+        assert session.rss_bytes == 734003200
+    finally:
+        browser.kill()
+        browser.wait()
+
+
+def test_without_cgroups_the_weight_becomes_a_nice_value(tmp_path):
+    governor = ResourceGovernor(root=tmp_path / 'missing')
+    browser = _sleeper()
+    try:
+        placement = governor.place(browser.pid, 'work', ResourceLimits(cpu_weight=25, memory_max_mb=512))
+        assert placement.mode == 'nice'
+        assert placement.nice == nice_for_weight(25) == 6
+        assert psutil.Process(browser.pid).nice() == 6
+        assert placement.unenforced == ['memory_max_mb']
+    finally:
+        browser.kill()
+        browser.wait()
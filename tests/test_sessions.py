@@ -0,0 +1,116 @@
+import sys
+import os
+import subprocess
+import textwrap
+import time
+
+import psutil
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.adapters.chromium import ChromiumAdapter
+from app.sessions import (
+    SESSION_CRASHED,
+    SESSION_EXITED,
+    SESSION_STOPPED,
+    ProcessHandle,
+    SessionRegistry,
+    load_session_records,
+)
+
+
+class _FakeHandle:
+    def __init__(self):
+        self.quit_calls = 0
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def _spawn(code: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, '-c', code])
+
+
+def test_session_registry_detects_exit_and_crash():
+    released = []
+    registry = SessionRegistry(release=released.append)
+    ok_proc = _spawn('pass')
+    bad_proc = _spawn('import sys; sys.exit(3)')
+    ok = registry.register('p1', 'chromium', _FakeHandle(), pid=ok_proc.pid)
+    bad = registry.register('p2', 'chromium', _FakeHandle(), pid=bad_proc.pid)
+    deadline = time.time() + 10
+    while registry.live_sessions() and time.time() < deadline:
+        registry.poll()
+        time.sleep(0.05)
+    assert ok.state == SESSION_EXITED
+    assert bad.state == SESSION_CRASHED
+    assert ok.handle is None and bad.handle is None
+    assert registry.live_sessions() == []
+
+
+def test_session_registry_samples_and_stops():
+    proc = _spawn('import time; time.sleep(30)')
+    handle = _FakeHandle()
+    try:
+        registry = SessionRegistry()
+        session = registry.register('p1', 'chromium', handle, pid=proc.pid, debug_port=9222)
+        assert registry.poll() == []
+        assert session.rss_bytes > 0
+        assert registry.find_live_by_profile('p1') is session
+
+        registry.stop(session.session_id)
+        assert session.state == SESSION_STOPPED
+        assert registry.find_live_by_profile('p1') is None
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_registry_persists_and_restores_live_sessions(tmp_path):
+    state = tmp_path / 'sessions.json'
+    proc = _spawn('import time; time.sleep(30)')
+    try:
+        first = SessionRegistry(release=lambda handle: None, state_path=state)
+        session = first.register('p1', 'chromium', _FakeHandle(), pid=proc.pid, debug_port=1)
+        assert [r['session_id'] for r in load_session_records(state)] == [session.session_id]
+
+        # A new app process: the browser is still running, so it is adopted instead of forgotten.
+        attached = []
+        second = SessionRegistry(state_path=state)
+        restored = second.restore(lambda record: attached.append(record) or ChromiumAdapter().attach(record))
+        assert [s.session_id for s in restored] == [session.session_id]
+        assert attached[0]['pid'] == proc.pid
+        # Nothing answers on port 1, so the adapter falls back to managing the process.
+        assert isinstance(restored[0].handle, ProcessHandle)
+        assert second.find_live_by_profile('p1') is restored[0]
+        assert second.restore(lambda record: None) == []
+        assert second.focus(session.session_id) is False
+
+        second.stop(session.session_id)
+        assert proc.wait(10) is not None
+        assert load_session_records(state) == []
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+
+def test_concurrent_record_updates_keep_every_record(tmp_path):
+    state = tmp_path / 'sessions.json'
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    owner = os.getpid()
+    created = psutil.Process(owner).create_time()
+    writer = textwrap.dedent(f"""
+        import sys
+        from pathlib import Path
+        sys.path.insert(0, {root!r})
+        from app.sessions import update_session_records
+        for i in range(15):
+            record = {{'session_id': f'{{sys.argv[1]}}-{{i}}', 'pid': {owner}, 'pid_create_time': {created!r}}}
+            update_session_records([record], path=Path({str(state)!r}))
+    """)
+    writers = [subprocess.Popen([sys.executable, '-c', writer, f'w{n}']) for n in range(4)]
+    for proc in writers:
+        assert proc.wait(30) == 0
+    assert len(load_session_records(state)) == 4 * 15
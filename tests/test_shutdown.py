@@ -0,0 +1,47 @@
+import sys
+import os
+import subprocess
+import threading
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.shutdown import ShutdownCoordinator
+
+
+def test_shutdown_kills_hung_browsers_within_deadline():
+    procs = [subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']) for _ in range(3)]
+    never = threading.Event()
+    coordinator = ShutdownCoordinator(deadline=1.5)
+    for idx, proc in enumerate(procs):
+        coordinator.add_browser(f'session:{idx}', never.wait, proc.pid)
+    coordinator.add_task('stuck-worker', never.wait)
+    coordinator.add_task('save', lambda: None)
+
+    report = coordinator.run()
+
+    assert report.elapsed < 2.5
+    assert sorted(report.killed) == ['session:0', 'session:1', 'session:2']
+    assert report.alive == ['stuck-worker']
+    assert report.finished == ['save']
+    for proc in procs:
+        assert proc.poll() is not None
+
+
+def test_shutdown_does_not_kill_browsers_that_quit_in_time():
+    proc = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    cleaned = threading.Event()
+
+    def quit_browser():
+        # Like quit(): ask the browser to close and return before it has exited.
+        threading.Timer(0.1, proc.terminate).start()
+
+    coordinator = ShutdownCoordinator(deadline=1.5)
+    coordinator.add_browser('session:0', quit_browser, proc.pid, cleanup=cleaned.set)
+
+    report = coordinator.run()
+
+    assert report.killed == []
+    assert report.finished == ['session:0', 'cleanup:session:0']
+    assert cleaned.is_set()
+    assert proc.wait(timeout=1) is not None
@@ -0,0 +1,67 @@
+import sys
+import os
+import time
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.adapters.registry import DEV_ADAPTERS_ENV, get_adapter, list_adapters
+from app.adapters.simulated import SimulatedLaunchError
+from app.cdp import fetch_json
+from app.async_bridge import get_async_loop
+from app.sessions import SESSION_CRASHED, SessionRegistry
+from app.spoofers.profile import BaseConfig
+
+FAST = {'startup_delay_ms': 0, 'startup_jitter_ms': 0, 'memory_mb': 1}
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_simulated_adapter_is_only_listed_in_dev_mode(monkeypatch):
+    monkeypatch.delenv(DEV_ADAPTERS_ENV, raising=False)
+    assert [adapter_id for adapter_id, _ in list_adapters()] == ['chromium', 'camoufox']
+    assert get_adapter('simulated').id == 'simulated'
+    monkeypatch.setenv(DEV_ADAPTERS_ENV, '1')
+    assert 'simulated' in [adapter_id for adapter_id, _ in list_adapters()]
+
+
+def test_sessions_run_as_processes_and_end_like_browsers():
+    adapter = get_adapter('simulated')
+    assert adapter.id == 'simulated'
+    registry = SessionRegistry()
+
+    result = adapter.launch(BaseConfig(profile_id='a', adapter_id='simulated'), dict(FAST))
+    session = registry.register('a', 'simulated', result.page, pid=result.pid)
+    assert session.pid and result.page.is_alive()
+    registry.poll()
+    assert session.is_live
+    result.page.quit()
+    assert not result.page.is_alive()
+
+    crashing = adapter.launch(BaseConfig(profile_id='b', adapter_id='simulated'), {**FAST, 'crash_after_s': 0.2})
+    crashed = registry.register('b', 'simulated', crashing.page, pid=crashing.pid)
+    assert _wait_for(lambda: crashed in registry.poll() or not crashed.is_live)
+    assert crashed.state == SESSION_CRASHED
+
+
+def test_failures_and_processless_sessions_with_devtools():
+    adapter = get_adapter('simulated')
+    with pytest.raises(SimulatedLaunchError):
+        adapter.launch(BaseConfig(profile_id='a'), {**FAST, 'failure_rate': 100})
+    assert adapter.validate(BaseConfig(profile_id='a'), {'failure_rate': 150})[0].key == 'failure_rate'
+
+    result = adapter.launch(BaseConfig(profile_id='a'), {**FAST, 'spawn_process': False, 'devtools': True})
+    assert result.pid is None and result.page.is_alive()
+    version = get_async_loop().run(fetch_json(result.debug_port, '/json/version'))
+    assert version['webSocketDebuggerUrl'].startswith(f'ws://127.0.0.1:{result.debug_port}/')
+    result.page.quit()
+    assert not result.page.is_alive()
@@ -0,0 +1,52 @@
+import sys
+import os
+import queue
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.stall_watchdog import StallWatchdog
+
+
+def _slow_refresh():
+    time.sleep(0.3)
+
+
+def test_stalls_are_attributed_to_the_blocking_call_site(tmp_path):
+    # The test thread plays the GUI thread: it runs whatever the watchdog posts.
+    inbox = queue.Queue()
+    recorded = threading.Event()
+    log_path = tmp_path / 'logs' / 'stalls.log'
+    watchdog = StallWatchdog(
+        inbox.put, threshold_ms=100, log_path=log_path, on_stall=lambda site: recorded.set(),
+        thread_id=threading.get_ident(),
+    )
+    watchdog.start()
+    try:
+        def pump(seconds):
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                try:
+                    inbox.get(timeout=0.01)()
+                except queue.Empty:
+                    pass
+
+        pump(0.3)
+        assert watchdog.sites() == []
+        assert watchdog.max_latency_ms < 100
+
+        _slow_refresh()
+        pump(0.2)
+        assert recorded.wait(2)
+    finally:
+        watchdog.stop()
+
+    [site] = watchdog.sites()
+    assert site.site.startswith('tests/test_stall_watchdog.py:') and site.site.endswith('_slow_refresh')
+    assert site.count == 1 and site.max_ms >= 150
+    assert '_slow_refresh' in site.last_stack
+    assert 'stall' in log_path.read_text(encoding='utf-8')
+    watchdog.clear()
+    assert watchdog.sites() == []
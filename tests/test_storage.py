@@ -0,0 +1,57 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.spoofers.profile as profile_module
+import app.storage as storage_module
+from app.storage import enforce_quota, measure_storage_usage, trim_cache, usage_by_profile
+
+
+def _use_profiles_dir(monkeypatch, path):
+    monkeypatch.setattr(profile_module, 'get_profiles_dir', lambda: path)
+    monkeypatch.setattr(storage_module, 'get_profiles_dir', lambda: path)
+
+
+def _make_chrome_dir(path, cache_size, last_used):
+    (path / 'Default' / 'Cache').mkdir(parents=True)
+    (path / 'Default' / 'Cache' / 'data_0').write_bytes(b'c' * cache_size)
+    (path / 'Default' / 'Local Storage').mkdir()
+    (path / 'Default' / 'Local Storage' / 'leveldb').write_bytes(b'l' * 100)
+    (path / 'Default' / 'Cookies').write_bytes(b'k' * 100)
+    (path / 'GrShaderCache').mkdir()
+    (path / 'GrShaderCache' / 'data_1').write_bytes(b'g' * 50)
+    (path / 'Local State').write_text('{}')
+    for entry in path.iterdir():
+        os.utime(entry, (last_used, last_used))
+
+
+def test_trim_cache_keeps_cookies_and_local_storage(tmp_path):
+    _make_chrome_dir(tmp_path, cache_size=1000, last_used=1)
+
+    assert trim_cache(tmp_path) == 1050
+
+    assert not (tmp_path / 'Default' / 'Cache').exists()
+    assert not (tmp_path / 'GrShaderCache').exists()
+    assert (tmp_path / 'Default' / 'Cookies').exists()
+    assert (tmp_path / 'Default' / 'Local Storage' / 'leveldb').exists()
+
+
+def test_enforce_quota_evicts_least_recently_used_first(tmp_path, monkeypatch):
+    _use_profiles_dir(monkeypatch, tmp_path)
+    _make_chrome_dir(tmp_path / 'chrome' / 'old', cache_size=1000, last_used=1000)
+    _make_chrome_dir(tmp_path / 'chrome' / 'new', cache_size=1000, last_used=2000)
+    _make_chrome_dir(tmp_path / 'chrome' / 'running', cache_size=1000, last_used=500)
+
+    usage = usage_by_profile(measure_storage_usage())
+    assert usage['old'] == (1252, 1050)
+    total = sum(size for size, _ in usage.values())
+
+    freed, trimmed = enforce_quota(total - 1, skip=[tmp_path / 'chrome' / 'running'])
+
+    assert freed == 1050
+    assert [item.profile_id for item in trimmed] == ['old']
+    assert (tmp_path / 'chrome' / 'new' / 'Default' / 'Cache').exists()
+    assert (tmp_path / 'chrome' / 'running' / 'Default' / 'Cache').exists()
+    assert enforce_quota(0) == (0, [])
@@ -0,0 +1,54 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.spoofers.profile as profile_module
+import app.trash as trash_module
+from app.spoofers.profile import BaseConfig, ProfileConfig, save_profile
+from app.trash import empty_trash, find_orphan_user_data_dirs, trash_profile_data
+
+
+def _use_profiles_dir(monkeypatch, path):
+    monkeypatch.setattr(profile_module, 'get_profiles_dir', lambda: path)
+    monkeypatch.setattr(trash_module, 'get_profiles_dir', lambda: path)
+
+
+def _make_user_data(path, size=1024):
+    (path / 'Default').mkdir(parents=True)
+    (path / 'Default' / 'Preferences').write_bytes(b'x' * size)
+
+
+def test_trash_profile_data_and_reap(tmp_path, monkeypatch):
+    _use_profiles_dir(monkeypatch, tmp_path)
+    base = BaseConfig(profile_id='alice', adapter_id='chromium')
+    _make_user_data(tmp_path / 'chrome' / 'alice')
+    _make_user_data(tmp_path / 'camoufox' / 'alice')
+
+    trashed = trash_profile_data(base)
+
+    assert len(trashed) == 2
+    assert not (tmp_path / 'chrome' / 'alice').exists()
+    assert empty_trash(tmp_path) == 2048
+    assert list((tmp_path / '.trash').iterdir()) == []
+
+
+def test_trash_profile_data_ignores_custom_user_data_dir(tmp_path, monkeypatch):
+    _use_profiles_dir(monkeypatch, tmp_path / 'profiles')
+    custom = tmp_path / 'my-chrome'
+    _make_user_data(custom)
+
+    assert trash_profile_data(BaseConfig(profile_id='bob', user_data_dir=str(custom))) == []
+    assert custom.exists()
+
+
+def test_find_orphan_user_data_dirs(tmp_path, monkeypatch):
+    _use_profiles_dir(monkeypatch, tmp_path)
+    save_profile('kept@example.com', ProfileConfig(base_config=BaseConfig(profile_id='kept@example.com')))
+    _make_user_data(tmp_path / 'chrome' / 'kept@example.com')
+    _make_user_data(tmp_path / 'chrome' / 'gone', size=4096)
+
+    orphans = find_orphan_user_data_dirs()
+
+    assert [(path.name, size) for path, size in orphans] == [('gone', 4096)]